@@ -1,23 +1,48 @@
 #!/usr/bin/env python3
 import os
 
-def run_quality_checks():
-    # For demonstration, we'll simulate checking the assets.
-    assets = {
-        "script_outline": "exists",
-        "voiceover": "exists",
-        "final_video": "exists",
-        "thumbnail": "exists",
-        "metadata": "exists",
-        "social_post": "exists"
-    }
-    
+from qa_engine import QAEngine, QualityCheckError, format_report
+# qa_engine puts the repository root on sys.path for the shared utils.
+from utils.file_io import write_json
+
+AGENTS_DIR = os.path.join(os.path.expanduser("~"), "Documents/youtube/Agents")
+ASSETS = {
+    "script": os.path.join(AGENTS_DIR, "2_Scriptwriting_Outline_Agent/code/script_outline.txt"),
+    "voiceover": os.path.join(AGENTS_DIR, "4_Voiceover_Audio_Agent/code/voiceover.wav"),
+    "video": os.path.join(AGENTS_DIR, "5_Video_Creation_Editing_Agent/code/final_video.mp4"),
+    "thumbnail": os.path.join(AGENTS_DIR, "6_Thumbnail_Graphic_Design_Agent/code/thumbnail.png"),
+    "metadata": os.path.join(AGENTS_DIR, "7_SEO_Metadata_Optimization_Agent/code/metadata.json"),
+}
+REPORT_FILE = os.path.join(AGENTS_DIR, "10_Quality_Assurance_Agent/code/qa_report.json")
+
+def run_quality_checks(script_file=ASSETS["script"], voiceover_file=ASSETS["voiceover"],
+                       video_file=ASSETS["video"], thumbnail_file=ASSETS["thumbnail"],
+                       metadata_file=ASSETS["metadata"], report_file=REPORT_FILE,
+                       engine=None, strict=True):
+    # Every asset is checked in parallel; unchanged files reuse cached results.
+    engine = engine or QAEngine()
     print("Running quality assurance checks on all assets...")
-    for asset, status in assets.items():
-        print(f"{asset}: {status}")
-    
-    print("All assets have passed quality assurance.")
+    report = engine.check_assets({
+        "script": script_file,
+        "voiceover": voiceover_file,
+        "video": video_file,
+        "thumbnail": thumbnail_file,
+        "metadata": metadata_file,
+    })
+    print(format_report(report))
+    write_json(report_file, report)
+    print("QA report saved to", report_file)
+
+    if report["warnings"]:
+        print("QA warnings (not blocking):", ", ".join(report["warnings"]))
+    if report["ok"]:
+        print("All assets have passed quality assurance.")
+    elif strict:
+        # Fail the stage so nothing downstream publishes a broken asset.
+        failed = [f"{c['asset']}/{c['check']}" for c in report["checks"]
+                  if not (c["ok"] or c["advisory"])]
+        raise QualityCheckError("Assets failed QA: " + ", ".join(failed))
+    return report
 
 if __name__ == '__main__':
     run_quality_checks()
-
@@ -0,0 +1,448 @@
+"""
+QA Engine
+
+Purpose: Validates every produced asset against the upload spec in parallel:
+         video/audio duration agreement, silence gaps, EBU R128 loudness,
+         resolution and codecs, thumbnail size, and metadata length limits
+Input: Paths of the video, voiceover, thumbnail, metadata and script files
+Output: A QA report of individual checks, cached per file hash
+Dependencies: ffmpeg-python and the ffmpeg/ffprobe binaries (imported when a
+              media file is analysed), struct, hashlib
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.file_io import file_digest, read_json, write_json  # pylint: disable=wrong-import-position
+from utils.instrumentation import span  # pylint: disable=wrong-import-position
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/10_Quality_Assurance_Agent/code/qa_cache"
+)
+# Bump when a checker changes, so cached results from older code are ignored.
+ENGINE_VERSION = 2
+
+_SUMMARY_PATTERNS = {
+    "integrated_lufs": re.compile(r"I:\s+(-?[\d.]+|-inf)\s+LUFS"),
+    "loudness_range_lu": re.compile(r"LRA:\s+(-?[\d.]+|-inf)\s+LU\b"),
+    "true_peak_dbfs": re.compile(r"Peak:\s+(-?[\d.]+|-inf)\s+dBFS"),
+}
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+class QualityCheckError(Exception):
+    """Raised when assets fail QA and the caller asked for a hard stop."""
+
+
+class UploadSpec:
+    """Limits the assets must meet before they are published."""
+
+    def __init__(self, resolutions: Tuple[Tuple[int, int], ...] = (
+                     (1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)),
+                 video_codecs: Tuple[str, ...] = ("h264",),
+                 audio_codecs: Tuple[str, ...] = ("aac",),
+                 max_duration_drift: float = 0.5, max_silence: float = 3.0,
+                 silence_noise_db: float = -50.0, target_lufs: float = -14.0,
+                 lufs_tolerance: float = 4.0, max_true_peak: float = -1.0,
+                 thumbnail_size: Tuple[int, int] = (1280, 720),
+                 thumbnail_min_width: int = 640,
+                 thumbnail_max_bytes: int = 2 * 1024 * 1024,
+                 max_title_chars: int = 100, max_description_bytes: int = 5000,
+                 max_tags_chars: int = 500,
+                 advisory: Tuple[str, ...] = ("loudness", "true_peak")):
+        """Initializes the spec (defaults follow YouTube's upload limits).
+
+        Args:
+            resolutions: Accepted video frame sizes.
+            video_codecs: Accepted video codecs, as named by ffprobe.
+            audio_codecs: Accepted audio codecs, as named by ffprobe.
+            max_duration_drift: Largest allowed video/voiceover length gap, seconds.
+            max_silence: Longest allowed silence inside the audio, seconds.
+            silence_noise_db: Level below which audio counts as silence.
+            target_lufs: Integrated loudness target (YouTube normalizes to -14).
+            lufs_tolerance: Allowed distance from the target, in LU.
+            max_true_peak: Highest allowed true peak, dBTP.
+            thumbnail_size: Aspect ratio the thumbnail must match.
+            thumbnail_min_width: Smallest accepted thumbnail width.
+            thumbnail_max_bytes: Largest accepted thumbnail file.
+            max_title_chars: Longest accepted title.
+            max_description_bytes: Longest accepted description, UTF-8 bytes.
+            max_tags_chars: Longest accepted tag list, counted as YouTube does.
+            advisory: Checks that only warn when they fail. Loudness and
+                true peak are advisory by default: no stage normalises the
+                voiceover yet (Coqui peak-normalises to full scale), and
+                YouTube normalises playback loudness itself.
+        """
+        self.resolutions = tuple(tuple(size) for size in resolutions)
+        self.video_codecs = tuple(video_codecs)
+        self.audio_codecs = tuple(audio_codecs)
+        self.max_duration_drift = max_duration_drift
+        self.max_silence = max_silence
+        self.silence_noise_db = silence_noise_db
+        self.target_lufs = target_lufs
+        self.lufs_tolerance = lufs_tolerance
+        self.max_true_peak = max_true_peak
+        self.thumbnail_size = tuple(thumbnail_size)
+        self.thumbnail_min_width = thumbnail_min_width
+        self.thumbnail_max_bytes = thumbnail_max_bytes
+        self.max_title_chars = max_title_chars
+        self.max_description_bytes = max_description_bytes
+        self.max_tags_chars = max_tags_chars
+        self.advisory = tuple(advisory)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the spec as a plain dictionary."""
+        return dict(vars(self))
+
+
+def check(asset: str, name: str, ok: bool, value: Any = None, limit: Any = None) -> Dict[str, Any]:
+    """Builds one check result."""
+    return {"asset": asset, "check": name, "ok": bool(ok), "value": value, "limit": limit}
+
+
+def _number(text: str) -> float:
+    return float("-inf") if text == "-inf" else float(text)
+
+
+def parse_loudness(stderr: str) -> Dict[str, float]:
+    """Reads the integrated loudness, range and true peak from ebur128 output.
+
+    Only the final summary is used; the per-frame log lines before it are
+    skipped.
+    """
+    summary = stderr[stderr.rfind("Summary:"):] if "Summary:" in stderr else ""
+    values = {}
+    for key, pattern in _SUMMARY_PATTERNS.items():
+        match = pattern.search(summary)
+        if match:
+            values[key] = _number(match.group(1))
+    return values
+
+
+def parse_silences(stderr: str, duration: float) -> List[Tuple[float, float]]:
+    """Returns (start, end) silence intervals from silencedetect output.
+
+    A silence still open when the stream ends runs to ``duration``.
+    """
+    silences, start = [], None
+    for line in stderr.splitlines():
+        started = _SILENCE_START.search(line)
+        if started:
+            start = max(0.0, float(started.group(1)))
+            continue
+        ended = _SILENCE_END.search(line)
+        if ended and start is not None:
+            silences.append((start, float(ended.group(1))))
+            start = None
+    if start is not None:
+        silences.append((start, duration))
+    return silences
+
+
+def analyze_media(path: str, spec: UploadSpec) -> Dict[str, Any]:
+    """Probes a media file and measures its audio in a single decode.
+
+    ffprobe reads the container and stream headers; one ffmpeg run then
+    decodes the first audio stream once through ``ebur128`` and
+    ``silencedetect`` chained in the same filter graph.
+
+    Returns:
+        Dict[str, Any]: Duration, video size and codec, audio codec,
+        loudness values and silence intervals.
+
+    Raises:
+        ImportError: If ffmpeg-python is not installed.
+        RuntimeError: If ffprobe or ffmpeg fails.
+    """
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+
+    with span("qa_probe", category="qa", file=os.path.basename(path)):
+        try:
+            probe = ffmpeg.probe(path)
+        except ffmpeg.Error as error:
+            message = error.stderr.decode("utf-8", "replace") if error.stderr else str(error)
+            raise RuntimeError(f"ffprobe error: {message}") from error
+    facts: Dict[str, Any] = {"duration": float(probe["format"].get("duration", 0.0))}
+    streams = probe.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is not None:
+        facts["video_codec"] = video.get("codec_name")
+        facts["resolution"] = [int(video.get("width", 0)), int(video.get("height", 0))]
+    if audio is None:
+        return facts
+    facts["audio_codec"] = audio.get("codec_name")
+
+    stream = (ffmpeg.input(path).audio
+              .filter("ebur128", peak="true")
+              .filter("silencedetect", noise=f"{spec.silence_noise_db}dB", d=spec.max_silence)
+              .output("-", format="null"))
+    with span("qa_analyze", category="qa", file=os.path.basename(path)):
+        try:
+            _, stderr = ffmpeg.run(stream, capture_stderr=True)
+        except ffmpeg.Error as error:
+            message = error.stderr.decode("utf-8", "replace") if error.stderr else str(error)
+            raise RuntimeError(f"FFmpeg error: {message}") from error
+    text = stderr.decode("utf-8", "replace")
+    facts.update(parse_loudness(text))
+    facts["silences"] = parse_silences(text, facts["duration"])
+    return facts
+
+
+def image_size(path: str) -> Tuple[int, int]:
+    """Reads a PNG or JPEG's width and height from its header.
+
+    Raises:
+        ValueError: If the file is neither PNG nor JPEG, or is truncated.
+    """
+    with open(path, "rb") as file:
+        head = file.read(26)
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 24:
+            return struct.unpack(">II", head[16:24])
+        if head[:2] != b"\xff\xd8":
+            raise ValueError(f"{path} is not a PNG or JPEG image")
+        # Walk the JPEG segments up to the first start-of-frame marker.
+        file.seek(2)
+        while True:
+            marker = file.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                raise ValueError(f"{path}: no JPEG frame header")
+            if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                continue
+            (length,) = struct.unpack(">H", file.read(2))
+            if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">xHH", file.read(5))
+                return width, height
+            file.seek(length - 2, os.SEEK_CUR)
+
+
+def tags_length(tags: List[str]) -> int:
+    """Counts a tag list the way YouTube does: tags with spaces are quoted
+    and tags are comma separated."""
+    return sum(len(tag) + (2 if " " in tag else 0) for tag in tags) + max(len(tags) - 1, 0)
+
+
+def media_checks(asset: str, facts: Dict[str, Any], spec: UploadSpec,
+                 expect_video: bool) -> List[Dict[str, Any]]:
+    """Checks a probed video or audio file against the spec."""
+    checks = []
+    if expect_video:
+        checks.append(check(asset, "resolution", facts.get("resolution") in
+                            [list(size) for size in spec.resolutions],
+                            facts.get("resolution"), [list(size) for size in spec.resolutions]))
+        checks.append(check(asset, "video_codec", facts.get("video_codec") in spec.video_codecs,
+                            facts.get("video_codec"), list(spec.video_codecs)))
+        checks.append(check(asset, "audio_codec", facts.get("audio_codec") in spec.audio_codecs,
+                            facts.get("audio_codec"), list(spec.audio_codecs)))
+    if "audio_codec" not in facts:
+        checks.append(check(asset, "audio_stream", False, None, "present"))
+        return checks
+    loudness = facts.get("integrated_lufs")
+    checks.append(check(asset, "loudness", loudness is not None and
+                        abs(loudness - spec.target_lufs) <= spec.lufs_tolerance, loudness,
+                        [spec.target_lufs - spec.lufs_tolerance,
+                         spec.target_lufs + spec.lufs_tolerance]))
+    peak = facts.get("true_peak_dbfs")
+    checks.append(check(asset, "true_peak", peak is not None and peak <= spec.max_true_peak,
+                        peak, spec.max_true_peak))
+    longest = max((end - start for start, end in facts.get("silences", [])), default=0.0)
+    checks.append(check(asset, "silence_gap", longest <= spec.max_silence, round(longest, 3),
+                        spec.max_silence))
+    return checks
+
+
+def thumbnail_checks(path: str, spec: UploadSpec) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    size = os.path.getsize(path)
+    try:
+        width, height = image_size(path)
+    except ValueError as error:
+        return {"bytes": size}, [check("thumbnail", "format", False, str(error), "PNG or JPEG")]
+    want_w, want_h = spec.thumbnail_size
+    facts = {"bytes": size, "size": [width, height]}
+    return facts, [
+        check("thumbnail", "file_size", size <= spec.thumbnail_max_bytes, size,
+              spec.thumbnail_max_bytes),
+        check("thumbnail", "width", width >= spec.thumbnail_min_width, width,
+              spec.thumbnail_min_width),
+        check("thumbnail", "aspect_ratio", width * want_h == height * want_w,
+              [width, height], list(spec.thumbnail_size)),
+    ]
+
+
+def metadata_checks(path: str, spec: UploadSpec) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    try:
+        metadata = read_json(path)
+    except IOError as error:
+        return {}, [check("metadata", "json", False, str(error), "valid JSON")]
+    title = str(metadata.get("title", ""))
+    description = str(metadata.get("description", ""))
+    tags = [str(tag) for tag in metadata.get("tags", [])]
+    description_bytes = len(description.encode("utf-8"))
+    return {"title": title, "tags": len(tags)}, [
+        check("metadata", "title_length", 0 < len(title) <= spec.max_title_chars, len(title),
+              spec.max_title_chars),
+        # YouTube rejects angle brackets in titles and descriptions.
+        check("metadata", "no_angle_brackets", not re.search(r"[<>]", title + description),
+              None, "no < or >"),
+        check("metadata", "description_length",
+              description_bytes <= spec.max_description_bytes, description_bytes,
+              spec.max_description_bytes),
+        check("metadata", "tags_length", tags_length(tags) <= spec.max_tags_chars,
+              tags_length(tags), spec.max_tags_chars),
+    ]
+
+
+class QAEngine:
+    """Checks assets in parallel and caches the result per file hash."""
+
+    def __init__(self, spec: Optional[UploadSpec] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, workers: int = 4):
+        """Initializes the engine.
+
+        Args:
+            spec (Optional[UploadSpec]): Limits to check against.
+            cache_dir (Optional[str]): Directory of cached results; None
+                disables caching.
+            workers (int): Assets checked at once (each media file is one
+                ffmpeg process).
+        """
+        self.spec = spec or UploadSpec()
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._spec_digest = hashlib.sha256(json.dumps(
+            dict(self.spec.as_dict(), version=ENGINE_VERSION),
+            sort_keys=True).encode("utf-8")).hexdigest()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, asset: str, path: str) -> str:
+        """Hashes the asset kind, the file contents and the spec."""
+        payload = f"{asset}:{file_digest(path)}:{self._spec_digest}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _run_checker(self, asset: str, path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        if asset == "video":
+            facts = analyze_media(path, self.spec)
+            return facts, media_checks(asset, facts, self.spec, expect_video=True)
+        if asset == "voiceover":
+            facts = analyze_media(path, self.spec)
+            return facts, media_checks(asset, facts, self.spec, expect_video=False)
+        if asset == "thumbnail":
+            return thumbnail_checks(path, self.spec)
+        if asset == "metadata":
+            return metadata_checks(path, self.spec)
+        with open(path, "r", encoding="utf-8") as file:
+            words = len(file.read().split())
+        return {"words": words}, [check(asset, "not_empty", words > 0, words, "> 0 words")]
+
+    def check_asset(self, asset: str, path: str) -> Dict[str, Any]:
+        """Checks one asset, reusing the cached result for unchanged files.
+
+        Returns:
+            Dict[str, Any]: ``facts`` measured, ``checks`` run and whether
+            the result came from the ``cache``.
+        """
+        if not path or not os.path.exists(path):
+            return {"facts": {}, "checks": [check(asset, "exists", False, path)],
+                    "cached": False}
+        key = self.key(asset, path)
+        cache_file = os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+        if cache_file and os.path.exists(cache_file):
+            try:
+                result = read_json(cache_file)
+            except IOError:
+                result = None
+            if result is not None:
+                with self._lock:
+                    self.hits += 1
+                return dict(result, cached=True)
+        with self._lock:
+            self.misses += 1
+        try:
+            facts, checks = self._run_checker(asset, path)
+        except (ImportError, RuntimeError, OSError, ValueError) as error:
+            # Analysis failures (including a missing ffmpeg-python) are
+            # reported, never cached: the tool may be installed or fixed.
+            logging.error("QA analysis of %s failed: %s", path, error)
+            return {"facts": {}, "checks": [check(asset, "analysis", False, str(error))],
+                    "cached": False}
+        result = {"facts": facts, "checks": checks}
+        if cache_file:
+            write_json(cache_file, result)
+        return dict(result, cached=False)
+
+    def check_assets(self, assets: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Checks all assets in parallel, then the checks that span assets.
+
+        Args:
+            assets (Dict[str, Optional[str]]): Asset kind (video, voiceover,
+                thumbnail, metadata, or any text asset such as script) to path.
+
+        Returns:
+            Dict[str, Any]: ``ok`` (no blocking check failed), the flat list
+            of ``checks``, the failed advisory checks as ``warnings``,
+            per-asset ``facts``, the assets served from ``cached`` results and
+            ``elapsed`` seconds.
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            futures = {asset: pool.submit(self.check_asset, asset, path)
+                       for asset, path in assets.items()}
+            results = {asset: future.result() for asset, future in futures.items()}
+        checks = [dict(c, advisory=c["check"] in self.spec.advisory)
+                  for result in results.values() for c in result["checks"]]
+        video = results.get("video", {}).get("facts", {})
+        voiceover = results.get("voiceover", {}).get("facts", {})
+        if "duration" in video and "duration" in voiceover:
+            drift = abs(video["duration"] - voiceover["duration"])
+            checks.append(dict(check("video", "duration_matches_voiceover",
+                                     drift <= self.spec.max_duration_drift, round(drift, 3),
+                                     self.spec.max_duration_drift),
+                               advisory="duration_matches_voiceover" in self.spec.advisory))
+        # Failed advisory checks are reported as warnings but do not fail QA.
+        return {"ok": all(c["ok"] or c["advisory"] for c in checks), "checks": checks,
+                "warnings": [f"{c['asset']}/{c['check']}" for c in checks
+                             if c["advisory"] and not c["ok"]],
+                "facts": {asset: result["facts"] for asset, result in results.items()},
+                "cached": sorted(asset for asset, result in results.items() if result["cached"]),
+                "elapsed": time.perf_counter() - start}
+
+    def stats(self) -> Dict[str, int]:
+        """Returns cache hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Renders a QA report as one line per check."""
+    lines = []
+    for item in report["checks"]:
+        status = "ok" if item["ok"] else "warn" if item.get("advisory") else "FAIL"
+        detail = f"{item['value']}" if item["value"] is not None else ""
+        if item["limit"] is not None and not item["ok"]:
+            detail += f" (limit {item['limit']})"
+        lines.append(f"{status:<5}{item['asset']}/{item['check']} {detail}".rstrip())
+    failed = sum(1 for item in report["checks"] if not item["ok"])
+    warnings = len(report.get("warnings", []))
+    lines.append(f"{len(report['checks']) - failed} of {len(report['checks'])} checks passed, "
+                 f"{warnings} warning(s), in {report['elapsed']:.2f}s "
+                 f"({len(report['cached'])} assets cached)")
+    return "\n".join(lines)
@@ -0,0 +1,465 @@
+"""
+Publish Scheduler
+
+Purpose: Schedules approval reminders and uploads for many videos in one
+         lightweight daemon instead of one sleeping, input()-blocked process
+         per video
+Input: Videos queued with a publish time; approvals from the CLI
+Output: Reminders and uploads run at their due time, with durable job state;
+        uploaded videos are added to the SEO agent's keyword index
+Dependencies: sqlite3, socket, heapq, seo_engine
+
+Jobs live in SQLite, so they survive restarts. The daemon keeps pending jobs
+in a heap ordered by due time and sleeps in ``select`` until the next job is
+due or a datagram on its wake socket reports new jobs or approvals.
+
+    python publish_scheduler.py run                  # start the daemon
+    python publish_scheduler.py approve <video_id>   # approve an upload
+    python publish_scheduler.py status
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import select
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.logger import setup_logger  # pylint: disable=wrong-import-position
+
+BASE_DIR = os.path.join(os.path.expanduser("~"), "Documents/youtube/Agents")
+DEFAULT_DB = os.path.join(BASE_DIR, "12_Video_Publishing_Agent/code/publish_jobs.db")
+DEFAULT_SOCKET = os.path.join(BASE_DIR, "12_Video_Publishing_Agent/code/scheduler.sock")
+PUBLISHED_FILE = os.path.join(BASE_DIR, "1_Content_Research_Agent/code/published_topics.txt")
+SEO_INDEX = os.path.join(BASE_DIR, "7_SEO_Metadata_Optimization_Agent/code/seo_index.db")
+SEO_ENGINE = os.path.join(REPO_ROOT, "Agents", "7_SEO_Metadata_Optimization_Agent", "code",
+                          "seo_engine.py")
+
+REMINDER_LEAD = 3 * 3600
+MAX_ATTEMPTS = 5
+RETRY_BASE = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    video_file TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    publish_at REAL NOT NULL,
+    approval TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL REFERENCES videos(video_id),
+    kind TEXT NOT NULL,
+    run_at REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state_run_at ON jobs (state, run_at);
+CREATE INDEX IF NOT EXISTS jobs_video ON jobs (video_id);
+"""
+
+
+class JobStore:
+    """Durable video and job state shared by the daemon and the CLI.
+
+    Job states: ``pending`` (waiting for its time), ``running``, ``held``
+    (an upload that came due before approval), ``done``, ``cancelled`` and
+    ``failed``.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB, clock: Callable[[], float] = time.time):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def schedule_video(self, video_id: str, video_file: str, metadata: Dict[str, Any],
+                       publish_at: float, reminder_lead: float = REMINDER_LEAD) -> None:
+        """Queues a reminder and an upload for a video, replacing earlier jobs.
+
+        Args:
+            video_id (str): Unique video identifier.
+            video_file (str): Path of the rendered video.
+            metadata (Dict[str, Any]): Title, description and tags.
+            publish_at (float): Upload time as a Unix timestamp.
+            reminder_lead (float): Seconds before the upload to ask for approval.
+        """
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, video_file, metadata, publish_at) "
+                "VALUES (?, ?, ?, ?)", (video_id, video_file, json.dumps(metadata), publish_at))
+            self._conn.execute(
+                "UPDATE jobs SET state='cancelled', updated_at=? "
+                "WHERE video_id=? AND state IN ('pending', 'held')", (now, video_id))
+            self._conn.executemany(
+                "INSERT INTO jobs (video_id, kind, run_at, updated_at) VALUES (?, ?, ?, ?)",
+                [(video_id, "reminder", publish_at - reminder_lead, now),
+                 (video_id, "upload", publish_at, now)])
+
+    def set_approval(self, video_id: str, approved: bool) -> bool:
+        """Records an approval decision and releases or cancels held uploads.
+
+        Returns:
+            bool: False if the video is unknown.
+        """
+        now = self._clock()
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                "UPDATE videos SET approval=? WHERE video_id=?",
+                ("approved" if approved else "rejected", video_id)).rowcount
+            if not updated:
+                return False
+            if approved:
+                self._conn.execute(
+                    "UPDATE jobs SET state='pending', run_at=MAX(run_at, ?), updated_at=? "
+                    "WHERE video_id=? AND kind='upload' AND state='held'", (now, now, video_id))
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET state='cancelled', updated_at=? "
+                    "WHERE video_id=? AND state IN ('pending', 'held')", (now, video_id))
+        return True
+
+    def pending_jobs(self) -> List[tuple]:
+        """Returns ``(run_at, job_id)`` for every pending job."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT run_at, id FROM jobs WHERE state='pending'").fetchall()
+
+    def recover(self) -> int:
+        """Requeues jobs left running by a daemon that died mid-job."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET state='pending', updated_at=? WHERE state='running'",
+                (self._clock(),)).rowcount
+
+    def claim(self, job_id: int, run_at: float) -> Optional[Dict[str, Any]]:
+        """Marks a due job as running and returns it with its video.
+
+        Returns None if the job changed since it was queued (rescheduled,
+        cancelled or already claimed).
+        """
+        with self._lock, self._conn:
+            claimed = self._conn.execute(
+                "UPDATE jobs SET state='running', attempts=attempts+1, updated_at=? "
+                "WHERE id=? AND state='pending' AND run_at=?",
+                (self._clock(), job_id, run_at)).rowcount
+            if not claimed:
+                return None
+            row = self._conn.execute(
+                "SELECT j.id, j.kind, j.attempts, v.video_id, v.video_file, v.metadata, "
+                "v.publish_at, v.approval FROM jobs j JOIN videos v USING (video_id) "
+                "WHERE j.id=?", (job_id,)).fetchone()
+        keys = ("job_id", "kind", "attempts", "video_id", "video_file", "metadata",
+                "publish_at", "approval")
+        job = dict(zip(keys, row))
+        job["metadata"] = json.loads(job["metadata"])
+        return job
+
+    def finish(self, job_id: int, state: str, error: Optional[str] = None,
+               run_at: Optional[float] = None) -> None:
+        """Moves a claimed job to its next state, optionally rescheduling it."""
+        with self._lock, self._conn:
+            if run_at is None:
+                self._conn.execute(
+                    "UPDATE jobs SET state=?, last_error=?, updated_at=? WHERE id=?",
+                    (state, error, self._clock(), job_id))
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET state=?, last_error=?, run_at=?, updated_at=? WHERE id=?",
+                    (state, error, run_at, self._clock(), job_id))
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Lists unfinished jobs with their video's approval, soonest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT j.id, j.video_id, j.kind, j.run_at, j.state, j.attempts, v.approval "
+                "FROM jobs j JOIN videos v USING (video_id) "
+                "WHERE j.state NOT IN ('done', 'cancelled') ORDER BY j.run_at").fetchall()
+        keys = ("job_id", "video_id", "kind", "run_at", "state", "attempts", "approval")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of jobs per state."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+
+def notify(socket_path: str = DEFAULT_SOCKET, message: str = "wake") -> bool:
+    """Wakes a running daemon; returns False when none is listening.
+
+    Jobs are durable, so a daemon that is not running picks the change up
+    when it starts.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        try:
+            sock.sendto(message.encode("utf-8"), socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def send_reminder(job: Dict[str, Any]) -> None:
+    """Default reminder: asks for approval without blocking on input."""
+    print(f"Reminder: approve '{job['metadata'].get('title', job['video_id'])}' "
+          f"for upload at {datetime.fromtimestamp(job['publish_at'])}:\n"
+          f"    python publish_scheduler.py approve {job['video_id']}")
+
+
+def run_upload(job: Dict[str, Any]) -> None:
+    """Default upload: publishes the video, records its topic as published and
+    indexes its metadata for the SEO agent."""
+    # pylint: disable=import-outside-toplevel
+    from video_publishing_agent import upload_video
+
+    metadata = job["metadata"]
+    if not upload_video(job["video_file"], metadata.get("title", ""),
+                        metadata.get("description", ""), metadata.get("tags", [])):
+        raise RuntimeError("Upload reported failure")
+    topic = metadata.get("topic") or metadata.get("title")
+    if topic:
+        os.makedirs(os.path.dirname(PUBLISHED_FILE), exist_ok=True)
+        with open(PUBLISHED_FILE, "a", encoding="utf-8") as file:
+            file.write(topic + "\n")
+    # The upload already happened; a failed index update must not retry it.
+    try:
+        index_published(job["video_id"], metadata)
+    except (sqlite3.Error, OSError) as error:
+        logging.warning("Could not index %s for SEO: %s", job["video_id"], error)
+
+
+def index_published(video_id: str, metadata: Dict[str, Any],
+                    index_path: Optional[str] = None) -> int:
+    """Adds a published video to the SEO keyword index, so later metadata
+    learns from what the channel has already put out.
+
+    Returns:
+        int: Number of documents indexed.
+    """
+    # pylint: disable=import-outside-toplevel
+    from utils.dag_executor import load_agent_module
+
+    seo_engine = load_agent_module(SEO_ENGINE)
+    index = seo_engine.KeywordIndex(index_path or SEO_INDEX)
+    try:
+        return seo_engine.SEOEngine(index).index_video(video_id, metadata)
+    finally:
+        index.close()
+
+
+class PublishScheduler:
+    """Runs due jobs from a :class:`JobStore` using an in-memory heap."""
+
+    def __init__(self, store: JobStore, handlers: Optional[Dict[str, Callable]] = None,
+                 socket_path: Optional[str] = DEFAULT_SOCKET, max_workers: int = 2,
+                 clock: Callable[[], float] = time.time, retry_base: float = RETRY_BASE,
+                 max_attempts: int = MAX_ATTEMPTS):
+        """Initializes the scheduler.
+
+        Args:
+            store (JobStore): Durable job state.
+            handlers (Optional[Dict[str, Callable]]): Callables per job kind
+                (``reminder``, ``upload``) taking the claimed job.
+            socket_path (Optional[str]): Wake socket for the daemon loop.
+            max_workers (int): Jobs (e.g. uploads) running at once.
+            clock: Time source (injectable for tests).
+            retry_base (float): First retry delay for a failed job.
+            max_attempts (int): Attempts before a job is marked failed.
+        """
+        self.store = store
+        self.handlers = handlers or {"reminder": send_reminder, "upload": run_upload}
+        self.socket_path = socket_path
+        self.max_workers = max_workers
+        self.retry_base = retry_base
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._heap: List[tuple] = []
+        self._queued: Dict[int, float] = {}
+        self._stop = threading.Event()
+
+    def refresh(self) -> int:
+        """Adds new or rescheduled pending jobs to the heap.
+
+        Stale heap entries are left in place and skipped when popped.
+        """
+        added = 0
+        for run_at, job_id in self.store.pending_jobs():
+            if self._queued.get(job_id) != run_at:
+                self._queued[job_id] = run_at
+                heapq.heappush(self._heap, (run_at, job_id))
+                added += 1
+        return added
+
+    def next_due(self) -> Optional[float]:
+        """Returns the earliest queued run time."""
+        while self._heap and self._queued.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        if job["kind"] == "reminder" and job["approval"] != "pending":
+            self.store.finish(job["job_id"], "done")
+            return
+        if job["kind"] == "upload" and job["approval"] != "approved":
+            if job["approval"] == "rejected":
+                self.store.finish(job["job_id"], "cancelled")
+            else:
+                logging.info("Upload of %s is due but not approved; holding", job["video_id"])
+                self.store.finish(job["job_id"], "held")
+            return
+        try:
+            self.handlers[job["kind"]](job)
+        except Exception as error:  # pylint: disable=broad-except
+            if job["attempts"] >= self.max_attempts:
+                logging.error("%s for %s failed permanently: %s", job["kind"],
+                              job["video_id"], error)
+                self.store.finish(job["job_id"], "failed", str(error))
+            else:
+                delay = self.retry_base * 2 ** (job["attempts"] - 1)
+                logging.warning("%s for %s failed (attempt %d), retrying in %.0fs: %s",
+                                job["kind"], job["video_id"], job["attempts"], delay, error)
+                self.store.finish(job["job_id"], "pending", str(error),
+                                  run_at=self._clock() + delay)
+            return
+        self.store.finish(job["job_id"], "done")
+        logging.info("%s for %s done", job["kind"], job["video_id"])
+
+    def _due_jobs(self) -> List[Dict[str, Any]]:
+        now = self._clock()
+        jobs = []
+        while True:
+            run_at = self.next_due()
+            if run_at is None or run_at > now:
+                return jobs
+            _, job_id = heapq.heappop(self._heap)
+            del self._queued[job_id]
+            job = self.store.claim(job_id, run_at)
+            if job is not None:
+                jobs.append(job)
+
+    def run_pending(self) -> int:
+        """Runs every due job in the calling thread; returns how many ran."""
+        self.refresh()
+        jobs = self._due_jobs()
+        for job in jobs:
+            self._execute(job)
+        # Retries and released holds go back into the heap.
+        self.refresh()
+        return len(jobs)
+
+    def stop(self) -> None:
+        """Asks :meth:`serve_forever` to return."""
+        self._stop.set()
+        if self.socket_path:
+            notify(self.socket_path, "stop")
+
+    def _wake(self, _future) -> None:
+        # Wake the loop after a job so retries and held uploads are queued.
+        if self.socket_path:
+            notify(self.socket_path)
+
+    def serve_forever(self) -> None:
+        """Sleeps until the next job or a wake datagram, running due jobs in a pool."""
+        recovered = self.store.recover()
+        if recovered:
+            logging.info("Requeued %d jobs interrupted by a previous run", recovered)
+        sock = None
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(self.socket_path)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            self.refresh()
+            logging.info("Scheduler started with %d pending jobs", len(self._queued))
+            while not self._stop.is_set():
+                for job in self._due_jobs():
+                    pool.submit(self._execute, job).add_done_callback(self._wake)
+                run_at = self.next_due()
+                timeout = None if run_at is None else max(0.0, run_at - self._clock())
+                if sock is None:
+                    self._stop.wait(timeout if timeout is not None else 1.0)
+                else:
+                    readable, _, _ = select.select([sock], [], [], timeout)
+                    if readable:
+                        sock.recv(1024)
+                self.refresh()
+        finally:
+            pool.shutdown(wait=True)
+            if sock is not None:
+                sock.close()
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule approvals and uploads.")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="start the scheduler daemon")
+    run.add_argument("--workers", type=int, default=2)
+    for name in ("approve", "reject"):
+        commands.add_parser(name, help=f"{name} a video's upload").add_argument("video_id")
+    schedule = commands.add_parser("schedule", help="queue a video for upload")
+    schedule.add_argument("video_id")
+    schedule.add_argument("video_file")
+    schedule.add_argument("--at", required=True, help="publish time, ISO format")
+    schedule.add_argument("--metadata", help="JSON metadata file (title, description, tags)")
+    commands.add_parser("status", help="list unfinished jobs")
+    args = parser.parse_args(argv)
+
+    store = JobStore(args.db)
+    if args.command == "run":
+        setup_logger()
+        PublishScheduler(store, socket_path=args.socket, max_workers=args.workers).serve_forever()
+    elif args.command in ("approve", "reject"):
+        if not store.set_approval(args.video_id, args.command == "approve"):
+            parser.exit(1, f"Unknown video: {args.video_id}\n")
+        notify(args.socket)
+        print(f"{args.video_id}: {args.command}d")
+    elif args.command == "schedule":
+        metadata = {}
+        if args.metadata:
+            with open(args.metadata, "r", encoding="utf-8") as file:
+                metadata = json.load(file)
+        store.schedule_video(args.video_id, os.path.abspath(args.video_file), metadata,
+                             datetime.fromisoformat(args.at).timestamp())
+        notify(args.socket)
+        print(f"{args.video_id}: scheduled for {args.at}")
+    else:
+        for job in store.status():
+            print(f"{job['job_id']:>6}  {datetime.fromtimestamp(job['run_at']):%Y-%m-%d %H:%M}  "
+                  f"{job['kind']:<8} {job['state']:<8} {job['approval']:<8} {job['video_id']}")
+        print(store.counts())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Upload Pipeline
+
+Purpose: Uploads videos in fixed-size chunks over a resumable-upload protocol,
+         several at once under per-channel concurrency and daily quotas
+Input: Video files with metadata and a channel name
+Output: Uploaded video ids with per-upload throughput; session state on disk
+        so an interrupted upload resumes from the last acknowledged byte
+Dependencies: urllib, mmap, http.server (local stand-in endpoint), utils.rate_limit
+
+The protocol follows YouTube's resumable uploads: a POST creates a session
+and returns its URL in ``Location``; each chunk is PUT with a
+``Content-Range`` header and answered with ``308`` and the received
+``Range`` until the final chunk returns the created video. A PUT with
+``Content-Range: bytes */<size>`` asks how much the server already has.
+"""
+
+import hashlib
+import http.server
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.instrumentation import span  # pylint: disable=wrong-import-position
+from utils.rate_limit import RateLimiter  # pylint: disable=wrong-import-position
+
+DEFAULT_STATE_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/12_Video_Publishing_Agent/code/upload_sessions"
+)
+# Resumable chunks must be multiples of 256 KiB.
+CHUNK_ALIGN = 256 * 1024
+DEFAULT_CHUNK_SIZE = 32 * CHUNK_ALIGN
+
+_RANGE = re.compile(r"bytes=0-(\d+)")
+_CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+)")
+
+
+class UploadError(RuntimeError):
+    """Raised when an upload cannot be completed."""
+
+
+class QuotaExceeded(UploadError):
+    """Raised when a channel has used its daily upload quota."""
+
+
+class UploadJob:
+    """One video to upload."""
+
+    def __init__(self, video_file: str, metadata: Dict[str, Any], channel: str = "default"):
+        self.video_file = video_file
+        self.metadata = metadata
+        self.channel = channel
+
+
+class UploadResult:
+    """Outcome and throughput of one upload."""
+
+    def __init__(self, video_file: str, channel: str):
+        self.video_file = video_file
+        self.channel = channel
+        self.video_id: Optional[str] = None
+        self.size = 0
+        self.bytes_sent = 0
+        self.resumed_from = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second sent during this run."""
+        return self.bytes_sent / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the result as a plain dictionary."""
+        return dict(vars(self), throughput=self.throughput)
+
+
+class SessionState:
+    """Resumable session for one file, persisted as JSON after every chunk."""
+
+    def __init__(self, state_dir: str, video_file: str):
+        self.path = os.path.join(
+            state_dir, hashlib.sha1(os.path.abspath(video_file).encode("utf-8")).hexdigest()
+            + ".json")
+        self.data: Dict[str, Any] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.data = json.load(file)
+
+    def matches(self, size: int, mtime: float) -> bool:
+        """True when the saved session belongs to the file as it is now."""
+        return (self.data.get("size") == size and self.data.get("mtime") == mtime
+                and bool(self.data.get("session_url")))
+
+    def save(self, **changes) -> None:
+        """Updates and atomically rewrites the state file."""
+        self.data.update(changes)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.data, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Removes the state file after a completed upload."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ResumableUploader:
+    """Streams one file at a time to a resumable-upload endpoint."""
+
+    def __init__(self, endpoint: str, state_dir: str = DEFAULT_STATE_DIR,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, timeout: float = 60.0,
+                 retries: int = 5, retry_base: float = 1.0,
+                 max_bytes_per_second: Optional[float] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        """Initializes the uploader.
+
+        Args:
+            endpoint (str): Upload URL that creates sessions.
+            state_dir (str): Directory for resumable session state.
+            chunk_size (int): Bytes per PUT; rounded up to 256 KiB.
+            timeout (float): Socket timeout per request.
+            retries (int): Consecutive failed requests before giving up.
+            retry_base (float): First retry delay, doubled per failure.
+            max_bytes_per_second (Optional[float]): Bandwidth cap shared by
+                every upload using this uploader.
+            headers (Optional[Dict[str, str]]): Extra headers, e.g. auth.
+        """
+        self.endpoint = endpoint
+        self.state_dir = state_dir
+        self.chunk_size = -(-chunk_size // CHUNK_ALIGN) * CHUNK_ALIGN
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_base = retry_base
+        self.headers = headers or {}
+        self.bandwidth = (RateLimiter(max_bytes_per_second, burst=self.chunk_size)
+                          if max_bytes_per_second else None)
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _request(self, url: str, method: str, data=b"", headers=None):
+        """Sends a request; returns (status, headers, body) including 308s."""
+        request = urllib.request.Request(url, data=data, method=method,
+                                         headers=dict(self.headers, **(headers or {})))
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as error:
+            if error.code == 308:
+                return 308, error.headers, b""
+            raise
+
+    def _create_session(self, size: int, metadata: Dict[str, Any]) -> str:
+        status, headers, _ = self._request(
+            self.endpoint, "POST", json.dumps(metadata).encode("utf-8"),
+            {"Content-Type": "application/json", "X-Upload-Content-Length": str(size),
+             "X-Upload-Content-Type": "video/*"})
+        if status != 200 or not headers.get("Location"):
+            raise UploadError(f"Session creation failed with HTTP {status}")
+        return headers["Location"]
+
+    def _query_offset(self, session_url: str, size: int) -> Optional[int]:
+        """Returns bytes the server holds, or None if the session is gone."""
+        try:
+            status, headers, body = self._request(
+                session_url, "PUT", b"", {"Content-Range": f"bytes */{size}"})
+        except urllib.error.HTTPError as error:
+            if error.code in (404, 410):
+                return None
+            raise
+        if status in (200, 201):
+            return size if body else None
+        match = _RANGE.match(headers.get("Range", ""))
+        return int(match.group(1)) + 1 if match else 0
+
+    def upload(self, video_file: str, metadata: Dict[str, Any], channel: str = "default",
+               progress: Optional[Callable[[int, int], None]] = None) -> UploadResult:
+        """Uploads a file, resuming a saved session when possible.
+
+        Args:
+            video_file (str): File to upload.
+            metadata (Dict[str, Any]): Title, description, tags, ...
+            channel (str): Channel the upload counts against.
+            progress: Called with (bytes acknowledged, total) after each chunk.
+
+        Returns:
+            UploadResult: Video id, bytes sent and throughput.
+
+        Raises:
+            UploadError: If the upload fails after all retries.
+        """
+        result = UploadResult(video_file, channel)
+        stat = os.stat(video_file)
+        result.size = size = stat.st_size
+        state = SessionState(self.state_dir, video_file)
+        offset: Optional[int] = None
+        if state.matches(size, stat.st_mtime):
+            offset = self._query_offset(state.data["session_url"], size)
+        if offset is None:
+            state.data = {}
+            state.save(video_file=os.path.abspath(video_file), size=size, mtime=stat.st_mtime,
+                       channel=channel, session_url=self._create_session(size, metadata),
+                       offset=0)
+            offset = 0
+        result.resumed_from = offset
+        session_url = state.data["session_url"]
+
+        start = time.perf_counter()
+        failures = 0
+        with span("upload", category="publishing", size=size, resumed_from=offset,
+                  channel=channel), open(video_file, "rb") as file:
+            # mmap cannot map empty files; those are sent as one empty chunk.
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            try:
+                while True:
+                    end = min(offset + self.chunk_size, size)
+                    if self.bandwidth is not None and end > offset:
+                        self.bandwidth.acquire(end - offset)
+                    content_range = (f"bytes {offset}-{end - 1}/{size}" if size
+                                     else "bytes */0")
+                    try:
+                        with memoryview(mapped if mapped is not None else b"") as view, \
+                                view[offset:end] as chunk:
+                            status, headers, body = self._request(
+                                session_url, "PUT", chunk,
+                                {"Content-Range": content_range,
+                                 "Content-Length": str(end - offset),
+                                 "Content-Type": "application/octet-stream"})
+                    except (urllib.error.URLError, OSError) as error:
+                        failures += 1
+                        if failures > self.retries or (
+                                isinstance(error, urllib.error.HTTPError) and error.code < 500):
+                            raise UploadError(f"Upload of {video_file} failed: {error}") from error
+                        delay = self.retry_base * 2 ** (failures - 1)
+                        logging.warning("Chunk at %d failed (%s); retrying in %.1fs",
+                                        offset, error, delay)
+                        time.sleep(delay)
+                        offset = self._query_offset(session_url, size)
+                        if offset is None:
+                            raise UploadError("Upload session expired") from error
+                        continue
+                    failures = 0
+                    result.chunks += 1
+                    if status in (200, 201):
+                        result.bytes_sent += end - offset
+                        result.video_id = json.loads(body or b"{}").get("id")
+                        break
+                    match = _RANGE.match(headers.get("Range", ""))
+                    acknowledged = int(match.group(1)) + 1 if match else 0
+                    result.bytes_sent += max(0, acknowledged - offset)
+                    offset = acknowledged
+                    state.save(offset=offset)
+                    if progress is not None:
+                        progress(offset, size)
+            finally:
+                if mapped is not None:
+                    mapped.close()
+                result.elapsed = time.perf_counter() - start
+        state.clear()
+        logging.info("Uploaded %s as %s: %.1f MiB in %.1fs (%.2f MiB/s, resumed at %d)",
+                     video_file, result.video_id, result.bytes_sent / 2 ** 20, result.elapsed,
+                     result.throughput / 2 ** 20, result.resumed_from)
+        return result
+
+
+class QuotaLedger:
+    """Daily upload counts per channel, persisted next to the session state."""
+
+    def __init__(self, path: str, daily_limits: Dict[str, int]):
+        self.path = path
+        self.daily_limits = daily_limits
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                ledger = json.load(file)
+            if ledger.get("day") == date.today().isoformat():
+                return ledger
+        return {"day": date.today().isoformat(), "used": {}}
+
+    def reserve(self, channel: str) -> None:
+        """Counts an upload against the channel's daily limit.
+
+        Raises:
+            QuotaExceeded: If the channel has no uploads left today.
+        """
+        with self._lock:
+            ledger = self._load()
+            used = ledger["used"].get(channel, 0)
+            limit = self.daily_limits.get(channel)
+            if limit is not None and used >= limit:
+                raise QuotaExceeded(f"Channel {channel} has used its daily quota of {limit} uploads")
+            ledger["used"][channel] = used + 1
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(ledger, file)
+            os.replace(self.path + ".tmp", self.path)
+
+    def release(self, channel: str) -> None:
+        """Returns a reservation for an upload that failed."""
+        with self._lock:
+            ledger = self._load()
+            ledger["used"][channel] = max(0, ledger["used"].get(channel, 0) - 1)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(ledger, file)
+            os.replace(self.path + ".tmp", self.path)
+
+
+class UploadPipeline:
+    """Runs many uploads concurrently under per-channel limits."""
+
+    def __init__(self, uploader: ResumableUploader, max_concurrent: int = 4,
+                 channel_concurrency: Optional[Dict[str, int]] = None,
+                 daily_quota: Optional[Dict[str, int]] = None,
+                 default_channel_concurrency: int = 2):
+        """Initializes the pipeline.
+
+        Args:
+            uploader (ResumableUploader): Shared uploader (and bandwidth cap).
+            max_concurrent (int): Uploads in flight across all channels.
+            channel_concurrency (Optional[Dict[str, int]]): Uploads in flight
+                per channel.
+            daily_quota (Optional[Dict[str, int]]): Uploads per channel per day.
+            default_channel_concurrency (int): Limit for unlisted channels.
+        """
+        self.uploader = uploader
+        self.max_concurrent = max_concurrent
+        self.channel_concurrency = channel_concurrency or {}
+        self.default_channel_concurrency = default_channel_concurrency
+        self.quota = QuotaLedger(os.path.join(uploader.state_dir, "quota.json"),
+                                 daily_quota or {})
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, channel: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if channel not in self._semaphores:
+                limit = self.channel_concurrency.get(channel, self.default_channel_concurrency)
+                self._semaphores[channel] = threading.BoundedSemaphore(limit)
+            return self._semaphores[channel]
+
+    def _run(self, job: UploadJob) -> UploadResult:
+        try:
+            self.quota.reserve(job.channel)
+        except QuotaExceeded as error:
+            result = UploadResult(job.video_file, job.channel)
+            result.error = str(error)
+            return result
+        with self._semaphore(job.channel):
+            try:
+                return self.uploader.upload(job.video_file, job.metadata, job.channel)
+            except (UploadError, OSError) as error:
+                self.quota.release(job.channel)
+                result = UploadResult(job.video_file, job.channel)
+                result.error = str(error)
+                logging.error("Upload of %s failed: %s", job.video_file, error)
+                return result
+
+    def run(self, jobs: Sequence[UploadJob]) -> List[UploadResult]:
+        """Uploads every job and returns results in job order."""
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+            return list(pool.map(self._run, jobs))
+
+
+def format_report(results: Sequence[UploadResult]) -> str:
+    """Formats per-upload throughput as a table."""
+    lines = [f"{'file':<40} {'channel':<10} {'MiB':>8} {'s':>7} {'MiB/s':>7}  status"]
+    for result in results:
+        status = result.error or f"ok {result.video_id}"
+        if result.resumed_from:
+            status += f" (resumed at {result.resumed_from})"
+        lines.append(f"{os.path.basename(result.video_file)[:40]:<40} {result.channel:<10} "
+                     f"{result.bytes_sent / 2 ** 20:>8.1f} {result.elapsed:>7.1f} "
+                     f"{result.throughput / 2 ** 20:>7.2f}  {status}")
+    return "\n".join(lines)
+
+
+class _UploadHandler(http.server.BaseHTTPRequestHandler):
+    """Resumable-upload stand-in; state lives on the server object."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug("upload endpoint: " + format, *args)
+
+    def _reply(self, status: int, headers: Optional[Dict[str, str]] = None,
+               body: bytes = b"") -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        metadata = json.loads(self.rfile.read(length) or b"{}")
+        session_id = uuid.uuid4().hex
+        with server.lock:
+            server.sessions[session_id] = {
+                "size": int(self.headers["X-Upload-Content-Length"]),
+                "received": 0, "metadata": metadata, "done": None}
+        open(os.path.join(server.storage_dir, session_id + ".part"), "wb").close()
+        self._reply(200, {"Location": f"{server.url}/session/{session_id}"})
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        server = self.server
+        session_id = self.path.rsplit("/", 1)[-1]
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        session = server.sessions.get(session_id)
+        if session is None:
+            self._reply(404)
+            return
+        match = _CONTENT_RANGE.match(self.headers.get("Content-Range", ""))
+        if not match:
+            self._reply(400)
+            return
+        if session["done"] is not None:
+            self._reply(201, {"Content-Type": "application/json"}, session["done"])
+            return
+        if match.group(1) is not None and body:
+            with server.lock:
+                server.chunks += 1
+                fail = server.chunks in server.fail_chunks
+            if fail:
+                self._reply(503)
+                return
+            start = int(match.group(1))
+            if start != session["received"]:
+                # Out-of-order chunk: report what we actually have.
+                self._reply_incomplete(session)
+                return
+            if server.bytes_per_second:
+                time.sleep(len(body) / server.bytes_per_second)
+            with open(os.path.join(server.storage_dir, session_id + ".part"), "ab") as file:
+                file.write(body)
+            session["received"] += len(body)
+        if session["received"] >= session["size"]:
+            video_id = session_id[:11]
+            os.replace(os.path.join(server.storage_dir, session_id + ".part"),
+                       os.path.join(server.storage_dir, video_id + ".mp4"))
+            session["done"] = json.dumps({"id": video_id,
+                                          "snippet": session["metadata"]}).encode("utf-8")
+            self._reply(201, {"Content-Type": "application/json"}, session["done"])
+            return
+        self._reply_incomplete(session)
+
+    def _reply_incomplete(self, session):
+        headers = {}
+        if session["received"]:
+            headers["Range"] = f"bytes=0-{session['received'] - 1}"
+        self._reply(308, headers)
+
+
+class LocalUploadServer(http.server.ThreadingHTTPServer):
+    """Local resumable-upload endpoint for offline tests and benchmarks.
+
+    ``bytes_per_second`` throttles every chunk to simulate a slow link and
+    ``fail_chunks`` answers those chunk numbers (1-based, counted across all
+    sessions) with ``503`` to exercise retry and resume.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, storage_dir: str, bytes_per_second: Optional[float] = None,
+                 fail_chunks: Sequence[int] = ()):
+        super().__init__(("127.0.0.1", 0), _UploadHandler)
+        os.makedirs(storage_dir, exist_ok=True)
+        self.storage_dir = storage_dir
+        self.bytes_per_second = bytes_per_second
+        self.fail_chunks = set(fail_chunks)
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.chunks = 0
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def upload_url(self) -> str:
+        """URL that creates upload sessions."""
+        return f"{self.url}/upload?uploadType=resumable"
+
+    def start(self) -> "LocalUploadServer":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
@@ -1,67 +1,7 @@
 #!/usr/bin/env python3
-import os
-import datetime
-import time
-
-def get_scheduled_upload_time():
-    # Schedule upload for tomorrow at 12:00 PM.
-    scheduled_time = datetime.datetime.now() + datetime.timedelta(days=1)
-    scheduled_time = scheduled_time.replace(hour=12, minute=0, second=0, 
-microsecond=0)
-    return scheduled_time
-
-def wait_for_approval(reminder_time):
-    # Prompt the user for approval.
-    print("Reminder: Please approve the video for upload by", 
-reminder_time)
-    approval = input("Type 'approve' to confirm upload: ")
-    return approval.strip().lower() == "approve"
-
-def upload_video(video_file, title, description, tags):
-    # Simulate video upload (stub for YouTube API).
-    print("Uploading video:", video_file)
-    time.sleep(2)  # Simulate some upload time.
-    print("Video uploaded successfully!")
-    return True
-
-def main():
-    # Define the final video file path.
-    video_file = os.path.join(os.path.expanduser("~"), 
-                              
-"Documents/youtube/Agents/5_Video_Creation_Editing_Agent/code/final_video.mp4")
-    if not os.path.exists(video_file):
-        print("Final video not found. Please ensure it is generated before 
-publishing.")
-        return
-    
-    scheduled_time = get_scheduled_upload_time()
-    print("Scheduled upload time:", scheduled_time)
-    
-    # Set reminder time to 3 hours before scheduled upload.
-    reminder_time = scheduled_time - datetime.timedelta(hours=3)
-    print("Reminder time (when approval is needed):", reminder_time)
-    
-    # Wait until the reminder time.
-    while datetime.datetime.now() < reminder_time:
-        time_to_wait = (reminder_time - 
-datetime.datetime.now()).total_seconds()
-        print(f"Waiting for {int(time_to_wait)} seconds until 
-reminder...")
-        time.sleep(min(60, time_to_wait))  # Sleep in increments of 60 
-seconds.
-    
-    # Prompt for approval.
-    if wait_for_approval(reminder_time):
-        print("Approval received. Proceeding with upload...")
-        # Simulated metadata.
-        title = "Breaking News on Asap Rocky"
-        description = "This video discusses trending news about Asap Rocky 
-with in-depth analysis."
-        tags = ["Asap Rocky", "Breaking News", "Analysis", "Trending"]
-        upload_video(video_file, title, description, tags)
-    else:
-        print("Approval not received. Upload cancelled.")
+# Kept for existing entry points; publishing is queued with the scheduler
+# daemon exactly as in video_publishing_agent.
+from video_publishing_agent import get_scheduled_upload_time, main, upload_video
 
 if __name__ == '__main__':
     main()
-
@@ -1,58 +1,117 @@
 #!/usr/bin/env python3
 import os
 import datetime
+import json
 import time
 
-def get_scheduled_upload_time():
-    # Schedule the upload for tomorrow at 12:00 PM.
-    scheduled_time = datetime.datetime.now() + datetime.timedelta(days=1)
+from publish_scheduler import DEFAULT_DB as JOB_DB, REMINDER_LEAD, JobStore, notify
+from upload_pipeline import ResumableUploader, UploadError, format_report
+
+CALENDAR_DB = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/3_Content_Planning_Calendar_Agent/code/calendar.db"
+)
+CALENDAR_ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                               "3_Content_Planning_Calendar_Agent", "code", "calendar_engine.py")
+
+def open_calendar(calendar_db=CALENDAR_DB):
+    # The planning agent's publish calendar, or None before anything was planned.
+    if not os.path.exists(calendar_db):
+        return None
+    # publish_scheduler puts the repository root on sys.path for the shared utils.
+    from utils.dag_executor import load_agent_module  # pylint: disable=import-outside-toplevel
+    return load_agent_module(CALENDAR_ENGINE).ContentCalendar(
+        calendar_db, utc_offset=time.localtime().tm_gmtoff)
+
+def get_scheduled_upload_time(video=None, calendar_db=CALENDAR_DB, lock=False, now=None):
+    # Publish in the slot the planning agent assigned to this video. A slot that
+    # has already passed, or a video the planner never saw, gets the next free
+    # slot from the calendar so its daily cap and spacing still hold; with
+    # lock=True that slot is pinned so later re-planning never moves it.
+    now = time.time() if now is None else now
+    calendar = open_calendar(calendar_db) if video else None
+    if calendar is not None:
+        try:
+            entry = calendar.entry(video) or {"title": "", "priority": 0}
+            slot = entry.get("slot")
+            if slot is None or slot <= now:
+                # A passed slot, even a locked one, belonged to an earlier attempt.
+                calendar.remove(video)
+                slot = calendar.add({"video": video, "ready_at": now, "title": entry["title"],
+                                     "priority": entry["priority"]}, now)
+            if slot is not None and lock:
+                calendar.lock(video)
+        finally:
+            calendar.close()
+        if slot is not None:
+            return datetime.datetime.fromtimestamp(slot)
+    # Without a calendar (or a free slot within its horizon) go out tomorrow at 12:00 PM.
+    scheduled_time = datetime.datetime.fromtimestamp(now) + datetime.timedelta(days=1)
     scheduled_time = scheduled_time.replace(hour=12, minute=0, second=0, microsecond=0)
     return scheduled_time
 
-def wait_for_approval(reminder_time):
-    # Prompt the user for approval.
-    print("Reminder: Please approve the video for upload by", reminder_time)
-    approval = input("Type 'approve' to confirm upload: ")
-    return approval.strip().lower() == "approve"
-
 def upload_video(video_file, title, description, tags):
-    # Simulate video upload (stub for YouTube API).
-    print("Uploading video:", video_file)
-    time.sleep(2)  # Simulate some upload time.
-    print("Video uploaded successfully!")
+    endpoint = os.environ.get("YOUTUBE_UPLOAD_ENDPOINT")
+    if not endpoint:
+        # Simulate video upload (stub for YouTube API).
+        print("Uploading video:", video_file)
+        time.sleep(2)  # Simulate some upload time.
+        print("Video uploaded successfully!")
+        return True
+    # Stream the file in resumable chunks; an interrupted upload resumes on retry.
+    uploader = ResumableUploader(endpoint)
+    metadata = {"title": title, "description": description, "tags": tags}
+    try:
+        result = uploader.upload(video_file, metadata)
+    except (UploadError, OSError) as e:
+        print("Upload failed:", e)
+        return False
+    print(format_report([result]))
     return True
 
-def main():
-    # Define the final video file path.
-    video_file = os.path.join(os.path.expanduser("~"),
-                              "Documents/youtube/Agents/5_Video_Creation_Editing_Agent/code/final_video.mp4")
+METADATA_FILE = os.path.join(os.path.expanduser("~"),
+                             "Documents/youtube/Agents/7_SEO_Metadata_Optimization_Agent/code/metadata.json")
+VIDEO_FILE = os.path.join(os.path.expanduser("~"),
+                          "Documents/youtube/Agents/5_Video_Creation_Editing_Agent/code/final_video.mp4")
+
+def load_metadata(metadata_file=METADATA_FILE):
+    # Use the SEO agent's metadata when available.
+    if os.path.exists(metadata_file):
+        with open(metadata_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    # Simulated metadata.
+    return {
+        "title": "Breaking News on Asap Rocky",
+        "description": "This video discusses trending news about Asap Rocky with in-depth analysis.",
+        "tags": ["Asap Rocky", "Breaking News", "Analysis", "Trending"],
+    }
+
+def main(video_file=VIDEO_FILE, metadata_file=METADATA_FILE, video=None,
+         calendar_db=CALENDAR_DB, job_db=JOB_DB):
     if not os.path.exists(video_file):
         print("Final video not found. Please ensure it is generated before publishing.")
         return
     
-    scheduled_time = get_scheduled_upload_time()
+    # The slot is locked before the upload is queued, so the calendar always
+    # holds the time the upload actually goes out.
+    scheduled_time = get_scheduled_upload_time(video, calendar_db, lock=True)
     print("Scheduled upload time:", scheduled_time)
     
-    # Set reminder time to 3 hours before the scheduled upload time.
-    reminder_time = scheduled_time - datetime.timedelta(hours=3)
+    # Queue the approval reminder (3 hours before) and the upload with the
+    # scheduler daemon instead of keeping this process alive until then. The
+    # pipeline's run id names the job; re-queuing the same run replaces it.
+    video_id = video or (f"{os.path.splitext(os.path.basename(video_file))[0]}-"
+                         f"{scheduled_time:%Y%m%d%H%M}")
+    store = JobStore(job_db)
+    store.schedule_video(video_id, video_file, load_metadata(metadata_file),
+                         scheduled_time.timestamp(), reminder_lead=REMINDER_LEAD)
+    store.close()
+    reminder_time = scheduled_time - datetime.timedelta(seconds=REMINDER_LEAD)
     print("Reminder time (when approval is needed):", reminder_time)
-    
-    # Wait until the reminder time.
-    while datetime.datetime.now() < reminder_time:
-        time_to_wait = (reminder_time - datetime.datetime.now()).total_seconds()
-        print(f"Waiting for {int(time_to_wait)} seconds until reminder...")
-        time.sleep(min(60, time_to_wait))  # Sleep in 60-second increments.
-    
-    # Prompt for approval.
-    if wait_for_approval(reminder_time):
-        print("Approval received. Proceeding with upload...")
-        # Simulated metadata.
-        title = "Breaking News on Asap Rocky"
-        description = "This video discusses trending news about Asap Rocky with in-depth analysis."
-        tags = ["Asap Rocky", "Breaking News", "Analysis", "Trending"]
-        upload_video(video_file, title, description, tags)
-    else:
-        print("Approval not received. Upload cancelled.")
+    if not notify():
+        print("Scheduler daemon is not running; start it with: python publish_scheduler.py run")
+    print(f"Approve with: python publish_scheduler.py approve {video_id}")
+    return video_id
 
 if __name__ == '__main__':
     main()
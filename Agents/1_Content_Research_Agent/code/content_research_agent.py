@@ -1,31 +1,51 @@
 """Module to fetch Google Trends data asynchronously for multiple topics
-and save results to JSON files with validation and error handling."""
+and save results as columnar snapshots with validation and error handling."""
 
 import json
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional, Sequence
 
-from pytrends.request import TrendReq
 from requests.exceptions import RequestException
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("debug.log"), logging.StreamHandler()]
+from trend_fetcher import BatchResult, TrendBatchFetcher, default_client, split_frame
+from trends_store import TrendsStore
+# trend_fetcher puts the repository root on sys.path for the shared utils.
+from utils.instrumentation import span
+from utils.logger import setup_logger
+from utils.trends_columnar import write_snapshot
+
+# Configure logging (a no-op when the orchestrator already did)
+setup_logger()
+
+TIMEFRAME = "now 1-d"
+GEO = "IN"
+SNAPSHOT_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/trends_snapshot"
 )
 
 class ContentResearchAgent:
     """Fetches Google Trends data for topics and saves results as JSON files."""
 
-    def __init__(self):
-        """Initializes the TrendReq client."""
-        self.pytrends = TrendReq(hl="en-US", tz=360)
+    def __init__(self, store: Optional[TrendsStore] = None, client=None):
+        """Initializes the TrendReq client (pytrends, and with it pandas, is
+        only imported when no client is given).
+
+        Args:
+            store (Optional[TrendsStore]): Local trends store; fresh topics are
+                served from it and stale ones refreshed incrementally.
+            client: Object with the ``TrendReq`` payload API to use instead of
+                a live Google Trends session (e.g. ``StubTrendsClient``).
+        """
+        self.pytrends = client if client is not None else default_client()
+        self.store = store
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        reraise=True
     )
     def fetch_trends(self, search_topic: str) -> Dict[str, Any]:
         """Fetches interest-over-time data with retry logic.
@@ -39,13 +59,26 @@ class ContentResearchAgent:
         Raises:
             RequestException: If the API request fails after retries.
         """
+        timeframe = None
+        if self.store is not None:
+            cached = self.store.get(search_topic, TIMEFRAME, GEO)
+            if cached is not None:
+                self.store.record_saved(1)
+                return cached
+            timeframe = self.store.refresh_window(search_topic, TIMEFRAME, GEO)
         try:
-            self.pytrends.build_payload(
-                [search_topic], cat=0, timeframe="now 1-d", geo="IN", gprop=""
-            )
-            data = self.pytrends.interest_over_time()
+            with span("trends_request", category="research", incremental=bool(timeframe)):
+                self.pytrends.build_payload(
+                    [search_topic], cat=0, timeframe=timeframe or TIMEFRAME, geo=GEO, gprop=""
+                )
+                data = self.pytrends.interest_over_time()
             if not data.empty:
-                return data.reset_index().to_dict(orient="records")
+                records = split_frame(data, [search_topic])[search_topic]
+                if self.store is None:
+                    return records
+                self.store.merge(search_topic, TIMEFRAME, GEO, records,
+                                 incremental=timeframe is not None)
+                return self.store.records(search_topic, TIMEFRAME, GEO)
             logging.warning("No data retrieved for topic: %s", search_topic)
             return {}
         except RequestException as request_error:
@@ -55,6 +88,29 @@ class ContentResearchAgent:
             logging.error("Data format error: %s", str(key_error))
             return {}
 
+    def fetch_trends_batch(self, topics: Sequence[str], max_workers: int = 4,
+                           requests_per_minute: float = 60.0,
+                           budget: Optional[int] = None) -> BatchResult:
+        """Fetches interest-over-time data for many topics concurrently.
+
+        Topics are grouped into five-keyword payloads and fetched by a pool of
+        workers sharing one rate limiter, request budget and backoff.
+
+        Args:
+            topics (Sequence[str]): The topics to fetch data for.
+            max_workers (int): Concurrent requests in flight.
+            requests_per_minute (float): Global request rate.
+            budget (Optional[int]): Maximum requests, retries included.
+
+        Returns:
+            BatchResult: Per-topic records plus failed and skipped topics.
+        """
+        fetcher = TrendBatchFetcher(max_workers=max_workers,
+                                    requests_per_minute=requests_per_minute, budget=budget,
+                                    timeframe=TIMEFRAME, geo=GEO, store=self.store)
+        with span("fetch_batch", category="research", topics=len(topics)):
+            return fetcher.fetch(topics)
+
     def save_to_file(self, file_topic: str, data: Dict[str, Any]) -> None:
         """Saves data to a JSON file.
 
@@ -74,13 +130,70 @@ class ContentResearchAgent:
             logging.error("Failed to save data to %s: %s", file_name, str(file_error))
             raise
 
-# Example usage
-if __name__ == "__main__":
-    agent = ContentResearchAgent()
-    TOPIC = "Artificial Intelligence"
+    def save_snapshot(self, trends: Dict[str, Any], snapshot_dir: str = SNAPSHOT_DIR) -> str:
+        """Saves per-topic trends as a columnar snapshot for downstream agents.
+
+        Args:
+            trends (Dict[str, Any]): Trend records keyed by topic.
+            snapshot_dir (str): Snapshot directory, replaced atomically.
+
+        Returns:
+            str: The snapshot directory.
+
+        Raises:
+            OSError: If the snapshot cannot be saved.
+        """
+        try:
+            with span("write_snapshot", category="research", topics=len(trends)):
+                write_snapshot(snapshot_dir, trends, timeframe=TIMEFRAME, geo=GEO)
+            logging.info("Saved trends for %d topics to %s", len(trends), snapshot_dir)
+        except OSError as file_error:
+            logging.error("Failed to save snapshot to %s: %s", snapshot_dir, str(file_error))
+            raise
+        return snapshot_dir
+
+def run_research(topic: str = "Artificial Intelligence",
+                 snapshot_dir: str = SNAPSHOT_DIR) -> None:
+    """Fetches trends for a topic and saves them, logging critical errors.
+
+    Args:
+        topic (str): The topic to research.
+        snapshot_dir (str): Where the trends snapshot is written.
+    """
+    agent = ContentResearchAgent(store=TrendsStore())
     try:
-        trends = agent.fetch_trends(TOPIC)
+        trends = agent.fetch_trends(topic)
         if trends:
-            agent.save_to_file(TOPIC, trends)
+            agent.save_snapshot({topic: trends}, snapshot_dir)
     except (RequestException, OSError) as specific_error:
         logging.error("Critical error: %s", str(specific_error))
+    agent.store.log_stats()
+
+def run_research_batch(topics: Sequence[str], max_workers: int = 4,
+                       budget: Optional[int] = None,
+                       snapshot_dir: str = SNAPSHOT_DIR) -> BatchResult:
+    """Fetches trends for many topics and saves them as one snapshot.
+
+    Args:
+        topics (Sequence[str]): The topics to research.
+        max_workers (int): Concurrent requests in flight.
+        budget (Optional[int]): Maximum requests for the sweep.
+        snapshot_dir (str): Where the trends snapshot is written.
+
+    Returns:
+        BatchResult: The fetch outcome.
+    """
+    agent = ContentResearchAgent(store=TrendsStore())
+    result = agent.fetch_trends_batch(topics, max_workers=max_workers, budget=budget)
+    if result.trends:
+        try:
+            agent.save_snapshot(result.trends, snapshot_dir)
+        except OSError as file_error:
+            logging.error("Critical error: %s", str(file_error))
+    for topic, error in result.failed.items():
+        logging.error("Failed to fetch %s: %s", topic, error)
+    return result
+
+# Example usage
+if __name__ == "__main__":
+    run_research()
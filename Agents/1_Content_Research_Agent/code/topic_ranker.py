@@ -0,0 +1,216 @@
+"""
+Topic Ranker
+
+Purpose: Scores every researched topic in one vectorized pass over the trends
+         matrix and writes the ranking consumed by the scriptwriting stage
+Input: Columnar trends snapshot, titles of topics already published
+Output: ``ranking.json`` in the snapshot directory, cached per snapshot
+Dependencies: numpy, utils.trends_columnar
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.file_io import atomic_write  # pylint: disable=wrong-import-position
+from utils.instrumentation import span  # pylint: disable=wrong-import-position
+from utils.logger import setup_logger  # pylint: disable=wrong-import-position
+from utils.trends_columnar import load_trends_matrix  # pylint: disable=wrong-import-position
+
+SNAPSHOT_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/trends_snapshot"
+)
+PUBLISHED_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/published_topics.txt"
+)
+RANKING_FILE = "ranking.json"
+
+DEFAULT_WEIGHTS = {"momentum": 0.35, "slope": 0.25, "recency": 0.2, "novelty": 0.2}
+# Fraction of the timeline treated as "recent" for momentum and slope.
+RECENT_FRACTION = 0.25
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"a", "an", "and", "the", "of", "on", "in", "for", "to", "is", "with",
+              "breaking", "news", "2024", "2025"}
+
+
+def tokenize(text: str) -> frozenset:
+    """Lower-cased word set without stopwords."""
+    return frozenset(t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS)
+
+
+def novelty(topics: Sequence[str], published: Sequence[str]) -> List[float]:
+    """Scores each topic as 1 minus its best Jaccard overlap with a published title.
+
+    Shared words are counted through an inverted index, so the cost grows
+    with the number of matching words rather than topics x titles.
+    """
+    titles = [tokenize(title) for title in published]
+    index: Dict[str, List[int]] = defaultdict(list)
+    for title_id, tokens in enumerate(titles):
+        for token in tokens:
+            index[token].append(title_id)
+    scores = []
+    for topic in topics:
+        tokens = tokenize(topic)
+        shared = Counter(title_id for token in tokens for title_id in index.get(token, ()))
+        best = max((count / len(tokens | titles[title_id])
+                    for title_id, count in shared.items()), default=0.0)
+        scores.append(1.0 - best)
+    return scores
+
+
+def load_published(published_file: str = PUBLISHED_FILE) -> List[str]:
+    """Reads published topic titles, one per line."""
+    if not os.path.exists(published_file):
+        return []
+    with open(published_file, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def score_matrix(values, partial: Optional[Sequence[bool]] = None,
+                 recent_fraction: float = RECENT_FRACTION) -> Dict[str, Any]:
+    """Computes momentum, slope and peak recency for every row at once.
+
+    Args:
+        values: (topics, timestamps) interest matrix.
+        partial: Per-timestamp flags; partial points are left out.
+        recent_fraction (float): Share of the timeline used as the recent window.
+
+    Returns:
+        Dict[str, Any]: One float32 array per feature, in row order.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    matrix = np.asarray(values, dtype=np.float32)
+    if partial is not None and any(partial) and not all(partial):
+        matrix = matrix[:, ~np.asarray(partial, dtype=bool)]
+    rows, points = matrix.shape
+    if points < 2:
+        zeros = np.zeros(rows, dtype=np.float32)
+        return {"momentum": zeros, "slope": zeros, "recency": zeros}
+
+    window = min(points, max(2, int(round(points * recent_fraction))))
+    recent = matrix[:, -window:]
+    earlier = matrix[:, :-window] if points > window else recent
+    momentum = np.log1p(recent.mean(axis=1)) - np.log1p(earlier.mean(axis=1))
+    # Least-squares slope over the recent window, in index points per step.
+    steps = np.arange(window, dtype=np.float32) - (window - 1) / 2.0
+    slope = recent @ steps / float(steps @ steps)
+    # argmax returns the first maximum, so search the reversed rows for the latest peak.
+    latest_peak = points - 1 - np.argmax(matrix[:, ::-1], axis=1)
+    recency = latest_peak.astype(np.float32) / (points - 1)
+    return {"momentum": momentum.astype(np.float32), "slope": slope.astype(np.float32),
+            "recency": recency}
+
+
+def _scale(feature):
+    """Min-max scales a feature to [0, 1]; constant features map to 0."""
+    low, high = feature.min(), feature.max()
+    if high - low <= 1e-9:
+        return feature * 0.0
+    return (feature - low) / (high - low)
+
+
+def rank_topics(snapshot, published: Sequence[str] = (),
+                weights: Optional[Dict[str, float]] = None,
+                top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Ranks the snapshot's topics by weighted, scaled features.
+
+    Args:
+        snapshot: A loaded ``TrendsSnapshot``.
+        published (Sequence[str]): Titles already published, for novelty.
+        weights (Optional[Dict[str, float]]): Feature weights.
+        top_n (Optional[int]): Keep only the best N topics.
+
+    Returns:
+        List[Dict[str, Any]]: Topics with their score and features, best first.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    if not len(snapshot):
+        return []
+    features = score_matrix(snapshot.values, snapshot.partial)
+    features["novelty"] = np.asarray(novelty(snapshot.topics, published), dtype=np.float32)
+    score = sum(weights[name] * _scale(features[name]) for name in DEFAULT_WEIGHTS)
+
+    count = len(score) if top_n is None else min(top_n, len(score))
+    if count < len(score):
+        best = np.argpartition(-score, count - 1)[:count]
+    else:
+        best = np.arange(len(score))
+    order = best[np.argsort(-score[best], kind="stable")]
+    return [{"topic": snapshot.topics[i], "score": round(float(score[i]), 4),
+             **{name: round(float(features[name][i]), 4) for name in DEFAULT_WEIGHTS}}
+            for i in order]
+
+
+def ranking_key(header: Dict[str, Any], published: Sequence[str],
+                weights: Dict[str, float], top_n: Optional[int]) -> str:
+    """Identifies a ranking by snapshot, published titles and parameters."""
+    payload = json.dumps({"values_file": header["values_file"],
+                          "created_at": header["created_at"], "published": list(published),
+                          "weights": weights, "top_n": top_n}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def rank_snapshot(snapshot_dir: str = SNAPSHOT_DIR, published_file: str = PUBLISHED_FILE,
+                  top_n: Optional[int] = None,
+                  weights: Optional[Dict[str, float]] = None,
+                  ranking_file: Optional[str] = None) -> str:
+    """Ranks the latest research snapshot, reusing the cached ranking if current.
+
+    Args:
+        snapshot_dir (str): Snapshot written by the research stage.
+        published_file (str): Published topic titles, one per line.
+        top_n (Optional[int]): Keep only the best N topics.
+        weights (Optional[Dict[str, float]]): Feature weight overrides.
+        ranking_file (Optional[str]): Where to write the ranking; defaults to
+            ``ranking.json`` inside the snapshot directory.
+
+    Returns:
+        str: Path of the ranking file.
+
+    Raises:
+        OSError: If the snapshot is missing.
+    """
+    snapshot = load_trends_matrix(snapshot_dir)
+    published = load_published(published_file)
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    key = ranking_key(snapshot.header, published, weights, top_n)
+    ranking_path = ranking_file or os.path.join(snapshot_dir, RANKING_FILE)
+    if os.path.exists(ranking_path):
+        with open(ranking_path, "r", encoding="utf-8") as file:
+            if json.load(file).get("key") == key:
+                logging.info("Reused cached topic ranking for %s", snapshot_dir)
+                return ranking_path
+
+    start = time.perf_counter()
+    with span("rank_topics", category="research", topics=len(snapshot)):
+        ranked = rank_topics(snapshot, published, weights, top_n)
+    elapsed = time.perf_counter() - start
+    logging.info("Ranked %d topics in %.3fs", len(snapshot), elapsed)
+    with atomic_write(ranking_path) as file:
+        json.dump({"key": key, "values_file": snapshot.header["values_file"],
+                   "weights": weights, "rank_time": elapsed, "topics": ranked},
+                  file, ensure_ascii=False, indent=2)
+    return ranking_path
+
+
+if __name__ == "__main__":
+    setup_logger()
+    print(rank_snapshot())
@@ -0,0 +1,308 @@
+"""
+Batch Trend Fetcher
+
+Purpose: Fetches Google Trends interest-over-time data for many topics at once,
+         five keywords per request, across concurrent workers that share one
+         rate limiter, request budget and backoff
+Input: A list of topics
+Output: Per-topic trend records plus request, throttle, budget and cache statistics
+Dependencies: pytrends (imported when the default client is created), utils.rate_limit,
+              trends_store (optional)
+"""
+
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.rate_limit import (  # pylint: disable=wrong-import-position
+    BudgetExceeded, RateLimiter, RequestBudget, SharedBackoff)
+
+# pytrends accepts at most five keywords per payload.
+MAX_KEYWORDS = 5
+
+
+class ThrottledError(Exception):
+    """Raised by the stand-in client to simulate an HTTP 429 response."""
+
+
+def default_client():
+    """Creates a pytrends session; each worker thread gets its own."""
+    from pytrends.request import TrendReq  # pylint: disable=import-outside-toplevel
+    return TrendReq(hl="en-US", tz=360)
+
+
+def chunk_topics(topics: Sequence[str], size: int = MAX_KEYWORDS) -> List[List[str]]:
+    """De-duplicates topics (keeping order) and groups them into payloads."""
+    unique = list(dict.fromkeys(t.strip() for t in topics if t and t.strip()))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+def is_throttled(error: Exception) -> bool:
+    """True for rate-limit responses from pytrends or the stand-in client."""
+    if isinstance(error, ThrottledError) or type(error).__name__ == "TooManyRequestsError":
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def split_frame(frame, keywords: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Splits a multi-keyword interest frame into per-topic records.
+
+    Records keep the single-topic ``fetch_trends`` layout
+    (``date``, ``<topic>``, ``isPartial``) with ISO-formatted dates.
+    """
+    if frame is None or frame.empty:
+        return {keyword: [] for keyword in keywords}
+    rows = frame.reset_index().to_dict(orient="records")
+    result = {}
+    for keyword in keywords:
+        records = []
+        for row in rows:
+            if keyword not in row:
+                continue
+            date = row.get("date")
+            records.append({"date": date.isoformat() if hasattr(date, "isoformat") else date,
+                            keyword: int(row[keyword]),
+                            "isPartial": bool(row.get("isPartial", False))})
+        result[keyword] = records
+    return result
+
+
+class BatchResult:
+    """Outcome of a multi-topic fetch."""
+
+    def __init__(self):
+        self.trends: Dict[str, List[Dict[str, Any]]] = {}
+        self.failed: Dict[str, str] = {}
+        self.skipped: List[str] = []
+        self.cached: List[str] = []
+        self.requests = 0
+        self.throttled = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns counters suitable for logging."""
+        return {"topics": len(self.trends), "failed": len(self.failed),
+                "skipped": len(self.skipped), "cached": len(self.cached),
+                "requests": self.requests,
+                "throttled": self.throttled, "elapsed": round(self.elapsed, 2)}
+
+
+class TrendBatchFetcher:
+    """Fetches trends for many topics concurrently under a shared request policy.
+
+    All workers draw from one token bucket, so the combined request rate stays
+    under ``requests_per_minute`` no matter how many workers run. A throttled
+    response pauses every worker through the shared backoff rather than each
+    worker sleeping on its own schedule, and the request budget caps the total
+    number of requests (including retries) a sweep may send.
+
+    With a ``store`` (see ``trends_store``), fresh topics are served locally
+    and stale ones only fetch the window after their last stored point.
+
+    Note that Google normalizes values to 0-100 within each payload, so topics
+    fetched in the same batch are comparable with each other.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any] = default_client,
+                 max_workers: int = 4, requests_per_minute: float = 60.0,
+                 burst: int = 4, budget: Optional[int] = None, max_attempts: int = 4,
+                 backoff_base: float = 2.0, backoff_max: float = 60.0,
+                 timeframe: str = "now 1-d", geo: str = "IN",
+                 limiter: Optional[RateLimiter] = None,
+                 backoff: Optional[SharedBackoff] = None, store=None):
+        """Initializes the fetcher.
+
+        Args:
+            client_factory: Creates a pytrends-compatible client exposing
+                ``build_payload`` and ``interest_over_time``.
+            max_workers (int): Concurrent batches in flight.
+            requests_per_minute (float): Global request rate.
+            burst (int): Requests allowed back to back before the rate applies.
+            budget (Optional[int]): Maximum requests for the fetcher's lifetime.
+            max_attempts (int): Attempts per batch before its topics fail.
+            backoff_base (float): First shared pause after a throttle, in seconds.
+            backoff_max (float): Longest shared pause.
+            timeframe (str): pytrends timeframe.
+            geo (str): pytrends region.
+            limiter (Optional[RateLimiter]): Shared limiter; overrides the rate.
+            backoff (Optional[SharedBackoff]): Shared backoff state.
+            store (Optional[TrendsStore]): Local store for cached and
+                incrementally refreshed series.
+        """
+        self.client_factory = client_factory
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter(requests_per_minute / 60.0, burst)
+        self.budget = RequestBudget(budget)
+        self.backoff = backoff or SharedBackoff(backoff_base, backoff_max)
+        self.max_attempts = max_attempts
+        self.timeframe = timeframe
+        self.geo = geo
+        self.store = store
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self.client_factory()
+            self._local.client = client
+        return client
+
+    def _fetch_batch(self, keywords: List[str], result: BatchResult,
+                     timeframe: Optional[str] = None) -> None:
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            self.backoff.wait()
+            try:
+                self.budget.consume()
+            except BudgetExceeded:
+                with self._lock:
+                    result.skipped.extend(keywords)
+                logging.warning("Request budget exhausted; skipped %s", keywords)
+                return
+            self.limiter.acquire()
+            with self._lock:
+                result.requests += 1
+            try:
+                client = self._client()
+                client.build_payload(keywords, cat=0, timeframe=timeframe or self.timeframe,
+                                     geo=self.geo, gprop="")
+                frame = client.interest_over_time()
+            except Exception as error:  # pylint: disable=broad-except
+                last_error = error
+                if is_throttled(error):
+                    delay = self.backoff.failure()
+                    with self._lock:
+                        result.throttled += 1
+                    logging.warning("Throttled on %s (attempt %d); all workers pausing %.1fs",
+                                    keywords, attempt, delay)
+                else:
+                    logging.warning("Fetch failed for %s (attempt %d): %s",
+                                    keywords, attempt, error)
+                continue
+            self.backoff.success()
+            try:
+                trends = split_frame(frame, keywords)
+                if self.store is not None:
+                    trends = self._merge(trends, incremental=timeframe is not None)
+            except (KeyError, ValueError, TypeError) as format_error:
+                last_error = format_error
+                logging.error("Data format error for %s: %s", keywords, format_error)
+                break
+            with self._lock:
+                result.trends.update(trends)
+            return
+        with self._lock:
+            for keyword in keywords:
+                result.failed[keyword] = str(last_error)
+
+    def _merge(self, trends: Dict[str, List[Dict[str, Any]]],
+               incremental: bool) -> Dict[str, List[Dict[str, Any]]]:
+        """Stores fetched records and returns the full merged series."""
+        merged = {}
+        for keyword, records in trends.items():
+            self.store.merge(keyword, self.timeframe, self.geo, records, incremental)
+            merged[keyword] = self.store.records(keyword, self.timeframe, self.geo)
+        return merged
+
+    def _plan(self, topics: Sequence[str], result: BatchResult):
+        """Serves fresh topics from the store and groups the rest into batches.
+
+        Stale topics sharing a refresh window are batched together; topics
+        without a usable stored series get the full timeframe.
+        """
+        unique = [t for batch in chunk_topics(topics) for t in batch]
+        if self.store is None:
+            return [(None, batch) for batch in chunk_topics(unique)]
+        groups: Dict[Optional[str], List[str]] = defaultdict(list)
+        for topic in unique:
+            records = self.store.get(topic, self.timeframe, self.geo)
+            if records is not None:
+                result.trends[topic] = records
+                result.cached.append(topic)
+            else:
+                groups[self.store.refresh_window(topic, self.timeframe, self.geo)].append(topic)
+        batches = [(window, batch) for window, group in groups.items()
+                   for batch in chunk_topics(group)]
+        self.store.record_saved(math.ceil(len(unique) / MAX_KEYWORDS) - len(batches))
+        return batches
+
+    def fetch(self, topics: Sequence[str]) -> BatchResult:
+        """Fetches trends for every topic.
+
+        Args:
+            topics (Sequence[str]): Topics to research; duplicates are fetched once.
+
+        Returns:
+            BatchResult: Per-topic records plus failed, budget-skipped and
+            store-served topics.
+        """
+        result = BatchResult()
+        start = time.perf_counter()
+        batches = self._plan(topics, result)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(lambda job: self._fetch_batch(job[1], result, job[0]), batches))
+        result.elapsed = time.perf_counter() - start
+        logging.info("Fetched %d topics in %d batches: %s", len(result.trends),
+                     len(batches), result.summary())
+        if self.store is not None:
+            self.store.log_stats()
+        return result
+
+
+class StubTrendsClient:
+    """Offline stand-in for ``TrendReq`` that answers with synthetic series.
+
+    Values are derived from each keyword's CRC so responses are deterministic.
+    ``throttle_every`` makes every n-th request (counted across all instances
+    sharing ``state``) fail with :class:`ThrottledError`, and ``latency``
+    simulates the network round trip.
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_every: int = 0, points: int = 24,
+                 state: Optional[Dict[str, Any]] = None):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.points = points
+        self.state = state if state is not None else {"requests": 0}
+        self.state.setdefault("lock", threading.Lock())
+        self._keywords: List[str] = []
+
+    def build_payload(self, kw_list, cat=0, timeframe="now 1-d", geo="", gprop=""):
+        """Records the keywords for the next ``interest_over_time`` call."""
+        # pylint: disable=unused-argument
+        if len(kw_list) > MAX_KEYWORDS:
+            raise ValueError("The number of keywords must be at most five")
+        self._keywords = list(kw_list)
+
+    def interest_over_time(self):
+        """Returns a pandas frame shaped like the pytrends response."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        with self.state["lock"]:
+            self.state["requests"] += 1
+            count = self.state["requests"]
+        if self.latency:
+            time.sleep(self.latency)
+        if self.throttle_every and count % self.throttle_every == 0:
+            raise ThrottledError("The request failed: Google returned a response with code 429")
+        index = pd.date_range("2025-01-01", periods=self.points, freq="h", name="date")
+        data = {}
+        for keyword in self._keywords:
+            seed = zlib.crc32(keyword.encode("utf-8"))
+            data[keyword] = [(seed >> (i % 24)) % 101 for i in range(self.points)]
+        data["isPartial"] = [False] * (self.points - 1) + [True]
+        return pd.DataFrame(data, index=index)
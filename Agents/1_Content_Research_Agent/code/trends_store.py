@@ -0,0 +1,229 @@
+"""
+Trends Store
+
+Purpose: Keeps fetched Google Trends series in SQLite so fresh results are
+         served locally and stale ones are refreshed incrementally
+Input: Trend records keyed by (topic, timeframe, geo)
+Output: Merged series, freshness checks, incremental refresh windows and
+        hit-rate / saved-request statistics
+Dependencies: sqlite3
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_DB = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/trends.db"
+)
+DEFAULT_TTL = 3600.0
+
+_WINDOW = re.compile(r"^(now|today)\s+(\d+)-([HdmMy])$")
+_UNIT_SECONDS = {"H": 3600, "d": 86400, "m": 30 * 86400, "M": 30 * 86400, "y": 365 * 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    topic TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    geo TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_point TEXT,
+    PRIMARY KEY (topic, timeframe, geo)
+);
+CREATE TABLE IF NOT EXISTS points (
+    topic TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    geo TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    is_partial INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (topic, timeframe, geo, date)
+) WITHOUT ROWID;
+"""
+
+
+def window_seconds(timeframe: str) -> Optional[float]:
+    """Returns the length of a rolling timeframe such as ``now 7-d``.
+
+    Returns None for fixed ranges and ``all``, which are never pruned.
+    """
+    match = _WINDOW.match(timeframe.strip())
+    if not match:
+        return None
+    return int(match.group(2)) * _UNIT_SECONDS[match.group(3)]
+
+
+def refresh_timeframe(timeframe: str, last_point: str, now: datetime) -> str:
+    """Builds a pytrends timeframe from the last stored point to ``now``.
+
+    The window starts at the last stored point so the refreshed series
+    overlaps the stored one by a point, which is used to rescale it.
+    ``now ...`` timeframes are sub-daily and get an hourly range; the rest
+    get a date range.
+    """
+    start = datetime.fromisoformat(last_point)
+    if timeframe.strip().startswith("now"):
+        return f"{start:%Y-%m-%dT%H} {now:%Y-%m-%dT%H}"
+    return f"{start:%Y-%m-%d} {now:%Y-%m-%d}"
+
+
+class TrendsStore:
+    """SQLite-backed trends series with TTL freshness and incremental merges."""
+
+    def __init__(self, db_path: str = DEFAULT_DB, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.time):
+        """Opens (and creates) the store.
+
+        Args:
+            db_path (str): SQLite database file.
+            ttl (float): Seconds a fetched series stays fresh.
+            clock: Wall-clock time source (injectable for tests).
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.incremental = 0
+        self.requests_saved = 0
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def _series(self, topic: str, timeframe: str, geo: str):
+        return self._conn.execute(
+            "SELECT fetched_at, last_point FROM series WHERE topic=? AND timeframe=? AND geo=?",
+            (topic, timeframe, geo)).fetchone()
+
+    def is_fresh(self, topic: str, timeframe: str, geo: str) -> bool:
+        """True when the series was fetched less than ``ttl`` seconds ago."""
+        with self._lock:
+            row = self._series(topic, timeframe, geo)
+        return row is not None and self._clock() - row[0] < self.ttl
+
+    def get(self, topic: str, timeframe: str, geo: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the stored records if fresh, counting a hit or a miss."""
+        if self.is_fresh(topic, timeframe, geo):
+            with self._lock:
+                self.hits += 1
+            return self.records(topic, timeframe, geo)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def refresh_window(self, topic: str, timeframe: str, geo: str) -> Optional[str]:
+        """Returns the timeframe covering only points after the stored series.
+
+        Returns None when nothing usable is stored, i.e. a full fetch is needed.
+        """
+        with self._lock:
+            row = self._series(topic, timeframe, geo)
+        if row is None or row[1] is None:
+            return None
+        now = datetime.utcfromtimestamp(self._clock())
+        window = window_seconds(timeframe)
+        last = datetime.fromisoformat(row[1])
+        if window is None or now - last >= timedelta(seconds=window):
+            return None
+        return refresh_timeframe(timeframe, row[1], now)
+
+    def records(self, topic: str, timeframe: str, geo: str) -> List[Dict[str, Any]]:
+        """Returns the stored series in the ``fetch_trends`` record layout."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, value, is_partial FROM points "
+                "WHERE topic=? AND timeframe=? AND geo=? ORDER BY date",
+                (topic, timeframe, geo)).fetchall()
+        return [{"date": date, topic: int(round(value)), "isPartial": bool(partial)}
+                for date, value, partial in rows]
+
+    def merge(self, topic: str, timeframe: str, geo: str,
+              records: List[Dict[str, Any]], incremental: bool = False) -> int:
+        """Merges fetched records into the stored series.
+
+        Google scales every response to 0-100 within its own window, so an
+        incremental window is rescaled using the point it shares with the
+        stored series. A short window can come back at a finer resolution;
+        only points on the stored series' step are kept. Partial points are
+        overwritten, points outside a rolling timeframe are pruned.
+
+        Returns:
+            int: Number of points written.
+        """
+        points = [(r["date"], float(r[topic]), int(bool(r.get("isPartial"))))
+                  for r in records if topic in r]
+        with self._lock, self._conn:
+            if incremental and points:
+                self.incremental += 1
+                points = self._align(topic, timeframe, geo, points)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?)",
+                [(topic, timeframe, geo, date, value, partial)
+                 for date, value, partial in points])
+            window = window_seconds(timeframe)
+            if window is not None:
+                cutoff = datetime.utcfromtimestamp(self._clock() - window).isoformat()
+                self._conn.execute(
+                    "DELETE FROM points WHERE topic=? AND timeframe=? AND geo=? AND date<?",
+                    (topic, timeframe, geo, cutoff))
+            last = self._conn.execute(
+                "SELECT MAX(date) FROM points WHERE topic=? AND timeframe=? AND geo=?",
+                (topic, timeframe, geo)).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)",
+                (topic, timeframe, geo, self._clock(), last))
+        return len(points)
+
+    def _align(self, topic: str, timeframe: str, geo: str, points: List[tuple]) -> List[tuple]:
+        """Rescales and resamples an incremental window onto the stored series."""
+        stored = self._conn.execute(
+            "SELECT date, value FROM points WHERE topic=? AND timeframe=? AND geo=? "
+            "ORDER BY date DESC LIMIT 2", (topic, timeframe, geo)).fetchall()
+        if not stored:
+            return points
+        last_date, last_value = stored[0]
+        last = datetime.fromisoformat(last_date)
+        if len(stored) == 2:
+            step = (last - datetime.fromisoformat(stored[1][0])).total_seconds()
+            points = [p for p in points
+                      if step <= 0 or (datetime.fromisoformat(p[0]) - last).total_seconds()
+                      % step == 0]
+        overlap = next((value for date, value, _ in points if date == last_date), None)
+        if overlap:
+            scale = last_value / overlap
+            points = [(date, value * scale, partial) for date, value, partial in points]
+        return points
+
+    def record_saved(self, requests: int) -> None:
+        """Counts requests avoided by serving results from the store."""
+        with self._lock:
+            self.requests_saved += requests
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit rate and saved-request counters."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "incremental_refreshes": self.incremental,
+                "requests_saved": self.requests_saved}
+
+    def log_stats(self) -> None:
+        """Logs the store statistics."""
+        stats = self.stats()
+        logging.info("Trends store: %d hits, %d misses (%.0f%% hit rate), "
+                     "%d incremental refreshes, %d requests saved",
+                     stats["hits"], stats["misses"], stats["hit_rate"] * 100,
+                     stats["incremental_refreshes"], stats["requests_saved"])
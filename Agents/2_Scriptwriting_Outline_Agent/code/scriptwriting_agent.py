@@ -1,32 +1,73 @@
 #!/usr/bin/env python3
+import csv
+import json
 import os
-import pandas as pd
+import sys
 
-def generate_script_outline():
-    # Define the path to the trending topics file from the Content Research Agent
-    trending_file = os.path.join(
-        os.path.expanduser("~"),
-        "Documents/youtube/Agents/1_Content_Research_Agent/code/trending_topics.txt"
-    )
-    
-    # Check if the file exists
-    if not os.path.exists(trending_file):
-        print("Trending topics file not found. Please run the Content Research Agent first.")
-        return
-    
-    # Read the trending topics file (assuming it's in CSV format)
-    try:
-        trending_df = pd.read_csv(trending_file)
-    except Exception as e:
-        print("Error reading trending topics file:", e)
-        return
-    
-    if trending_df.empty:
-        print("Trending topics file is empty.")
-        return
-    
-    # For simplicity, select the first trending topic from the file
-    trending_topic = trending_df.iloc[0, 0]
+# Make the shared utils package importable when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from utils.file_io import write_text
+from utils.trends_columnar import HEADER_FILE, load_snapshot_topics, read_header
+
+# Define the path to the trending topics file from the Content Research Agent
+TRENDING_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/trending_topics.txt"
+)
+# Columnar trends snapshot written by the research stage (preferred when present)
+SNAPSHOT_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/1_Content_Research_Agent/code/trends_snapshot"
+)
+OUTPUT_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/2_Scriptwriting_Outline_Agent/code/script_outline.txt"
+)
+
+def load_trending_topics(trending_file=TRENDING_FILE, snapshot_dir=SNAPSHOT_DIR):
+    # The snapshot header lists the topics; the matrix itself is never read here.
+    if os.path.exists(os.path.join(snapshot_dir, HEADER_FILE)):
+        return load_snapshot_topics(snapshot_dir)
+    # Otherwise fall back to the headerless CSV with one topic per row; only
+    # the first cell is needed, so the csv module does instead of pandas.
+    with open(trending_file, "r", encoding="utf-8", newline="") as f:
+        return [row[0].strip() for row in csv.reader(f) if row and row[0].strip()]
+
+def select_topics(n=None, snapshot_dir=SNAPSHOT_DIR, ranking_file=None):
+    # Best-first topics from the ranking stage, if it ranked the current snapshot.
+    ranking_file = ranking_file or os.path.join(snapshot_dir, "ranking.json")
+    if os.path.exists(ranking_file) and os.path.exists(os.path.join(snapshot_dir, HEADER_FILE)):
+        with open(ranking_file, "r", encoding="utf-8") as f:
+            ranking = json.load(f)
+        if ranking.get("values_file") == read_header(snapshot_dir)["values_file"]:
+            topics = [entry["topic"] for entry in ranking["topics"]]
+            return topics if n is None else topics[:n]
+    # Otherwise keep the research order.
+    topics = load_trending_topics(snapshot_dir=snapshot_dir)
+    return topics if n is None else topics[:n]
+
+def generate_script_outline(trending_topic=None, output_file=OUTPUT_FILE,
+                            snapshot_dir=SNAPSHOT_DIR, ranking_file=None):
+    if trending_topic is None:
+        # Check if research output exists
+        if not (os.path.exists(TRENDING_FILE) or
+                os.path.exists(os.path.join(snapshot_dir, HEADER_FILE))):
+            print("Trending topics file not found. Please run the Content Research Agent first.")
+            return
+        
+        # Read the trending topics file (assuming it's in CSV format)
+        try:
+            topics = select_topics(1, snapshot_dir, ranking_file)
+        except Exception as e:
+            print("Error reading trending topics file:", e)
+            return
+        
+        if not topics:
+            print("Trending topics file is empty.")
+            return
+        
+        # Take the highest-ranked trending topic
+        trending_topic = topics[0]
     print("Selected trending topic:", trending_topic)
     
     # Generate a simple script outline with pause markers
@@ -40,13 +81,10 @@ Script Outline:
 """
     print(outline)
     
-    # Save the outline to a file
-    output_dir = os.path.join(os.path.expanduser("~"), 
-                              "Documents/youtube/Agents/2_Scriptwriting_Outline_Agent/code")
-    output_file = os.path.join(output_dir, "script_outline.txt")
-    with open(output_file, "w") as f:
-        f.write(outline)
+    # Save the outline atomically so readers never see a partial file
+    write_text(output_file, outline)
     print("Script outline saved to", output_file)
+    return output_file
 
 if __name__ == '__main__':
     generate_script_outline()
@@ -0,0 +1,351 @@
+"""
+Calendar Engine
+
+Purpose: Assigns publish slots to the whole backlog of ready videos in one
+         pass and keeps the calendar in SQLite, so a change to one video is
+         re-planned without re-solving the rest
+Input: Backlog entries (video, render-ready ETA, priority), per-day caps,
+       minimum spacing and an hour-of-day performance profile
+Output: Publish slots queryable by video, day or time range
+Dependencies: sqlite3, bisect
+"""
+
+import bisect
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_DB = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/3_Content_Planning_Calendar_Agent/code/calendar.db"
+)
+
+HOUR = 3600
+DAY = 86400
+
+# Relative audience activity by local hour when the channel has no analytics
+# yet: a lunchtime bump and an early-evening peak.
+DEFAULT_HOUR_SCORES = {8: 0.3, 9: 0.4, 10: 0.5, 11: 0.6, 12: 0.8, 13: 0.75, 14: 0.7,
+                       15: 0.8, 16: 0.9, 17: 1.0, 18: 0.95, 19: 0.85, 20: 0.7, 21: 0.5,
+                       22: 0.3}
+
+PLANNED = "planned"
+LOCKED = "locked"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    ready_at REAL NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    slot INTEGER,
+    status TEXT NOT NULL DEFAULT 'planned'
+);
+CREATE INDEX IF NOT EXISTS videos_slot ON videos (slot);
+CREATE TABLE IF NOT EXISTS hours (
+    hour INTEGER PRIMARY KEY,
+    score REAL NOT NULL
+);
+"""
+
+_COLUMNS = "video, title, ready_at, priority, slot, status"
+
+
+def _entry(row: Tuple) -> Dict[str, Any]:
+    return dict(zip(("video", "title", "ready_at", "priority", "slot", "status"), row))
+
+
+class _Occupancy:
+    """Taken slots in time order plus per-day counts, for spacing and cap checks."""
+
+    def __init__(self, slots: Iterable[int], day_of):
+        self.times = sorted(slots)
+        self.day_of = day_of
+        self.per_day: Dict[int, int] = {}
+        for slot in self.times:
+            day = day_of(slot)
+            self.per_day[day] = self.per_day.get(day, 0) + 1
+
+    def spaced(self, slot: int, spacing: int) -> bool:
+        index = bisect.bisect_left(self.times, slot)
+        if index < len(self.times) and self.times[index] - slot < spacing:
+            return False
+        return not (index > 0 and slot - self.times[index - 1] < spacing)
+
+    def add(self, slot: int) -> None:
+        bisect.insort(self.times, slot)
+        day = self.day_of(slot)
+        self.per_day[day] = self.per_day.get(day, 0) + 1
+
+
+class ContentCalendar:
+    """Publish calendar for the video backlog, stored in SQLite.
+
+    ``plan`` solves the whole backlog in one greedy pass: videos are taken
+    by priority, then render ETA, and each gets the slot that best trades
+    hour-of-day performance against delay, subject to the per-day cap and
+    the minimum spacing between uploads. ``add``, ``update`` and ``remove``
+    change one video and leave every other slot where it is.
+
+    Slots are hour-aligned Unix timestamps. Days and hours are counted in
+    local time ``utc_offset`` seconds ahead of UTC.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB, daily_cap: int = 2,
+                 min_spacing: float = 4 * HOUR, delay_weight: float = 0.5,
+                 horizon_days: int = 60, utc_offset: int = 0):
+        """Opens (and creates) the calendar.
+
+        Args:
+            db_path (str): SQLite database path.
+            daily_cap (int): Maximum uploads per local day.
+            min_spacing (float): Minimum seconds between two uploads.
+            delay_weight (float): Score lost per day a video waits past its
+                earliest slot; hour scores range from 0 to 1.
+            horizon_days (int): How far ahead to look for a free slot.
+            utc_offset (int): Local time offset from UTC in seconds.
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.daily_cap = daily_cap
+        self.min_spacing = int(min_spacing)
+        self.delay_weight = delay_weight
+        self.horizon_days = horizon_days
+        self.utc_offset = utc_offset
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._hour_scores = dict(self._conn.execute("SELECT hour, score FROM hours"))
+        if not self._hour_scores:
+            self.set_hour_scores(DEFAULT_HOUR_SCORES)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def day_of(self, timestamp: float) -> int:
+        """Returns the local day number (days since the epoch) of a timestamp."""
+        return int((timestamp + self.utc_offset) // DAY)
+
+    def set_hour_scores(self, profile: Mapping[int, float]) -> None:
+        """Stores the hour-of-day performance profile used to rank slots.
+
+        Args:
+            profile (Mapping[int, float]): Local hour (0-23) to any
+                non-negative measure of performance, such as views in that
+                hour. Values are scaled so the best hour scores 1; hours that
+                are missing or score 0 are never used.
+        """
+        best = max(profile.values(), default=0)
+        if best <= 0:
+            raise ValueError("hour profile needs at least one positive score")
+        scores = {int(hour) % 24: value / best for hour, value in profile.items() if value > 0}
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM hours")
+            self._conn.executemany("INSERT INTO hours (hour, score) VALUES (?, ?)",
+                                   scores.items())
+        self._hour_scores = scores
+
+    @staticmethod
+    def _normalize(item: Any, existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # Accepts a mapping or a (video, ready_at[, priority[, title]]) tuple.
+        if not isinstance(item, Mapping):
+            item = dict(zip(("video", "ready_at", "priority", "title"), item))
+        base = existing or {"title": "", "priority": 0.0}
+        return {"video": str(item["video"]),
+                "title": item.get("title", base["title"]) or "",
+                "ready_at": float(item.get("ready_at", base.get("ready_at", time.time()))),
+                "priority": float(item.get("priority", base["priority"]))}
+
+    def _occupancy(self, start: float, where: str = "1", params: Iterable[Any] = ()) -> _Occupancy:
+        # Only slots that can interact with a placement from ``start`` on:
+        # the cap looks at the whole local day, spacing one interval back.
+        low = min(self.day_of(start) * DAY - self.utc_offset, start - self.min_spacing)
+        high = start + (self.horizon_days + 1) * DAY + self.min_spacing
+        rows = self._conn.execute(
+            f"SELECT slot FROM videos WHERE slot >= ? AND slot < ? AND {where}",
+            [low, high, *params]).fetchall()
+        return _Occupancy((slot for (slot,) in rows), self.day_of)
+
+    def _best_slot(self, ready_at: float, now: float, taken: _Occupancy) -> Optional[int]:
+        earliest = int(math.ceil(max(ready_at, now) / HOUR)) * HOUR
+        ranked = sorted(self._hour_scores.items(), key=lambda item: -item[1])
+        best_hour_score = ranked[0][1] if ranked else 0.0
+        first_day = self.day_of(earliest)
+        best, best_value = None, -math.inf
+        for day in range(first_day, first_day + self.horizon_days + 1):
+            day_start = day * DAY - self.utc_offset
+            waited = max(0.0, (day_start - earliest) / DAY)
+            # No later day can beat a slot already found.
+            if best is not None and best_hour_score - self.delay_weight * waited <= best_value:
+                break
+            if taken.per_day.get(day, 0) >= self.daily_cap:
+                continue
+            for hour, score in ranked:
+                slot = day_start + hour * HOUR
+                if slot < earliest or not taken.spaced(slot, self.min_spacing):
+                    continue
+                value = score - self.delay_weight * (slot - earliest) / DAY
+                if value > best_value:
+                    best, best_value = slot, value
+        return best
+
+    def plan(self, backlog: Iterable[Any] = (),
+             now: Optional[float] = None) -> Dict[str, Optional[int]]:
+        """Solves the calendar for the whole backlog in one pass.
+
+        New entries are added; every planned video whose slot is still in the
+        future is re-slotted. Locked videos and slots already in the past stay
+        fixed and count against caps and spacing.
+
+        Args:
+            backlog (Iterable[Any]): Entries as mappings with ``video``,
+                ``ready_at`` (render-completion ETA, Unix seconds) and
+                optional ``priority`` (higher first) and ``title``, or tuples
+                in that order.
+            now (Optional[float]): Current time; defaults to ``time.time()``.
+
+        Returns:
+            Dict[str, Optional[int]]: Slot per re-planned video; None when no
+            slot fits within the horizon.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            for item in backlog:
+                self._upsert(self._normalize(item, self._get(self._video(item))))
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM videos WHERE status = ? AND (slot IS NULL OR slot >= ?)",
+                (PLANNED, now)).fetchall()
+            movable = [_entry(row) for row in rows]
+            taken = self._occupancy(now, "NOT (status = ? AND slot >= ?)", (PLANNED, now))
+            movable.sort(key=lambda entry: (-entry["priority"], entry["ready_at"], entry["video"]))
+            assigned = {}
+            for entry in movable:
+                slot = self._best_slot(entry["ready_at"], now, taken)
+                if slot is not None:
+                    taken.add(slot)
+                assigned[entry["video"]] = slot
+            self._conn.executemany("UPDATE videos SET slot = ? WHERE video = ?",
+                                   [(slot, video) for video, slot in assigned.items()])
+        return assigned
+
+    @staticmethod
+    def _video(item: Any) -> str:
+        return str(item["video"] if isinstance(item, Mapping) else item[0])
+
+    def _get(self, video: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(f"SELECT {_COLUMNS} FROM videos WHERE video = ?",
+                                 (video,)).fetchone()
+        return _entry(row) if row else None
+
+    def _upsert(self, entry: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT INTO videos (video, title, ready_at, priority) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(video) DO UPDATE SET title = excluded.title, "
+            "ready_at = excluded.ready_at, priority = excluded.priority",
+            (entry["video"], entry["title"], entry["ready_at"], entry["priority"]))
+
+    def add(self, item: Any, now: Optional[float] = None) -> Optional[int]:
+        """Adds or changes one video and re-plans only that video.
+
+        A video keeps its slot when the slot is still in the future and not
+        before its (possibly new) render ETA; otherwise it gets the best slot
+        left free by the rest of the calendar, which is not moved.
+
+        Args:
+            item (Any): Backlog entry, as for ``plan``; omitted fields keep
+                their stored values.
+            now (Optional[float]): Current time; defaults to ``time.time()``.
+
+        Returns:
+            Optional[int]: The video's slot, or None if nothing fits.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            existing = self._get(self._video(item))
+            entry = self._normalize(item, existing)
+            self._upsert(entry)
+            slot = existing["slot"] if existing else None
+            if existing and existing["status"] == LOCKED:
+                return slot
+            if slot is None or slot < max(entry["ready_at"], now):
+                taken = self._occupancy(max(entry["ready_at"], now), "video != ?",
+                                        (entry["video"],))
+                slot = self._best_slot(entry["ready_at"], now, taken)
+                self._conn.execute("UPDATE videos SET slot = ? WHERE video = ?",
+                                   (slot, entry["video"]))
+        return slot
+
+    update = add
+
+    def remove(self, video: str) -> bool:
+        """Drops a video from the calendar, freeing its slot.
+
+        Returns:
+            bool: Whether the video was in the calendar.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM videos WHERE video = ?",
+                                      (video,)).rowcount > 0
+
+    def lock(self, video: str) -> Optional[int]:
+        """Pins a video's slot, e.g. once its upload is queued.
+
+        Returns:
+            Optional[int]: The pinned slot, or None if the video has none.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE videos SET status = ? WHERE video = ? AND slot IS NOT NULL",
+                               (LOCKED, video))
+            row = self._conn.execute("SELECT slot FROM videos WHERE video = ?",
+                                     (video,)).fetchone()
+        return row[0] if row else None
+
+    def entry(self, video: str) -> Optional[Dict[str, Any]]:
+        """Returns a video's calendar entry, or None if it is not planned."""
+        with self._lock:
+            return self._get(video)
+
+    def slot(self, video: str) -> Optional[int]:
+        """Returns a video's publish slot (Unix seconds), or None."""
+        entry = self.entry(video)
+        return entry["slot"] if entry else None
+
+    def upcoming(self, start: Optional[float] = None, end: Optional[float] = None,
+                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns slotted entries in publish order within ``[start, end)``.
+
+        Args:
+            start (Optional[float]): Range start; defaults to now.
+            end (Optional[float]): Range end; None means open-ended.
+            limit (Optional[int]): Maximum number of entries.
+        """
+        start = time.time() if start is None else start
+        sql = f"SELECT {_COLUMNS} FROM videos WHERE slot >= ?"
+        params: List[Any] = [start]
+        if end is not None:
+            sql += " AND slot < ?"
+            params.append(end)
+        sql += " ORDER BY slot"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [_entry(row) for row in self._conn.execute(sql, params)]
+
+    def day(self, timestamp: float) -> List[Dict[str, Any]]:
+        """Returns the entries published on the local day containing ``timestamp``."""
+        start = self.day_of(timestamp) * DAY - self.utc_offset
+        return self.upcoming(start, start + DAY)
+
+    def unscheduled(self) -> List[Dict[str, Any]]:
+        """Returns backlog entries that found no slot within the horizon."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM videos WHERE slot IS NULL "
+                "ORDER BY priority DESC, ready_at").fetchall()
+        return [_entry(row) for row in rows]
@@ -1,23 +1,95 @@
 #!/usr/bin/env python3
+import argparse
 import os
-from datetime import datetime, timedelta
-
-def plan_content():
-    # For simplicity, schedule the video 1 day from now
-    scheduled_date = datetime.now() + timedelta(days=1)
-    scheduled_date_str = scheduled_date.strftime("%Y-%m-%d %H:%M:%S")
-    
-    plan_file = os.path.join(
-        os.path.expanduser("~"),
-        
-"Documents/youtube/Agents/3_Content_Planning_Calendar_Agent/code/content_calendar.txt"
-    )
-    
-    with open(plan_file, "w") as f: f.write(f"Video scheduled for publication on: {scheduled_date_str}\n")
-    
-    print("Content scheduled for publication on:", scheduled_date_str)
+import sys
+import time
+from datetime import datetime
+
+from calendar_engine import DEFAULT_DB, HOUR, ContentCalendar
+
+# Make the shared utils package importable when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from utils.file_io import atomic_write
+
+AGENTS_DIR = os.path.join(os.path.expanduser("~"), "Documents/youtube/Agents")
+PLAN_FILE = os.path.join(AGENTS_DIR, "3_Content_Planning_Calendar_Agent/code/content_calendar.txt")
+ANALYTICS_DIR = os.path.join(AGENTS_DIR, "9_Analytics_Performance_Agent/code/analytics")
+ANALYTICS_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                               "9_Analytics_Performance_Agent", "code", "analytics_store.py")
+
+def local_utc_offset(now=None):
+    return time.localtime(now).tm_gmtoff
+
+def best_hours(analytics_dir=ANALYTICS_DIR, utc_offset=0):
+    # Views by local hour of day from the analytics rollups; None when the
+    # channel has no history yet, so the calendar keeps its default profile.
+    if not os.path.exists(os.path.join(analytics_dir, "rollups.db")):
+        return None
+    from utils.dag_executor import load_agent_module  # pylint: disable=import-outside-toplevel
+    store = load_agent_module(ANALYTICS_STORE).AnalyticsStore(analytics_dir)
+    try:
+        profile = store.hour_profile("views", utc_offset)
+    finally:
+        store.close()
+    return profile if any(value > 0 for value in profile.values()) else None
+
+def _format(slot):
+    return datetime.fromtimestamp(slot).strftime("%Y-%m-%d %H:%M:%S")
+
+def plan_content(video=None, ready_at=None, priority=0, title="", backlog=None,
+                 plan_file=PLAN_FILE, calendar_db=DEFAULT_DB, analytics_dir=ANALYTICS_DIR,
+                 daily_cap=2, min_spacing_hours=4, now=None):
+    # Slot this video into the shared publish calendar without moving anyone
+    # else's slot; an explicit backlog re-solves every planned future video.
+    now = time.time() if now is None else now
+    if video is None and not backlog:
+        video = f"video-{datetime.fromtimestamp(now):%Y%m%d%H%M%S}"
+    entries = list(backlog or [])
+    if video is not None:
+        entries.append({"video": video, "ready_at": now if ready_at is None else ready_at,
+                        "priority": priority, "title": title})
+
+    utc_offset = local_utc_offset(now)
+    calendar = ContentCalendar(calendar_db, daily_cap=daily_cap,
+                               min_spacing=min_spacing_hours * HOUR, utc_offset=utc_offset)
+    try:
+        profile = best_hours(analytics_dir, utc_offset)
+        if profile:
+            calendar.set_hour_scores(profile)
+        if backlog:
+            slots = calendar.plan(entries, now)
+        else:
+            slots = {video: calendar.add(entries[0], now)}
+        upcoming = calendar.upcoming(now)
+        unscheduled = calendar.unscheduled()
+    finally:
+        calendar.close()
+
+    with atomic_write(plan_file) as f:
+        slot = slots.get(video)
+        if video is not None and slot is not None:
+            f.write(f"Video scheduled for publication on: {_format(slot)}\n")
+        f.write("\nUpcoming publications:\n")
+        for entry in upcoming:
+            f.write(f"{_format(entry['slot'])}  {entry['video']}  {entry['title']}".rstrip() + "\n")
+        for entry in unscheduled:
+            f.write(f"unscheduled          {entry['video']}  {entry['title']}".rstrip() + "\n")
+
+    if video is not None:
+        if slots.get(video) is None:
+            print("No publish slot available for", video, "within the planning horizon.")
+        else:
+            print("Content scheduled for publication on:", _format(slots[video]))
+    print(f"Calendar: {len(upcoming)} upcoming, {len(unscheduled)} unscheduled")
     print("Calendar saved to", plan_file)
+    return slots.get(video) if video is not None else slots
 
 if __name__ == '__main__':
-    plan_content()
-
+    parser = argparse.ArgumentParser(description="Plan publish slots for the video backlog.")
+    parser.add_argument("--video", help="video to add or re-plan")
+    parser.add_argument("--ready-in", type=float, default=0.0,
+                        help="hours until the video's render completes (default: 0)")
+    parser.add_argument("--priority", type=float, default=0.0)
+    parser.add_argument("--title", default="")
+    args = parser.parse_args()
+    plan_content(args.video, time.time() + args.ready_in * HOUR, args.priority, args.title)
@@ -0,0 +1,290 @@
+"""
+Chunked Voiceover Synthesis
+
+Purpose: Splits a script at [PAUSE] markers and sentence boundaries, synthesizes
+         the chunks in parallel and streams them in order into one WAV file
+Input: Script text, speaker, output path
+Output: WAV file plus a segment timeline (text, start, duration) for captions
+Dependencies: concurrent.futures, wave, tts_server, synthesis_cache
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+import wave
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from synthesis_cache import SynthesisCache
+from tts_server import DEFAULT_SPEAKER, MODEL_NAME, load_coqui_model
+# tts_server puts the repository root on sys.path for the shared utils.
+from utils.file_io import write_json
+
+PAUSE_MARKER = "[PAUSE]"
+# Break after sentence punctuation, but not after list numbers such as "1."
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?<!\d\.)\s+")
+
+_POOLS: Dict[Tuple[int, str], ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+_WORKER: Dict[str, Any] = {}
+
+WavParams = Tuple[int, int, int]
+
+
+def split_script(text: str, max_chars: int = 300) -> List[Dict[str, Any]]:
+    """Splits a script into synthesis chunks.
+
+    Lines and sentences become separate chunks; sentences longer than
+    ``max_chars`` are further split at commas. The chunk before each
+    ``[PAUSE]`` marker is flagged with ``pause_after``.
+
+    Args:
+        text (str): The script text.
+        max_chars (int): Soft upper bound on chunk length.
+
+    Returns:
+        List[Dict[str, Any]]: Chunks with ``text`` and ``pause_after`` keys.
+    """
+    chunks: List[Dict[str, Any]] = []
+    parts = text.split(PAUSE_MARKER)
+    for index, part in enumerate(parts):
+        for line in part.splitlines():
+            for sentence in _SENTENCE_END.split(line.strip()):
+                for piece in _split_long(sentence.strip(), max_chars):
+                    chunks.append({"text": piece, "pause_after": False})
+        if index < len(parts) - 1 and chunks:
+            chunks[-1]["pause_after"] = True
+    return chunks
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    if not sentence:
+        return []
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces, current = [], ""
+    for clause in re.split(r"(?<=,)\s+", sentence):
+        if current and len(current) + len(clause) + 1 > max_chars:
+            pieces.append(current)
+            current = clause
+        else:
+            current = f"{current} {clause}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _read_wav(path: str) -> Tuple[WavParams, bytes]:
+    with wave.open(path, "rb") as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return params, wav.readframes(wav.getnframes())
+
+
+def _init_worker(model_name: str, model_factory: Callable[[str], Any]) -> None:
+    """Loads the model once per pool process."""
+    _WORKER["model"] = model_factory(model_name)
+
+
+def _synthesize_chunk(text: str, speaker: str) -> Tuple[WavParams, bytes]:
+    """Synthesizes one chunk inside a pool worker and returns its PCM data."""
+    path = os.path.join(tempfile.gettempdir(), f"chunk_{uuid.uuid4().hex}.wav")
+    try:
+        _WORKER["model"].tts_to_file(text=text, file_path=path, speaker=speaker)
+        return _read_wav(path)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def get_pool(workers: int, model_name: str = MODEL_NAME,
+             model_factory: Callable[[str], Any] = load_coqui_model) -> ProcessPoolExecutor:
+    """Returns a long-lived process pool whose workers keep the model loaded."""
+    key = (workers, model_name)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(model_name, model_factory))
+        return pool
+
+
+class _ServerSource:
+    """Feeds chunks through an in-process or socket TTS server."""
+
+    def __init__(self, server):
+        self.server = server
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, text: str, speaker: str) -> Future:
+        return self.executor.submit(self._synthesize, text, speaker)
+
+    def _synthesize(self, text: str, speaker: str) -> Tuple[WavParams, bytes]:
+        path = os.path.join(tempfile.gettempdir(), f"chunk_{uuid.uuid4().hex}.wav")
+        try:
+            self.server.synthesize(text, path, speaker=speaker)
+            return _read_wav(path)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+
+class _PoolSource:
+    """Feeds chunks through a process pool."""
+
+    def __init__(self, pool: ProcessPoolExecutor):
+        self.pool = pool
+
+    def submit(self, text: str, speaker: str) -> Future:
+        return self.pool.submit(_synthesize_chunk, text, speaker)
+
+    def close(self) -> None:
+        """The pool is shared and outlives a single voiceover."""
+
+
+def synthesize_chunked(
+    text: str,
+    output_file: str,
+    speaker: str = DEFAULT_SPEAKER,
+    workers: int = 0,
+    server=None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    pause_seconds: float = 0.6,
+    retries: int = 2,
+    max_chars: int = 300,
+    cache: Optional[SynthesisCache] = None,
+    model_name: str = MODEL_NAME,
+) -> Dict[str, Any]:
+    """Synthesizes a script chunk by chunk and streams it into one WAV file.
+
+    At most ``2 * workers`` chunks are in flight, and chunks are written as
+    soon as every earlier chunk is on disk, so memory stays bounded no matter
+    how long the script is. A failing chunk is resubmitted on its own.
+    With a ``cache``, only chunks whose text changed are synthesized.
+
+    Args:
+        text (str): Script text, optionally containing ``[PAUSE]`` markers.
+        output_file (str): Destination WAV path.
+        speaker (str): Speaker ID for the multi-speaker VITS model.
+        workers (int): Process-pool size; 0 synthesizes through ``server``.
+        server: Object with ``synthesize(text, path, speaker=...)``, used
+            when ``workers`` is 0.
+        pool (Optional[ProcessPoolExecutor]): Pool to use instead of the
+            shared one from :func:`get_pool`.
+        pause_seconds (float): Silence inserted at each ``[PAUSE]`` marker.
+        retries (int): Extra attempts per chunk before giving up.
+        max_chars (int): Soft upper bound on chunk length.
+        cache (Optional[SynthesisCache]): Segment cache to read and fill.
+        model_name (str): Model the shared pool's workers load; also part
+            of the cache key.
+
+    Returns:
+        Dict[str, Any]: Output path, total duration, retry count, cache
+        hits and misses, and the segment timeline, which is also saved as ``<output>_segments.json``.
+
+    Raises:
+        ValueError: If the script is empty or chunks disagree on audio format.
+        RuntimeError: If a chunk still fails after all retries.
+    """
+    chunks = split_script(text, max_chars)
+    if not chunks:
+        raise ValueError("Script is empty; nothing to synthesize")
+    if workers > 0:
+        source = _PoolSource(pool or get_pool(workers, model_name))
+    else:
+        if server is None:
+            raise ValueError("A TTS server is required when workers is 0")
+        source = _ServerSource(server)
+    window = max(1, workers) * 2
+    attempts = [0] * len(chunks)
+    in_flight: deque = deque()
+    next_index = 0
+    position = 0.0
+    retried = 0
+    segments: List[Dict[str, Any]] = []
+    params: Optional[WavParams] = None
+    cache_hits = cache_misses = 0
+    cached = set()
+
+    def submit(index: int) -> Future:
+        nonlocal cache_hits, cache_misses
+        if cache is not None:
+            entry = cache.get(SynthesisCache.key(model_name, speaker, chunks[index]["text"]))
+            if entry is not None:
+                cache_hits += 1
+                cached.add(index)
+                future: Future = Future()
+                future.set_result(entry)
+                return future
+            cache_misses += 1
+        return source.submit(chunks[index]["text"], speaker)
+
+    # Write beside the target and rename at the end, so a reader (or another
+    # run sharing the file) never sees a partial WAV.
+    tmp_path = f"{output_file}.{uuid.uuid4().hex}.tmp"
+    out = wave.open(tmp_path, "wb")
+    try:
+        while next_index < len(chunks) or in_flight:
+            while next_index < len(chunks) and len(in_flight) < window:
+                in_flight.append((next_index, submit(next_index)))
+                next_index += 1
+            index, future = in_flight.popleft()
+            try:
+                chunk_params, frames = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                attempts[index] += 1
+                if attempts[index] > retries:
+                    raise RuntimeError(
+                        f"Chunk {index} failed after {retries + 1} attempts: {error}"
+                    ) from error
+                logging.warning("Retrying chunk %d after error: %s", index, error)
+                retried += 1
+                in_flight.appendleft(
+                    (index, source.submit(chunks[index]["text"], speaker)))
+                continue
+            if params is None:
+                params = chunk_params
+                out.setnchannels(params[0])
+                out.setsampwidth(params[1])
+                out.setframerate(params[2])
+            elif chunk_params != params:
+                raise ValueError(f"Chunk {index} audio format {chunk_params} != {params}")
+            if cache is not None and index not in cached:
+                cache.put(SynthesisCache.key(model_name, speaker, chunks[index]["text"]),
+                          chunk_params, frames)
+            frame_size = params[0] * params[1]
+            out.writeframes(frames)
+            duration = len(frames) / frame_size / params[2]
+            segments.append({"text": chunks[index]["text"], "start": position,
+                             "duration": duration,
+                             "pause_after": chunks[index]["pause_after"]})
+            position += duration
+            if chunks[index]["pause_after"] and pause_seconds > 0:
+                silence_frames = int(round(pause_seconds * params[2]))
+                out.writeframes(b"\0" * silence_frames * frame_size)
+                position += silence_frames / params[2]
+    except BaseException:
+        # Leave no truncated WAV behind; wave needs a format to close cleanly.
+        if params is None:
+            out.setparams((1, 2, 16000, 0, "NONE", "not compressed"))
+        out.close()
+        os.remove(tmp_path)
+        raise
+    else:
+        out.close()
+        os.replace(tmp_path, output_file)
+    finally:
+        source.close()
+
+    timeline = {"output_file": output_file, "duration": position,
+                "pause_seconds": pause_seconds, "retries": retried,
+                "cache_hits": cache_hits, "cache_misses": cache_misses, "segments": segments}
+    write_json(os.path.splitext(output_file)[0] + "_segments.json", timeline)
+    return timeline
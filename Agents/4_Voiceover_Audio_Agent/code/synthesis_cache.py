@@ -0,0 +1,132 @@
+"""
+Voiceover Synthesis Cache
+
+Purpose: Stores synthesized PCM audio per segment so unchanged text is never
+         synthesized twice
+Input: (model name, speaker, segment text) keys and WAV audio
+Output: Cached WAV segments on disk with LRU eviction and hit/miss statistics
+Dependencies: hashlib, wave, os
+"""
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+import uuid
+import wave
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/4_Voiceover_Audio_Agent/code/synthesis_cache"
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+WavParams = Tuple[int, int, int]
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes unicode and whitespace so cosmetic edits still hit."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class SynthesisCache:
+    """Content-addressed, size-capped store of synthesized segments."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Opens (and creates) the cache directory.
+
+        Args:
+            cache_dir (str): Directory holding one WAV file per segment.
+            max_bytes (int): Size cap; least recently used entries are
+                evicted once the cache grows beyond it.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._sizes: Dict[str, int] = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith(".wav"):
+                self._sizes[name[:-4]] = os.path.getsize(os.path.join(cache_dir, name))
+
+    @staticmethod
+    def key(model_name: str, speaker: str, text: str) -> str:
+        """Returns the cache key for a segment."""
+        payload = json.dumps([model_name, speaker, normalize_text(text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def get(self, key: str) -> Optional[Tuple[WavParams, bytes]]:
+        """Returns cached ``(params, frames)`` and marks the entry as used."""
+        path = self._path(key)
+        try:
+            with wave.open(path, "rb") as wav:
+                params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+                frames = wav.readframes(wav.getnframes())
+            os.utime(path)
+        except (FileNotFoundError, EOFError, wave.Error):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return params, frames
+
+    def put(self, key: str, params: WavParams, frames: bytes) -> None:
+        """Stores a segment atomically, then evicts down to the size cap."""
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(params[0])
+            wav.setsampwidth(params[1])
+            wav.setframerate(params[2])
+            wav.writeframes(frames)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._sizes[key] = os.path.getsize(path)
+            self._evict()
+
+    def _evict(self) -> None:
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        by_age = []
+        for key in self._sizes:
+            try:
+                by_age.append((os.path.getmtime(self._path(key)), key))
+            except FileNotFoundError:
+                by_age.append((0.0, key))
+        for _, key in sorted(by_age):
+            if total <= self.max_bytes:
+                break
+            total -= self._sizes.pop(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently stored."""
+        return sum(self._sizes.values())
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and the current cache size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._sizes),
+            "size_bytes": self.size_bytes,
+        }
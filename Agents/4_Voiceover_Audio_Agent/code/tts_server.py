@@ -0,0 +1,257 @@
+"""
+TTS Synthesis Server
+
+Purpose: Loads the Coqui VITS model once and synthesizes many jobs from a queue
+Input: (text, speaker, output path) jobs, in-process or over a Unix socket
+Output: WAV files plus queue depth, model-load time and real-time factor per job
+Dependencies: Coqui TTS (loaded lazily), socketserver, threading, wave
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.instrumentation import span  # pylint: disable=wrong-import-position
+from utils.logger import setup_logger  # pylint: disable=wrong-import-position
+
+MODEL_NAME = "tts_models/en/vctk/vits"
+DEFAULT_SPEAKER = "p227"
+
+_SERVERS: Dict[str, "TTSServer"] = {}
+_SERVERS_LOCK = threading.Lock()
+
+
+def load_coqui_model(model_name: str = MODEL_NAME):
+    """Builds the Coqui TTS model on CPU."""
+    from TTS.api import TTS  # pylint: disable=import-outside-toplevel
+    return TTS(model_name=model_name, progress_bar=False, gpu=False)
+
+
+def wav_duration(path: str) -> float:
+    """Returns the length of a WAV file in seconds."""
+    with wave.open(path, "rb") as wav:
+        return wav.getnframes() / float(wav.getframerate())
+
+
+class TTSServer:
+    """Serializes synthesis jobs onto one long-lived model instance."""
+
+    def __init__(self, model_name: str = MODEL_NAME,
+                 model_factory: Optional[Callable[[str], Any]] = None):
+        """Initializes the server without loading the model yet.
+
+        Args:
+            model_name (str): Coqui model identifier.
+            model_factory: Callable building a model with ``tts_to_file``;
+                defaults to :func:`load_coqui_model`.
+        """
+        self.model_name = model_name
+        self.model_factory = model_factory or load_coqui_model
+        self.model_load_time: Optional[float] = None
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._load_error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def start(self, wait: bool = True) -> "TTSServer":
+        """Starts the worker thread, which loads the model before serving.
+
+        Args:
+            wait (bool): Block until the model is loaded.
+
+        Raises:
+            RuntimeError: If ``wait`` is set and the model failed to load.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name="tts-server",
+                                                daemon=True)
+                self._thread.start()
+        if wait:
+            self._ready.wait()
+            if self._load_error is not None:
+                raise RuntimeError(f"TTS model failed to load: {self._load_error}")
+        return self
+
+    def _serve(self) -> None:
+        start = time.perf_counter()
+        try:
+            with span("model_load", category="voiceover", model=self.model_name):
+                model = self.model_factory(self.model_name)
+        except Exception as error:  # pylint: disable=broad-except
+            logging.exception("Failed to load TTS model %s", self.model_name)
+            self._load_error = error
+            model = None
+        self.model_load_time = time.perf_counter() - start
+        self._ready.set()
+        logging.info("TTS model %s loaded in %.2fs", self.model_name, self.model_load_time)
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            future, text, speaker, output_path, queued_at = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                if model is None:
+                    raise RuntimeError(f"TTS model failed to load: {self._load_error}")
+                with span("tts_job", category="voiceover", chars=len(text)):
+                    model.tts_to_file(text=text, file_path=output_path, speaker=speaker)
+                synth_time = time.perf_counter() - started
+                audio_seconds = wav_duration(output_path)
+            except Exception as error:  # pylint: disable=broad-except
+                self.jobs_failed += 1
+                future.set_exception(error)
+                continue
+            self.jobs_done += 1
+            future.set_result({
+                "output_path": output_path,
+                "speaker": speaker,
+                "wait_time": started - queued_at,
+                "synth_time": synth_time,
+                "audio_seconds": audio_seconds,
+                "rtf": synth_time / audio_seconds if audio_seconds else 0.0,
+            })
+
+    def submit(self, text: str, output_path: str, speaker: str = DEFAULT_SPEAKER) -> Future:
+        """Queues a synthesis job and returns a future for its statistics."""
+        self.start(wait=False)
+        future: Future = Future()
+        self._queue.put((future, text, speaker, output_path, time.perf_counter()))
+        return future
+
+    def synthesize(self, text: str, output_path: str,
+                   speaker: str = DEFAULT_SPEAKER) -> Dict[str, Any]:
+        """Synthesizes ``text`` into ``output_path`` and waits for the result.
+
+        Returns:
+            Dict[str, Any]: Wait time, synthesis time, audio length and RTF.
+        """
+        return self.submit(text, output_path, speaker).result()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for the model."""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the server counters."""
+        return {
+            "model_name": self.model_name,
+            "model_loaded": self._ready.is_set() and self._load_error is None,
+            "model_load_time": self.model_load_time,
+            "queue_depth": self.queue_depth,
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+        }
+
+    def stop(self) -> None:
+        """Finishes queued jobs and stops the worker thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def get_server(model_name: str = MODEL_NAME) -> TTSServer:
+    """Returns the process-wide server for ``model_name``, creating it once."""
+    with _SERVERS_LOCK:
+        server = _SERVERS.get(model_name)
+        if server is None:
+            server = _SERVERS[model_name] = TTSServer(model_name)
+        return server
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles newline-delimited JSON requests from :class:`TTSClient`."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("op") == "stats":
+                    reply = {"ok": True, "result": self.server.tts.stats()}
+                else:
+                    result = self.server.tts.synthesize(
+                        request["text"], request["output_path"],
+                        request.get("speaker", DEFAULT_SPEAKER))
+                    reply = {"ok": True, "result": result}
+            except Exception as error:  # pylint: disable=broad-except
+                reply = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class UnixSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Exposes a :class:`TTSServer` to other processes on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, tts: TTSServer):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.tts = tts
+        super().__init__(socket_path, _RequestHandler)
+
+
+class TTSClient:
+    """Talks to a :class:`UnixSocketServer` with the same API as the server."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reply_file:
+                reply = json.loads(reply_file.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def synthesize(self, text: str, output_path: str,
+                   speaker: str = DEFAULT_SPEAKER) -> Dict[str, Any]:
+        """Synthesizes ``text`` on the remote model and waits for the result."""
+        return self._call({"op": "synthesize", "text": text, "speaker": speaker,
+                           "output_path": os.path.abspath(output_path)})
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the remote server counters."""
+        return self._call({"op": "stats"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve TTS synthesis on a Unix socket.")
+    parser.add_argument("--socket", default="/tmp/tts_server.sock")
+    parser.add_argument("--model", default=MODEL_NAME)
+    args = parser.parse_args()
+    setup_logger()
+    tts = TTSServer(args.model).start()
+    with UnixSocketServer(args.socket, tts) as server:
+        print("TTS server listening on", args.socket)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
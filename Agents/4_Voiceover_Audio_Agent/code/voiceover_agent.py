@@ -1,42 +1,66 @@
 #!/usr/bin/env python3
 import os
-from TTS.api import TTS
+from chunked_synthesis import synthesize_chunked
+from synthesis_cache import SynthesisCache
+from tts_server import TTSClient, get_server
+# tts_server puts the repository root on sys.path for the shared utils.
+from utils.instrumentation import span
 
-def generate_voiceover():
-    # Define the path to the script outline file from the Scriptwriting & Outline Agent
-    outline_file = os.path.join(
-        os.path.expanduser("~"),
-        "Documents/youtube/Agents/2_Scriptwriting_Outline_Agent/code/script_outline.txt"
-    )
-    
-    # Check if the file exists
+OUTLINE_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/2_Scriptwriting_Outline_Agent/code/script_outline.txt"
+)
+OUTPUT_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/4_Voiceover_Audio_Agent/code/voiceover.wav"
+)
+
+def get_tts_server():
+    # Use a shared server process when one is running, otherwise keep the
+    # VCTK-based VITS model loaded in this process for every later call.
+    socket_path = os.environ.get("TTS_SERVER_SOCKET")
+    if socket_path:
+        return TTSClient(socket_path)
+    return get_server()
+
+def generate_voiceover(outline_file=OUTLINE_FILE, output_file=OUTPUT_FILE, server=None,
+                       workers=None, pause_seconds=0.6, cache=None):
+    # Check if the script outline file from the Scriptwriting & Outline Agent exists
     if not os.path.exists(outline_file):
         print("Script outline file not found. Please run the Scriptwriting & Outline Agent first.")
         return
     
-    # Read and preprocess the script outline text
+    # Read the script outline text; it is split at [PAUSE] markers and
+    # sentence boundaries so each chunk can be synthesized on its own core.
     with open(outline_file, "r") as f:
         text = f.read()
-    # Replace newlines with spaces and periods with commas to reduce long pauses
-    text = text.replace("\n", " ").replace(". ", ", ")
 
     print("Generating voiceover for the following text:")
     print(text)
     
-    # Initialize the Coqui TTS model using the VCTK-based VITS model.
-    # Experiment with different speaker IDs for a deeper, calming male voice.
-    tts = TTS(model_name="tts_models/en/vctk/vits", progress_bar=True, gpu=False)
-    
-    # Define the output file (using .wav format)
-    output_file = os.path.join(
-        os.path.expanduser("~"),
-        "Documents/youtube/Agents/4_Voiceover_Audio_Agent/code/voiceover.wav"
-    )
+    # workers=0 synthesizes through the warm in-process (or socket) server,
+    # which is what batch workers use to avoid nested process pools.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 0 and server is None:
+        server = get_tts_server()
+    # Segments already rendered by an earlier run (intros, outros, calls to
+    # action, unchanged lines) are read back from the synthesis cache.
+    if cache is None:
+        cache = SynthesisCache()
     
     try:
-        # Specify a male speaker ID (try "p227" as an example)
-        tts.tts_to_file(text=text, file_path=output_file, speaker="p227")
+        # Specify a male speaker ID (try "p227" as an example).
+        # Experiment with different speaker IDs for a deeper, calming male voice.
+        with span("synthesis", category="voiceover", chars=len(text), workers=workers):
+            timeline = synthesize_chunked(text, output_file, speaker="p227", workers=workers,
+                                          server=server, pause_seconds=pause_seconds,
+                                          cache=cache)
         print("Voiceover saved to", output_file)
+        print(f"Synthesized {len(timeline['segments'])} segments, "
+              f"{timeline['duration']:.1f}s of audio ({timeline['retries']} retries, "
+              f"{timeline['cache_hits']} cached, {timeline['cache_misses']} synthesized)")
+        return output_file
     except Exception as e:
         print("Error generating voiceover:", e)
 
@@ -0,0 +1,148 @@
+"""
+Render Cache
+
+Purpose: Reuses finished renders when the voiceover, script and render settings
+         have not changed, so unchanged videos are never re-encoded
+Input: Voiceover file, script file, render settings
+Output: Cached videos on disk under a disk budget, with hit/miss statistics
+Dependencies: hashlib, shutil, os, utils.file_io
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from render_graph import RenderSettings, segments_file_for
+# render_graph puts the repository root on sys.path for the shared utils.
+from utils.file_io import file_digest
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/5_Video_Creation_Editing_Agent/code/render_cache"
+)
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+
+_DEFAULT_CACHE: Optional["RenderCache"] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def _place(source: str, destination: str) -> None:
+    """Hard-links ``source`` to ``destination``, copying across filesystems.
+
+    The destination is replaced atomically and never shares an inode with a
+    file that ffmpeg may later overwrite in place.
+    """
+    tmp_path = f"{destination}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+class RenderCache:
+    """Content-addressed store of rendered videos with LRU eviction."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Opens (and creates) the cache directory.
+
+        Args:
+            cache_dir (str): Directory holding ``<key>.mp4`` renders.
+            max_bytes (int): Disk budget; least recently used renders are
+                evicted once it is exceeded.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(voiceover_file: str, script_outline_file: str,
+            settings: RenderSettings) -> str:
+        """Hashes the audio, script, caption timing and render settings."""
+        parts: Dict[str, Any] = {
+            "audio": file_digest(voiceover_file),
+            "script": file_digest(script_outline_file),
+            "settings": settings.as_dict(),
+        }
+        timeline = segments_file_for(voiceover_file)
+        if os.path.exists(timeline):
+            parts["timeline"] = file_digest(timeline)
+        if settings.fontfile and os.path.exists(settings.fontfile):
+            parts["font"] = file_digest(settings.fontfile)
+        payload = json.dumps(parts, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".mp4", base + ".json"
+
+    def fetch(self, key: str, output_video: str) -> Optional[Dict[str, Any]]:
+        """Places a cached render at ``output_video``.
+
+        Returns:
+            Optional[Dict[str, Any]]: Stats of the original render on a hit,
+            otherwise None.
+        """
+        video_path, stats_path = self._paths(key)
+        try:
+            _place(video_path, output_video)
+            os.utime(video_path)
+            with open(stats_path, "r", encoding="utf-8") as file:
+                stats = json.load(file)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return stats
+
+    def store(self, key: str, output_video: str, stats: Dict[str, Any]) -> None:
+        """Adds a finished render to the cache, then enforces the budget."""
+        video_path, stats_path = self._paths(key)
+        _place(output_video, video_path)
+        with open(stats_path, "w", encoding="utf-8") as file:
+            json.dump(stats, file, indent=4)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".mp4"):
+                    path = os.path.join(self.cache_dir, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, name[:-4]))
+            total = sum(size for _, size, _ in entries)
+            for _, size, key in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in self._paths(key):
+                    if os.path.exists(path):
+                        os.remove(path)
+                total -= size
+                self.evictions += 1
+                logging.info("Evicted render %s from cache", key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/eviction counters."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def get_render_cache() -> RenderCache:
+    """Returns the process-wide render cache in the default location."""
+    global _DEFAULT_CACHE  # pylint: disable=global-statement
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = RenderCache()
+        return _DEFAULT_CACHE
@@ -0,0 +1,253 @@
+"""
+Single-Pass Render Graph
+
+Purpose: Renders the captioned video in one ffmpeg invocation, with one timed
+         drawtext caption per voiceover segment
+Input: Voiceover audio, its segment timeline (or the script text), render settings
+Output: Encoded video plus per-render encode time and encoder fps
+Dependencies: ffmpeg-python (imported when rendering), wave, json
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import textwrap
+import time
+import wave
+from typing import Any, Dict, List, Optional
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.instrumentation import span  # pylint: disable=wrong-import-position
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?<!\d\.)\s+")
+_FPS_PATTERN = re.compile(r"fps=\s*([\d.]+)")
+
+
+class RenderSettings:
+    """Encoder and caption options for a render."""
+
+    def __init__(self, resolution: str = "1280x720", fps: int = 30,
+                 vcodec: str = "libx264", acodec: str = "aac", preset: str = "veryfast",
+                 crf: int = 23, threads: int = 0, fontsize: int = 36,
+                 fontcolor: str = "white", boxcolor: str = "black@0.5",
+                 fontfile: Optional[str] = None, wrap_width: int = 48):
+        """Initializes the settings.
+
+        Args:
+            resolution (str): Output frame size as ``WIDTHxHEIGHT``.
+            fps (int): Output frame rate.
+            vcodec (str): Video encoder.
+            acodec (str): Audio encoder.
+            preset (str): x264 speed/quality preset (ultrafast ... veryslow).
+            crf (int): x264 constant rate factor.
+            threads (int): Encoder threads; 0 lets ffmpeg decide.
+            fontsize (int): Caption font size.
+            fontcolor (str): Caption colour.
+            boxcolor (str): Caption background box colour.
+            fontfile (Optional[str]): TrueType font for captions.
+            wrap_width (int): Characters per caption line.
+        """
+        self.resolution = resolution
+        self.fps = fps
+        self.vcodec = vcodec
+        self.acodec = acodec
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads
+        self.fontsize = fontsize
+        self.fontcolor = fontcolor
+        self.boxcolor = boxcolor
+        self.fontfile = fontfile
+        self.wrap_width = wrap_width
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the settings as a plain dictionary."""
+        return dict(vars(self))
+
+
+def segments_file_for(voiceover_file: str) -> str:
+    """Returns the segment timeline path written by the voiceover stage."""
+    return os.path.splitext(voiceover_file)[0] + "_segments.json"
+
+
+def audio_duration(voiceover_file: str) -> float:
+    """Reads the audio length from the WAV header, probing other formats."""
+    if voiceover_file.lower().endswith(".wav"):
+        with wave.open(voiceover_file, "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+    with span("probe", category="video", file=os.path.basename(voiceover_file)):
+        return float(ffmpeg.probe(voiceover_file)["format"]["duration"])
+
+
+def load_timeline(voiceover_file: str, script_outline_file: str) -> Dict[str, Any]:
+    """Returns the caption segments and total duration for a voiceover.
+
+    Uses the voiceover stage's ``_segments.json`` when present. Otherwise the
+    script is split into sentences whose durations are proportional to their
+    length across the audio duration.
+    """
+    timeline_file = segments_file_for(voiceover_file)
+    if os.path.exists(timeline_file):
+        with open(timeline_file, "r", encoding="utf-8") as file:
+            timeline = json.load(file)
+        return {"duration": timeline["duration"], "segments": timeline["segments"]}
+
+    duration = audio_duration(voiceover_file)
+    with open(script_outline_file, "r", encoding="utf-8") as file:
+        text = file.read().replace("[PAUSE]", "")
+    sentences = [s.strip() for line in text.splitlines()
+                 for s in _SENTENCE_END.split(line) if s.strip()]
+    total_chars = sum(len(s) for s in sentences) or 1
+    segments, start = [], 0.0
+    for sentence in sentences:
+        length = duration * len(sentence) / total_chars
+        segments.append({"text": sentence, "start": start, "duration": length})
+        start += length
+    return {"duration": duration, "segments": segments}
+
+
+def build_captions(segments: List[Dict[str, Any]], duration: float,
+                   wrap_width: int = 48) -> List[Dict[str, Any]]:
+    """Turns voiceover segments into wrapped, non-overlapping captions.
+
+    Returns:
+        List[Dict[str, Any]]: Captions with ``text``, ``start`` and ``end``.
+    """
+    captions = []
+    for segment in segments:
+        start = max(0.0, float(segment["start"]))
+        end = min(duration, start + float(segment["duration"]))
+        if end <= start or not segment["text"].strip():
+            continue
+        captions.append({"text": textwrap.fill(segment["text"], wrap_width),
+                         "start": round(start, 3), "end": round(end, 3)})
+    return captions
+
+
+def parse_encoder_fps(stderr: str) -> Optional[float]:
+    """Returns the last ``fps=`` value reported by ffmpeg, if any."""
+    matches = _FPS_PATTERN.findall(stderr)
+    return float(matches[-1]) if matches else None
+
+
+def add_captions(video, captions: List[Dict[str, Any]], settings: RenderSettings,
+                 caption_dir: str):
+    """Chains one timed drawtext filter per caption onto an ffmpeg stream.
+
+    Caption text is written to files in ``caption_dir`` and passed through
+    ``textfile`` so no filter escaping is needed for script punctuation.
+    """
+    for index, caption in enumerate(captions):
+        text_file = os.path.join(caption_dir, f"{index:05d}.txt")
+        with open(text_file, "w", encoding="utf-8") as file:
+            file.write(caption["text"])
+        options = dict(textfile=text_file, expansion="none", fontsize=settings.fontsize,
+                       fontcolor=settings.fontcolor, x="(w-text_w)/2", y="(h-text_h)/2",
+                       box=1, boxcolor=settings.boxcolor,
+                       enable=f"between(t,{caption['start']},{caption['end']})")
+        if settings.fontfile:
+            options["fontfile"] = settings.fontfile
+        video = video.filter("drawtext", **options)
+    return video
+
+
+def render_video(voiceover_file: str, captions: List[Dict[str, Any]], duration: float,
+                 output_video: str, settings: Optional[RenderSettings] = None) -> Dict[str, Any]:
+    """Encodes the captioned video and muxes the audio in one ffmpeg run.
+
+    Returns:
+        Dict[str, Any]: Encode time, encoder fps and the settings used.
+
+    Raises:
+        RuntimeError: If ffmpeg fails.
+    """
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+
+    settings = settings or RenderSettings()
+    # Encode beside the target and rename, so the output is replaced rather
+    # than rewritten in place.
+    partial = f"{output_video}.partial{os.path.splitext(output_video)[1] or '.mp4'}"
+    caption_dir = tempfile.mkdtemp(prefix="captions_")
+    try:
+        video = ffmpeg.input(
+            f"color=c=black:s={settings.resolution}:r={settings.fps}:d={duration}", f="lavfi")
+        video = add_captions(video, captions, settings, caption_dir)
+        audio = ffmpeg.input(voiceover_file)
+        out = ffmpeg.output(video, audio, partial, vcodec=settings.vcodec,
+                            acodec=settings.acodec, pix_fmt="yuv420p", preset=settings.preset,
+                            crf=settings.crf, threads=settings.threads,
+                            movflags="+faststart", shortest=None)
+        start = time.perf_counter()
+        try:
+            with span("encode", category="video", duration=duration, preset=settings.preset):
+                _, stderr = ffmpeg.run(out, overwrite_output=True, capture_stderr=True)
+        except ffmpeg.Error as error:
+            message = error.stderr.decode("utf-8", "replace") if error.stderr else str(error)
+            raise RuntimeError(f"FFmpeg error: {message}") from error
+        encode_time = time.perf_counter() - start
+        os.replace(partial, output_video)
+    finally:
+        shutil.rmtree(caption_dir, ignore_errors=True)
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    frames = int(round(duration * settings.fps))
+    encoder_fps = parse_encoder_fps(stderr.decode("utf-8", "replace"))
+    if encoder_fps is None:
+        encoder_fps = frames / encode_time if encode_time else 0.0
+    return {"output_video": output_video, "duration": duration, "frames": frames,
+            "captions": len(captions), "encode_time": encode_time,
+            "encoder_fps": encoder_fps, "settings": settings.as_dict()}
+
+
+def render_script_video(voiceover_file: str, script_outline_file: str, output_video: str,
+                        settings: Optional[RenderSettings] = None,
+                        chunk_seconds: Optional[float] = None,
+                        workers: Optional[int] = None, cache=None) -> Dict[str, Any]:
+    """Renders a captioned video for a voiceover and records the render stats.
+
+    With ``chunk_seconds`` set, the timeline is encoded as parallel,
+    checkpointed chunks (see ``segmented_render``) instead of one process.
+    With a ``cache`` (see ``render_cache``), unchanged inputs reuse an
+    earlier render instead of encoding again. Stats are appended to
+    ``render_log.jsonl`` beside the output video.
+    """
+    settings = settings or RenderSettings()
+    key = None
+    if cache is not None:
+        key = cache.key(voiceover_file, script_outline_file, settings)
+        cached = cache.fetch(key, output_video)
+        if cached is not None:
+            logging.info("Reused cached render for %s", output_video)
+            return dict(cached, output_video=output_video, cache="hit",
+                        encode_time=0.0)
+        # Never let ffmpeg truncate a file that is hard-linked into the cache.
+        if os.path.exists(output_video):
+            os.remove(output_video)
+    timeline = load_timeline(voiceover_file, script_outline_file)
+    captions = build_captions(timeline["segments"], timeline["duration"], settings.wrap_width)
+    if chunk_seconds:
+        from segmented_render import render_segmented  # pylint: disable=import-outside-toplevel
+        stats = render_segmented(voiceover_file, captions, timeline["duration"], output_video,
+                                 settings, chunk_seconds=chunk_seconds, workers=workers)
+    else:
+        stats = render_video(voiceover_file, captions, timeline["duration"], output_video,
+                             settings)
+    if cache is not None:
+        cache.store(key, output_video, stats)
+        stats["cache"] = "miss"
+    log_file = os.path.join(os.path.dirname(os.path.abspath(output_video)), "render_log.jsonl")
+    with open(log_file, "a", encoding="utf-8") as file:
+        file.write(json.dumps(dict(stats, rendered_at=time.time())) + "\n")
+    logging.info("Rendered %s in %.1fs (%.1f fps, preset %s)", output_video,
+                 stats["encode_time"], stats["encoder_fps"], settings.preset)
+    return stats
@@ -0,0 +1,236 @@
+"""
+Segmented Parallel Render
+
+Purpose: Encodes long videos as caption-aligned chunks in parallel ffmpeg
+         workers and joins them with the concat demuxer without re-encoding
+Input: Voiceover audio, caption timeline, render settings
+Output: Final video; finished chunks are checkpointed so an interrupted render
+        resumes where it stopped
+Dependencies: ffmpeg-python (imported when rendering), render_graph
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from render_graph import RenderSettings, add_captions
+# render_graph puts the repository root on sys.path for the shared utils.
+from utils.instrumentation import span
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def plan_chunks(captions: List[Dict[str, Any]], duration: float, fps: int,
+                chunk_seconds: float = 60.0) -> List[Dict[str, Any]]:
+    """Splits the timeline into chunks that end on caption boundaries.
+
+    Chunks are at least ``chunk_seconds`` long except for the last one; a
+    caption running much longer than that is cut at fixed intervals.
+
+    Boundaries are snapped to whole frames so the concatenated chunks add up
+    to exactly the same frame count as a single-pass render. Captions are
+    shifted to chunk-local time.
+
+    Args:
+        captions (List[Dict[str, Any]]): Captions with ``start``/``end``.
+        duration (float): Total video duration in seconds.
+        fps (int): Output frame rate.
+        chunk_seconds (float): Target chunk length.
+
+    Returns:
+        List[Dict[str, Any]]: Chunks with ``index``, ``start``, ``end``,
+        ``frames`` and local ``captions``.
+    """
+    total_frames = int(round(duration * fps))
+    step = max(1, int(round(chunk_seconds * fps)))
+    cuts = sorted({int(round(c["end"] * fps)) for c in captions})
+    boundaries: List[int] = []
+    last = 0
+    for cut in [c for c in cuts if 0 < c < total_frames] + [total_frames]:
+        # Cut mid-caption only when no caption ends within 1.5 chunk lengths.
+        while cut - last > step * 3 // 2:
+            last += step
+            boundaries.append(last)
+        if cut - last >= step and cut < total_frames:
+            boundaries.append(cut)
+            last = cut
+
+    chunks = []
+    edges = [0] + boundaries + [total_frames]
+    for index, (first, stop) in enumerate(zip(edges, edges[1:])):
+        start, end = first / fps, stop / fps
+        local = []
+        for caption in captions:
+            if caption["end"] > start and caption["start"] < end:
+                local.append({"text": caption["text"],
+                              "start": round(max(caption["start"], start) - start, 3),
+                              "end": round(min(caption["end"], end) - start, 3)})
+        chunks.append({"index": index, "start": start, "end": end,
+                       "frames": stop - first, "captions": local})
+    return chunks
+
+
+def chunk_key(chunk: Dict[str, Any], settings: RenderSettings) -> str:
+    """Hashes everything that affects a chunk's encoded bytes."""
+    payload = json.dumps({"frames": chunk["frames"], "captions": chunk["captions"],
+                          "settings": settings.as_dict()}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """Records finished chunks on disk, rewriting the file atomically."""
+
+    def __init__(self, work_dir: str):
+        self.path = os.path.join(work_dir, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        self.done: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.done = json.load(file)
+
+    def is_done(self, key: str, chunk_file: str) -> bool:
+        """True when ``chunk_file`` holds the finished encode for ``key``."""
+        return self.done.get(key) == os.path.basename(chunk_file) and os.path.exists(chunk_file)
+
+    def mark_done(self, key: str, chunk_file: str) -> None:
+        """Records a finished chunk."""
+        with self._lock:
+            self.done[key] = os.path.basename(chunk_file)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.done, file, indent=4)
+            os.replace(tmp_path, self.path)
+
+
+def _encode_chunk(chunk: Dict[str, Any], chunk_file: str, settings: RenderSettings,
+                  threads: int) -> float:
+    """Encodes one video-only chunk and returns the encode time."""
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+
+    caption_dir = chunk_file + ".captions"
+    os.makedirs(caption_dir, exist_ok=True)
+    partial = chunk_file + ".partial.mp4"
+    try:
+        duration = chunk["frames"] / settings.fps
+        video = ffmpeg.input(
+            f"color=c=black:s={settings.resolution}:r={settings.fps}:d={duration}", f="lavfi")
+        video = add_captions(video, chunk["captions"], settings, caption_dir)
+        out = ffmpeg.output(video, partial, vcodec=settings.vcodec, pix_fmt="yuv420p",
+                            preset=settings.preset, crf=settings.crf, threads=threads,
+                            frames=chunk["frames"])
+        start = time.perf_counter()
+        try:
+            with span("encode_chunk", category="video", chunk=chunk["index"],
+                      frames=chunk["frames"]):
+                ffmpeg.run(out, overwrite_output=True, capture_stderr=True)
+        except ffmpeg.Error as error:
+            message = error.stderr.decode("utf-8", "replace") if error.stderr else str(error)
+            raise RuntimeError(f"Chunk {chunk['index']} failed: {message}") from error
+        os.replace(partial, chunk_file)
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(caption_dir, ignore_errors=True)
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def render_segmented(voiceover_file: str, captions: List[Dict[str, Any]], duration: float,
+                     output_video: str, settings: Optional[RenderSettings] = None,
+                     chunk_seconds: float = 60.0, workers: Optional[int] = None,
+                     work_dir: Optional[str] = None, keep_chunks: bool = False
+                     ) -> Dict[str, Any]:
+    """Renders the video as parallel chunks and concatenates them losslessly.
+
+    Video chunks are encoded without audio and joined with the concat
+    demuxer using stream copy; the voiceover is encoded once while muxing.
+    Chunks recorded in the work directory's checkpoint are reused, so a
+    render interrupted at minute 9 only redoes the chunks after minute 8.
+
+    Args:
+        voiceover_file (str): Audio track for the final video.
+        captions (List[Dict[str, Any]]): Timed captions for the whole video.
+        duration (float): Total duration in seconds.
+        output_video (str): Destination path.
+        settings (Optional[RenderSettings]): Encoder and caption settings.
+        chunk_seconds (float): Target chunk length.
+        workers (Optional[int]): Parallel ffmpeg processes; defaults to the
+            CPU count.
+        work_dir (Optional[str]): Chunk and checkpoint directory; defaults to
+            ``<output>.parts``.
+        keep_chunks (bool): Keep the work directory after success.
+
+    Returns:
+        Dict[str, Any]: Encode and concat times, encoder fps, chunk counts.
+
+    Raises:
+        RuntimeError: If a chunk or the final concat fails.
+    """
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+
+    settings = settings or RenderSettings()
+    workers = workers or os.cpu_count() or 1
+    threads = settings.threads or max(1, (os.cpu_count() or 1) // workers)
+    work_dir = work_dir or output_video + ".parts"
+    os.makedirs(work_dir, exist_ok=True)
+    checkpoint = Checkpoint(work_dir)
+
+    chunks = plan_chunks(captions, duration, settings.fps, chunk_seconds)
+    files, todo = [], []
+    for chunk in chunks:
+        key = chunk_key(chunk, settings)
+        chunk_file = os.path.join(work_dir, f"chunk_{chunk['index']:05d}_{key[:12]}.mp4")
+        files.append(chunk_file)
+        if not checkpoint.is_done(key, chunk_file):
+            todo.append((chunk, key, chunk_file))
+    logging.info("Rendering %d of %d chunks (%d reused from checkpoint)",
+                 len(todo), len(chunks), len(chunks) - len(todo))
+
+    def encode(job):
+        chunk, key, chunk_file = job
+        seconds = _encode_chunk(chunk, chunk_file, settings, threads)
+        checkpoint.mark_done(key, chunk_file)
+        return seconds
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(encode, todo))
+    encode_time = time.perf_counter() - start
+
+    list_file = os.path.join(work_dir, "concat.txt")
+    with open(list_file, "w", encoding="utf-8") as file:
+        for chunk_file in files:
+            file.write(f"file '{os.path.basename(chunk_file)}'\n")
+    start = time.perf_counter()
+    video = ffmpeg.input(list_file, f="concat", safe=0)
+    audio = ffmpeg.input(voiceover_file)
+    partial = f"{output_video}.partial{os.path.splitext(output_video)[1] or '.mp4'}"
+    out = ffmpeg.output(video.video, audio.audio, partial, vcodec="copy",
+                        acodec=settings.acodec, movflags="+faststart", shortest=None)
+    try:
+        with span("concat", category="video", chunks=len(files)):
+            ffmpeg.run(out, overwrite_output=True, capture_stderr=True)
+        os.replace(partial, output_video)
+    except ffmpeg.Error as error:
+        message = error.stderr.decode("utf-8", "replace") if error.stderr else str(error)
+        raise RuntimeError(f"Concat failed: {message}") from error
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    concat_time = time.perf_counter() - start
+
+    if not keep_chunks:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    encoded_frames = sum(chunk["frames"] for chunk, _, _ in todo)
+    return {"output_video": output_video, "duration": duration,
+            "frames": int(round(duration * settings.fps)), "captions": len(captions),
+            "chunks": len(chunks), "chunks_reused": len(chunks) - len(todo),
+            "workers": workers, "encode_time": encode_time + concat_time,
+            "chunk_encode_time": encode_time, "concat_time": concat_time,
+            "encoder_fps": encoded_frames / encode_time if encode_time and todo else 0.0,
+            "settings": settings.as_dict()}
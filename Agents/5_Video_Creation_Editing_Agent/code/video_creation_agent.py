@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import os
-import ffmpeg
+from render_cache import get_render_cache
+from render_graph import RenderSettings, render_script_video
 
-def create_video():
+def create_video(preset="veryfast", threads=0, chunk_seconds=None, use_cache=True):
     # Define paths
     base_dir = os.path.expanduser("~")
     voiceover_file = os.path.join(base_dir, "Documents/youtube/Agents/4_Voiceover_Audio_Agent/code/voiceover.aiff")
@@ -17,47 +18,26 @@ def create_video():
         print("Script outline file not found. Please run the Scriptwriting & Outline Agent first.")
         return
 
-    # Get audio duration using ffmpeg.probe
+    # Build one filter graph with a caption per voiceover segment and encode it
+    # in a single ffmpeg run. Segment timing comes from the voiceover stage, so
+    # no separate probe pass is needed when its timeline is available.
+    # Long videos can be split into parallel, checkpointed chunks instead, and
+    # unchanged inputs are served from the render cache without encoding.
+    settings = RenderSettings(preset=preset, threads=threads)
     try:
-        probe = ffmpeg.probe(voiceover_file)
-        duration = float(probe['format']['duration'])
-    except Exception as e:
-        print("Error obtaining audio duration:", e)
+        stats = render_script_video(voiceover_file, script_outline_file, output_video, settings,
+                                    chunk_seconds=chunk_seconds,
+                                    cache=get_render_cache() if use_cache else None)
+    except (OSError, RuntimeError) as e:
+        print("ffmpeg error:", e)
         return
-
-    # Read the script outline text and replace newlines with spaces
-    with open(script_outline_file, "r") as f:
-        text = f.read().replace('\n', ' ')
-
-    print("Audio duration:", duration)
-    print("Script text:", text)
-
-    # Create a black background video with the same duration as the audio using ffmpeg's lavfi input
-    # (This is a comment. Make sure it starts with a '#' so it isn't interpreted as code.)
-    black_video = ffmpeg.input('color=c=black:s=1280x720:d={}'.format(duration), f='lavfi')
-
-    # Overlay text using the drawtext filter (adjust parameters as needed)
-    video_with_text = black_video.filter('drawtext',
-                                           text=text,
-                                           fontsize=24,
-                                           fontcolor='white',
-                                           x='(w-text_w)/2',
-                                           y='(h-text_h)/2',
-                                           box=1,
-                                           boxcolor='black@0.5',
-                                           enable='between(t,0,{})'.format(duration))
-
-    # Load the audio file
-    audio = ffmpeg.input(voiceover_file)
-
-    # Combine video and audio into the final output
-    try:
-        out = ffmpeg.output(video_with_text, audio, output_video,
-                            vcodec='libx264', acodec='aac', pix_fmt='yuv420p', shortest=None)
-        ffmpeg.run(out, overwrite_output=True)
-        print("Final video saved to", output_video)
-    except ffmpeg.Error as e:
-        print("ffmpeg error:", e.stderr.decode())
+    print("Audio duration:", stats["duration"])
+    if stats.get("cache") == "hit":
+        print("Inputs unchanged; reused cached render.")
+    print(f"Encoded {stats['captions']} captions in {stats['encode_time']:.1f}s "
+          f"({stats['encoder_fps']:.1f} fps, preset {preset})")
+    print("Final video saved to", output_video)
+    return output_video
 
 if __name__ == '__main__':
     create_video()
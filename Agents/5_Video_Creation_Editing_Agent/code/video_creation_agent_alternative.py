@@ -2,32 +2,46 @@
 Video Creation Agent (Alternative)
 
 Purpose:
-    Creates videos by combining a voiceover audio file with a text script overlay using ffmpeg.
+    Creates videos by combining a voiceover audio file with timed script captions using ffmpeg.
 Input:
     - voiceover_file: Path to the voiceover audio file.
     - script_outline_file: Path to the text file containing the script.
 Output:
     - Returns the path to the generated video file.
 Dependencies:
-    - ffmpeg-python
+    - ffmpeg-python (via render_graph)
     - os
     - logging
 """
 
 import os
-import ffmpeg
 import logging
+from typing import Optional
 
-logging.basicConfig(level=logging.INFO)
+from render_cache import get_render_cache
+from render_graph import RenderSettings, render_script_video
+# render_graph puts the repository root on sys.path for the shared utils.
+from utils.logger import setup_logger
 
-def create_video(voiceover_file: str, script_outline_file: str, output_video: str = "output_video_alt.mp4") -> str:
+setup_logger()
+
+def create_video(voiceover_file: str, script_outline_file: str,
+                 output_video: str = "output_video_alt.mp4",
+                 settings: Optional[RenderSettings] = None,
+                 chunk_seconds: Optional[float] = None, workers: Optional[int] = None,
+                 use_cache: bool = True) -> str:
     """
-    Generates a video by overlaying text on a black background and adding a voiceover.
+    Generates a video with timed captions on a black background and adds a voiceover.
 
     Args:
         voiceover_file (str): Path to the audio file.
         script_outline_file (str): Path to the text script file.
         output_video (str): Path for the output video file (default: "output_video_alt.mp4").
+        settings (Optional[RenderSettings]): Resolution, x264 preset, threads and caption style.
+        chunk_seconds (Optional[float]): Encode in parallel, checkpointed chunks of about
+            this length (useful for long videos); None encodes in a single pass.
+        workers (Optional[int]): Parallel ffmpeg processes for chunked encoding.
+        use_cache (bool): Reuse an earlier render when audio, script and settings are unchanged.
 
     Returns:
         str: The path to the generated video file.
@@ -41,53 +55,17 @@ def create_video(voiceover_file: str, script_outline_file: str, output_video: st
         raise FileNotFoundError(f"Voiceover file {voiceover_file} not found")
     if not os.path.exists(script_outline_file):
         raise FileNotFoundError(f"Script file {script_outline_file} not found")
-    
-    try:
-        # Get audio duration from the voiceover file
-        probe = ffmpeg.probe(voiceover_file)
-        duration = float(probe['format']['duration'])
-
-        # Read the script text with explicit UTF-8 encoding
-        with open(script_outline_file, "r", encoding="utf-8") as file:
-            text = file.read().replace('\n', ' ')
-
-        # Create a black background video using ffmpeg's lavfi input with the specified duration
-        black_video = ffmpeg.input(f"color=c=black:s=1280x720:d={duration}", f="lavfi")
-
-        # Apply a text overlay filter on the black video
-        video_with_text = (
-            black_video.filter(
-                'drawtext',
-                text=text,
-                fontsize=24,
-                fontcolor='white',
-                x='(w-text_w)/2',
-                y='(h-text_h)/2',
-                box=1,
-                boxcolor='black@0.5',
-                enable=f'between(t,0,{duration})'
-            )
-        )
-
-        # Add the audio input from the voiceover file
-        audio = ffmpeg.input(voiceover_file)
-
-        # Combine video and audio into the final output file
-        ffmpeg.output(
-            video_with_text,
-            audio,
-            output_video,
-            vcodec='libx264',
-            acodec='aac'
-        ).run(overwrite_output=True)
-
-        logging.info(f"Video created successfully: {output_video}")
-        return output_video
 
-    except ffmpeg.Error as error:
-        error_message = error.stderr.decode('utf-8') if error.stderr else str(error)
-        logging.error(f"FFmpeg error: {error_message}")
-        raise RuntimeError(f"FFmpeg error: {error_message}") from error
+    # Captions are timed from the voiceover's segment timeline and the whole
+    # video is encoded in a single ffmpeg invocation, unless the render cache
+    # already holds a video for the same inputs.
+    stats = render_script_video(voiceover_file, script_outline_file, output_video, settings,
+                                chunk_seconds=chunk_seconds, workers=workers,
+                                cache=get_render_cache() if use_cache else None)
+    logging.info(f"Video created successfully: {output_video} "
+                 f"({stats['encode_time']:.1f}s, {stats['encoder_fps']:.1f} fps, "
+                 f"cache {stats.get('cache', 'off')})")
+    return output_video
 
 if __name__ == "__main__":
     try:
@@ -4,45 +4,43 @@ Thumbnail Design Agent
 Purpose: Creates YouTube thumbnails from text templates
 Input: Title text, style preferences
 Output: Thumbnail image file
-Dependencies: Pillow (PIL)
+Dependencies: Pillow (PIL), thumbnail_engine
 """
 
-from PIL import Image, ImageDraw, ImageFont
-import os
+from typing import List, Sequence
 
-def generate_thumbnail(title: str, output_path: str = "thumbnail.png") -> str:
+from thumbnail_engine import (DEFAULT_TEMPLATE, ThumbnailTemplate, generate_thumbnails,
+                              save_thumbnail)
+
+def generate_thumbnail(title: str, output_path: str = "thumbnail.png",
+                       template: ThumbnailTemplate = DEFAULT_TEMPLATE) -> str:
     """Generates YouTube thumbnail with specified text.
     
     Args:
         title: Video title text
-        output_path: Output file path
+        output_path: Output file path (.png or .jpg)
+        template: Background, font and layout settings
         
     Returns:
         Path to generated thumbnail
-        
-    Raises:
-        OSError: If font file is missing
     """
-    # Create blank image
-    img = Image.new("RGB", (1280, 720), color=(30, 30, 30))
-    draw = ImageDraw.Draw(img)
+    # The title is wrapped and sized to fit the template's text box; the font
+    # must exist unless Pillow can scale its own default font.
+    return save_thumbnail(title, output_path, template)
+
+def generate_thumbnail_variants(titles: Sequence[str], output_dir: str = "thumbnails",
+                                template: ThumbnailTemplate = DEFAULT_TEMPLATE) -> List[str]:
+    """Renders an A/B set of thumbnails, one per title, across all CPU cores.
     
-    try:
-        font = ImageFont.truetype("fonts/arial-bold.ttf", 60)
-    except IOError:
-        font = ImageFont.load_default()
+    Args:
+        titles: Title variants
+        output_dir: Directory for the rendered files
+        template: Shared background, font and layout settings
         
-    # Center text
-    text_width, text_height = draw.textsize(title, font=font)
-    x = (1280 - text_width) / 2
-    y = (720 - text_height) / 2
-    
-    # Add text
-    draw.text((x, y), title, fill=(255, 255, 255), font=font)
-    
-    # Save output
-    img.save(output_path)
-    return output_path
+    Returns:
+        Paths to the generated thumbnails, in title order
+    """
+    return generate_thumbnails(titles, output_dir, template)
 
 if __name__ == "__main__":
     result = generate_thumbnail("AI Revolution in 2025")
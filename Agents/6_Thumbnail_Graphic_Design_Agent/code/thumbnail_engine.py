@@ -0,0 +1,266 @@
+"""
+Thumbnail Engine
+
+Purpose: Renders thumbnails from reusable templates with cached fonts and
+         pre-rendered background layers, singly or in batches
+Input: Titles, a template, output format and size target
+Output: Encoded PNG/JPEG thumbnail files
+Dependencies: Pillow (PIL)
+"""
+
+import io
+import os
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+# YouTube rejects custom thumbnails larger than 2 MB.
+MAX_THUMBNAIL_BYTES = 2 * 1024 * 1024
+
+Color = Tuple[int, int, int]
+
+# Bundled so the default template renders the same on every machine.
+DEFAULT_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "fonts", "DejaVuSans-Bold.ttf")
+
+
+class ThumbnailTemplate:
+    """Layout, colours and typography shared by a family of thumbnails."""
+
+    def __init__(self, size: Tuple[int, int] = (1280, 720),
+                 background: Color = (30, 30, 30), gradient_to: Optional[Color] = None,
+                 font_path: str = DEFAULT_FONT, max_font_size: int = 110,
+                 min_font_size: int = 32, text_color: Color = (255, 255, 255),
+                 stroke_color: Color = (0, 0, 0), stroke_width: int = 4,
+                 margin: int = 80, line_spacing: float = 1.15):
+        """Initializes the template.
+
+        Args:
+            size: Canvas width and height.
+            background: Background colour (top colour when a gradient is set).
+            gradient_to: Bottom colour of an optional vertical gradient.
+            font_path: TrueType font; defaults to the bundled DejaVu Sans Bold.
+            max_font_size: Largest size tried when fitting the title.
+            min_font_size: Smallest size before the title is truncated.
+            text_color: Title colour.
+            stroke_color: Title outline colour.
+            stroke_width: Title outline width in pixels.
+            margin: Padding between the text box and the canvas edge.
+            line_spacing: Line height as a multiple of the font size.
+        """
+        self.size = tuple(size)
+        self.background = tuple(background)
+        self.gradient_to = tuple(gradient_to) if gradient_to else None
+        self.font_path = font_path
+        self.max_font_size = max_font_size
+        self.min_font_size = min_font_size
+        self.text_color = tuple(text_color)
+        self.stroke_color = tuple(stroke_color)
+        self.stroke_width = stroke_width
+        self.margin = margin
+        self.line_spacing = line_spacing
+
+
+DEFAULT_TEMPLATE = ThumbnailTemplate()
+
+
+@lru_cache(maxsize=256)
+def get_font(path: str, size: int):
+    """Loads a font once per (path, size).
+
+    A missing font falls back to Pillow's scalable default font (Pillow 10.1+).
+
+    Raises:
+        OSError: If the font is missing and this Pillow's default font cannot
+            be sized, since the title could then be neither fitted nor wrapped.
+    """
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError as error:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            raise OSError(f"Thumbnail font not found: {path}") from error
+
+
+@lru_cache(maxsize=32)
+def _base_layer(size: Tuple[int, int], top: Color, bottom: Optional[Color]) -> Image.Image:
+    """Pre-renders a template background; callers must copy it before drawing."""
+    if bottom is None:
+        return Image.new("RGB", size, color=top)
+    # Build a 1-pixel-wide gradient column and stretch it across the canvas.
+    column = Image.new("RGB", (1, size[1]))
+    for y in range(size[1]):
+        t = y / max(1, size[1] - 1)
+        column.putpixel((0, y), tuple(int(a + (b - a) * t) for a, b in zip(top, bottom)))
+    return column.resize(size)
+
+
+def base_layer(template: ThumbnailTemplate) -> Image.Image:
+    """Returns a fresh copy of the template's cached background."""
+    return _base_layer(template.size, template.background, template.gradient_to).copy()
+
+
+def _text_size(draw: ImageDraw.ImageDraw, text: str, font, stroke_width: int):
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+    return right - left, bottom - top
+
+
+def wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_width: int,
+              stroke_width: int = 0) -> List[str]:
+    """Greedily wraps words so every line fits ``max_width`` pixels."""
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if current and _text_size(draw, candidate, font, stroke_width)[0] > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def fit_text(draw: ImageDraw.ImageDraw, text: str, template: ThumbnailTemplate):
+    """Finds the largest font size at which the wrapped title fits the box.
+
+    Returns:
+        Tuple of the font, the wrapped lines and the line height in pixels.
+    """
+    box_w = template.size[0] - 2 * template.margin
+    box_h = template.size[1] - 2 * template.margin
+
+    def layout(size: int):
+        font = get_font(template.font_path, size)
+        lines = wrap_text(draw, text, font, box_w, template.stroke_width)
+        line_height = int(size * template.line_spacing)
+        fits = (len(lines) * line_height <= box_h and
+                all(_text_size(draw, line, font, template.stroke_width)[0] <= box_w
+                    for line in lines))
+        return fits, font, lines, line_height
+
+    low, high = template.min_font_size, template.max_font_size
+    best = layout(low)
+    while low <= high:
+        mid = (low + high) // 2
+        result = layout(mid)
+        if result[0]:
+            best = result
+            low = mid + 1
+        else:
+            high = mid - 1
+    _, font, lines, line_height = best
+    max_lines = max(1, (template.size[1] - 2 * template.margin) // line_height)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1].rstrip(".,;:") + "..."
+    return font, lines, line_height
+
+
+def render_thumbnail(title: str, template: ThumbnailTemplate = DEFAULT_TEMPLATE) -> Image.Image:
+    """Draws the title centred on the template background."""
+    img = base_layer(template)
+    draw = ImageDraw.Draw(img)
+    font, lines, line_height = fit_text(draw, title, template)
+    y = (template.size[1] - line_height * len(lines)) / 2
+    for line in lines:
+        width, _ = _text_size(draw, line, font, template.stroke_width)
+        draw.text(((template.size[0] - width) / 2, y), line, fill=template.text_color,
+                  font=font, stroke_width=template.stroke_width,
+                  stroke_fill=template.stroke_color)
+        y += line_height
+    return img
+
+
+def encode_image(img: Image.Image, fmt: str = "JPEG", quality: int = 90,
+                 max_bytes: Optional[int] = MAX_THUMBNAIL_BYTES) -> bytes:
+    """Encodes a thumbnail, lowering JPEG quality until it fits ``max_bytes``.
+
+    PNGs use a fast compression level and fall back to a 256-colour palette
+    when the full-colour image is over the size target.
+    """
+    fmt = "JPEG" if fmt.upper() in ("JPG", "JPEG") else fmt.upper()
+
+    def encode(image, **options) -> bytes:
+        buffer = io.BytesIO()
+        image.save(buffer, format=fmt, **options)
+        return buffer.getvalue()
+
+    if fmt == "JPEG":
+        while True:
+            data = encode(img, quality=quality, optimize=True, progressive=True)
+            if max_bytes is None or len(data) <= max_bytes or quality <= 40:
+                return data
+            quality -= 10
+    data = encode(img, compress_level=6)
+    if max_bytes is not None and len(data) > max_bytes:
+        data = encode(img.quantize(colors=256), compress_level=9)
+    return data
+
+
+def save_thumbnail(title: str, output_path: str,
+                   template: ThumbnailTemplate = DEFAULT_TEMPLATE, quality: int = 90,
+                   max_bytes: Optional[int] = MAX_THUMBNAIL_BYTES) -> str:
+    """Renders and writes one thumbnail; the format follows the file extension."""
+    fmt = os.path.splitext(output_path)[1].lstrip(".") or "png"
+    data = encode_image(render_thumbnail(title, template), fmt, quality, max_bytes)
+    # Temp file plus rename: readers never see a partial image.
+    tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+
+def _warm(template: ThumbnailTemplate) -> None:
+    """Pre-renders the template background once per pool worker."""
+    base_layer(template)
+    get_font(template.font_path, template.max_font_size)
+
+
+def _render_job(job) -> str:
+    title, output_path, template, quality, max_bytes = job
+    return save_thumbnail(title, output_path, template, quality, max_bytes)
+
+
+def generate_thumbnails(titles: Sequence[str], output_dir: str,
+                        template: ThumbnailTemplate = DEFAULT_TEMPLATE, fmt: str = "jpg",
+                        quality: int = 90, max_bytes: Optional[int] = MAX_THUMBNAIL_BYTES,
+                        workers: Optional[int] = None) -> List[str]:
+    """Renders one thumbnail per title across a process pool.
+
+    Args:
+        titles: Title variants, e.g. an A/B test set.
+        output_dir: Directory for the numbered output files.
+        template: Shared template; its fonts and background are cached per worker.
+        fmt: ``jpg`` or ``png``.
+        quality: Starting JPEG quality.
+        max_bytes: File size target.
+        workers: Pool size; defaults to the CPU count.
+
+    Returns:
+        List[str]: Output paths in the same order as ``titles``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for index, title in enumerate(titles, start=1):
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_").lower()[:40] or "title"
+        path = os.path.join(output_dir, f"{index:04d}_{slug}.{fmt}")
+        jobs.append((title, path, template, quality, max_bytes))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return [_render_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm,
+                             initargs=(template,)) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
@@ -1,25 +1,76 @@
 #!/usr/bin/env python3
 import os
 import json
+import sys
+
+from seo_engine import DEFAULT_INDEX, KeywordIndex, SEOEngine
+
+# Make the shared utils package importable when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from utils.file_io import write_json
+
+AGENTS_DIR = os.path.join(os.path.expanduser("~"), "Documents/youtube/Agents")
+OUTPUT_FILE = os.path.join(AGENTS_DIR, "7_SEO_Metadata_Optimization_Agent/code/metadata.json")
+OUTLINE_FILE = os.path.join(AGENTS_DIR, "2_Scriptwriting_Outline_Agent/code/script_outline.txt")
+RANKING_FILE = os.path.join(AGENTS_DIR,
+                            "1_Content_Research_Agent/code/trends_snapshot/ranking.json")
+PUBLISHED_FILE = os.path.join(AGENTS_DIR, "1_Content_Research_Agent/code/published_topics.txt")
+
+def _read_outline(outline_file):
+    if outline_file and os.path.exists(outline_file):
+        with open(outline_file, "r", encoding="utf-8") as f:
+            return f.read()
+    return ""
+
+def open_engine(index_path=DEFAULT_INDEX, ranking_file=RANKING_FILE,
+                published_file=PUBLISHED_FILE):
+    # Bring the keyword index up to date: titles published since the last run
+    # and the trend scores of the latest research ranking.
+    engine = SEOEngine(KeywordIndex(index_path))
+    engine.index.sync_published(published_file)
+    if ranking_file and os.path.exists(ranking_file):
+        with open(ranking_file, "r", encoding="utf-8") as f:
+            ranking = json.load(f)
+        engine.index_trends({entry["topic"]: entry["score"] for entry in ranking["topics"]})
+    return engine
+
+def optimize_metadata(topic=None, output_file=OUTPUT_FILE, outline_file=OUTLINE_FILE,
+                      ranking_file=RANKING_FILE, published_file=PUBLISHED_FILE,
+                      index_path=DEFAULT_INDEX):
+    outline = _read_outline(outline_file)
+    if not (topic or outline):
+        print("Script outline not found. Please run the Scriptwriting Agent first.")
+        return None
+
+    engine = open_engine(index_path, ranking_file, published_file)
+    try:
+        metadata = engine.generate(outline, topic)
+    finally:
+        engine.index.close()
+
+    write_json(output_file, metadata)
 
-def optimize_metadata():
-    # For simplicity, generate metadata based on a fixed template.
-    metadata = {
-        "title": "Breaking News on Asap Rocky",
-        "description": "This video discusses trending news about Asap Rocky with background, analysis, and conclusion.",
-        "tags": ["Asap Rocky", "Breaking News", "Analysis", "Trending"]
-    }
-    
-    output_file = os.path.join(
-        os.path.expanduser("~"),
-        "Documents/youtube/Agents/7_SEO_Metadata_Optimization_Agent/code/metadata.json"
-    )
-    
-    with open(output_file, "w") as f:
-        json.dump(metadata, f, indent=4)
-    
     print("SEO metadata generated and saved to", output_file)
+    return output_file
+
+def optimize_metadata_batch(items, output_dir, ranking_file=RANKING_FILE,
+                            published_file=PUBLISHED_FILE, index_path=DEFAULT_INDEX):
+    # items: [{"outline_file": ..., "topic": ...}]; one keyword lookup serves the batch.
+    engine = open_engine(index_path, ranking_file, published_file)
+    try:
+        results = engine.generate_batch([{"outline": _read_outline(item.get("outline_file")),
+                                          "topic": item.get("topic")} for item in items])
+    finally:
+        engine.index.close()
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_files = []
+    for index, metadata in enumerate(results):
+        output_file = os.path.join(output_dir, f"metadata_{index:03d}.json")
+        write_json(output_file, metadata)
+        output_files.append(output_file)
+    print(f"SEO metadata for {len(output_files)} videos saved to", output_dir)
+    return output_files
 
 if __name__ == '__main__':
     optimize_metadata()
-
@@ -0,0 +1,410 @@
+"""
+SEO Engine
+
+Purpose: Builds titles, descriptions and tags from a script outline by scoring
+         its candidate keywords against an inverted index of past videos and
+         trends history, for one video or a batch
+Input: Script outlines and topics; published titles, video metadata and
+       trend scores to index
+Output: Metadata dictionaries (title, description, tags, keywords)
+Dependencies: sqlite3
+"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_INDEX = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/7_SEO_Metadata_Optimization_Agent/code/seo_index.db"
+)
+
+MAX_TITLE_CHARS = 100
+MAX_DESCRIPTION_BYTES = 5000
+MAX_TAGS_CHARS = 500
+MAX_TAGS = 15
+# SQLite's default limit on bound parameters per statement is 999.
+_QUERY_CHUNK = 900
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'+#-]*")
+_STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does
+for from had has have how if in into is it its just may more most new not now of
+on or our out over so some such than that the their them then there these they
+this those to up us was we were what when which while who why will with would you
+your video breaking news briefly provide discuss summarize invite viewers comment
+key points various viewpoints implications context introduce introduction trending
+topic background analysis conclusion
+""".split())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    weight REAL NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL DEFAULT 0,
+    trend REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words with stopwords and bare numbers removed."""
+    return [t.strip("'-") for t in _TOKEN.findall(text.lower())
+            if t not in _STOPWORDS and not t.isdigit() and len(t.strip("'-")) > 1]
+
+
+def extract_terms(text: str) -> Counter:
+    """Counts unigrams and adjacent-word bigrams (the candidate keywords).
+
+    Bigrams never span a sentence or line break.
+    """
+    counts: Counter = Counter()
+    for clause in re.split(r"[\n.!?:;,()\[\]]+", text):
+        words = tokenize(clause)
+        counts.update(words)
+        counts.update(f"{a} {b}" for a, b in zip(words, words[1:]) if a != b)
+    return counts
+
+
+def tags_length(tags: Sequence[str]) -> int:
+    """Counts a tag list the way YouTube does (quoted multi-word tags, commas)."""
+    return sum(len(tag) + (2 if " " in tag else 0) for tag in tags) + max(len(tags) - 1, 0)
+
+
+def parse_outline(text: str) -> Tuple[Optional[str], List[str]]:
+    """Returns the outline's topic and its section texts.
+
+    The topic comes from the ``Video Title: Breaking News on <topic>`` line
+    written by the scriptwriting stage.
+    """
+    topic, sections = None, []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.lower().startswith("video title:"):
+            title = line.split(":", 1)[1].strip()
+            topic = re.sub(r"^breaking news on\s+", "", title, flags=re.IGNORECASE) or None
+        elif re.match(r"^\d+\.\s", line):
+            sections.append(line.split(".", 1)[1].replace("[PAUSE]", "").strip())
+    return topic, sections
+
+
+def section_text(section: str) -> str:
+    """Drops a leading ``Label:`` (Introduction:, Background: ...) from a section."""
+    return re.sub(r"^[A-Za-z ]{1,24}:\s*", "", section)
+
+
+class KeywordIndex:
+    """Inverted index of past videos and trends in SQLite, updated in place.
+
+    ``terms.df`` counts the video documents containing a term and
+    ``terms.trend`` sums the weights of trend documents containing it; both
+    are adjusted whenever a document is added, replaced or removed, so
+    scoring a keyword is a single row lookup.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX):
+        """Opens (and creates) the index.
+
+        Args:
+            db_path (str): SQLite database file.
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def _remove(self, doc_id: str) -> None:
+        row = self._conn.execute("SELECT kind, weight FROM docs WHERE id=?", (doc_id,)).fetchone()
+        if row is None:
+            return
+        kind, weight = row
+        terms = [term for (term,) in self._conn.execute(
+            "SELECT term FROM postings WHERE doc_id=?", (doc_id,))]
+        column, delta = ("trend", weight) if kind == "trend" else ("df", 1)
+        self._conn.executemany(f"UPDATE terms SET {column} = {column} - ? WHERE term=?",
+                               [(delta, term) for term in terms])
+        self._conn.execute("DELETE FROM postings WHERE doc_id=?", (doc_id,))
+        self._conn.execute("DELETE FROM docs WHERE id=?", (doc_id,))
+
+    def add_documents(self, documents: Iterable[Tuple[str, str, str, float]]) -> int:
+        """Adds or replaces documents in one transaction.
+
+        Args:
+            documents: (doc id, kind, text, weight) tuples. ``kind`` is
+                ``video`` or ``script`` for past content (counted in document
+                frequency) or ``trend`` for a researched topic whose weight is
+                its trend score.
+
+        Returns:
+            int: Number of documents written.
+        """
+        count = 0
+        with self._lock, self._conn:
+            for doc_id, kind, text, weight in documents:
+                self._remove(doc_id)
+                terms = extract_terms(text)
+                self._conn.execute("INSERT INTO docs (id, kind, weight, updated_at) "
+                                   "VALUES (?, ?, ?, ?)", (doc_id, kind, weight, time.time()))
+                self._conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                                       [(term, doc_id, tf) for term, tf in terms.items()])
+                column, delta = ("trend", weight) if kind == "trend" else ("df", 1)
+                self._conn.executemany(
+                    f"INSERT INTO terms (term, {column}) VALUES (?, ?) "
+                    f"ON CONFLICT (term) DO UPDATE SET {column} = {column} + excluded.{column}",
+                    [(term, delta) for term in terms])
+                count += 1
+        return count
+
+    def remove(self, doc_id: str) -> None:
+        """Removes a document and its contribution to the term statistics."""
+        with self._lock, self._conn:
+            self._remove(doc_id)
+
+    def sync_published(self, published_file: str) -> int:
+        """Indexes titles appended to the published-topics file since last time.
+
+        The file is append-only, so only the bytes past the stored offset are
+        read.
+
+        Returns:
+            int: Number of newly indexed titles.
+        """
+        if not os.path.exists(published_file):
+            return 0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key='published_offset'").fetchone()
+        offset = row[0] if row and row[0] <= os.path.getsize(published_file) else 0
+        with open(published_file, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        # Leave a partially written last line for the next sync.
+        data = data[:data.rfind(b"\n") + 1]
+        titles = [line.strip() for line in data.decode("utf-8").splitlines() if line.strip()]
+        self.add_documents((f"published:{hashlib.sha1(t.encode('utf-8')).hexdigest()}",
+                            "video", t, 1.0) for t in titles)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO state (key, value) "
+                               "VALUES ('published_offset', ?)", (offset + len(data),))
+        return len(titles)
+
+    def related(self, words: Iterable[str], limit: int = 30) -> List[str]:
+        """Returns terms that share trend or video documents with ``words``.
+
+        Terms are ordered by the summed weight of the shared documents, so
+        words from strongly trending topics come first.
+        """
+        words = list(dict.fromkeys(words))
+        if not words:
+            return []
+        marks = ",".join("?" * len(words))
+        sql = ("SELECT other.term, SUM(docs.weight) AS strength FROM postings AS seed "
+               "JOIN docs ON docs.id = seed.doc_id AND docs.kind != 'script' "
+               "JOIN postings AS other ON other.doc_id = seed.doc_id "
+               f"WHERE seed.term IN ({marks}) GROUP BY other.term "
+               "ORDER BY strength DESC, other.term LIMIT ?")
+        with self._lock:
+            return [term for term, _ in self._conn.execute(sql, words + [limit])]
+
+    def document_count(self) -> int:
+        """Returns the number of past-content documents (videos and scripts)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM docs WHERE kind != 'trend'").fetchone()[0]
+
+    def lookup(self, terms: Iterable[str]) -> Dict[str, Tuple[int, float]]:
+        """Returns (document frequency, trend weight) for the known terms."""
+        terms = list(dict.fromkeys(terms))
+        found: Dict[str, Tuple[int, float]] = {}
+        with self._lock:
+            for start in range(0, len(terms), _QUERY_CHUNK):
+                chunk = terms[start:start + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for term, df, trend in self._conn.execute(
+                        f"SELECT term, df, trend FROM terms WHERE term IN ({marks})", chunk):
+                    found[term] = (df, trend)
+        return found
+
+
+def score_keywords(terms: Counter, stats: Dict[str, Tuple[int, float]], documents: int,
+                   max_trend: float) -> List[Tuple[str, float]]:
+    """Ranks candidate keywords by TF-IDF against past videos, boosted by trends.
+
+    Terms every past video shares (template words) get a low IDF; terms that
+    appear in trending topics get up to double weight.
+
+    Returns:
+        List[Tuple[str, float]]: (keyword, score), best first.
+    """
+    scored = []
+    for term, tf in terms.items():
+        df, trend = stats.get(term, (0, 0.0))
+        idf = math.log((documents + 1) / (df + 1)) + 1
+        boost = 1 + (trend / max_trend if max_trend > 0 else 0.0)
+        # Bigrams are more specific than single words.
+        phrase = 1.5 if " " in term else 1.0
+        scored.append((term, (1 + math.log(tf)) * idf * boost * phrase))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored
+
+
+def _fit(text: str, limit: int) -> str:
+    """Cuts text at a word boundary to at most ``limit`` characters."""
+    if len(text) <= limit:
+        return text
+    return text[:limit + 1].rsplit(" ", 1)[0].rstrip(" ,:-")
+
+
+def build_metadata(topic: str, sections: Sequence[str],
+                   keywords: Sequence[Tuple[str, float]]) -> Dict[str, Any]:
+    """Composes title, description and tags within YouTube's limits."""
+    topic_words = set(tokenize(topic))
+    # Prefer keywords that add something beyond the topic itself, and skip
+    # terms whose new words an earlier, better keyword already covers.
+    chosen: List[str] = []
+    covered: set = set()
+    for term, _ in keywords:
+        novel = set(term.split()) - topic_words
+        if not novel or novel <= covered:
+            continue
+        chosen.append(term)
+        covered |= novel
+        if len(chosen) == MAX_TAGS:
+            break
+
+    # Keep acronyms the way the topic or script wrote them (AI, NASA).
+    acronyms = {word.lower() for word in re.findall(r"\b[A-Z0-9]{2,}\b",
+                                                     " ".join([topic, *sections]))}
+
+    def display(term):
+        return " ".join(word.upper() if word in acronyms else word.capitalize()
+                        for word in term.split())
+
+    # The title highlights two keywords that do not repeat each other's words.
+    highlights: List[str] = []
+    for term in chosen:
+        if not any(set(term.split()) & set(h.lower().split()) for h in highlights):
+            highlights.append(display(term))
+        if len(highlights) == 2:
+            break
+    title = f"{topic}: {' & '.join(highlights)}" if highlights else f"Breaking News on {topic}"
+    title = _fit(title, MAX_TITLE_CHARS)
+
+    lines = [f"This video discusses {topic}"
+             + (f": {', '.join(display(t) for t in chosen[:3])}." if chosen else ".")]
+    lines += [f"- {section}" for section in sections]
+    topic_tag = "".join(word[:1].upper() + word[1:] for word in topic.split())
+    hashtags = [f"#{re.sub(r'[^A-Za-z0-9]', '', tag)}"
+                for tag in [topic_tag] + [display(t) for t in chosen[:2]]]
+    lines += ["", " ".join(tag for tag in hashtags if len(tag) > 1)]
+    description = "\n".join(lines)
+    while len(description.encode("utf-8")) > MAX_DESCRIPTION_BYTES:
+        description = description[:-100]
+
+    tags = [topic]
+    for term in chosen:
+        if tags_length(tags + [term]) > MAX_TAGS_CHARS:
+            break
+        tags.append(term)
+    return {"topic": topic, "title": title, "description": description, "tags": tags,
+            "keywords": [term for term, _ in keywords[:MAX_TAGS]]}
+
+
+class SEOEngine:
+    """Generates metadata for one or many videos from a shared keyword index."""
+
+    def __init__(self, index: Optional[KeywordIndex] = None):
+        """Initializes the engine.
+
+        Args:
+            index (Optional[KeywordIndex]): Keyword index; the default
+                location is opened when omitted.
+        """
+        self.index = index or KeywordIndex()
+
+    def index_trends(self, scores: Dict[str, float]) -> int:
+        """Indexes researched topics, weighted by their trend score."""
+        return self.index.add_documents((f"trend:{topic}", "trend", topic, max(score, 0.0))
+                                        for topic, score in scores.items())
+
+    def index_video(self, video_id: str, metadata: Dict[str, Any]) -> int:
+        """Indexes a published video's title, description and tags."""
+        text = "\n".join([metadata.get("title", ""), metadata.get("description", "")]
+                         + list(metadata.get("tags", [])))
+        return self.index.add_documents([(f"video:{video_id}", "video", text, 1.0)])
+
+    def generate_batch(self, items: Sequence[Dict[str, Any]],
+                       learn: bool = True) -> List[Dict[str, Any]]:
+        """Generates metadata for many videos with one index lookup.
+
+        Args:
+            items: Dicts with ``outline`` (script text) and optionally
+                ``topic`` (otherwise read from the outline's title line).
+            learn (bool): Add each outline to the index afterwards, so later
+                videos see its words as already used.
+
+        Returns:
+            List[Dict[str, Any]]: Metadata per item, in order.
+        """
+        parsed = []
+        for item in items:
+            outline_topic, sections = parse_outline(item.get("outline", ""))
+            topic = item.get("topic") or outline_topic
+            if not topic:
+                raise ValueError("No topic given and none found in the outline")
+            # The topic and section text are the candidate keyword source; the
+            # topic counts triple so its words stay on top. Terms that co-occur
+            # with the topic in trends or past videos join as single mentions.
+            text = "\n".join([topic] * 3 + [section_text(s) for s in sections])
+            terms = extract_terms(text)
+            for term in self.index.related(tokenize(topic)):
+                terms.setdefault(term, 1)
+            parsed.append((topic, sections, terms))
+
+        # One statistics lookup serves every candidate keyword of the batch.
+        stats = self.index.lookup(term for _, _, terms in parsed for term in terms)
+        documents = self.index.document_count()
+        max_trend = max((trend for _, trend in stats.values()), default=0.0)
+        results = [build_metadata(topic, sections,
+                                  score_keywords(terms, stats, documents, max_trend))
+                   for topic, sections, terms in parsed]
+        if learn:
+            self.index.add_documents(
+                (f"script:{hashlib.sha1(topic.encode('utf-8')).hexdigest()}", "script",
+                 "\n".join([topic] + [section_text(s) for s in sections]), 1.0)
+                for topic, sections, _ in parsed)
+        return results
+
+    def generate(self, outline: str, topic: Optional[str] = None,
+                 learn: bool = True) -> Dict[str, Any]:
+        """Generates metadata for a single video."""
+        return self.generate_batch([{"outline": outline, "topic": topic}], learn=learn)[0]
@@ -3,36 +3,71 @@ Social Media Promotion Agent
 
 Purpose: Manages social media post creation and scheduling
 Input: Video metadata, platform credentials
-Output: Scheduled social media posts
-Dependencies: datetime, os
+Output: Posts queued in the social post queue; ``social_queue.py run``
+        dispatches them when due
+Dependencies: datetime, social_queue
 """
 
-import os
+import time
 from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence
 
-def schedule_post(content: str, platform: str) -> str:
+from social_queue import DEFAULT_DB, PostQueue, render
+
+DEFAULT_DELAY = timedelta(hours=24)
+
+def schedule_post(content: str, platform: str, queue_db: str = DEFAULT_DB) -> str:
     """Schedules social media posts for video promotion.
-    
+
     Args:
         content: Post text content
         platform: Target platform (YouTube/Instagram)
-        
+        queue_db: Social post queue database
+
     Returns:
         Confirmation message with scheduled time
     """
-    post_time = (datetime.now() + timedelta(hours=24)).strftime("%Y-%m-%d %H:%M")
-    
+    post_time = datetime.now() + DEFAULT_DELAY
+
     # Platform-specific formatting
-    if platform.lower() == "youtube":
-        formatted_content = f"🎥 New Video!\n{content}"
-    else:
-        formatted_content = f"📱 {content}"
-        
-    # Save to file with encoding
-    filename = f"scheduled_posts/{platform}_post_{post_time.replace(' ', '_')}.txt"
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(formatted_content)
-        
-    return f"Post scheduled for {post_time} on {platform}"
+    formatted_content = render(platform, content)
+
+    # Queue the post; the dispatcher sends it when due
+    queue = PostQueue(queue_db)
+    try:
+        queue.enqueue(platform, formatted_content, post_time.timestamp())
+    finally:
+        queue.close()
+
+    return f"Post scheduled for {post_time:%Y-%m-%d %H:%M} on {platform}"
+
+def promote_video(content: str, platforms: Sequence[str], video: Optional[str] = None,
+                  url: str = "", tags: Iterable[str] = (), delay_hours: float = 24,
+                  stagger_minutes: float = 15, queue_db: str = DEFAULT_DB) -> str:
+    """Fans one video out to many platforms with platform-specific templates.
+
+    Args:
+        content: Post text content
+        platforms: Target platforms
+        video: Video id; promoting the same video again adds no duplicate posts
+        url: Video link for templates that include one
+        tags: Tags rendered as hashtags
+        delay_hours: Hours until the first post
+        stagger_minutes: Minutes between consecutive platforms
+        queue_db: Social post queue database
+
+    Returns:
+        Confirmation message with the first scheduled time
+    """
+    first = time.time() + delay_hours * 3600
+    queue = PostQueue(queue_db)
+    try:
+        ids = queue.fan_out(content, platforms, first, batch=video,
+                            stagger=stagger_minutes * 60, url=url, tags=list(tags))
+    finally:
+        queue.close()
+    queued = [platform for platform, post_id in ids.items() if post_id is not None]
+    if not queued:
+        return f"Posts for {video} are already scheduled"
+    return (f"{len(queued)} post(s) scheduled from "
+            f"{datetime.fromtimestamp(first):%Y-%m-%d %H:%M} on {', '.join(queued)}")
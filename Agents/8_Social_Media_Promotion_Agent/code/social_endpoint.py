@@ -0,0 +1,128 @@
+"""
+Social Endpoint
+
+Purpose: HTTP transport for the social post dispatcher and a local stand-in
+         for the platforms' posting APIs
+Input: Queued posts
+Output: Posts delivered as ``POST {endpoint}/{platform}/posts`` JSON requests;
+        the stand-in records what it receives
+Dependencies: urllib, http.server (local stand-in endpoint)
+"""
+
+import http.server
+import json
+import logging
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class PostError(RuntimeError):
+    """Raised when a platform rejects or cannot take a post."""
+
+
+class HttpPoster:
+    """Delivers posts to a posting API; usable as a dispatcher ``send``."""
+
+    def __init__(self, endpoint: str, timeout: float = 30.0,
+                 headers: Optional[Dict[str, str]] = None):
+        """Initializes the poster.
+
+        Args:
+            endpoint (str): API base URL; posts go to ``{endpoint}/{platform}/posts``.
+            timeout (float): Socket timeout per request.
+            headers (Optional[Dict[str, str]]): Extra headers, e.g. auth.
+        """
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def __call__(self, post) -> str:
+        """Sends one post and returns the platform's id for it.
+
+        Raises:
+            PostError: On an HTTP error or a response without an id.
+        """
+        body = json.dumps({"content": post.content, "scheduled_at": post.due_at,
+                           "client_id": post.id}).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.endpoint}/{post.platform.lower()}/posts", data=body, method="POST",
+            headers=dict(self.headers, **{"Content-Type": "application/json"}))
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                reply = json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as error:
+            raise PostError(f"{post.platform} answered HTTP {error.code}") from error
+        except urllib.error.URLError as error:
+            raise PostError(f"{post.platform} unreachable: {error.reason}") from error
+        if not reply.get("id"):
+            raise PostError(f"{post.platform} returned no post id")
+        return reply["id"]
+
+
+class _PostHandler(http.server.BaseHTTPRequestHandler):
+    """Posting API stand-in; received posts live on the server object."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug("social endpoint: " + format, *args)
+
+    def _reply(self, status: int, payload: Optional[Dict[str, Any]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        server = self.server
+        parts = self.path.strip("/").split("/")
+        length = int(self.headers.get("Content-Length", 0))
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if len(parts) != 2 or parts[1] != "posts" or not data.get("content"):
+            self._reply(400, {"error": "expected POST /{platform}/posts with content"})
+            return
+        with server.lock:
+            server.requests += 1
+            fail = server.requests in server.fail_requests
+            if not fail:
+                post_id = uuid.uuid4().hex[:12]
+                server.posts.append({"id": post_id, "platform": parts[0], **data})
+        if fail:
+            self._reply(503, {"error": "unavailable"})
+            return
+        self._reply(201, {"id": post_id})
+
+
+class LocalSocialEndpoint(http.server.ThreadingHTTPServer):
+    """Local posting API for offline runs and tests.
+
+    ``fail_requests`` answers those request numbers (1-based, counted across
+    all platforms) with ``503`` to exercise retries.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fail_requests: Sequence[int] = ()):
+        super().__init__(("127.0.0.1", 0), _PostHandler)
+        self.fail_requests = set(fail_requests)
+        self.posts: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "LocalSocialEndpoint":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,480 @@
+"""
+Social Queue
+
+Purpose: Keeps scheduled social media posts in one indexed SQLite queue and
+         dispatches due posts in time order under per-platform rate limits
+Input: Post text per platform, or one video fanned out to many platforms
+       through platform templates
+Output: Queued posts with their delivery state; a dispatcher that sends due
+        posts through any ``send(post)`` callable
+Dependencies: sqlite3, utils.rate_limit
+
+    python social_queue.py status
+    python social_queue.py run [--endpoint URL]   # dispatch due posts
+"""
+
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Make the shared utils package importable when this agent runs as a script.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from utils.logger import setup_logger  # pylint: disable=wrong-import-position
+from utils.rate_limit import RateLimiter  # pylint: disable=wrong-import-position
+
+DEFAULT_DB = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/8_Social_Media_Promotion_Agent/code/social_queue.db"
+)
+
+# Post text per platform; unknown platforms use DEFAULT_TEMPLATE. Fields:
+# content, title, url and hashtags (built from the tags).
+TEMPLATES = {
+    "youtube": "🎥 New Video!\n{content}",
+    "twitter": "{content} {url} {hashtags}",
+    "x": "{content} {url} {hashtags}",
+    "instagram": "📱 {content}\n\n{hashtags}",
+    "facebook": "{content}\n{url}",
+    "linkedin": "{content}\n\n{url}\n{hashtags}",
+}
+DEFAULT_TEMPLATE = "📱 {content}"
+MAX_LENGTH = {"twitter": 280, "x": 280, "instagram": 2200, "linkedin": 3000}
+
+# (posts per second, burst) per platform.
+DEFAULT_LIMITS = {
+    "youtube": (1 / 60, 3),
+    "twitter": (1 / 36, 10),
+    "x": (1 / 36, 10),
+    "instagram": (25 / 86400, 5),
+    "facebook": (1 / 60, 5),
+    "linkedin": (1 / 300, 2),
+}
+DEFAULT_LIMIT = (1 / 60, 3)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    content TEXT NOT NULL,
+    due_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    batch TEXT,
+    remote_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    UNIQUE (batch, platform)
+);
+CREATE INDEX IF NOT EXISTS posts_due ON posts (status, due_at, id);
+"""
+
+_COLUMNS = "id, platform, content, due_at, status, attempts, batch, remote_id, error"
+
+
+class Post(NamedTuple):
+    """One queued post."""
+
+    id: int
+    platform: str
+    content: str
+    due_at: float
+    status: str
+    attempts: int
+    batch: Optional[str]
+    remote_id: Optional[str]
+    error: Optional[str]
+
+
+class _Fields(dict):
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def hashtags(tags: Iterable[str]) -> str:
+    """Turns tags into ``#CamelCase`` hashtags, dropping case-insensitive duplicates."""
+    seen: Dict[str, str] = {}
+    for tag in tags:
+        words = re.findall(r"\w+", str(tag))
+        tag = "#" + "".join(word[:1].upper() + word[1:] for word in words)
+        if len(tag) > 1:
+            seen.setdefault(tag.lower(), tag)
+    return " ".join(seen.values())
+
+
+def render(platform: str, content: str, **fields: Any) -> str:
+    """Formats a post for a platform and keeps it within its length limit.
+
+    Only ``content`` is shortened; the template's other parts (links,
+    hashtags) are kept whole.
+
+    Args:
+        platform (str): Platform name, case-insensitive.
+        content (str): Post text.
+        **fields: Optional ``title``, ``url`` and ``tags`` (a list).
+
+    Returns:
+        str: The post text.
+    """
+    key = platform.lower()
+    content = content.strip()
+    template = TEMPLATES.get(key, DEFAULT_TEMPLATE)
+    values = _Fields(fields, hashtags=hashtags(fields.pop("tags", None) or ()))
+
+    def fill(text: str) -> str:
+        values["content"] = text
+        text = template.format_map(values)
+        lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.split("\n")]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+    post = fill(content)
+    limit = MAX_LENGTH.get(key)
+    if limit and len(post) > limit:
+        room = max(0, len(content) - (len(post) - limit) - 1)
+        post = fill(content[:room].rstrip() + "…")
+    return post
+
+
+class PostQueue:
+    """SQLite queue of scheduled posts, indexed by status and due time.
+
+    Delivery is at least once: a post is claimed (``sending``) before it is
+    sent, and posts left claimed by a crashed dispatcher are returned to the
+    queue by ``recover``.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        """Opens (and creates) the queue.
+
+        Args:
+            db_path (str): SQLite database path.
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def enqueue(self, platform: str, content: str, due_at: float,
+                batch: Optional[str] = None) -> Optional[int]:
+        """Queues one post.
+
+        Args:
+            platform (str): Target platform.
+            content (str): Final post text.
+            due_at (float): When to post, Unix seconds.
+            batch (Optional[str]): Campaign key; a platform gets at most one
+                post per batch.
+
+        Returns:
+            Optional[int]: The post id, or None if the batch already has a
+            post for this platform.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO posts (platform, content, due_at, batch, created_at) "
+                "VALUES (?, ?, ?, ?, ?)", (platform, content, due_at, batch, time.time()))
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def fan_out(self, content: str, platforms: Sequence[str], due_at: float,
+                batch: Optional[str] = None, stagger: float = 0.0,
+                **fields: Any) -> Dict[str, Optional[int]]:
+        """Queues one promotion on many platforms in a single transaction.
+
+        Args:
+            content (str): Post text, rendered through each platform's template.
+            platforms (Sequence[str]): Target platforms.
+            due_at (float): Time of the first post, Unix seconds.
+            batch (Optional[str]): Campaign key, e.g. the video id; fanning
+                the same batch out again does not duplicate posts.
+            stagger (float): Seconds between consecutive platforms.
+            **fields: Template fields (``title``, ``url``, ``tags``).
+
+        Returns:
+            Dict[str, Optional[int]]: Post id per platform; None where the
+            batch already had one.
+        """
+        now = time.time()
+        ids = {}
+        with self._lock, self._conn:
+            for index, platform in enumerate(platforms):
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO posts (platform, content, due_at, batch, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (platform, render(platform, content, **fields),
+                     due_at + index * stagger, batch, now))
+                ids[platform] = cursor.lastrowid if cursor.rowcount else None
+        return ids
+
+    def get(self, post_id: int) -> Optional[Post]:
+        """Returns a post by id, or None."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM posts WHERE id = ?",
+                                     (post_id,)).fetchone()
+        return Post(*row) if row else None
+
+    def due(self, now: float, limit: int = 100, after: Optional[Tuple[float, int]] = None,
+            exclude: Iterable[str] = ()) -> List[Post]:
+        """Returns pending posts due by ``now``, oldest first.
+
+        Args:
+            now (float): Current time, Unix seconds.
+            limit (int): Maximum number of posts.
+            after (Optional[Tuple[float, int]]): Resume after this
+                (due_at, id) position, for paging.
+            exclude (Iterable[str]): Platforms to skip.
+        """
+        sql = f"SELECT {_COLUMNS} FROM posts WHERE status = ? AND due_at <= ?"
+        params: List[Any] = [PENDING, now]
+        if after is not None:
+            sql += " AND (due_at, id) > (?, ?)"
+            params.extend(after)
+        excluded = list(exclude)
+        if excluded:
+            sql += f" AND platform NOT IN ({', '.join('?' * len(excluded))})"
+            params.extend(excluded)
+        sql += " ORDER BY due_at, id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [Post(*row) for row in self._conn.execute(sql, params)]
+
+    def next_due(self) -> Optional[float]:
+        """Returns the due time of the earliest pending post, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(due_at) FROM posts WHERE status = ?",
+                                     (PENDING,)).fetchone()
+        return row[0]
+
+    def claim(self, post_id: int) -> bool:
+        """Marks a pending post as being sent; False if another dispatcher has it."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE posts SET status = ?, attempts = attempts + 1 "
+                "WHERE id = ? AND status = ?", (SENDING, post_id, PENDING)).rowcount > 0
+
+    def mark_sent(self, post_id: int, remote_id: Optional[str] = None) -> None:
+        """Records a delivered post."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE posts SET status = ?, remote_id = ?, error = NULL, sent_at = ? "
+                "WHERE id = ?", (SENT, remote_id, time.time(), post_id))
+
+    def mark_failed(self, post_id: int, error: str, retry_at: Optional[float] = None) -> None:
+        """Records a failed delivery; the post is retried at ``retry_at`` if given."""
+        status = PENDING if retry_at is not None else FAILED
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE posts SET status = ?, error = ?, due_at = COALESCE(?, due_at) "
+                "WHERE id = ?", (status, error, retry_at, post_id))
+
+    def recover(self) -> int:
+        """Returns posts left claimed by an interrupted dispatcher to the queue."""
+        with self._lock, self._conn:
+            return self._conn.execute("UPDATE posts SET status = ? WHERE status = ?",
+                                      (PENDING, SENDING)).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of posts per status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM posts GROUP BY status"))
+
+    def posts(self, status: Optional[str] = None, platform: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Post]:
+        """Returns posts in due-time order, optionally filtered."""
+        clauses, params = [], []
+        for column, value in (("status", status), ("platform", platform)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = f"SELECT {_COLUMNS} FROM posts WHERE {' AND '.join(clauses) or '1'} "
+        sql += "ORDER BY due_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [Post(*row) for row in self._conn.execute(sql, params)]
+
+
+class Dispatcher:
+    """Sends due posts in time order, each platform under its own rate limit.
+
+    A platform that is out of tokens is skipped for the rest of the pass, so
+    it never holds up posts for other platforms.
+    """
+
+    def __init__(self, queue: PostQueue, send: Callable[[Post], Optional[str]],
+                 limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_attempts: int = 5, retry_base: float = 60.0, page_size: int = 200,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initializes the dispatcher.
+
+        Args:
+            queue (PostQueue): Queue to drain.
+            send (Callable[[Post], Optional[str]]): Delivers one post and
+                returns the platform's id for it; raises on failure.
+            limits (Optional[Dict[str, Tuple[float, int]]]): (posts per
+                second, burst) per platform, over ``DEFAULT_LIMITS``.
+            max_attempts (int): Deliveries tried before a post is failed.
+            retry_base (float): First retry delay in seconds, doubled per attempt.
+            page_size (int): Due posts read per query.
+            clock: Monotonic time source for the rate limiters.
+            sleep: Sleep function used by ``run``.
+        """
+        self.queue = queue
+        self.send = send
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.page_size = page_size
+        self._clock = clock
+        self._sleep = sleep
+        self._limiters: Dict[str, RateLimiter] = {}
+        self.queue.recover()
+
+    def limiter(self, platform: str) -> RateLimiter:
+        """Returns the platform's token bucket."""
+        key = platform.lower()
+        if key not in self._limiters:
+            rate, burst = self.limits.get(key, DEFAULT_LIMIT)
+            self._limiters[key] = RateLimiter(rate, burst, clock=self._clock, sleep=self._sleep)
+        return self._limiters[key]
+
+    def _deliver(self, post: Post, now: float) -> bool:
+        if not self.queue.claim(post.id):
+            return False
+        try:
+            remote_id = self.send(post)
+        except Exception as error:  # pylint: disable=broad-except
+            attempts = post.attempts + 1
+            retry_at = (now + self.retry_base * 2 ** (attempts - 1)
+                        if attempts < self.max_attempts else None)
+            self.queue.mark_failed(post.id, str(error), retry_at)
+            logging.warning("Post %d to %s failed (attempt %d): %s",
+                            post.id, post.platform, attempts, error)
+            return False
+        self.queue.mark_sent(post.id, remote_id)
+        return True
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """Sends every due post the rate limits allow right now.
+
+        Returns:
+            int: Number of posts delivered.
+        """
+        now = time.time() if now is None else now
+        blocked: set = set()
+        sent, cursor = 0, None
+        while True:
+            page = self.queue.due(now, self.page_size, cursor, blocked)
+            if not page:
+                return sent
+            for post in page:
+                cursor = (post.due_at, post.id)
+                if post.platform in blocked:
+                    continue
+                if not self.limiter(post.platform).try_acquire():
+                    blocked.add(post.platform)
+                    continue
+                sent += self._deliver(post, now)
+
+    def run(self, stop: Optional[threading.Event] = None, poll: float = 30.0,
+            idle_exit: bool = False) -> int:
+        """Dispatches until stopped.
+
+        Args:
+            stop (Optional[threading.Event]): Set to end the loop.
+            poll (float): Longest sleep between passes, in seconds.
+            idle_exit (bool): Return once nothing is left pending.
+
+        Returns:
+            int: Number of posts delivered.
+        """
+        stop = stop or threading.Event()
+        sent = 0
+        while not stop.is_set():
+            sent += self.run_once()
+            next_due = self.queue.next_due()
+            if next_due is None:
+                if idle_exit:
+                    return sent
+                wait = poll
+            else:
+                # Posts already due were held back by a rate limit; check again shortly.
+                wait = next_due - time.time()
+                wait = min(poll, wait if wait > 0 else 1.0)
+            self._sleep(wait)
+        return sent
+
+
+def _status(queue: PostQueue) -> None:
+    counts = queue.counts()
+    print(", ".join(f"{status}: {counts.get(status, 0)}"
+                    for status in (PENDING, SENDING, SENT, FAILED)))
+    for post in queue.posts(PENDING, limit=20):
+        when = datetime.fromtimestamp(post.due_at).strftime("%Y-%m-%d %H:%M")
+        text = " ".join(post.content.split())
+        print(f"{when}  {post.platform:<10} {text[:50]}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Social post queue")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="dispatch due posts")
+    run_parser.add_argument("--endpoint", default=os.environ.get("SOCIAL_POST_ENDPOINT"),
+                            help="posting API base URL (default: a local stand-in)")
+    run_parser.add_argument("--once", action="store_true", help="one pass, then exit")
+    commands.add_parser("status", help="show queued posts")
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    queue = PostQueue(args.db)
+    try:
+        if args.command == "status":
+            _status(queue)
+            return
+        # The HTTP transport is only needed by the dispatcher.
+        # pylint: disable=import-outside-toplevel
+        from social_endpoint import HttpPoster, LocalSocialEndpoint
+        server = None
+        if not args.endpoint:
+            server = LocalSocialEndpoint().start()
+            args.endpoint = server.url
+            print("SOCIAL_POST_ENDPOINT is not set; posting to a local stand-in at", server.url)
+        dispatcher = Dispatcher(queue, HttpPoster(args.endpoint))
+        try:
+            sent = dispatcher.run_once() if args.once else dispatcher.run()
+        except KeyboardInterrupt:
+            sent = None
+        finally:
+            if server is not None:
+                server.stop()
+        if sent is not None:
+            print(f"Delivered {sent} post(s)")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,66 @@
 #!/usr/bin/env python3
+import argparse
 import os
-import json
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
 
-def generate_analytics_report():
-    # Simulate some analytics data
-    report = {
-        "views": 1000,
-        "watch_time": "5000 minutes",
-        "click_through_rate": "5%",
-        "timestamp": datetime.now().isoformat()
-    }
-    
-    output_file = os.path.join(
-        os.path.expanduser("~"),
-        "Documents/youtube/Agents/9_Analytics_Performance_Agent/code/analytics_report.json"
-    )
-    
-    with open(output_file, "w") as f:
-        json.dump(report, f, indent=4)
-    
+from analytics_store import DAY, DEFAULT_DIR, AnalyticsStore, synthetic_events
+
+# Make the shared utils package importable when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from utils.file_io import write_json
+
+OUTPUT_FILE = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/9_Analytics_Performance_Agent/code/analytics_report.json"
+)
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+def generate_analytics_report(output_file=OUTPUT_FILE, store_dir=DEFAULT_DIR, events=None,
+                              top_n=10, trend_days=28):
+    # Metrics accumulate in the event store; the report is a view over its
+    # rollups, so earlier reports are never the only copy of the data.
+    store = AnalyticsStore(store_dir)
+    try:
+        if events is not None:
+            store.ingest(events)
+        totals = store.totals()
+        daily = store.series("views", bucket="day")
+        recent = daily[-trend_days:]
+        report = {
+            "views": totals["views"],
+            "watch_time_minutes": round(totals["watch_seconds"] / 60.0, 1),
+            "click_through_rate": totals["ctr"],
+            "avg_view_seconds": totals["avg_view_seconds"],
+            "videos": totals["videos"],
+            "events": store.event_count(),
+            "top_videos": [{"video": video, "views": views}
+                           for video, views in store.top_videos("views", top_n)],
+            "top_ctr": [{"video": video, "ctr": ctr}
+                        for video, ctr in store.top_videos("ctr", top_n)],
+            "movers_7d": store.movers("views", top_n, days=7),
+            "daily_views": [{"date": _iso(bucket)[:10], "views": views}
+                            for bucket, views in recent],
+            "timestamp": datetime.now().isoformat(),
+        }
+    finally:
+        store.close()
+
+    write_json(output_file, report)
     print("Analytics report generated and saved to", output_file)
+    return output_file
 
 if __name__ == '__main__':
-    generate_analytics_report()
-
+    parser = argparse.ArgumentParser(description="Build the analytics report.")
+    parser.add_argument("--synthetic", type=int, metavar="VIDEOS",
+                        help="first ingest synthetic hourly events for this many videos")
+    parser.add_argument("--days", type=int, default=90,
+                        help="days of synthetic events (default: 90)")
+    args = parser.parse_args()
+    generated = None
+    if args.synthetic:
+        start = (datetime.now(timezone.utc).timestamp() // DAY - args.days) * DAY
+        generated = synthetic_events(args.synthetic, args.days, start=start)
+    generate_analytics_report(events=generated)
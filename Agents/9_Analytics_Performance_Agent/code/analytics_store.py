@@ -0,0 +1,469 @@
+"""
+Analytics Store
+
+Purpose: Ingests per-video metric events as an append-only binary stream and
+         keeps hourly, daily and per-video rollups up to date incrementally,
+         so top-N and trend queries never rescan the raw history
+Input: Metric events (video, timestamp, views, watch seconds, impressions, clicks)
+Output: Rollup queries (totals, top-N, time series, hour-of-day profile, movers)
+        and a synthetic event generator for load testing
+Dependencies: sqlite3, struct
+"""
+
+import math
+import os
+import random
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+DEFAULT_DIR = os.path.join(
+    os.path.expanduser("~"),
+    "Documents/youtube/Agents/9_Analytics_Performance_Agent/code/analytics"
+)
+LOG_FILE = "events.log"
+DB_FILE = "rollups.db"
+
+HOUR = 3600
+DAY = 86400
+
+# One event per fixed-size little-endian record: timestamp, video id, views,
+# watch seconds, impressions, clicks.
+_RECORD = struct.Struct("<dIIdII")
+RECORD_SIZE = _RECORD.size
+
+METRICS = ("views", "watch_seconds", "impressions", "clicks")
+# Ratios are computed from the additive sums, never stored.
+DERIVED = {
+    "ctr": "CAST(SUM(clicks) AS REAL) / NULLIF(SUM(impressions), 0)",
+    "avg_view_seconds": "SUM(watch_seconds) / NULLIF(SUM(views), 0)",
+}
+
+_ROLLUP_COLUMNS = """
+    views INTEGER NOT NULL DEFAULT 0,
+    watch_seconds REAL NOT NULL DEFAULT 0,
+    impressions INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0"""
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    first_ts REAL,
+    last_ts REAL,{_ROLLUP_COLUMNS}
+);
+CREATE TABLE IF NOT EXISTS hourly (
+    video_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,{_ROLLUP_COLUMNS},
+    PRIMARY KEY (video_id, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily (
+    video_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,{_ROLLUP_COLUMNS},
+    PRIMARY KEY (video_id, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hourly_bucket ON hourly (bucket);
+CREATE INDEX IF NOT EXISTS daily_bucket ON daily (bucket);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class MetricEvent(NamedTuple):
+    """One metric delta for a video at a point in time (Unix seconds, UTC)."""
+
+    video: str
+    timestamp: float
+    views: int = 0
+    watch_seconds: float = 0.0
+    impressions: int = 0
+    clicks: int = 0
+
+
+def _metric_sql(metric: str) -> str:
+    if metric in METRICS:
+        return f"SUM({metric})"
+    if metric in DERIVED:
+        return DERIVED[metric]
+    raise ValueError(f"Unknown metric {metric!r}; use one of {METRICS + tuple(DERIVED)}")
+
+
+class AnalyticsStore:
+    """Append-only event log with incrementally maintained SQLite rollups.
+
+    The log is the source of truth. Each batch is appended to it first, then
+    folded into the rollups in one transaction that also advances the log
+    checkpoint, so a crash between the two is repaired on the next open by
+    replaying the log tail.
+    """
+
+    def __init__(self, store_dir: str = DEFAULT_DIR):
+        """Opens (and creates) the store, replaying any unapplied events.
+
+        Args:
+            store_dir (str): Directory holding the event log and rollup database.
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        self.store_dir = store_dir
+        self.log_path = os.path.join(store_dir, LOG_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(store_dir, DB_FILE),
+                                     check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._video_ids: Dict[str, int] = dict(
+            self._conn.execute("SELECT name, id FROM videos"))
+        self._names = {video_id: name for name, video_id in self._video_ids.items()}
+        self.recover()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def _checkpoint(self) -> int:
+        row = self._conn.execute("SELECT value FROM state WHERE key='log_offset'").fetchone()
+        return row[0] if row else 0
+
+    def recover(self) -> int:
+        """Applies log records written after the last checkpoint.
+
+        A torn record at the end of the log (an interrupted append) is cut
+        off first.
+
+        Returns:
+            int: Number of events replayed.
+        """
+        with self._lock:
+            if not os.path.exists(self.log_path):
+                return 0
+            size = os.path.getsize(self.log_path)
+            if size % RECORD_SIZE:
+                with open(self.log_path, "r+b") as log:
+                    log.truncate(size - size % RECORD_SIZE)
+            offset = self._checkpoint()
+            replayed, batch = 0, []
+            for record in self._read_records(offset):
+                batch.append(record)
+                if len(batch) >= 50000:
+                    offset += len(batch) * RECORD_SIZE
+                    self._apply(batch, offset)
+                    replayed, batch = replayed + len(batch), []
+            if batch:
+                self._apply(batch, offset + len(batch) * RECORD_SIZE)
+            return replayed + len(batch)
+
+    def _read_records(self, offset: int = 0) -> Iterator[Tuple]:
+        with open(self.log_path, "rb") as log:
+            log.seek(offset)
+            while True:
+                block = log.read(RECORD_SIZE * 4096)
+                if not block:
+                    return
+                yield from _RECORD.iter_unpack(block[:len(block) - len(block) % RECORD_SIZE])
+
+    def _register(self, names: Iterable[str]) -> None:
+        # Ids are committed before the log references them, so a replayed log
+        # always resolves.
+        new = [name for name in dict.fromkeys(names) if name not in self._video_ids]
+        if not new:
+            return
+        with self._conn:
+            for name in new:
+                cursor = self._conn.execute("INSERT INTO videos (name) VALUES (?)", (name,))
+                self._video_ids[name] = cursor.lastrowid
+                self._names[cursor.lastrowid] = name
+
+    def ingest(self, events: Iterable[Any], batch_size: int = 50000) -> int:
+        """Appends events to the log and folds them into the rollups.
+
+        Args:
+            events: ``MetricEvent`` instances or tuples/dicts with its fields.
+            batch_size (int): Events written and applied per transaction.
+
+        Returns:
+            int: Number of events ingested.
+        """
+        count, batch = 0, []
+        for event in events:
+            if isinstance(event, dict):
+                event = MetricEvent(**event)
+            elif not isinstance(event, MetricEvent):
+                event = MetricEvent(*event)
+            batch.append(event)
+            if len(batch) >= batch_size:
+                count += self._ingest_batch(batch)
+                batch = []
+        if batch:
+            count += self._ingest_batch(batch)
+        return count
+
+    def _ingest_batch(self, batch: List[MetricEvent]) -> int:
+        with self._lock:
+            self._register(event.video for event in batch)
+            records = [(float(e.timestamp), self._video_ids[e.video], int(e.views),
+                        float(e.watch_seconds), int(e.impressions), int(e.clicks))
+                       for e in batch]
+            with open(self.log_path, "ab") as log:
+                offset = log.tell()
+                log.write(b"".join(_RECORD.pack(*record) for record in records))
+                log.flush()
+                os.fsync(log.fileno())
+            self._apply(records, offset + len(records) * RECORD_SIZE)
+        return len(batch)
+
+    def _apply(self, records: List[Tuple], offset: int) -> None:
+        # Pre-aggregate in memory so each touched rollup row is written once.
+        hourly: Dict[Tuple[int, int], List[float]] = {}
+        daily: Dict[Tuple[int, int], List[float]] = {}
+        videos: Dict[int, List[float]] = {}
+        for timestamp, video_id, views, watch, impressions, clicks in records:
+            values = (views, watch, impressions, clicks)
+            for table, bucket in ((hourly, int(timestamp // HOUR) * HOUR),
+                                  (daily, int(timestamp // DAY) * DAY)):
+                sums = table.setdefault((video_id, bucket), [0, 0.0, 0, 0])
+                for index, value in enumerate(values):
+                    sums[index] += value
+            totals = videos.setdefault(video_id, [0, 0.0, 0, 0, timestamp, timestamp])
+            for index, value in enumerate(values):
+                totals[index] += value
+            totals[4] = min(totals[4], timestamp)
+            totals[5] = max(totals[5], timestamp)
+
+        upsert = ("INSERT INTO {table} (video_id, bucket, views, watch_seconds, impressions, "
+                  "clicks) VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (video_id, bucket) DO UPDATE "
+                  "SET views = views + excluded.views, "
+                  "watch_seconds = watch_seconds + excluded.watch_seconds, "
+                  "impressions = impressions + excluded.impressions, "
+                  "clicks = clicks + excluded.clicks")
+        with self._conn:
+            for table, rows in (("hourly", hourly), ("daily", daily)):
+                self._conn.executemany(upsert.format(table=table),
+                                       [(*key, *sums) for key, sums in rows.items()])
+            self._conn.executemany(
+                "UPDATE videos SET views = views + ?, watch_seconds = watch_seconds + ?, "
+                "impressions = impressions + ?, clicks = clicks + ?, "
+                "first_ts = MIN(COALESCE(first_ts, ?), ?), "
+                "last_ts = MAX(COALESCE(last_ts, ?), ?) WHERE id = ?",
+                [(v, w, i, c, first, first, last, last, video_id)
+                 for video_id, (v, w, i, c, first, last) in videos.items()])
+            self._conn.execute("INSERT OR REPLACE INTO state (key, value) "
+                               "VALUES ('log_offset', ?)", (offset,))
+
+    def rebuild(self) -> int:
+        """Recomputes every rollup from the full event log.
+
+        Returns:
+            int: Number of events replayed.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM hourly")
+                self._conn.execute("DELETE FROM daily")
+                self._conn.execute("UPDATE videos SET views = 0, watch_seconds = 0, "
+                                   "impressions = 0, clicks = 0, first_ts = NULL, "
+                                   "last_ts = NULL")
+                self._conn.execute("DELETE FROM state WHERE key='log_offset'")
+        return self.recover()
+
+    def event_count(self) -> int:
+        """Returns the number of events in the log."""
+        if not os.path.exists(self.log_path):
+            return 0
+        return os.path.getsize(self.log_path) // RECORD_SIZE
+
+    def events(self) -> Iterator[MetricEvent]:
+        """Streams the raw event log (for audits and rebuilds, not queries)."""
+        if not os.path.exists(self.log_path):
+            return
+        for timestamp, video_id, views, watch, impressions, clicks in self._read_records():
+            yield MetricEvent(self._names[video_id], timestamp, views, watch, impressions,
+                              clicks)
+
+    def totals(self, video: Optional[str] = None) -> Dict[str, Any]:
+        """Returns lifetime sums (and ratios) for one video or the channel."""
+        where, params = ("WHERE name = ?", (video,)) if video else ("", ())
+        columns = ", ".join(_metric_sql(m) for m in METRICS + tuple(DERIVED))
+        with self._lock:
+            row = self._conn.execute(f"SELECT {columns}, COUNT(*) FROM videos {where}",
+                                     params).fetchone()
+        totals = dict(zip(METRICS + tuple(DERIVED), row))
+        for metric in METRICS:
+            totals[metric] = totals[metric] or 0
+        totals["videos"] = row[-1]
+        return totals
+
+    @staticmethod
+    def _table(start: Optional[float], end: Optional[float], bucket: Optional[str]) -> str:
+        # Whole-day ranges are answered from the daily rollup, anything finer
+        # from the hourly one.
+        if bucket in ("hour", "day"):
+            return "hourly" if bucket == "hour" else "daily"
+        aligned = all(bound is None or bound % DAY == 0 for bound in (start, end))
+        return "daily" if aligned else "hourly"
+
+    @staticmethod
+    def _range(start: Optional[float], end: Optional[float], step: int) -> Tuple[str, list]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("bucket >= ?")
+            params.append(int(start // step) * step)
+        if end is not None:
+            clauses.append("bucket < ?")
+            params.append(int(math.ceil(end / step)) * step)
+        return (" AND ".join(clauses) or "1"), params
+
+    def top_videos(self, metric: str = "views", n: int = 10, start: Optional[float] = None,
+                   end: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Returns the ``n`` best videos by a metric, optionally in a time range.
+
+        Args:
+            metric (str): A summed metric (views, watch_seconds, impressions,
+                clicks) or a ratio (ctr, avg_view_seconds).
+            n (int): Number of videos returned.
+            start (Optional[float]): Range start, Unix seconds (inclusive).
+            end (Optional[float]): Range end, Unix seconds (exclusive).
+
+        Returns:
+            List[Tuple[str, float]]: (video, value), best first.
+        """
+        expression = _metric_sql(metric)
+        if start is None and end is None:
+            table, where, params = "videos", "1", []
+            key = "id"
+        else:
+            table = self._table(start, end, None)
+            where, params = self._range(start, end, DAY if table == "daily" else HOUR)
+            key = "video_id"
+        sql = (f"SELECT {key}, {expression} AS value FROM {table} WHERE {where} "
+               f"GROUP BY {key} HAVING value IS NOT NULL ORDER BY value DESC, {key} LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, params + [n]).fetchall()
+        return [(self._names[video_id], value) for video_id, value in rows]
+
+    def series(self, metric: str = "views", video: Optional[str] = None, bucket: str = "day",
+               start: Optional[float] = None,
+               end: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Returns a metric over time for one video or the whole channel.
+
+        Args:
+            metric (str): Metric name, as for ``top_videos``.
+            video (Optional[str]): Video name; None sums all videos.
+            bucket (str): ``hour`` or ``day``.
+            start (Optional[float]): Range start, Unix seconds.
+            end (Optional[float]): Range end, Unix seconds.
+
+        Returns:
+            List[Tuple[int, float]]: (bucket start, value) in time order.
+        """
+        if bucket not in ("hour", "day"):
+            raise ValueError("bucket must be 'hour' or 'day'")
+        table = self._table(start, end, bucket)
+        where, params = self._range(start, end, HOUR if bucket == "hour" else DAY)
+        if video is not None:
+            video_id = self._video_ids.get(video)
+            if video_id is None:
+                return []
+            where += " AND video_id = ?"
+            params.append(video_id)
+        sql = (f"SELECT bucket, {_metric_sql(metric)} FROM {table} WHERE {where} "
+               "GROUP BY bucket ORDER BY bucket")
+        with self._lock:
+            return list(self._conn.execute(sql, params))
+
+    def hour_profile(self, metric: str = "views", utc_offset: int = 0,
+                     start: Optional[float] = None,
+                     end: Optional[float] = None) -> Dict[int, float]:
+        """Returns a metric summed by hour of day, read from the hourly rollup.
+
+        Args:
+            metric (str): Metric name, as for ``top_videos``.
+            utc_offset (int): Seconds to add to UTC so hours are local.
+            start (Optional[float]): Range start, Unix seconds.
+            end (Optional[float]): Range end, Unix seconds.
+
+        Returns:
+            Dict[int, float]: Hour (0-23) to value, for hours with data.
+        """
+        where, params = self._range(start, end, HOUR)
+        sql = (f"SELECT ((bucket + ?) % {DAY}) / {HOUR} AS hour, {_metric_sql(metric)} "
+               f"FROM hourly WHERE {where} GROUP BY hour")
+        with self._lock:
+            rows = self._conn.execute(sql, [utc_offset] + params).fetchall()
+        return {int(hour): value for hour, value in rows if value is not None}
+
+    def movers(self, metric: str = "views", n: int = 10, days: int = 7,
+               now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Returns the videos whose metric grew most versus the window before.
+
+        Compares the last ``days`` whole days with the ``days`` before them,
+        both read from the daily rollup.
+
+        Returns:
+            List[Dict[str, Any]]: ``video``, ``current``, ``previous`` and
+            ``change`` (absolute), largest growth first.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"movers needs a summed metric: {METRICS}")
+        if now is None:
+            with self._lock:
+                row = self._conn.execute("SELECT MAX(bucket) FROM daily").fetchone()
+            if row[0] is None:
+                return []
+            now = row[0] + DAY
+        end = int(now // DAY) * DAY
+        middle, start = end - days * DAY, end - 2 * days * DAY
+        sql = (f"SELECT video_id, "
+               f"SUM(CASE WHEN bucket >= ? THEN {metric} ELSE 0 END) AS current, "
+               f"SUM(CASE WHEN bucket < ? THEN {metric} ELSE 0 END) AS previous "
+               "FROM daily WHERE bucket >= ? AND bucket < ? GROUP BY video_id "
+               "ORDER BY current - previous DESC, video_id LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, (middle, middle, start, end, n)).fetchall()
+        return [{"video": self._names[video_id], "current": current, "previous": previous,
+                 "change": current - previous} for video_id, current, previous in rows]
+
+
+def synthetic_events(videos: int = 300, days: int = 90, start: float = 1735689600.0,
+                     step: int = HOUR, seed: int = 0) -> Iterator[MetricEvent]:
+    """Generates a time-ordered event stream for load testing.
+
+    Each video is published at a random point in the period, peaks shortly
+    after and decays; views follow a daily cycle, watch time and clicks
+    follow per-video retention and click-through rates.
+
+    Args:
+        videos (int): Number of videos.
+        days (int): Length of the period.
+        start (float): Period start, Unix seconds.
+        step (int): Seconds between events per video.
+        seed (int): Random seed.
+
+    Yields:
+        MetricEvent: One event per live video per step.
+    """
+    rng = random.Random(seed)
+    catalog = []
+    for index in range(videos):
+        catalog.append({
+            "video": f"video_{index:04d}",
+            "published": start + rng.uniform(0, days * DAY * 0.9),
+            "peak": rng.lognormvariate(3.0, 1.0),
+            "half_life": rng.uniform(1, 14) * DAY,
+            "watch": rng.uniform(60, 600),
+            "ctr": rng.uniform(0.02, 0.12),
+        })
+    for timestamp in range(int(start), int(start + days * DAY), step):
+        cycle = 1 + 0.5 * math.sin(2 * math.pi * ((timestamp % DAY) / DAY - 0.25))
+        for video in catalog:
+            age = timestamp - video["published"]
+            if age < 0:
+                continue
+            rate = video["peak"] * cycle * 0.5 ** (age / video["half_life"])
+            views = int(rate + rng.random())
+            impressions = int(views / video["ctr"] + rng.random())
+            yield MetricEvent(video["video"], float(timestamp), views,
+                              round(views * video["watch"] * rng.uniform(0.8, 1.2), 1),
+                              impressions, views)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Compares per-topic records JSON with the columnar trends snapshot.
+
+Generates synthetic interest-over-time data for many topics, writes it both
+ways and reports on-disk size, write time and load time.
+
+    python Benchmarks/bench_trends_storage.py --topics 5000 --points 180
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.trends_columnar import load_trends_matrix, write_snapshot  # noqa: E402
+
+
+def synthetic_trends(topics, points, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    dates = [(start + timedelta(hours=i)).isoformat() for i in range(points)]
+    trends = {}
+    for index in range(topics):
+        topic = f"topic {index}"
+        trends[topic] = [{"date": date, topic: rng.randint(0, 100), "isPartial": i == points - 1}
+                         for i, date in enumerate(dates)]
+    return trends
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def bench_json(trends, directory):
+    start = time.perf_counter()
+    for topic, records in trends.items():
+        # Same layout and formatting as ContentResearchAgent.save_to_file.
+        with open(os.path.join(directory, f"{topic}_research.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump({"topic": topic, "trends": records}, file, ensure_ascii=False, indent=4)
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    total = 0
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as file:
+            data = json.load(file)
+        total += sum(record[data["topic"]] for record in data["trends"])
+    load_time = time.perf_counter() - start
+    return {"bytes": directory_size(directory), "write": write_time, "load": load_time,
+            "checksum": total}
+
+
+def bench_columnar(trends, directory):
+    start = time.perf_counter()
+    write_snapshot(directory, trends)
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    snapshot = load_trends_matrix(directory)
+    open_time = time.perf_counter() - start
+    total = int(snapshot.values.sum(dtype="int64"))
+    load_time = time.perf_counter() - start
+    return {"bytes": directory_size(directory), "write": write_time, "load": load_time,
+            "open": open_time, "checksum": total}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, default=5000)
+    parser.add_argument("--points", type=int, default=180)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    trends = synthetic_trends(args.topics, args.points)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "json"))
+        results = {"topics": args.topics, "points": args.points,
+                   "json": bench_json(trends, os.path.join(tmp, "json")),
+                   "columnar": bench_columnar(trends, os.path.join(tmp, "columnar"))}
+    assert results["json"]["checksum"] == results["columnar"]["checksum"]
+
+    print(f"{args.topics} topics x {args.points} points")
+    print(f"{'format':<10} {'size MiB':>10} {'write s':>9} {'load s':>9}")
+    for name in ("json", "columnar"):
+        row = results[name]
+        print(f"{name:<10} {row['bytes'] / 2 ** 20:>10.2f} {row['write']:>9.3f} "
+              f"{row['load']:>9.3f}")
+    print(f"columnar open (header + mmap): {results['columnar']['open'] * 1000:.1f} ms; "
+          f"size ratio {results['json']['bytes'] / results['columnar']['bytes']:.0f}x")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Compares two benchmark result files and flags regressions.
+
+    python Benchmarks/compare.py BASE.json HEAD.json --threshold 0.1
+    python Benchmarks/compare.py            # the two newest files in results/
+
+Exits with status 1 when any benchmark got worse by more than the threshold,
+so it can gate a CI job.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(base, head, threshold=0.1):
+    """Returns one row per benchmark present in either document.
+
+    ``change`` is the relative improvement (positive is better, whatever the
+    benchmark's direction); ``status`` is ok, improved, regressed, new,
+    removed or skipped.
+    """
+    rows = []
+    base_results, head_results = base["benchmarks"], head["benchmarks"]
+    for key in sorted(set(base_results) | set(head_results)):
+        old, new = base_results.get(key), head_results.get(key)
+        row = {"key": key, "base": None, "head": None, "change": None,
+               "unit": (new or old or {}).get("unit", "")}
+        if old is None or new is None:
+            row["status"] = "new" if old is None else "removed"
+        elif "skipped" in old or "skipped" in new:
+            row["status"] = "skipped"
+        else:
+            row["base"], row["head"] = old["value"], new["value"]
+            ratio = new["value"] / old["value"] if old["value"] else float("inf")
+            change = ratio - 1 if new.get("higher_is_better", True) else 1 / ratio - 1
+            row["change"] = change
+            if change < -threshold:
+                row["status"] = "regressed"
+            elif change > threshold:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        if row["base"] is None and old and "value" in old:
+            row["base"] = old["value"]
+        if row["head"] is None and new and "value" in new:
+            row["head"] = new["value"]
+        rows.append(row)
+    return rows
+
+
+def format_rows(rows):
+    lines = [f"{'benchmark':<34}{'base':>12}{'head':>12}{'change':>9}  status"]
+    for row in rows:
+        base = f"{row['base']:.2f}" if row["base"] is not None else "-"
+        head = f"{row['head']:.2f}" if row["head"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        lines.append(f"{row['key']:<34}{base:>12}{head:>12}{change:>9}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("files", nargs="*", help="BASE and HEAD result files")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change counted as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    files = args.files
+    if not files:
+        files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))[-2:]
+    if len(files) != 2:
+        parser.error("need two result files (or two runs in Benchmarks/results)")
+    base, head = load(files[0]), load(files[1])
+    if base["machine"] != head["machine"]:
+        print("warning: results come from different machines", file=sys.stderr)
+    print(f"{base['commit']} -> {head['commit']}")
+    rows = compare(base, head, args.threshold)
+    print(format_rows(rows))
+    regressed = [row["key"] for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"{len(regressed)} regression(s) beyond {args.threshold:.0%}: "
+              + ", ".join(regressed), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Synthetic, offline inputs for the benchmark suite.
+
+Nothing here touches the network or a real TTS model: trends frames are
+generated, scripts are assembled from a fixed vocabulary at a speaking rate
+of ~150 words per minute, the TTS backend writes silence of the right
+length, and audio for render benchmarks comes from an ffmpeg lavfi source.
+"""
+
+import importlib.util
+import os
+import random
+import shutil
+import subprocess
+import sys
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils.dag_executor import load_agent_module  # noqa: E402
+
+WORDS_PER_MINUTE = 150
+_VOCABULARY = ("market model launch growth energy policy chip network video update "
+               "research climate league election phone battery startup rocket data "
+               "analysis impact future story record report season").split()
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark whose optional dependencies are unavailable."""
+
+
+def require(*modules):
+    """Skips the calling benchmark unless every module can be imported."""
+    missing = [name for name in modules if importlib.util.find_spec(name) is None]
+    if missing:
+        raise SkipBenchmark("missing " + ", ".join(missing))
+
+
+def require_binary(name):
+    """Skips the calling benchmark unless an executable is on PATH."""
+    if shutil.which(name) is None:
+        raise SkipBenchmark(f"{name} not found on PATH")
+
+
+def agent(relative):
+    """Loads an agent module by its path relative to the repository root."""
+    return load_agent_module(os.path.join(ROOT, "Agents", relative))
+
+
+def synthetic_topics(count, seed=0):
+    """Returns distinct, plausible-looking topic titles."""
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.sample(_VOCABULARY, 3))} {index}" for index in range(count)]
+
+
+def trends_frame(topics, points=168, seed=0):
+    """Builds a pandas frame shaped like ``TrendReq.interest_over_time()``."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2025-01-01", periods=points, freq="h", name="date")
+    data = {topic: rng.integers(0, 101, points) for topic in topics}
+    data["isPartial"] = [False] * (points - 1) + [True]
+    return pd.DataFrame(data, index=index)
+
+
+def synthetic_script(minutes, topic="Artificial Intelligence", seed=0):
+    """Generates a script outline that reads for about ``minutes`` minutes.
+
+    Uses the scriptwriting agent's layout: numbered sections of sentences
+    separated by ``[PAUSE]`` markers.
+    """
+    rng = random.Random(seed)
+    words_left = int(minutes * WORDS_PER_MINUTE)
+    lines = [f"Video Title: Breaking News on {topic}", "", "Script Outline:"]
+    section = 1
+    while words_left > 0:
+        sentences = []
+        for _ in range(rng.randint(2, 5)):
+            length = min(words_left, rng.randint(8, 22))
+            if length <= 0:
+                break
+            words = [rng.choice(_VOCABULARY) for _ in range(length)]
+            sentences.append(" ".join(words).capitalize() + ".")
+            words_left -= length
+        lines.append(f"{section}. {' '.join(sentences)} [PAUSE]")
+        section += 1
+    return "\n".join(lines) + "\n"
+
+
+class StubTTSModel:
+    """Stands in for the Coqui model: writes silence at the speaking rate.
+
+    The cost per call is a WAV write, so the benchmark measures the chunking,
+    queueing and streaming around synthesis rather than a neural network.
+    """
+
+    rate = 8000
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name
+
+    def tts_to_file(self, text, file_path, speaker=None):
+        # pylint: disable=unused-argument
+        seconds = len(text.split()) * 60.0 / WORDS_PER_MINUTE
+        with wave.open(file_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.rate)
+            wav.writeframes(b"\0\0" * int(seconds * self.rate))
+
+
+def lavfi_audio(path, seconds, rate=22050):
+    """Writes a sine-tone WAV of the given length with ffmpeg's lavfi source."""
+    require_binary("ffmpeg")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi",
+                    "-i", f"sine=frequency=440:duration={seconds}:sample_rate={rate}",
+                    "-ac", "1", path], check=True)
+    return path
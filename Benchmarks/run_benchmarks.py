@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Runs the offline benchmark suite and stores the results per commit.
+
+    python Benchmarks/run_benchmarks.py              # full parameter sets
+    python Benchmarks/run_benchmarks.py --quick -k synthesis
+    python Benchmarks/compare.py                     # newest two result files
+
+Results go to ``Benchmarks/results/<timestamp>_<commit>.json`` with the
+machine description, so runs from different commits on the same machine can
+be compared with ``compare.py``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from fixtures import ROOT, SkipBenchmark  # noqa: E402
+from suite import BENCHMARKS  # noqa: E402
+from utils.file_io import atomic_write  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def git_commit():
+    """Returns (short commit hash, whether the tree has local changes)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count()}
+
+
+def result_key(spec, param):
+    if param is None:
+        return spec["name"]
+    return f"{spec['name']}[{spec['param_name']}={param}]"
+
+
+def run_one(spec, param, repeat):
+    """Runs one benchmark ``repeat`` times and keeps the best value."""
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+            runs.append(spec["func"](param, workdir))
+    pick = max if spec["higher_is_better"] else min
+    best = pick(runs, key=lambda run: run["value"])
+    return {"value": best["value"], "unit": spec["unit"],
+            "higher_is_better": spec["higher_is_better"],
+            "runs": [run["value"] for run in runs],
+            "extra": {k: v for k, v in best.items() if k != "value"}}
+
+
+def run_suite(selected=None, quick=False, repeat=3):
+    """Runs the (filtered) suite and returns the results document."""
+    commit, dirty = git_commit()
+    results = {}
+    started = time.perf_counter()
+    for spec in BENCHMARKS:
+        for param in spec["quick"] if quick else spec["params"]:
+            key = result_key(spec, param)
+            if selected and not any(pattern in key for pattern in selected):
+                continue
+            try:
+                results[key] = run_one(spec, param, repeat)
+            except SkipBenchmark as reason:
+                results[key] = {"skipped": str(reason)}
+            print(format_row(key, results[key]), flush=True)
+    return {"commit": commit, "dirty": dirty, "timestamp": datetime.now().isoformat(),
+            "quick": quick, "repeat": repeat, "machine": machine(),
+            "elapsed": time.perf_counter() - started, "benchmarks": results}
+
+
+def format_row(key, result):
+    if "skipped" in result:
+        return f"{key:<34}{'skipped':>14}  {result['skipped']}"
+    return f"{key:<34}{result['value']:>14.2f}  {result['unit']}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("-k", dest="selected", action="append",
+                        help="only run benchmarks whose key contains this text; repeatable")
+    parser.add_argument("--quick", action="store_true",
+                        help="run only the smallest parameter of each benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark (best kept)")
+    parser.add_argument("--output", help="result file (default: Benchmarks/results/...)")
+    args = parser.parse_args(argv)
+
+    document = run_suite(args.selected, args.quick, args.repeat)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{document['commit']}"
+                     f"{'-dirty' if document['dirty'] else ''}.json")
+    with atomic_write(output) as file:
+        json.dump(document, file, indent=2)
+    print(f"Results written to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
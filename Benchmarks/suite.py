@@ -0,0 +1,122 @@
+"""Benchmarks for the heavy agents, run by ``run_benchmarks.py``.
+
+Each benchmark takes one parameter value and a scratch directory, builds its
+inputs from ``fixtures`` outside the timed region, and returns a dict whose
+``value`` is the headline rate (bigger is better unless registered
+otherwise). Benchmarks raise ``SkipBenchmark`` when an optional dependency
+(pandas, Pillow, ffmpeg) is missing.
+"""
+
+import os
+import time
+
+from fixtures import (StubTTSModel, agent, lavfi_audio, require, require_binary,
+                      synthetic_script, synthetic_topics, trends_frame)
+
+BENCHMARKS = []
+
+
+def benchmark(name, unit, params=(None,), quick=None, param_name=None, higher_is_better=True):
+    """Registers a benchmark function.
+
+    Args:
+        name (str): Benchmark name, used in result keys.
+        unit (str): Unit of the returned ``value``.
+        params: Parameter values to run the benchmark with.
+        quick: Subset of ``params`` used by ``--quick`` runs.
+        param_name (str): Label of the parameter in result keys.
+        higher_is_better (bool): Direction used when comparing results.
+    """
+    def register(func):
+        BENCHMARKS.append({"name": name, "func": func, "unit": unit, "params": tuple(params),
+                           "quick": tuple(quick if quick is not None else params[:1]),
+                           "param_name": param_name, "higher_is_better": higher_is_better})
+        return func
+    return register
+
+
+def timed(func, *args, **kwargs):
+    """Calls ``func`` and returns (result, seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+@benchmark("research_parsing", "topics/s", params=(50, 500), param_name="topics")
+def bench_research_parsing(topics, workdir):
+    """Splits one interest-over-time frame into per-topic records."""
+    # pylint: disable=unused-argument
+    require("pandas", "numpy")
+    fetcher = agent("1_Content_Research_Agent/code/trend_fetcher.py")
+    names = synthetic_topics(topics)
+    frame = trends_frame(names)
+    records, seconds = timed(fetcher.split_frame, frame, names)
+    return {"value": topics / seconds, "seconds": seconds,
+            "points": len(next(iter(records.values())))}
+
+
+@benchmark("script_outline", "outlines/s", params=(200,), param_name="outlines")
+def bench_script_outline(count, workdir):
+    """Writes script outlines for explicit topics."""
+    script_agent = agent("2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py")
+    topics = synthetic_topics(count)
+    output = os.path.join(workdir, "script_outline.txt")
+
+    def run():
+        for topic in topics:
+            script_agent.generate_script_outline(topic, output_file=output)
+
+    _, seconds = timed(run)
+    return {"value": count / seconds, "seconds": seconds}
+
+
+@benchmark("script_split", "words/s", params=(1, 10, 60), param_name="minutes")
+def bench_script_split(minutes, workdir):
+    """Splits 1/10/60-minute scripts into synthesis chunks."""
+    # pylint: disable=unused-argument
+    chunked = agent("4_Voiceover_Audio_Agent/code/chunked_synthesis.py")
+    text = synthetic_script(minutes)
+    chunks, seconds = timed(chunked.split_script, text)
+    return {"value": len(text.split()) / seconds, "seconds": seconds, "chunks": len(chunks)}
+
+
+@benchmark("synthesis", "x realtime", params=(1, 10, 60), param_name="minutes")
+def bench_synthesis(minutes, workdir):
+    """Streams a script through the TTS server with a stub model."""
+    chunked = agent("4_Voiceover_Audio_Agent/code/chunked_synthesis.py")
+    tts_server = agent("4_Voiceover_Audio_Agent/code/tts_server.py")
+    server = tts_server.TTSServer(model_factory=StubTTSModel).start()
+    output = os.path.join(workdir, "voiceover.wav")
+    try:
+        timeline, seconds = timed(chunked.synthesize_chunked, synthetic_script(minutes),
+                                  output, workers=0, server=server, pause_seconds=0.6)
+    finally:
+        server.stop()
+    return {"value": timeline["duration"] / seconds, "seconds": seconds,
+            "audio_seconds": timeline["duration"], "segments": len(timeline["segments"])}
+
+
+@benchmark("render", "fps", params=(10, 60), param_name="seconds")
+def bench_render(seconds, workdir):
+    """Encodes a captioned video over lavfi audio in one ffmpeg pass."""
+    require("ffmpeg")
+    require_binary("ffmpeg")
+    render_graph = agent("5_Video_Creation_Editing_Agent/code/render_graph.py")
+    audio = lavfi_audio(os.path.join(workdir, "voiceover.wav"), seconds)
+    script = os.path.join(workdir, "script_outline.txt")
+    with open(script, "w", encoding="utf-8") as file:
+        file.write(synthetic_script(seconds / 60.0))
+    stats, elapsed = timed(render_graph.render_script_video, audio, script,
+                           os.path.join(workdir, "video.mp4"))
+    return {"value": stats["encoder_fps"], "seconds": elapsed, "frames": stats["frames"]}
+
+
+@benchmark("thumbnails", "renders/s", params=(24,), param_name="count")
+def bench_thumbnails(count, workdir):
+    """Renders and encodes thumbnails on a single core."""
+    require("PIL")
+    engine = agent("6_Thumbnail_Graphic_Design_Agent/code/thumbnail_engine.py")
+    titles = [f"Breaking News on {topic}" for topic in synthetic_topics(count)]
+    paths, seconds = timed(engine.generate_thumbnails, titles,
+                           os.path.join(workdir, "thumbnails"), workers=1)
+    return {"value": len(paths) / seconds, "seconds": seconds}
@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/9_Analytics_Performance_Agent/code")
+analytics_store = load_agent_module(os.path.join(CODE_DIR, "analytics_store.py"))
+analytics_agent = load_agent_module(os.path.join(CODE_DIR, "analytics_agent.py"))
+
+DAY = analytics_store.DAY
+START = 1735689600.0  # 2025-01-01T00:00:00Z
+
+
+def events():
+    Event = analytics_store.MetricEvent
+    return [Event("a", START + 10, 100, 6000.0, 1000, 100),
+            Event("a", START + 4000, 50, 3000.0, 500, 50),
+            Event("b", START + DAY + 60, 30, 900.0, 100, 30),
+            ("b", START + 8 * DAY, 500, 15000.0, 2000, 500),
+            {"video": "c", "timestamp": START + 9 * DAY, "views": 10, "impressions": 1000}]
+
+
+def test_rollups_answer_totals_top_n_and_series(tmp_path):
+    store = analytics_store.AnalyticsStore(str(tmp_path))
+    assert store.ingest(events()) == 5
+    assert store.totals("a") == {"views": 150, "watch_seconds": 9000.0, "impressions": 1500,
+                                 "clicks": 150, "ctr": 0.1, "avg_view_seconds": 60.0,
+                                 "videos": 1}
+    assert store.top_videos("views", 2) == [("b", 530), ("a", 150)]
+    assert store.top_videos("ctr", 1) == [("b", 530 / 2100)]
+    # A whole-day range uses the daily rollup, a partial one the hourly rollup.
+    assert store.top_videos("views", start=START, end=START + 2 * DAY) == [("a", 150), ("b", 30)]
+    assert store.top_videos("views", start=START + 3600, end=START + DAY) == [("a", 50)]
+    assert store.series("views", video="a", bucket="hour") == [(START, 100), (START + 3600, 50)]
+    assert [bucket for bucket, _ in store.series("views")] == [
+        START, START + DAY, START + 8 * DAY, START + 9 * DAY]
+    with pytest.raises(ValueError):
+        store.top_videos("likes")
+
+
+def test_movers_compare_consecutive_windows(tmp_path):
+    store = analytics_store.AnalyticsStore(str(tmp_path))
+    store.ingest(events())
+    movers = store.movers("views", n=2, days=7, now=START + 10 * DAY)
+    assert movers[0] == {"video": "b", "current": 500, "previous": 30, "change": 470}
+
+
+def test_log_is_replayed_after_a_crash(tmp_path):
+    store = analytics_store.AnalyticsStore(str(tmp_path))
+    store.ingest(events()[:2])
+    # Simulate a crash after the log append but before the rollup commit,
+    # followed by a torn half-record.
+    store._register(["b"])
+    with open(store.log_path, "ab") as log:
+        log.write(analytics_store._RECORD.pack(START + DAY, store._video_ids["b"], 7, 1.0, 9, 7))
+        log.write(b"\0" * 5)
+    store.close()
+    reopened = analytics_store.AnalyticsStore(str(tmp_path))
+    assert reopened.event_count() == 3
+    assert reopened.totals()["views"] == 157
+    assert reopened.rebuild() == 3 and reopened.totals()["views"] == 157
+    assert [event.video for event in reopened.events()] == ["a", "a", "b"]
+
+
+def test_synthetic_events_are_time_ordered_and_deterministic():
+    first = list(analytics_store.synthetic_events(videos=5, days=3, seed=1))
+    assert first == list(analytics_store.synthetic_events(videos=5, days=3, seed=1))
+    timestamps = [event.timestamp for event in first]
+    assert timestamps == sorted(timestamps) and {event.video for event in first} <= {
+        f"video_{index:04d}" for index in range(5)}
+
+
+def test_report_has_numeric_metrics(tmp_path):
+    output = tmp_path / "report.json"
+    analytics_agent.generate_analytics_report(str(output), str(tmp_path / "store"), events())
+    report = json.loads(output.read_text())
+    assert report["views"] == 690 and report["watch_time_minutes"] == 415.0
+    assert report["top_videos"][0] == {"video": "b", "views": 530}
+    assert report["daily_views"][0] == {"date": "2025-01-01", "views": 150}
@@ -0,0 +1,166 @@
+import json
+import os
+
+import pytest
+from utils.artifact_store import MANIFEST_FILE, ArtifactStore
+from utils.dag_executor import DagExecutor, Stage
+from utils.file_io import atomic_write
+
+AGENT_SOURCE = '''
+CALLS = []
+
+def produce(output_file, text):
+    CALLS.append(output_file)
+    with open(output_file, "w") as f:
+        f.write(text)
+    return output_file
+
+def upper(input_file, output_file):
+    CALLS.append(output_file)
+    with open(input_file) as src, open(output_file, "w") as dst:
+        dst.write(src.read().upper())
+    return output_file
+'''
+
+
+@pytest.fixture
+def agent(tmp_path):
+    code_dir = tmp_path / "Agents" / "0_Artifact_Agent" / "code"
+    code_dir.mkdir(parents=True)
+    (code_dir / "artifact_agent.py").write_text(AGENT_SOURCE)
+    return "Agents/0_Artifact_Agent/code/artifact_agent.py"
+
+
+def pipeline(agent, run, text):
+    source = run.path("source", "source.txt")
+    return [
+        Stage("source", agent, "produce", kwargs={"output_file": source, "text": text}),
+        Stage("upper", agent, "upper", deps=["source"],
+              kwargs={"input_file": source, "output_file": run.path("upper", "upper.txt")}),
+    ]
+
+
+def run_pipeline(agent, tmp_path, store, text):
+    run = store.new_run()
+    report = DagExecutor(pipeline(agent, run, text), root=str(tmp_path), run=run).run()
+    assert report.ok
+    return run, report
+
+
+def test_atomic_write_leaves_old_file_on_error(tmp_path):
+    target = tmp_path / "data.json"
+    target.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(target)) as file:
+            file.write("partial")
+            raise RuntimeError("boom")
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_runs_get_separate_directories_and_manifests(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    first, _ = run_pipeline(agent, tmp_path, store, "one")
+    second, _ = run_pipeline(agent, tmp_path, store, "two")
+    assert first.dir != second.dir
+    assert open(first.artifact("upper", "upper.txt").path).read() == "ONE"
+    assert open(second.artifact("upper", "upper.txt").path).read() == "TWO"
+    with open(os.path.join(second.dir, MANIFEST_FILE)) as file:
+        manifest = json.load(file)
+    artifact = manifest["stages"]["upper"]["outputs"]["upper.txt"]
+    assert artifact["kind"] == "text" and artifact["path"] == "upper/upper.txt"
+
+
+def test_matching_inputs_reuse_previous_outputs(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    first, _ = run_pipeline(agent, tmp_path, store, "same")
+    second, report = run_pipeline(agent, tmp_path, store, "same")
+    assert report.results["source"].status == "reused"
+    assert report.results["upper"].status == "reused"
+    assert second.manifest["stages"]["upper"]["reused_from"] == first.run_id
+    assert second.artifact("upper", "upper.txt").verify()
+
+    _, changed = run_pipeline(agent, tmp_path, store, "different")
+    assert changed.results["source"].status == "ok"
+    assert changed.results["upper"].status == "ok"
+
+
+def test_rebuilding_a_reused_stage_leaves_the_earlier_run_intact(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    first, _ = run_pipeline(agent, tmp_path, store, "same")
+    second, _ = run_pipeline(agent, tmp_path, store, "same")
+    # The agent rewrites its outputs in place; the reused copies must not
+    # share storage with the first run's files.
+    rerun = store.open_run(second.run_id)
+    assert DagExecutor(pipeline(agent, rerun, "edited"), root=str(tmp_path), run=rerun).run().ok
+    assert open(first.artifact("upper", "upper.txt").path).read() == "SAME"
+    assert first.artifact("source", "source.txt").verify()
+
+
+def test_tampered_outputs_are_not_reused(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    first, _ = run_pipeline(agent, tmp_path, store, "same")
+    with open(first.artifact("upper", "upper.txt").path, "w") as file:
+        file.write("corrupted")
+    _, report = run_pipeline(agent, tmp_path, store, "same")
+    assert report.results["source"].status == "reused"
+    assert report.results["upper"].status == "ok"
+
+
+def test_reopened_run_reads_manifest(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    run, _ = run_pipeline(agent, tmp_path, store, "x")
+    reopened = store.open_run(run.run_id)
+    assert set(reopened.outputs("source")) == {"source.txt"}
+    with pytest.raises(KeyError):
+        reopened.outputs("missing")
+
+
+def test_rebuild_in_place_runs_only_stale_stages(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    run, _ = run_pipeline(agent, tmp_path, store, "same")
+    reopened = store.open_run(run.run_id)
+    executor = DagExecutor(pipeline(agent, reopened, "same"), root=str(tmp_path), run=reopened)
+    assert [step["action"] for step in executor.plan()] == ["fresh", "fresh"]
+    report = executor.run()
+    assert {r.status for r in report.results.values()} == {"fresh"}
+
+    rerun = store.open_run(run.run_id)
+    executor = DagExecutor(pipeline(agent, rerun, "edited"), root=str(tmp_path), run=rerun)
+    plan = executor.plan()
+    assert plan[0]["action"] == "run" and plan[0]["reason"] == "changed: params"
+    assert plan[1]["reason"] == "dependency rebuilds: source"
+    report = executor.run()
+    assert report.results["upper"].status == "ok"
+    assert open(rerun.artifact("upper", "upper.txt").path).read() == "EDITED"
+
+
+def test_agent_source_and_declared_inputs_are_fingerprinted(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    external = tmp_path / "external.txt"
+    external.write_text("v1")
+    run = store.new_run()
+    stage = Stage("source", agent, "produce", inputs=[str(external)],
+                  kwargs={"output_file": run.path("source", "source.txt"), "text": "x"})
+    assert DagExecutor([stage], root=str(tmp_path), run=run).run().ok
+    executor = DagExecutor([stage], root=str(tmp_path), run=run)
+    assert executor.plan()[0]["action"] == "fresh"
+
+    external.write_text("v2")
+    assert executor.plan()[0]["reason"] == "changed: inputs"
+    assert executor.run().results["source"].status == "ok"
+
+    with open(tmp_path / agent, "a") as file:
+        file.write("\n# edited\n")
+    assert executor.plan()[0]["reason"] == "changed: source"
+
+
+def test_missing_declared_output_fails_stage(agent, tmp_path):
+    store = ArtifactStore(str(tmp_path / "runs"))
+    run = store.new_run()
+    stage = Stage("source", agent, "produce", outputs=["expected.txt"],
+                  kwargs={"output_file": run.path("source", "other.txt"), "text": "x"})
+    report = DagExecutor([stage], root=str(tmp_path), run=run).run()
+    assert report.results["source"].status == "failed"
+    assert "expected.txt" in report.results["source"].error
+    assert "source" not in run.manifest["stages"]
@@ -0,0 +1,105 @@
+import json
+import os
+
+from utils.batch_runner import (SCRIPT_AGENT, SEO_AGENT, THUMBNAIL_AGENT, VIDEO_AGENT,
+                                VOICEOVER_AGENT, run_batch, slugify)
+
+FAKE_AGENTS = {
+    SCRIPT_AGENT: '''
+def generate_script_outline(trending_topic=None, output_file=None):
+    with open(output_file, "w") as f:
+        f.write("Video Title: " + trending_topic)
+    return output_file
+''',
+    VOICEOVER_AGENT: '''
+STARTS = []
+
+class Server:
+    def start(self):
+        STARTS.append(1)
+        return self
+
+def get_tts_server():
+    return Server()
+
+def generate_voiceover(outline_file=None, output_file=None, workers=None):
+    with open(output_file, "w") as f:
+        f.write("warm %d" % len(STARTS))
+    return output_file
+''',
+    VIDEO_AGENT: '''
+def create_video(voiceover_file, script_outline_file, output_video):
+    if "fail" in open(script_outline_file).read():
+        raise RuntimeError("render failed")
+    open(output_video, "w").close()
+    return output_video
+''',
+    THUMBNAIL_AGENT: '''
+def generate_thumbnail(title, output_path):
+    open(output_path, "w").close()
+    return output_path
+''',
+    SEO_AGENT: '''
+import json
+
+def optimize_metadata(topic, output_file, outline_file, ranking_file=None):
+    with open(outline_file) as f:
+        outline = f.read()
+    with open(output_file, "w") as f:
+        json.dump({"title": topic, "outline": outline, "ranking": ranking_file}, f)
+    return output_file
+''',
+}
+
+
+def make_tree(root):
+    for relative, source in FAKE_AGENTS.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+def test_batch_produces_one_directory_per_topic(tmp_path):
+    make_tree(tmp_path)
+    out = tmp_path / "out"
+    report = run_batch(["AI News", "Space Race", "Ocean Life"], str(out),
+                       root=str(tmp_path), workers=2)
+    assert len(report.completed) == 3
+    dirs = sorted(os.listdir(out))
+    assert dirs == ["001_ai_news", "002_space_race", "003_ocean_life"]
+    with open(out / "002_space_race" / "metadata.json") as f:
+        assert json.load(f) == {"title": "Space Race", "outline": "Video Title: Space Race",
+                                "ranking": None}
+    # The model was loaded by the worker initializer, never per item.
+    with open(out / "003_ocean_life" / "voiceover.wav") as f:
+        assert f.read() == "warm 1"
+    assert report.stage_throughput()["metadata"]["items"] == 3
+    assert "videos/hour" in report.format_summary()
+
+
+def test_failed_item_does_not_stop_batch(tmp_path):
+    make_tree(tmp_path)
+    report = run_batch(["will fail", "fine"], str(tmp_path / "out"),
+                       root=str(tmp_path), workers=1)
+    assert [item["topic"] for item in report.completed] == ["fine"]
+    failed = [item for item in report.items if item["error"]][0]
+    assert failed["error"].startswith("video: RuntimeError")
+    assert "thumbnail" not in failed["timings"]
+
+
+def test_seo_reads_each_items_own_outline(tmp_path):
+    make_tree(tmp_path)
+    out = tmp_path / "out"
+    ranking = str(tmp_path / "ranking.json")
+    run_batch(["AI News", "Space Race"], str(out), root=str(tmp_path), workers=2,
+              ranking_file=ranking)
+    for name, topic in (("001_ai_news", "AI News"), ("002_space_race", "Space Race")):
+        with open(out / name / "metadata.json") as f:
+            metadata = json.load(f)
+        assert metadata["outline"] == "Video Title: " + topic
+        assert metadata["ranking"] == ranking
+
+
+def test_slugify():
+    assert slugify("  Hello, World!  ") == "hello_world"
+    assert slugify("???") == "topic"
@@ -0,0 +1,38 @@
+import os
+import sys
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "Benchmarks")
+sys.path.insert(0, BENCH_DIR)
+
+import compare  # noqa: E402
+import fixtures  # noqa: E402
+from run_benchmarks import run_suite  # noqa: E402
+
+
+def result(value, higher_is_better=True):
+    return {"value": value, "unit": "x", "higher_is_better": higher_is_better}
+
+
+def test_synthetic_script_length():
+    words = len(fixtures.synthetic_script(10).split())
+    assert abs(words - 10 * fixtures.WORDS_PER_MINUTE) < 0.1 * 10 * fixtures.WORDS_PER_MINUTE
+
+
+def test_quick_suite_runs_offline():
+    document = run_suite(["synthesis", "script_split"], quick=True, repeat=1)
+    synthesis = document["benchmarks"]["synthesis[minutes=1]"]
+    assert synthesis["value"] > 1 and synthesis["extra"]["audio_seconds"] > 30
+    assert "script_split[minutes=1]" in document["benchmarks"]
+
+
+def test_compare_flags_regressions_in_either_direction():
+    base = {"benchmarks": {"fast": result(100), "slow": result(2.0, False),
+                           "gone": result(1), "skip": {"skipped": "missing PIL"}}}
+    head = {"benchmarks": {"fast": result(80), "slow": result(1.5, False),
+                           "skip": {"skipped": "missing PIL"}}}
+    rows = {row["key"]: row for row in compare.compare(base, head, threshold=0.1)}
+    assert rows["fast"]["status"] == "regressed"
+    assert rows["slow"]["status"] == "improved"
+    assert rows["gone"]["status"] == "removed"
+    assert rows["skip"]["status"] == "skipped"
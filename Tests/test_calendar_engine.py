@@ -0,0 +1,142 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+AGENTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Agents")
+calendar_engine = load_agent_module(
+    os.path.join(AGENTS, "3_Content_Planning_Calendar_Agent/code/calendar_engine.py"))
+planning_agent = load_agent_module(
+    os.path.join(AGENTS, "3_Content_Planning_Calendar_Agent/code/planning_agent.py"))
+analytics_store = load_agent_module(
+    os.path.join(AGENTS, "9_Analytics_Performance_Agent/code/analytics_store.py"))
+publishing_agent = load_agent_module(
+    os.path.join(AGENTS, "12_Video_Publishing_Agent/code/video_publishing_agent.py"))
+
+HOUR, DAY = calendar_engine.HOUR, calendar_engine.DAY
+NOW = 1735689600.0  # 2025-01-01T00:00:00Z
+PROFILE = {9: 2.0, 12: 5.0, 17: 10.0, 20: 8.0}
+
+
+def open_calendar(tmp_path, **options):
+    calendar = calendar_engine.ContentCalendar(str(tmp_path / "calendar.db"), **options)
+    calendar.set_hour_scores(PROFILE)
+    return calendar
+
+
+def hours(slots):
+    return [(int((slot - NOW) // DAY), int(slot % DAY // HOUR)) for slot in slots]
+
+
+def test_plan_respects_caps_spacing_etas_and_best_hours(tmp_path):
+    calendar = open_calendar(tmp_path, daily_cap=2, min_spacing=4 * HOUR)
+    backlog = [{"video": f"v{index}", "ready_at": NOW} for index in range(5)]
+    backlog.append({"video": "late", "ready_at": NOW + 2 * DAY + 18 * HOUR, "priority": 5})
+    slots = calendar.plan(backlog, now=NOW)
+    assert hours(slots[f"v{index}"] for index in range(5)) == [
+        (0, 17), (0, 12), (1, 17), (1, 12), (2, 12)]
+    # The top-priority video is placed first, but never before its render is done.
+    assert hours([slots["late"]]) == [(2, 20)]
+    for day in range(4):
+        assert len(calendar.day(NOW + day * DAY)) <= 2
+    ordered = [entry["slot"] for entry in calendar.upcoming(NOW)]
+    assert all(later - earlier >= 4 * HOUR for earlier, later in zip(ordered, ordered[1:]))
+
+
+def test_single_video_changes_are_replanned_incrementally(tmp_path):
+    calendar = open_calendar(tmp_path)
+    slots = calendar.plan([(f"v{index}", NOW) for index in range(4)], now=NOW)
+    # A delayed render moves only that video, into the best free slot.
+    moved = calendar.update({"video": "v0", "ready_at": NOW + 2 * DAY}, now=NOW)
+    assert hours([moved]) == [(2, 17)]
+    assert all(calendar.slot(f"v{index}") == slots[f"v{index}"] for index in range(1, 4))
+    # An unchanged ETA keeps the slot; freed slots go to the next additions.
+    assert calendar.update({"video": "v1", "priority": 3}, now=NOW) == slots["v1"]
+    assert calendar.remove("v2") and calendar.slot("v2") is None
+    assert calendar.add(("new", NOW), now=NOW) == slots["v0"]
+    assert calendar.add(("newer", NOW), now=NOW) == slots["v2"]
+
+
+def test_locked_slots_survive_a_full_replan(tmp_path):
+    calendar = open_calendar(tmp_path, daily_cap=1)
+    first = calendar.plan([("a", NOW)], now=NOW)["a"]
+    assert calendar.lock("a") == first
+    slots = calendar.plan([("b", NOW, 10)], now=NOW)
+    assert "a" not in slots and calendar.slot("a") == first
+    assert calendar.day_of(slots["b"]) == calendar.day_of(first) + 1
+    assert calendar.entry("a")["status"] == calendar_engine.LOCKED
+
+
+def test_backlog_beyond_the_horizon_is_reported_unscheduled(tmp_path):
+    calendar = open_calendar(tmp_path, daily_cap=1, horizon_days=1)
+    slots = calendar.plan([(f"v{index}", NOW) for index in range(3)], now=NOW)
+    assert list(slots.values()).count(None) == 1
+    assert [entry["video"] for entry in calendar.unscheduled()] == ["v2"]
+    with pytest.raises(ValueError):
+        calendar.set_hour_scores({3: 0})
+
+
+def test_planning_agent_uses_analytics_best_hours(tmp_path, monkeypatch):
+    monkeypatch.setattr(planning_agent, "local_utc_offset", lambda now=None: 0)
+    store = analytics_store.AnalyticsStore(str(tmp_path / "analytics"))
+    store.ingest([("old", NOW - DAY + 6 * HOUR, 900), ("old", NOW - DAY + 15 * HOUR, 100)])
+    store.close()
+    plan_file = tmp_path / "content_calendar.txt"
+    slot = planning_agent.plan_content("run-1", plan_file=str(plan_file),
+                                       calendar_db=str(tmp_path / "calendar.db"),
+                                       analytics_dir=str(tmp_path / "analytics"), now=NOW)
+    assert hours([slot]) == [(0, 6)]
+    assert plan_file.read_text().startswith("Video scheduled for publication on: ")
+
+
+def test_planning_one_video_leaves_announced_slots_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(planning_agent, "local_utc_offset", lambda now=None: 0)
+    options = {"plan_file": str(tmp_path / "content_calendar.txt"),
+               "calendar_db": str(tmp_path / "calendar.db"),
+               "analytics_dir": str(tmp_path / "analytics")}
+    first = planning_agent.plan_content("run-1", **options, now=NOW)
+    # A higher-priority video would win run-1's slot in a full re-solve.
+    second = planning_agent.plan_content("run-2", priority=5, **options, now=NOW)
+    calendar = calendar_engine.ContentCalendar(options["calendar_db"])
+    assert calendar.slot("run-1") == first and second not in (None, first)
+    calendar.close()
+
+
+def test_publishing_uses_the_planned_slot(tmp_path):
+    calendar_db = str(tmp_path / "calendar.db")
+    calendar = calendar_engine.ContentCalendar(calendar_db)
+    slot = calendar.plan([("run-2", NOW + HOUR, 0, "Title")], now=NOW)["run-2"]
+    calendar.close()
+    assert publishing_agent.get_scheduled_upload_time("run-2", calendar_db, now=NOW) == (
+        datetime.fromtimestamp(slot))
+    # A slot that passed before publishing is re-slotted by the calendar and locked.
+    late = slot + 1
+    used = publishing_agent.get_scheduled_upload_time("run-2", calendar_db, lock=True, now=late)
+    assert used.timestamp() > late
+    calendar = calendar_engine.ContentCalendar(calendar_db)
+    entry = calendar.entry("run-2")
+    assert (entry["slot"], entry["status"], entry["title"]) == (
+        used.timestamp(), calendar_engine.LOCKED, "Title")
+    calendar.close()
+    # Videos the planner never saw still respect the calendar's spacing.
+    other = publishing_agent.get_scheduled_upload_time("unplanned", calendar_db, now=late)
+    assert abs(other.timestamp() - used.timestamp()) >= 4 * HOUR
+    # Without a calendar, uploads go out tomorrow at noon.
+    fallback = publishing_agent.get_scheduled_upload_time(
+        "run-2", str(tmp_path / "missing.db"), now=NOW)
+    assert (fallback.hour, fallback.minute) == (12, 0)
+
+
+def test_publishing_jobs_are_named_after_the_run(tmp_path):
+    video_file = tmp_path / "final_video.mp4"
+    video_file.write_bytes(b"video")
+    job_db = str(tmp_path / "jobs.db")
+    options = {"metadata_file": str(tmp_path / "metadata.json"),
+               "calendar_db": str(tmp_path / "calendar.db"), "job_db": job_db}
+    assert publishing_agent.main(str(video_file), video="run-1", **options) == "run-1"
+    assert publishing_agent.main(str(video_file), video="run-2", **options) == "run-2"
+    store = publishing_agent.JobStore(job_db)
+    assert {job["video_id"] for job in store.status()} == {"run-1", "run-2"}
+    store.close()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import json
+import os
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+chunked = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/4_Voiceover_Audio_Agent/code/chunked_synthesis.py"))
+
+RATE = 16000
+OUTLINE = """Video Title: Breaking News on AI
+
+Script Outline:
+1. Introduction: Briefly introduce the trending topic. [PAUSE]
+2. Background: Provide context. Then add more detail! [PAUSE]
+"""
+
+
+class StubModel:
+    """Writes 0.1s of audio per word; texts containing 'flaky' fail once."""
+
+    def __init__(self, name=None):
+        pass
+
+    def tts_to_file(self, text, file_path, speaker):
+        marker = os.environ.get("STUB_TTS_FAILED_MARKER")
+        if "flaky" in text and marker and not os.path.exists(marker):
+            open(marker, "w").close()
+            raise RuntimeError("transient failure")
+        with wave.open(file_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(RATE)
+            wav.writeframes(b"\1\0" * (RATE // 10) * len(text.split()))
+
+    def synthesize(self, text, path, speaker):
+        self.tts_to_file(text, path, speaker)
+
+
+def test_split_script_at_pauses_and_sentences():
+    chunks = chunked.split_script(OUTLINE)
+    texts = [c["text"] for c in chunks]
+    assert texts == [
+        "Video Title: Breaking News on AI",
+        "Script Outline:",
+        "1. Introduction: Briefly introduce the trending topic.",
+        "2. Background: Provide context.",
+        "Then add more detail!",
+    ]
+    assert [c["pause_after"] for c in chunks] == [False, False, True, False, True]
+
+
+def test_long_sentences_split_at_commas():
+    chunks = chunked.split_script("alpha beta, gamma delta, epsilon zeta", max_chars=15)
+    assert [c["text"] for c in chunks] == ["alpha beta,", "gamma delta,", "epsilon zeta"]
+
+
+def test_streams_chunks_in_order_with_pauses(tmp_path):
+    out = str(tmp_path / "voice.wav")
+    timeline = chunked.synthesize_chunked(OUTLINE, out, server=StubModel(), pause_seconds=0.5)
+    words = len(OUTLINE.replace("[PAUSE]", "").split())
+    with wave.open(out, "rb") as wav:
+        assert wav.getnframes() == words * RATE // 10 + 2 * RATE // 2
+    assert timeline["duration"] == pytest.approx(words * 0.1 + 1.0)
+    segments = timeline["segments"]
+    assert segments[3]["start"] == pytest.approx(segments[2]["start"] + 0.7 + 0.5)
+    with open(str(tmp_path / "voice_segments.json")) as f:
+        assert json.load(f)["segments"] == segments
+
+
+def test_failed_chunk_is_retried_alone(tmp_path, monkeypatch):
+    monkeypatch.setenv("STUB_TTS_FAILED_MARKER", str(tmp_path / "failed"))
+    out = str(tmp_path / "voice.wav")
+    pool = ProcessPoolExecutor(max_workers=2, initializer=chunked._init_worker,
+                               initargs=("stub", StubModel))
+    try:
+        timeline = chunked.synthesize_chunked("One. Two flaky words. Three.", out,
+                                              workers=2, pool=pool)
+    finally:
+        pool.shutdown()
+    assert timeline["retries"] == 1
+    assert [s["text"] for s in timeline["segments"]] == ["One.", "Two flaky words.", "Three."]
+
+
+def test_persistent_failure_removes_partial_output(tmp_path):
+    class Broken(StubModel):
+        def synthesize(self, text, path, speaker):
+            raise RuntimeError("model crashed")
+
+    out = tmp_path / "voice.wav"
+    with pytest.raises(RuntimeError, match="after 2 attempts"):
+        chunked.synthesize_chunked("Hello.", str(out), server=Broken(), retries=1)
+    assert not out.exists()
+
+
+def test_shared_pool_loads_the_requested_model(tmp_path, monkeypatch):
+    requested, pools = [], []
+
+    def get_pool(workers, model_name=chunked.MODEL_NAME):
+        requested.append(model_name)
+        pools.append(ProcessPoolExecutor(max_workers=workers, initializer=chunked._init_worker,
+                                         initargs=(model_name, StubModel)))
+        return pools[-1]
+
+    monkeypatch.setattr(chunked, "get_pool", get_pool)
+    try:
+        chunked.synthesize_chunked("One. Two.", str(tmp_path / "voice.wav"), workers=1,
+                                   model_name="other-model")
+    finally:
+        for pool in pools:
+            pool.shutdown()
+    assert requested == ["other-model"]
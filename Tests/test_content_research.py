@@ -1,15 +1,38 @@
+import os
+
 import pytest
-from Agents.Content_Research_Agent.code.content_research_agent import ContentResearchAgent
+
+pytest.importorskip("pandas")
+pytest.importorskip("pytrends")
+pytest.importorskip("tenacity")
+from requests.exceptions import RequestException  # noqa: E402
+from tenacity import stop_after_attempt, wait_none  # noqa: E402
+from utils.dag_executor import load_agent_module  # noqa: E402
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/1_Content_Research_Agent/code")
+research = load_agent_module(os.path.join(CODE_DIR, "content_research_agent.py"))
+fetcher = load_agent_module(os.path.join(CODE_DIR, "trend_fetcher.py"))
+
+
+class FailingClient(fetcher.StubTrendsClient):
+    def interest_over_time(self):
+        raise RequestException("network unavailable")
+
 
 def test_fetch_trends_success():
-    """Test successful trend fetching."""
-    agent = ContentResearchAgent()
+    """Trends come back as per-timestamp records for the topic."""
+    agent = research.ContentResearchAgent(client=fetcher.StubTrendsClient(points=12))
     trends = agent.fetch_trends("AI")
     assert isinstance(trends, list), "Trends should be a list"
-    assert len(trends) > 0, "No trends found"
+    assert len(trends) == 12, "No trends found"
+    assert set(trends[0]) == {"date", "AI", "isPartial"}
+
 
 def test_fetch_trends_failure():
-    """Test API failure handling."""
-    agent = ContentResearchAgent()
-    with pytest.raises(Exception):
-        agent.fetch_trends("InvalidTopic@123")
+    """Request errors are re-raised once the retries are used up."""
+    agent = research.ContentResearchAgent(client=FailingClient())
+    fetch = research.ContentResearchAgent.fetch_trends.retry_with(
+        stop=stop_after_attempt(2), wait=wait_none())
+    with pytest.raises(RequestException):
+        fetch(agent, "InvalidTopic@123")
@@ -0,0 +1,80 @@
+import pytest
+from utils.dag_executor import DagExecutor, Stage, load_agent_module
+from utils.instrumentation import configure
+
+AGENT_SOURCE = '''
+import threading
+import time
+
+CALLS = []
+BARRIER = threading.Barrier(2, timeout=5)
+
+def record(name, wait=False, fail=False, sleep=0.0):
+    if wait:
+        BARRIER.wait()
+    time.sleep(sleep)
+    if fail:
+        raise RuntimeError(name + " failed")
+    CALLS.append(name)
+    return name
+'''
+
+
+@pytest.fixture
+def agent(tmp_path):
+    code_dir = tmp_path / "Agents" / "0_Test_Agent" / "code"
+    code_dir.mkdir(parents=True)
+    (code_dir / "test_agent.py").write_text(AGENT_SOURCE)
+    return "Agents/0_Test_Agent/code/test_agent.py"
+
+
+def stage(agent, name, deps=(), **kwargs):
+    return Stage(name, agent, "record", deps=deps, kwargs=dict(name=name, **kwargs))
+
+
+def test_independent_stages_run_concurrently(agent, tmp_path):
+    """Both stages must reach the barrier together or the run fails."""
+    stages = [stage(agent, "a", wait=True), stage(agent, "b", wait=True),
+              stage(agent, "c", deps=["a", "b"])]
+    report = DagExecutor(stages, root=str(tmp_path), max_workers=2).run()
+    assert report.ok
+    module = load_agent_module(str(tmp_path / agent))
+    assert module.CALLS[-1] == "c"
+
+
+def test_failure_skips_only_dependents(agent, tmp_path):
+    stages = [stage(agent, "bad", fail=True), stage(agent, "child", deps=["bad"]),
+              stage(agent, "other")]
+    report = DagExecutor(stages, root=str(tmp_path)).run()
+    assert report.results["bad"].status == "failed"
+    assert report.results["child"].status == "skipped"
+    assert report.results["other"].status == "ok"
+    assert not report.ok
+
+
+def test_critical_path_follows_longest_chain(agent, tmp_path):
+    stages = [stage(agent, "slow", sleep=0.2), stage(agent, "fast"),
+              stage(agent, "end", deps=["slow", "fast"])]
+    report = DagExecutor(stages, root=str(tmp_path)).run()
+    assert report.critical_path == ["slow", "end"]
+    assert report.critical_path_time >= 0.2
+    assert "Critical path" in report.format_summary()
+
+
+def test_cycles_are_rejected(agent):
+    with pytest.raises(ValueError):
+        DagExecutor([stage(agent, "a", deps=["b"]), stage(agent, "b", deps=["a"])])
+
+
+def test_module_is_imported_once(agent, tmp_path):
+    path = str(tmp_path / agent)
+    assert load_agent_module(path) is load_agent_module(path)
+
+
+def test_stages_are_traced(agent, tmp_path):
+    tracer = configure()
+    report = DagExecutor([stage(agent, "traced")], root=str(tmp_path)).run()
+    assert report.ok
+    stages = [s for s in tracer.spans if s.category == "stage"]
+    assert [(s.name, s.attrs["status"]) for s in stages] == [("traced", "ok")]
+    assert any(s.category == "import" and s.parent == "traced" for s in tracer.spans)
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+from utils.instrumentation import Tracer, read_proc_io
+
+
+def busy(n=200000):
+    return sum(i * i for i in range(n))
+
+
+def test_spans_nest_and_measure(tmp_path):
+    tracer = Tracer()
+    with tracer.span("stage", category="stage"):
+        with tracer.span("step", size=3) as record:
+            busy()
+            (tmp_path / "out.bin").write_bytes(b"x" * 4096)
+            record.attrs["extra"] = True
+    inner, outer = tracer.spans
+    assert inner.parent == "stage" and outer.parent is None
+    assert inner.attrs == {"size": 3, "extra": True}
+    assert 0 < inner.wall <= outer.wall
+    assert inner.cpu > 0
+    assert inner.peak_rss_kb > 0
+    assert set(read_proc_io()) == {"read_bytes", "write_bytes"}
+
+
+def test_errors_are_recorded_and_raised():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("boom"):
+            raise ValueError("bad input")
+    assert tracer.spans[0].error == "ValueError: bad input"
+    assert tracer.summary()[0]["errors"] == 1
+
+
+def test_chrome_trace_and_summary(tmp_path):
+    tracer = Tracer()
+    for _ in range(2):
+        with tracer.span("encode", category="video", frames=10):
+            busy(1000)
+    path = tracer.write_chrome_trace(str(tmp_path / "trace.json"))
+    with open(path) as file:
+        events = json.load(file)["traceEvents"]
+    assert [event["ph"] for event in events] == ["X", "X"]
+    assert events[0]["cat"] == "video" and events[0]["args"]["frames"] == 10
+    assert events[1]["ts"] >= events[0]["ts"] + events[0]["dur"]
+    (row,) = tracer.summary()
+    assert row["count"] == 2 and row["name"] == "encode"
+    assert "video/encode" in tracer.format_summary()
+
+
+def test_profile_named_span(tmp_path):
+    tracer = Tracer(profile=["hot"], profile_dir=str(tmp_path))
+    with tracer.span("hot"):
+        busy()
+    with tracer.span("cold"):
+        busy(10)
+    assert tracer.profiles == {"hot": os.path.join(str(tmp_path), "hot.prof")}
+    assert os.path.getsize(tracer.profiles["hot"]) > 0
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("anything"):
+        pass
+    assert tracer.spans == []
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+import main
+from orchestrator import build_stages, latest_research
+from utils.artifact_store import ArtifactStore, Run
+from utils.dag_executor import load_entry
+
+LIGHT = [name for name, (_, _, _, light) in main.AGENTS.items() if light]
+
+
+def test_agents_match_the_orchestrator_stages(tmp_path):
+    run = Run(ArtifactStore(str(tmp_path)), "plan")
+    stages = {stage.name: (stage.module, stage.func) for stage in build_stages(run)}
+    assert {name: (path, entry) for name, (path, entry, _, _) in main.AGENTS.items()} == stages
+
+
+@pytest.mark.parametrize("name", LIGHT)
+def test_light_agents_skip_heavy_imports_and_stay_in_budget(name):
+    result = main.measure_import(name, repeat=2)
+    assert result["heavy"] == []
+    assert result["ms"] <= result["budget"], f"{name} imported in {result['ms']:.1f} ms"
+
+
+@pytest.mark.parametrize("name", ["voiceover", "video", "publishing"])
+def test_heavy_agents_defer_their_dependencies(name):
+    # TTS and ffmpeg-python are imported inside synthesis and rendering only.
+    result = main.measure_import(name, repeat=1)
+    assert not {"TTS", "ffmpeg"} & set(result["modules"])
+
+
+def test_run_agent_by_script_name(tmp_path, capsys):
+    output = tmp_path / "metadata.json"
+    missing = tmp_path / "missing"
+    main.main(["run", "seo_agent", "--set", "topic=New Topic", "--set", f"output_file={output}",
+               "--set", f"index_path={tmp_path / 'seo.db'}", "--set", f"outline_file={missing}",
+               "--set", f"ranking_file={missing}", "--set", f"published_file={missing}"])
+    assert json.loads(output.read_text())["title"] == "Breaking News on New Topic"
+    with pytest.raises(SystemExit):
+        main.main(["run", "no_such_agent"])
+    capsys.readouterr()
+
+
+def test_parse_params_keeps_json_types():
+    assert main.parse_params(["count=3", "tags=[\"a\"]", "topic=AI"]) == {
+        "count": 3, "tags": ["a"], "topic": "AI"}
+    with pytest.raises(SystemExit):
+        main.parse_params(["missing-equals"])
+
+
+
+def test_social_stage_promotes_once_per_run(tmp_path):
+    run = ArtifactStore(str(tmp_path / "runs")).new_run("run-1")
+    os.makedirs(run.stage_dir("seo"))
+    with open(run.path("seo", "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump({"title": "New video"}, f)
+    run.record("seo")
+    stage = next(stage for stage in build_stages(run) if stage.name == "social")
+    kwargs = dict(stage.kwargs(), queue_db=str(tmp_path / "social.db"))
+    assert kwargs["video"] == "run-1"
+    promote = load_entry(os.path.join(main.ROOT, stage.module), stage.func)
+    assert promote(**kwargs).startswith("1 post(s) scheduled")
+    assert promote(**kwargs) == "Posts for run-1 are already scheduled"
+
+
+def test_batch_topics_come_from_the_latest_researched_run(tmp_path):
+    runs = str(tmp_path / "runs")
+    assert latest_research(runs) == {}
+    run = ArtifactStore(runs).new_run("run-1")
+    os.makedirs(run.stage_dir("research"))
+    run.record("research")
+    assert latest_research(runs) == {
+        "snapshot_dir": run.stage_dir("research"),
+        "ranking_file": os.path.join(run.dir, "ranking", "ranking.json")}
@@ -0,0 +1,119 @@
+import os
+import sys
+import tempfile
+import threading
+import types
+
+from utils.dag_executor import load_agent_module
+
+scheduler = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/12_Video_Publishing_Agent/code/publish_scheduler.py"))
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make(tmp_path, clock, calls, fail=0):
+    store = scheduler.JobStore(str(tmp_path / "jobs.db"), clock=clock)
+    failures = {"left": fail}
+
+    def upload(job):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("network down")
+        calls.append(("upload", job["video_id"]))
+
+    handlers = {"reminder": lambda job: calls.append(("reminder", job["video_id"])),
+                "upload": upload}
+    return store, scheduler.PublishScheduler(store, handlers, socket_path=None, clock=clock,
+                                             retry_base=10)
+
+
+def test_reminder_then_approved_upload(tmp_path):
+    clock, calls = Clock(), []
+    store, sched = make(tmp_path, clock, calls)
+    store.schedule_video("v1", "v1.mp4", {"title": "T"}, publish_at=1000 + 3 * 3600 + 100)
+    assert sched.run_pending() == 0
+    clock.now += 200
+    assert sched.run_pending() == 1 and calls == [("reminder", "v1")]
+    store.set_approval("v1", True)
+    clock.now += 3 * 3600
+    sched.run_pending()
+    assert calls[-1] == ("upload", "v1")
+    assert store.counts() == {"done": 2}
+
+
+def test_unapproved_upload_is_held_until_approval(tmp_path):
+    clock, calls = Clock(), []
+    store, sched = make(tmp_path, clock, calls)
+    store.schedule_video("v1", "v1.mp4", {}, publish_at=1000, reminder_lead=0)
+    clock.now += 1
+    sched.run_pending()
+    assert [job["state"] for job in store.status()] == ["held"]
+    store.set_approval("v1", True)
+    sched.run_pending()
+    assert calls == [("reminder", "v1"), ("upload", "v1")]
+
+
+def test_jobs_survive_restart_and_failed_uploads_retry(tmp_path):
+    clock, calls = Clock(), []
+    store, _ = make(tmp_path, clock, calls)
+    for i in range(1000):
+        store.schedule_video(f"v{i}", "v.mp4", {}, publish_at=2000 + i)
+        store.set_approval(f"v{i}", True)
+    store.close()
+
+    store, sched = make(tmp_path, clock, calls, fail=1)
+    clock.now = 2000
+    sched.run_pending()
+    assert calls == []
+    retry = [job for job in store.status() if job["video_id"] == "v0"]
+    assert retry[0]["attempts"] == 1 and retry[0]["run_at"] == 2010
+    clock.now = 2010
+    sched.run_pending()
+    assert sorted(v for _, v in calls) == sorted(f"v{i}" for i in range(11))
+    clock.now = 4000
+    sched.run_pending()
+    assert store.counts() == {"done": 2000}
+
+
+def test_daemon_wakes_on_notify():
+    workdir = tempfile.mkdtemp()
+    store = scheduler.JobStore(os.path.join(workdir, "jobs.db"))
+    done = threading.Event()
+    socket_path = os.path.join(workdir, "s.sock")
+    daemon = scheduler.PublishScheduler(
+        store, {"reminder": lambda job: done.set(), "upload": lambda job: None},
+        socket_path=socket_path)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    try:
+        while not os.path.exists(socket_path):
+            threading.Event().wait(0.01)
+        store.schedule_video("v1", "v1.mp4", {}, publish_at=0)
+        assert scheduler.notify(socket_path)
+        assert done.wait(5)
+    finally:
+        daemon.stop()
+        thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_uploaded_videos_are_indexed_for_seo(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "PUBLISHED_FILE", str(tmp_path / "published.txt"))
+    monkeypatch.setattr(scheduler, "SEO_INDEX", str(tmp_path / "seo_index.db"))
+    monkeypatch.setitem(sys.modules, "video_publishing_agent",
+                        types.SimpleNamespace(upload_video=lambda *args: True))
+    scheduler.run_upload({"video_id": "run-1", "video_file": "v.mp4",
+                          "metadata": {"title": "Mars rover finds water", "tags": ["space"]}})
+    assert (tmp_path / "published.txt").read_text() == "Mars rover finds water\n"
+    seo_engine = load_agent_module(scheduler.SEO_ENGINE)
+    index = seo_engine.KeywordIndex(scheduler.SEO_INDEX)
+    assert index.document_count() == 1
+    index.close()
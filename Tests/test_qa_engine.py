@@ -0,0 +1,171 @@
+import json
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/10_Quality_Assurance_Agent/code")
+qa_engine = load_agent_module(os.path.join(CODE_DIR, "qa_engine.py"))
+qa_agent = load_agent_module(os.path.join(CODE_DIR, "qa_agent.py"))
+
+FFMPEG_STDERR = """\
+[silencedetect @ 0x1] silence_start: 2.5
+[silencedetect @ 0x1] silence_end: 6.75 | silence_duration: 4.25
+[Parsed_ebur128_0 @ 0x2] t: 9.9 TARGET:-23 LUFS M: -14.1 S: -14.2 I: -14.3 LUFS
+[silencedetect @ 0x1] silence_start: 9.5
+[Parsed_ebur128_0 @ 0x2] Summary:
+
+  Integrated loudness:
+    I:         -15.2 LUFS
+    Threshold: -25.4 LUFS
+
+  Loudness range:
+    LRA:         3.1 LU
+    Threshold: -35.0 LUFS
+
+  True peak:
+    Peak:        -1.8 dBFS
+"""
+
+
+def write_png(path, width, height):
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+    raw = b"".join(b"\0" + b"\0\0\0" * width for _ in range(height))
+    path.write_bytes(b"\x89PNG\r\n\x1a\n"
+                     + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                     + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+    return str(path)
+
+
+def write_metadata(path, title="Breaking News on AI", tags=("AI", "Breaking News")):
+    path.write_text(json.dumps({"title": title, "description": "About AI.", "tags": list(tags)}))
+    return str(path)
+
+
+def test_ffmpeg_output_is_parsed_from_one_pass():
+    assert qa_engine.parse_loudness(FFMPEG_STDERR) == {
+        "integrated_lufs": -15.2, "loudness_range_lu": 3.1, "true_peak_dbfs": -1.8}
+    assert qa_engine.parse_silences(FFMPEG_STDERR, 12.0) == [(2.5, 6.75), (9.5, 12.0)]
+
+
+def test_image_size_reads_png_and_jpeg_headers(tmp_path):
+    assert qa_engine.image_size(write_png(tmp_path / "t.png", 32, 18)) == (32, 18)
+    jpeg = tmp_path / "t.jpg"
+    jpeg.write_bytes(b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 4) + b"JF"
+                     + b"\xff\xc0" + struct.pack(">HBHH", 11, 8, 720, 1280) + b"\x03")
+    assert qa_engine.image_size(str(jpeg)) == (1280, 720)
+    (tmp_path / "t.gif").write_bytes(b"GIF89a")
+    with pytest.raises(ValueError):
+        qa_engine.image_size(str(tmp_path / "t.gif"))
+
+
+def test_metadata_limits(tmp_path):
+    spec = qa_engine.UploadSpec()
+    _, checks = qa_engine.metadata_checks(write_metadata(tmp_path / "ok.json"), spec)
+    assert all(c["ok"] for c in checks)
+    bad = write_metadata(tmp_path / "bad.json", title="<b>" + "x" * 120,
+                         tags=["long tag"] * 60)
+    failed = {c["check"] for c in qa_engine.metadata_checks(bad, spec)[1] if not c["ok"]}
+    assert failed == {"title_length", "no_angle_brackets", "tags_length"}
+    assert qa_engine.tags_length(["AI", "Breaking News"]) == 2 + 15 + 1
+
+
+def test_assets_are_checked_and_cached_by_hash(tmp_path, monkeypatch):
+    analyzed = []
+
+    def fake_analyze(path, spec):
+        analyzed.append(os.path.basename(path))
+        facts = {"duration": 60.0, "audio_codec": "aac", "integrated_lufs": -14.0,
+                 "true_peak_dbfs": -2.0, "silences": [[10.0, 11.0]]}
+        if path.endswith(".mp4"):
+            facts.update(video_codec="h264", resolution=[1280, 720], duration=61.0)
+        return facts
+
+    monkeypatch.setattr(qa_engine, "analyze_media", fake_analyze)
+    (tmp_path / "voice.wav").write_bytes(b"audio")
+    (tmp_path / "video.mp4").write_bytes(b"video")
+    (tmp_path / "script.txt").write_text("Hello there. [PAUSE]")
+    assets = {"voiceover": str(tmp_path / "voice.wav"), "video": str(tmp_path / "video.mp4"),
+              "thumbnail": write_png(tmp_path / "thumb.png", 1280, 720),
+              "metadata": write_metadata(tmp_path / "metadata.json"),
+              "script": str(tmp_path / "script.txt")}
+    engine = qa_engine.QAEngine(cache_dir=str(tmp_path / "cache"))
+
+    report = engine.check_assets(assets)
+    failed = [(c["asset"], c["check"]) for c in report["checks"] if not c["ok"]]
+    assert failed == [("video", "duration_matches_voiceover")]
+    assert sorted(analyzed) == ["video.mp4", "voice.wav"] and report["cached"] == []
+
+    (tmp_path / "video.mp4").write_bytes(b"video, trimmed")
+    report = engine.check_assets(assets)
+    assert sorted(analyzed) == ["video.mp4", "video.mp4", "voice.wav"]
+    assert report["cached"] == ["metadata", "script", "thumbnail", "voiceover"]
+    assert engine.stats() == {"hits": 4, "misses": 6}
+
+
+def test_missing_assets_fail_the_stage(tmp_path):
+    engine = qa_engine.QAEngine(cache_dir=None)
+    with pytest.raises(qa_agent.QualityCheckError, match="video/exists"):
+        qa_agent.run_quality_checks(
+            script_file=str(tmp_path / "none.txt"), voiceover_file=str(tmp_path / "none.wav"),
+            video_file=str(tmp_path / "none.mp4"),
+            thumbnail_file=write_png(tmp_path / "thumb.png", 1280, 720),
+            metadata_file=write_metadata(tmp_path / "metadata.json"),
+            report_file=str(tmp_path / "qa_report.json"), engine=engine)
+    report = json.loads((tmp_path / "qa_report.json").read_text())
+    assert not report["ok"] and len(report["checks"]) == 3 + 4 + 3
+
+
+def test_loudness_and_true_peak_only_warn(tmp_path, monkeypatch):
+    # A peak-normalised TTS voiceover: full-scale peak, louder than the target.
+    monkeypatch.setattr(qa_engine, "analyze_media", lambda path, spec: {
+        "duration": 30.0, "audio_codec": "pcm_s16le", "integrated_lufs": -6.0,
+        "true_peak_dbfs": 0.0, "silences": []})
+    (tmp_path / "voice.wav").write_bytes(b"audio")
+    (tmp_path / "script.txt").write_text("Hello there.")
+    engine = qa_engine.QAEngine(cache_dir=None)
+    report = qa_agent.run_quality_checks(
+        script_file=str(tmp_path / "script.txt"), voiceover_file=str(tmp_path / "voice.wav"),
+        video_file=None, thumbnail_file=write_png(tmp_path / "thumb.png", 1280, 720),
+        metadata_file=write_metadata(tmp_path / "metadata.json"),
+        report_file=str(tmp_path / "qa_report.json"), engine=engine, strict=False)
+    assert report["warnings"] == ["voiceover/loudness", "voiceover/true_peak"]
+    assert [(c["asset"], c["check"]) for c in report["checks"]
+            if not (c["ok"] or c["advisory"])] == [("video", "exists")]
+    assert "warn voiceover/true_peak 0.0 (limit -1.0)" in qa_engine.format_report(report)
+    strict = qa_engine.QAEngine(qa_engine.UploadSpec(advisory=()), cache_dir=None)
+    assert not strict.check_assets({"voiceover": str(tmp_path / "voice.wav")})["ok"]
+    assert engine.check_assets({"voiceover": str(tmp_path / "voice.wav")})["ok"]
+
+
+def test_missing_ffmpeg_is_reported_as_a_failed_check(tmp_path, monkeypatch):
+    def no_ffmpeg(path, spec):
+        raise ImportError("No module named 'ffmpeg'")
+
+    monkeypatch.setattr(qa_engine, "analyze_media", no_ffmpeg)
+    (tmp_path / "video.mp4").write_bytes(b"video")
+    engine = qa_engine.QAEngine(cache_dir=str(tmp_path / "cache"))
+    report = engine.check_assets({"video": str(tmp_path / "video.mp4")})
+    assert not report["ok"]
+    assert [(c["check"], c["ok"]) for c in report["checks"]] == [("analysis", False)]
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_analysis_of_a_real_file(tmp_path):
+    pytest.importorskip("ffmpeg")
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg not found on PATH")
+    path = str(tmp_path / "tone.wav")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i",
+                    "sine=frequency=440:duration=3,apad=pad_dur=5", path], check=True)
+    facts = qa_engine.analyze_media(path, qa_engine.UploadSpec())
+    assert facts["duration"] == pytest.approx(8.0, abs=0.1)
+    assert facts["silences"] and facts["silences"][0][0] == pytest.approx(3.0, abs=0.1)
+    assert facts["integrated_lufs"] < 0
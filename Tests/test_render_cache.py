@@ -0,0 +1,65 @@
+import os
+
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/5_Video_Creation_Editing_Agent/code")
+render_cache = load_agent_module(os.path.join(CODE_DIR, "render_cache.py"))
+render_graph = load_agent_module(os.path.join(CODE_DIR, "render_graph.py"))
+
+
+def inputs(tmp_path, audio=b"audio", script="Hello."):
+    (tmp_path / "voice.wav").write_bytes(audio)
+    (tmp_path / "script.txt").write_text(script)
+    return str(tmp_path / "voice.wav"), str(tmp_path / "script.txt")
+
+
+def test_key_changes_with_any_input(tmp_path):
+    audio, script = inputs(tmp_path)
+    settings = render_graph.RenderSettings()
+    key = render_cache.RenderCache.key(audio, script, settings)
+    assert key == render_cache.RenderCache.key(audio, script, render_graph.RenderSettings())
+    assert key != render_cache.RenderCache.key(audio, script,
+                                               render_graph.RenderSettings(fontsize=40))
+    (tmp_path / "script.txt").write_text("Changed.")
+    assert key != render_cache.RenderCache.key(audio, script, settings)
+
+
+def test_hit_places_video_without_sharing_writes(tmp_path):
+    cache = render_cache.RenderCache(str(tmp_path / "cache"))
+    rendered = tmp_path / "render.mp4"
+    rendered.write_bytes(b"video")
+    assert cache.fetch("k", str(tmp_path / "out.mp4")) is None
+    cache.store("k", str(rendered), {"encode_time": 3.0})
+    assert cache.fetch("k", str(tmp_path / "out.mp4")) == {"encode_time": 3.0}
+    assert (tmp_path / "out.mp4").read_bytes() == b"video"
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_eviction_keeps_recent_renders_within_budget(tmp_path):
+    cache = render_cache.RenderCache(str(tmp_path / "cache"), max_bytes=15)
+    for index, key in enumerate(["old", "new"]):
+        video = tmp_path / f"{key}.mp4"
+        video.write_bytes(b"x" * 10)
+        cache.store(key, str(video), {})
+        os.utime(tmp_path / "cache" / f"{key}.mp4", (index, index))
+    cache._evict()
+    assert sorted(os.listdir(tmp_path / "cache")) == ["new.json", "new.mp4"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_render_script_video_skips_encoding_on_hit(tmp_path, monkeypatch):
+    audio, script = inputs(tmp_path)
+    cache = render_cache.RenderCache(str(tmp_path / "cache"))
+    settings = render_graph.RenderSettings()
+    cached_video = tmp_path / "cached.mp4"
+    cached_video.write_bytes(b"video")
+    cache.store(cache.key(audio, script, settings), str(cached_video), {"encoder_fps": 50.0})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should not encode")
+
+    monkeypatch.setattr(render_graph, "render_video", fail)
+    stats = render_graph.render_script_video(audio, script, str(tmp_path / "out.mp4"),
+                                             settings, cache=cache)
+    assert stats["cache"] == "hit" and stats["encode_time"] == 0.0
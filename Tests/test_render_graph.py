@@ -0,0 +1,66 @@
+import json
+import os
+import wave
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+render_graph = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/5_Video_Creation_Editing_Agent/code/render_graph.py"))
+
+
+def write_wav(path, seconds, rate=8000):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\0\0" * int(seconds * rate))
+
+
+def test_timeline_comes_from_voiceover_segments(tmp_path):
+    segments = [{"text": "Hello there.", "start": 0.0, "duration": 1.5},
+                {"text": "Second line.", "start": 2.1, "duration": 1.0}]
+    with open(tmp_path / "voice_segments.json", "w") as f:
+        json.dump({"duration": 3.1, "segments": segments}, f)
+    timeline = render_graph.load_timeline(str(tmp_path / "voice.wav"), "unused.txt")
+    assert timeline == {"duration": 3.1, "segments": segments}
+
+
+def test_timeline_falls_back_to_wav_header(tmp_path):
+    write_wav(tmp_path / "voice.wav", 4.0)
+    (tmp_path / "script.txt").write_text("Short one. [PAUSE]\nA much longer sentence.")
+    timeline = render_graph.load_timeline(str(tmp_path / "voice.wav"),
+                                          str(tmp_path / "script.txt"))
+    assert timeline["duration"] == pytest.approx(4.0)
+    texts = [s["text"] for s in timeline["segments"]]
+    assert texts == ["Short one.", "A much longer sentence."]
+    assert sum(s["duration"] for s in timeline["segments"]) == pytest.approx(4.0)
+
+
+def test_captions_are_wrapped_and_clamped():
+    segments = [{"text": "word " * 20, "start": 0.0, "duration": 2.0},
+                {"text": "   ", "start": 2.0, "duration": 1.0},
+                {"text": "tail", "start": 3.0, "duration": 5.0}]
+    captions = render_graph.build_captions(segments, duration=4.0, wrap_width=30)
+    assert len(captions) == 2
+    assert all(len(line) <= 30 for line in captions[0]["text"].splitlines())
+    assert captions[1] == {"text": "tail", "start": 3.0, "end": 4.0}
+
+
+def test_parse_encoder_fps():
+    stderr = "frame=  10 fps=5.0 q=0.0\rframe=  90 fps= 41 q=-1.0 Lsize=..."
+    assert render_graph.parse_encoder_fps(stderr) == 41.0
+    assert render_graph.parse_encoder_fps("no progress") is None
+
+
+def test_caption_errors_surface_unchanged(tmp_path, monkeypatch):
+    pytest.importorskip("ffmpeg")
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(render_graph, "add_captions", broken)
+    with pytest.raises(OSError, match="disk full"):
+        render_graph.render_video(str(tmp_path / "voice.wav"), [], 1.0,
+                                  str(tmp_path / "final_video.mp4"))
@@ -1,6 +1,22 @@
-import pytest  
-from Agents.Scriptwriting_Agent.code.scriptwriting_agent import generate_script  
+import os
 
-def test_script_generation():  
-    script = generate_script({"topic": "AI"})  
-    assert "AI" in script, "Topic missing in script"  
+from utils.dag_executor import load_agent_module
+
+scriptwriting = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py"))
+
+
+def test_script_generation(tmp_path):
+    output = tmp_path / "script_outline.txt"
+    assert scriptwriting.generate_script_outline("AI", output_file=str(output)) == str(output)
+    script = output.read_text()
+    assert "AI" in script, "Topic missing in script"
+    assert script.count("[PAUSE]") == 4
+
+
+def test_topics_come_from_the_csv_without_a_snapshot(tmp_path):
+    trending = tmp_path / "trending_topics.txt"
+    trending.write_text("AI\n\n\"Space, the final frontier\"\n")
+    topics = scriptwriting.load_trending_topics(str(trending), str(tmp_path / "missing"))
+    assert topics == ["AI", "Space, the final frontier"]
@@ -0,0 +1,43 @@
+import os
+
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/5_Video_Creation_Editing_Agent/code")
+segmented = load_agent_module(os.path.join(CODE_DIR, "segmented_render.py"))
+render_graph = load_agent_module(os.path.join(CODE_DIR, "render_graph.py"))
+
+
+def captions(n, length=10.0):
+    return [{"text": f"line {i}", "start": i * length, "end": (i + 1) * length}
+            for i in range(n)]
+
+
+def test_chunks_end_on_caption_boundaries_and_cover_every_frame():
+    chunks = segmented.plan_chunks(captions(10), duration=100.0, fps=30, chunk_seconds=25)
+    assert [c["start"] for c in chunks] == [0.0, 30.0, 60.0, 90.0]
+    assert sum(c["frames"] for c in chunks) == 3000
+    second = chunks[1]["captions"]
+    assert second[0] == {"text": "line 3", "start": 0.0, "end": 10.0}
+    assert len(second) == 3
+
+
+def test_caption_spanning_boundary_is_split_between_chunks():
+    timeline = [{"text": "long", "start": 0.0, "end": 95.0}]
+    chunks = segmented.plan_chunks(timeline, duration=100.0, fps=25, chunk_seconds=40)
+    assert [c["frames"] for c in chunks] == [1000, 1375, 125]
+    assert chunks[1]["captions"] == [{"text": "long", "start": 0.0, "end": 55.0}]
+    assert chunks[2]["captions"] == []
+
+
+def test_checkpoint_survives_restart(tmp_path):
+    settings = render_graph.RenderSettings()
+    chunk = segmented.plan_chunks(captions(2), 20.0, 30, 60)[0]
+    key = segmented.chunk_key(chunk, settings)
+    chunk_file = str(tmp_path / "chunk.mp4")
+    open(chunk_file, "w").close()
+    segmented.Checkpoint(str(tmp_path)).mark_done(key, chunk_file)
+    resumed = segmented.Checkpoint(str(tmp_path))
+    assert resumed.is_done(key, chunk_file)
+    assert not resumed.is_done(segmented.chunk_key(chunk, render_graph.RenderSettings(crf=18)),
+                               chunk_file)
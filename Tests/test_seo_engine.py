@@ -0,0 +1,91 @@
+import json
+import os
+
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/7_SEO_Metadata_Optimization_Agent/code")
+seo_engine = load_agent_module(os.path.join(CODE_DIR, "seo_engine.py"))
+seo_agent = load_agent_module(os.path.join(CODE_DIR, "seo_agent.py"))
+
+OUTLINE = """Video Title: Breaking News on {topic}
+
+Script Outline:
+1. Introduction: Briefly introduce the trending topic. [PAUSE]
+2. Background: Provide context and background on {topic}. [PAUSE]
+3. Analysis: Discuss the implications and various viewpoints. [PAUSE]
+4. Conclusion: Summarize the key points and invite viewers to comment. [PAUSE]
+"""
+
+
+def engine(tmp_path):
+    return seo_engine.SEOEngine(seo_engine.KeywordIndex(str(tmp_path / "seo.db")))
+
+
+def test_terms_and_outline_parsing():
+    terms = seo_engine.extract_terms("AI chips. The export ban on AI chips")
+    assert terms["ai chips"] == 2 and terms["export ban"] == 1
+    assert "chips export" not in terms and "the" not in terms
+    topic, sections = seo_engine.parse_outline(OUTLINE.format(topic="Mars Rover"))
+    assert topic == "Mars Rover" and len(sections) == 4
+    assert seo_engine.section_text(sections[1]) == "Provide context and background on Mars Rover."
+
+
+def test_index_statistics_update_incrementally(tmp_path):
+    index = engine(tmp_path).index
+    index.add_documents([("v1", "video", "Mars rover lands", 1.0),
+                         ("v2", "video", "Mars weather", 1.0),
+                         ("t1", "trend", "Mars rover", 0.5)])
+    assert index.lookup(["mars", "mars rover", "unknown"]) == {
+        "mars": (2, 0.5), "mars rover": (1, 0.5)}
+    index.add_documents([("t1", "trend", "Mars rover", 0.8)])
+    index.remove("v2")
+    assert index.lookup(["mars"]) == {"mars": (1, 0.8)}
+    assert index.document_count() == 1
+    assert index.related(["mars"])[:2] == ["mars", "mars rover"]
+
+
+def test_published_titles_are_indexed_once(tmp_path):
+    index = engine(tmp_path).index
+    published = tmp_path / "published_topics.txt"
+    published.write_text("Mars rover\nAI chips\nhalf-writ")
+    assert index.sync_published(str(published)) == 2
+    assert index.sync_published(str(published)) == 0
+    with open(published, "a") as file:
+        file.write("ten\n")
+    assert index.sync_published(str(published)) == 1
+    assert index.lookup(["half-written"]) == {"half-written": (1, 0.0)}
+
+
+def test_batch_metadata_uses_trends_and_past_videos(tmp_path):
+    seo = engine(tmp_path)
+    seo.index_trends({"AI chips export ban": 0.9, "Mars rover": 0.2})
+    seo.index_video("v1", {"title": "Mars rover finds water", "tags": ["space"]})
+    first, second = seo.generate_batch(
+        [{"outline": OUTLINE.format(topic="Nvidia AI chips")},
+         {"outline": OUTLINE.format(topic="Mars rover landing"), "topic": "Mars rover landing"}])
+    assert first["topic"] == "Nvidia AI chips"
+    assert first["title"].startswith("Nvidia AI chips: ") and "Export" in first["title"]
+    assert "export ban" in first["tags"] and first["tags"][0] == "Nvidia AI chips"
+    assert "#NvidiaAIChips" in first["description"]
+    assert "finds water" in second["tags"]
+    for metadata in (first, second):
+        assert len(metadata["title"]) <= seo_engine.MAX_TITLE_CHARS
+        assert seo_engine.tags_length(metadata["tags"]) <= seo_engine.MAX_TAGS_CHARS
+        assert "background" not in metadata["tags"]
+    # Generated scripts are learned, so their words count as already used.
+    assert seo.index.document_count() == 3
+
+
+def test_optimize_metadata_reads_outline_and_ranking(tmp_path):
+    outline = tmp_path / "script_outline.txt"
+    outline.write_text(OUTLINE.format(topic="Nvidia AI chips"))
+    ranking = tmp_path / "ranking.json"
+    ranking.write_text(json.dumps({"topics": [{"topic": "AI chips export ban", "score": 0.9}]}))
+    output = tmp_path / "metadata.json"
+    seo_agent.optimize_metadata(output_file=str(output), outline_file=str(outline),
+                                ranking_file=str(ranking),
+                                published_file=str(tmp_path / "none.txt"),
+                                index_path=str(tmp_path / "seo.db"))
+    metadata = json.loads(output.read_text())
+    assert metadata["topic"] == "Nvidia AI chips" and "export ban" in metadata["tags"]
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/8_Social_Media_Promotion_Agent/code")
+social_queue = load_agent_module(os.path.join(CODE_DIR, "social_queue.py"))
+social_endpoint = load_agent_module(os.path.join(CODE_DIR, "social_endpoint.py"))
+social_agent = load_agent_module(os.path.join(CODE_DIR, "social_agent.py"))
+
+NOW = 1735689600.0
+
+
+@pytest.fixture
+def queue(tmp_path):
+    store = social_queue.PostQueue(str(tmp_path / "social.db"))
+    yield store
+    store.close()
+
+
+def test_templates_fit_platform_limits():
+    assert social_queue.render("YouTube", "Big news") == "🎥 New Video!\nBig news"
+    assert social_queue.render("Mastodon", "Big news") == "📱 Big news"
+    post = social_queue.render("twitter", "word " * 100, url="https://youtu.be/x",
+                               tags=["breaking news", "AI", "ai"])
+    assert len(post) == 280
+    assert post.endswith("… https://youtu.be/x #BreakingNews #AI")
+    assert social_queue.render("facebook", "Big news") == "Big news"
+
+
+def test_fan_out_is_one_batch_per_video(queue):
+    ids = queue.fan_out("New video", ["youtube", "twitter", "instagram"], NOW,
+                        batch="video-1", stagger=60, tags=["AI"])
+    assert all(ids.values())
+    assert queue.fan_out("New video", ["twitter", "facebook"], NOW, batch="video-1") == {
+        "twitter": None, "facebook": ids["instagram"] + 1}
+    assert [(post.platform, post.due_at) for post in queue.due(NOW + 3600)] == [
+        ("youtube", NOW), ("facebook", NOW), ("twitter", NOW + 60), ("instagram", NOW + 120)]
+    assert queue.due(NOW + 60, exclude=["youtube", "facebook"])[0].platform == "twitter"
+
+
+def test_dispatcher_sends_in_time_order_under_platform_limits(queue):
+    for index in range(4):
+        queue.enqueue("twitter", f"t{index}", NOW + index)
+    queue.enqueue("instagram", "i0", NOW + 10)
+    queue.enqueue("twitter", "later", NOW + 3600)
+    clock = [0.0]
+    sent = []
+
+    def send(post):
+        sent.append(post.content)
+        return f"remote-{post.id}"
+
+    dispatcher = social_queue.Dispatcher(queue, send, limits={"twitter": (1.0, 2)},
+                                         clock=lambda: clock[0])
+    # Twitter runs out of tokens, but Instagram is not held up behind it.
+    assert dispatcher.run_once(NOW + 60) == 3
+    assert sent == ["t0", "t1", "i0"]
+    clock[0] += 2
+    assert dispatcher.run_once(NOW + 60) == 2 and sent[3:] == ["t2", "t3"]
+    assert queue.counts() == {"sent": 5, "pending": 1}
+    assert queue.get(1).remote_id == "remote-1"
+
+
+def test_failed_posts_are_retried_then_given_up(queue):
+    endpoint = social_endpoint.LocalSocialEndpoint(fail_requests=[1]).start()
+    try:
+        post_id = queue.enqueue("instagram", "hello", NOW)
+        dispatcher = social_queue.Dispatcher(queue, social_endpoint.HttpPoster(endpoint.url),
+                                             retry_base=30, max_attempts=2)
+        assert dispatcher.run_once(NOW) == 0
+        post = queue.get(post_id)
+        assert (post.status, post.attempts, post.due_at) == ("pending", 1, NOW + 30)
+        assert dispatcher.run_once(NOW + 30) == 1
+        assert endpoint.posts[0]["platform"] == "instagram"
+        assert queue.get(post_id).remote_id == endpoint.posts[0]["id"]
+    finally:
+        endpoint.stop()
+
+    def down(post):
+        raise social_endpoint.PostError("down")
+
+    failing = social_queue.Dispatcher(queue, down, max_attempts=1)
+    post_id = queue.enqueue("twitter", "bye", NOW)
+    failing.run_once(NOW)
+    assert queue.get(post_id)[4:] == ("failed", 1, None, None, "down")
+
+
+def test_claimed_posts_are_recovered(queue):
+    post_id = queue.enqueue("youtube", "x", NOW)
+    assert queue.claim(post_id) and not queue.claim(post_id)
+    assert queue.recover() == 1 and queue.get(post_id).status == "pending"
+
+
+def test_schedule_post_queues_without_collisions(tmp_path):
+    db = str(tmp_path / "social.db")
+    first = social_agent.schedule_post("Breaking News", "YouTube", queue_db=db)
+    social_agent.schedule_post("Breaking News again", "YouTube", queue_db=db)
+    assert first.startswith("Post scheduled for ") and first.endswith(" on YouTube")
+    queue = social_queue.PostQueue(db)
+    assert [post.content for post in queue.posts()] == [
+        "🎥 New Video!\nBreaking News", "🎥 New Video!\nBreaking News again"]
+    queue.close()
+    message = social_agent.promote_video("New", ["youtube", "twitter"], video="v1", queue_db=db)
+    assert message.startswith("2 post(s) scheduled")
+    assert social_agent.promote_video("New", ["twitter"], video="v1", queue_db=db) == (
+        "Posts for v1 are already scheduled")
@@ -0,0 +1,58 @@
+import os
+import wave
+
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/4_Voiceover_Audio_Agent/code")
+cache_module = load_agent_module(os.path.join(CODE_DIR, "synthesis_cache.py"))
+chunked = load_agent_module(os.path.join(CODE_DIR, "chunked_synthesis.py"))
+
+PARAMS = (1, 2, 16000)
+
+
+class CountingServer:
+    def __init__(self):
+        self.texts = []
+
+    def synthesize(self, text, path, speaker):
+        self.texts.append(text)
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\0\0" * 160 * len(text))
+
+
+def test_key_ignores_whitespace_but_not_speaker():
+    key = cache_module.SynthesisCache.key
+    assert key("m", "p227", "Hello  world\n") == key("m", "p227", " Hello world")
+    assert key("m", "p227", "Hello world") != key("m", "p225", "Hello world")
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = cache_module.SynthesisCache(str(tmp_path), max_bytes=2500)
+    cache.put("a", PARAMS, b"\0" * 1000)
+    cache.put("b", PARAMS, b"\0" * 1000)
+    os.utime(tmp_path / "a.wav", (1, 1))
+    os.utime(tmp_path / "b.wav", (2, 2))
+    assert cache.get("a") is not None  # refreshes "a", so "b" is now oldest
+    cache.put("c", PARAMS, b"\0" * 1000)
+    assert cache.get("b") is None
+    assert cache.get("a")[1] == b"\0" * 1000
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["size_bytes"] <= 2500
+
+
+def test_rerun_only_synthesizes_changed_segments(tmp_path):
+    cache = cache_module.SynthesisCache(str(tmp_path / "cache"))
+    server = CountingServer()
+    first = chunked.synthesize_chunked("Intro line. Topic one. Outro line.",
+                                       str(tmp_path / "a.wav"), server=server, cache=cache)
+    second = chunked.synthesize_chunked("Intro line. Topic two. Outro line.",
+                                        str(tmp_path / "b.wav"), server=server, cache=cache)
+    assert first["cache_misses"] == 3
+    assert second["cache_hits"] == 2 and second["cache_misses"] == 1
+    assert server.texts[3:] == ["Topic two."]
+    assert second["duration"] == first["duration"]
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from utils.dag_executor import load_agent_module  # noqa: E402
+
+engine = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/6_Thumbnail_Graphic_Design_Agent/code/thumbnail_engine.py"))
+
+
+def test_long_titles_are_wrapped_inside_the_margin():
+    from PIL import ImageDraw
+    # The bundled font, so the result does not depend on system fonts.
+    template = engine.ThumbnailTemplate(font_path=engine.DEFAULT_FONT)
+    assert os.path.exists(template.font_path)
+    img = engine.base_layer(template)
+    title = "An extremely long title about artificial intelligence " * 3
+    font, lines, _ = engine.fit_text(ImageDraw.Draw(img), title, template)
+    assert len(lines) > 1
+    draw = ImageDraw.Draw(img)
+    for line in lines:
+        left, _, right, _ = draw.textbbox((0, 0), line, font=font)
+        assert right - left <= template.size[0] - 2 * template.margin
+
+
+def test_missing_font_scales_or_fails_loudly(tmp_path):
+    missing = str(tmp_path / "missing.ttf")
+    try:
+        font = engine.get_font(missing, 64)
+    except OSError as error:
+        assert missing in str(error)
+    else:
+        assert font.getbbox("Title")[3] > engine.get_font(missing, 16).getbbox("Title")[3]
+
+
+def test_base_layer_is_cached_but_copied():
+    template = engine.ThumbnailTemplate(gradient_to=(200, 0, 0))
+    first, second = engine.base_layer(template), engine.base_layer(template)
+    assert first is not second
+    assert engine._base_layer.cache_info().hits >= 1
+    assert first.getpixel((0, 719))[0] > first.getpixel((0, 0))[0]
+
+
+def test_jpeg_quality_drops_to_meet_size_target():
+    img = engine.render_thumbnail("Size target")
+    large = engine.encode_image(img, "jpg", quality=95, max_bytes=None)
+    small = engine.encode_image(img, "jpg", quality=95, max_bytes=len(large) - 1)
+    assert len(small) < len(large)
+
+
+def test_batch_renders_every_title_in_order(tmp_path):
+    titles = ["First idea", "Second idea", "Third idea"]
+    paths = engine.generate_thumbnails(titles, str(tmp_path), fmt="png", workers=2)
+    assert [os.path.basename(p) for p in paths] == [
+        "0001_first_idea.png", "0002_second_idea.png", "0003_third_idea.png"]
+    assert all(os.path.getsize(p) > 0 for p in paths)
@@ -0,0 +1,41 @@
+import json
+import os
+
+import pytest
+
+from utils.dag_executor import load_agent_module
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/1_Content_Research_Agent/code")
+ranker = load_agent_module(os.path.join(CODE_DIR, "topic_ranker.py"))
+
+
+def test_novelty_penalizes_published_overlap():
+    published = ["Breaking News on Asap Rocky", "The Rise of Quantum Computing"]
+    scores = ranker.novelty(["Asap Rocky", "quantum computing jobs", "Mars rover"], published)
+    assert scores == [0.0, 0.5, 1.0]
+
+
+def test_rank_prefers_rising_recent_novel_topics(tmp_path):
+    pytest.importorskip("numpy")
+    from utils.trends_columnar import write_matrix
+
+    timestamps = [f"2025-01-01T{h:02d}:00:00" for h in range(8)]
+    values = [[5, 10, 20, 30, 45, 60, 80, 100],   # rising
+              [100, 80, 60, 40, 30, 20, 10, 5],   # fading
+              [5, 10, 20, 30, 45, 60, 80, 100],   # rising but already published
+              [20, 20, 20, 20, 20, 20, 20, 20]]   # flat
+    write_matrix(str(tmp_path), ["rising", "fading", "old news", "flat"], timestamps, values)
+    published = tmp_path / "published.txt"
+    published.write_text("old news\n")
+
+    path = ranker.rank_snapshot(str(tmp_path), str(published))
+    with open(path, "r", encoding="utf-8") as file:
+        ranking = json.load(file)
+    assert [t["topic"] for t in ranking["topics"]] == ["rising", "old news", "flat", "fading"]
+    mtime = os.path.getmtime(path)
+    assert ranker.rank_snapshot(str(tmp_path), str(published)) == path
+    assert os.path.getmtime(path) == mtime
+
+    top = ranker.rank_topics(ranker.load_trends_matrix(str(tmp_path)), top_n=1)
+    assert [t["topic"] for t in top] == ["rising"]
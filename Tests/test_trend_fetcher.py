@@ -0,0 +1,128 @@
+import os
+import threading
+
+import pytest
+
+from utils.dag_executor import load_agent_module
+from utils.rate_limit import BudgetExceeded, RateLimiter, RequestBudget, SharedBackoff
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/1_Content_Research_Agent/code")
+fetcher_module = load_agent_module(os.path.join(CODE_DIR, "trend_fetcher.py"))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Records:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def to_dict(self, orient):
+        assert orient == "records"
+        return self.rows
+
+
+class FakeFrame:
+    """Minimal stand-in for the pandas frame pytrends returns."""
+
+    def __init__(self, keywords):
+        self.rows = [dict({k: len(k) for k in keywords}, date="2025-01-01T00:00:00",
+                          isPartial=False)]
+        self.empty = False
+
+    def reset_index(self):
+        return Records(self.rows)
+
+
+class FakeClient:
+    def __init__(self, calls, throttle_first=0):
+        self.calls = calls
+        self.throttle_first = throttle_first
+        self.keywords = []
+
+    def build_payload(self, kw_list, **kwargs):
+        self.keywords = list(kw_list)
+
+    def interest_over_time(self):
+        with self.calls["lock"]:
+            self.calls["count"] += 1
+            count = self.calls["count"]
+        if count <= self.throttle_first:
+            raise fetcher_module.ThrottledError("429")
+        return FakeFrame(self.keywords)
+
+
+def make_fetcher(throttle_first=0, **kwargs):
+    calls = {"count": 0, "lock": threading.Lock()}
+    fetcher = fetcher_module.TrendBatchFetcher(
+        client_factory=lambda: FakeClient(calls, throttle_first),
+        requests_per_minute=600000, burst=100,
+        backoff=SharedBackoff(base=0.001, maximum=0.01), **kwargs)
+    return fetcher, calls
+
+
+def test_rate_limiter_spaces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_budget_and_shared_backoff():
+    budget = RequestBudget(2)
+    budget.consume()
+    budget.consume()
+    with pytest.raises(BudgetExceeded):
+        budget.consume()
+    clock = FakeClock()
+    backoff = SharedBackoff(base=1.0, maximum=4.0, jitter=0.0, clock=clock, sleep=clock.sleep)
+    assert [backoff.failure() for _ in range(4)] == [1.0, 2.0, 4.0, 4.0]
+    assert backoff.wait() == pytest.approx(4.0)
+    assert backoff.wait() == 0.0
+
+
+def test_chunk_topics_dedupes_into_five_keyword_payloads():
+    topics = [f"t{i}" for i in range(12)] + ["t0", " "]
+    batches = fetcher_module.chunk_topics(topics)
+    assert [len(batch) for batch in batches] == [5, 5, 2]
+
+
+def test_fetch_groups_topics_and_retries_throttled_batches():
+    fetcher, calls = make_fetcher(throttle_first=2, max_workers=3)
+    topics = [f"topic {i}" for i in range(23)]
+    result = fetcher.fetch(topics)
+    assert sorted(result.trends) == sorted(topics)
+    assert result.throttled == 2
+    assert result.requests == calls["count"] == 5 + 2
+    assert result.trends["topic 3"][0]["topic 3"] == len("topic 3")
+    assert not result.failed and not result.skipped
+
+
+def test_budget_skips_remaining_topics():
+    fetcher, _ = make_fetcher(max_workers=1, budget=2)
+    result = fetcher.fetch([f"topic {i}" for i in range(15)])
+    assert result.requests == 2
+    assert len(result.trends) == 10
+    assert result.skipped == [f"topic {i}" for i in range(10, 15)]
+
+
+def test_stub_client_round_trip():
+    pytest.importorskip("pandas")
+    state = {"requests": 0}
+    fetcher = fetcher_module.TrendBatchFetcher(
+        client_factory=lambda: fetcher_module.StubTrendsClient(throttle_every=4, state=state),
+        max_workers=4, requests_per_minute=600000, burst=100,
+        backoff=SharedBackoff(base=0.001, maximum=0.01))
+    result = fetcher.fetch([f"topic {i}" for i in range(40)])
+    assert len(result.trends) == 40 and result.throttled >= 1
+    assert len(result.trends["topic 0"]) == 24
@@ -0,0 +1,40 @@
+import json
+import os
+
+import pytest
+
+from utils.trends_columnar import (HEADER_FILE, build_matrix, load_snapshot_topics,
+                                   load_trends_matrix, write_snapshot)
+
+TRENDS = {
+    "ai": [{"date": "2025-01-01T00:00:00", "ai": 10, "isPartial": False},
+           {"date": "2025-01-01T01:00:00", "ai": 90, "isPartial": True}],
+    "robots": [{"date": "2025-01-01T01:00:00", "robots": 40, "isPartial": True}],
+    "empty": [],
+}
+
+
+def test_build_matrix_aligns_on_union_of_timestamps():
+    topics, timestamps, partial, rows = build_matrix(TRENDS)
+    assert topics == ["ai", "robots"]
+    assert timestamps == ["2025-01-01T00:00:00", "2025-01-01T01:00:00"]
+    assert partial == [False, True]
+    assert rows == [[10, 90], [0, 40]]
+
+
+def test_topics_load_without_reading_matrix(tmp_path):
+    header = {"version": 1, "topics": ["ai"], "timestamps": [], "partial": []}
+    (tmp_path / HEADER_FILE).write_text(json.dumps(header))
+    assert load_snapshot_topics(str(tmp_path)) == ["ai"]
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path):
+    np = pytest.importorskip("numpy")
+    write_snapshot(str(tmp_path), TRENDS, geo="IN")
+    write_snapshot(str(tmp_path), TRENDS, geo="IN")
+    assert len([n for n in os.listdir(tmp_path) if n.startswith("values-")]) == 1
+    snapshot = load_trends_matrix(str(tmp_path))
+    assert isinstance(snapshot.values, np.memmap)
+    assert snapshot.values.dtype == np.uint8
+    assert snapshot.series("robots").tolist() == [0, 40]
+    assert snapshot.header["geo"] == "IN"
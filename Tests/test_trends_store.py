@@ -0,0 +1,111 @@
+import os
+import threading
+from datetime import datetime
+
+from utils.dag_executor import load_agent_module
+from utils.rate_limit import SharedBackoff
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Agents/1_Content_Research_Agent/code")
+store_module = load_agent_module(os.path.join(CODE_DIR, "trends_store.py"))
+fetcher_module = load_agent_module(os.path.join(CODE_DIR, "trend_fetcher.py"))
+
+NOW = datetime(2025, 1, 2, 12).timestamp() - datetime(1970, 1, 1).timestamp()
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def hourly(topic, start_hour, values):
+    return [{"date": f"2025-01-02T{start_hour + i:02d}:00:00", topic: v, "isPartial": False}
+            for i, v in enumerate(values)]
+
+
+def test_ttl_hit_then_incremental_window(tmp_path):
+    clock = Clock(NOW)
+    store = store_module.TrendsStore(str(tmp_path / "t.db"), ttl=600, clock=clock)
+    assert store.get("ai", "now 1-d", "IN") is None
+    store.merge("ai", "now 1-d", "IN", hourly("ai", 8, [10, 20, 40]))
+    assert [r["ai"] for r in store.get("ai", "now 1-d", "IN")] == [10, 20, 40]
+    clock.now += 3600
+    assert store.get("ai", "now 1-d", "IN") is None
+    assert store.refresh_window("ai", "now 1-d", "IN") == "2025-01-02T10 2025-01-02T13"
+    assert store.stats()["hit_rate"] == 1 / 3
+
+
+def test_incremental_merge_rescales_and_keeps_step(tmp_path):
+    store = store_module.TrendsStore(str(tmp_path / "t.db"), clock=Clock(NOW))
+    store.merge("ai", "now 1-d", "IN", hourly("ai", 8, [10, 20, 40]))
+    # The short window comes back at 30-minute resolution and its own 0-100 scale.
+    fresh = [{"date": "2025-01-02T10:00:00", "ai": 50, "isPartial": False},
+             {"date": "2025-01-02T10:30:00", "ai": 70, "isPartial": False},
+             {"date": "2025-01-02T11:00:00", "ai": 100, "isPartial": True}]
+    store.merge("ai", "now 1-d", "IN", fresh, incremental=True)
+    records = store.records("ai", "now 1-d", "IN")
+    assert [(r["date"][11:16], r["ai"]) for r in records] == [
+        ("08:00", 10), ("09:00", 20), ("10:00", 40), ("11:00", 80)]
+    assert records[-1]["isPartial"]
+
+
+def test_rolling_window_prunes_old_points(tmp_path):
+    store = store_module.TrendsStore(str(tmp_path / "t.db"), clock=Clock(NOW))
+    old = [{"date": "2024-12-30T00:00:00", "ai": 5, "isPartial": False}]
+    store.merge("ai", "now 1-d", "IN", old + hourly("ai", 8, [1]))
+    assert [r["date"] for r in store.records("ai", "now 1-d", "IN")] == ["2025-01-02T08:00:00"]
+
+
+class Frame:
+    empty = False
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def reset_index(self):
+        return self
+
+    def to_dict(self, orient):
+        return self.rows
+
+
+class Client:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def build_payload(self, kw_list, timeframe, **kwargs):
+        self.payloads.append((tuple(kw_list), timeframe))
+        self.keywords = kw_list
+
+    def interest_over_time(self):
+        return Frame([dict({k: 30 for k in self.keywords}, date="2025-01-02T11:00:00")])
+
+
+def test_batch_fetcher_serves_fresh_topics_from_store(tmp_path):
+    clock = Clock(NOW)
+    store = store_module.TrendsStore(str(tmp_path / "t.db"), ttl=600, clock=clock)
+    payloads = []
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            return Client(payloads)
+
+    def make():
+        return fetcher_module.TrendBatchFetcher(
+            client_factory=factory, requests_per_minute=600000, burst=100, store=store,
+            backoff=SharedBackoff(base=0.001))
+
+    topics = [f"t{i}" for i in range(7)]
+    make().fetch(topics[:5])
+    result = make().fetch(topics)
+    assert sorted(result.cached) == topics[:5]
+    assert sorted(result.trends) == topics
+    assert payloads[-1] == (("t5", "t6"), "now 1-d")
+    clock.now += 3600
+    make().fetch(topics[:2])
+    assert payloads[-1] == (("t0", "t1"), "2025-01-02T11 2025-01-02T13")
+    assert store.stats()["requests_saved"] == 1
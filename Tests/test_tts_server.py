@@ -0,0 +1,70 @@
+import os
+import threading
+import wave
+
+import pytest
+from utils.dag_executor import load_agent_module
+
+tts_server = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/4_Voiceover_Audio_Agent/code/tts_server.py"))
+
+
+class StubModel:
+    """Writes 0.1s of silence per word at 16 kHz."""
+
+    def __init__(self, loads):
+        loads.append(1)
+
+    def tts_to_file(self, text, file_path, speaker):
+        if not text:
+            raise ValueError("empty text")
+        with wave.open(file_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\0\0" * 1600 * len(text.split()))
+
+
+@pytest.fixture
+def server():
+    loads = []
+    srv = tts_server.TTSServer("stub", model_factory=lambda name: StubModel(loads))
+    srv.loads = loads
+    yield srv.start()
+    srv.stop()
+
+
+def test_model_loads_once_for_many_jobs(server, tmp_path):
+    futures = [server.submit("one two three", str(tmp_path / f"{i}.wav")) for i in range(5)]
+    results = [f.result(timeout=5) for f in futures]
+    assert server.loads == [1]
+    assert results[0]["audio_seconds"] == pytest.approx(0.3)
+    assert all(r["rtf"] >= 0 for r in results)
+    stats = server.stats()
+    assert stats["jobs_done"] == 5 and stats["queue_depth"] == 0
+    assert stats["model_load_time"] is not None
+
+
+def test_failed_job_does_not_stop_server(server, tmp_path):
+    with pytest.raises(ValueError):
+        server.synthesize("", str(tmp_path / "bad.wav"))
+    assert server.synthesize("ok", str(tmp_path / "ok.wav"))["audio_seconds"] > 0
+    assert server.stats()["jobs_failed"] == 1
+
+
+def test_unix_socket_client(server, tmp_path):
+    socket_path = str(tmp_path / "tts.sock")
+    unix_server = tts_server.UnixSocketServer(socket_path, server)
+    thread = threading.Thread(target=unix_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = tts_server.TTSClient(socket_path, timeout=5)
+        result = client.synthesize("hello there", str(tmp_path / "remote.wav"))
+        assert result["audio_seconds"] == pytest.approx(0.2)
+        assert client.stats()["jobs_done"] == 1
+        with pytest.raises(RuntimeError):
+            client.synthesize("", str(tmp_path / "bad.wav"))
+    finally:
+        unix_server.shutdown()
+        unix_server.server_close()
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from utils.dag_executor import load_agent_module
+
+uploads = load_agent_module(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Agents/12_Video_Publishing_Agent/code/upload_pipeline.py"))
+
+CHUNK = uploads.CHUNK_ALIGN
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = uploads.LocalUploadServer(str(tmp_path / "server")).start()
+    yield srv
+    srv.stop()
+
+
+def make_video(path, size):
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return data
+
+
+def uploaded(server, result):
+    with open(os.path.join(server.storage_dir, result.video_id + ".mp4"), "rb") as file:
+        return file.read()
+
+
+def test_chunked_upload_round_trip(tmp_path, server):
+    data = make_video(tmp_path / "v.mp4", 3 * CHUNK + 123)
+    uploader = uploads.ResumableUploader(server.upload_url, str(tmp_path / "state"),
+                                         chunk_size=CHUNK)
+    result = uploader.upload(str(tmp_path / "v.mp4"), {"title": "T"})
+    assert result.chunks == 4 and result.bytes_sent == len(data)
+    assert uploaded(server, result) == data
+    assert os.listdir(tmp_path / "state") == []
+
+
+def test_resume_after_kill_and_retry_on_503(tmp_path, server):
+    data = make_video(tmp_path / "v.mp4", 5 * CHUNK)
+    state_dir = str(tmp_path / "state")
+
+    def kill(sent, total):
+        if sent >= 2 * CHUNK:
+            raise KeyboardInterrupt
+
+    first = uploads.ResumableUploader(server.upload_url, state_dir, chunk_size=CHUNK)
+    with pytest.raises(KeyboardInterrupt):
+        first.upload(str(tmp_path / "v.mp4"), {}, progress=kill)
+
+    server.fail_chunks = {server.chunks + 1}
+    second = uploads.ResumableUploader(server.upload_url, state_dir, chunk_size=CHUNK,
+                                       retry_base=0.01)
+    result = second.upload(str(tmp_path / "v.mp4"), {})
+    assert result.resumed_from == 2 * CHUNK
+    assert result.bytes_sent == 3 * CHUNK
+    assert uploaded(server, result) == data
+
+
+def test_pipeline_enforces_daily_quota(tmp_path, server):
+    jobs = []
+    for i in range(3):
+        make_video(tmp_path / f"v{i}.mp4", CHUNK)
+        jobs.append(uploads.UploadJob(str(tmp_path / f"v{i}.mp4"), {}, channel="main"))
+    uploader = uploads.ResumableUploader(server.upload_url, str(tmp_path / "state"))
+    pipeline = uploads.UploadPipeline(uploader, max_concurrent=3, daily_quota={"main": 2})
+    results = pipeline.run(jobs)
+    assert sum(1 for r in results if r.video_id) == 2
+    assert sum(1 for r in results if r.error and "quota" in r.error) == 1
+    assert "MiB/s" in uploads.format_report(results)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Single entry point for the pipeline and for running one agent by name.
+
+    python main.py                                  # full pipeline (orchestrator)
+    python main.py pipeline --dry-run --resume      # orchestrator flags pass through
+    python main.py list
+    python main.py run seo --set topic="New Topic"
+    python main.py imports                          # check import-time budgets
+
+Agents are imported only when they run, and their heavy dependencies
+(pandas, TTS, ffmpeg-python, Pillow) only inside the stages that use them,
+so light agents start in milliseconds. ``imports`` measures each agent's
+import in a fresh interpreter and exits with status 1 when one exceeds its
+budget or a light agent pulls in a heavy module.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from utils.dag_executor import load_entry
+from utils.logger import setup_logger
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Agent name -> (script, entry function, import budget in ms, light). The
+# names and entries match the orchestrator's stages. Budgets cover importing
+# the agent and its sibling modules, not the shared utils or interpreter
+# startup; light agents must not import any of HEAVY_MODULES.
+AGENTS = {
+    "research": ("Agents/1_Content_Research_Agent/code/content_research_agent.py",
+                 "run_research", 300, False),
+    "ranking": ("Agents/1_Content_Research_Agent/code/topic_ranker.py",
+                "rank_snapshot", 25, True),
+    "script": ("Agents/2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py",
+               "generate_script_outline", 25, True),
+    "planning": ("Agents/3_Content_Planning_Calendar_Agent/code/planning_agent.py",
+                 "plan_content", 25, True),
+    "voiceover": ("Agents/4_Voiceover_Audio_Agent/code/voiceover_agent.py",
+                  "generate_voiceover", 100, False),
+    "video": ("Agents/5_Video_Creation_Editing_Agent/code/video_creation_agent_alternative.py",
+              "create_video", 100, False),
+    "thumbnail": ("Agents/6_Thumbnail_Graphic_Design_Agent/code/thumbnail_agent.py",
+                  "generate_thumbnail", 250, False),
+    "seo": ("Agents/7_SEO_Metadata_Optimization_Agent/code/seo_agent.py",
+            "optimize_metadata", 25, True),
+    "social": ("Agents/8_Social_Media_Promotion_Agent/code/social_agent.py",
+               "promote_video", 25, True),
+    "analytics": ("Agents/9_Analytics_Performance_Agent/code/analytics_agent.py",
+                  "generate_analytics_report", 25, True),
+    "qa": ("Agents/10_Quality_Assurance_Agent/code/qa_agent.py",
+           "run_quality_checks", 25, True),
+    "manager": ("Agents/11_High_Level_Manager_Agent/code/manager_agent.py",
+                "consolidate_work", 25, True),
+    "publishing": ("Agents/12_Video_Publishing_Agent/code/video_publishing_agent.py",
+                   "main", 100, False),
+}
+HEAVY_MODULES = ("pandas", "numpy", "TTS", "ffmpeg", "PIL")
+
+# Runs in a fresh interpreter: the shared utils are imported before the clock
+# starts, so the figure is the agent's own import cost.
+_PROBE = """
+import json, sys, time
+from utils.dag_executor import load_agent_module
+before = set(sys.modules)
+start = time.perf_counter()
+load_agent_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+loaded = sorted({name.partition(".")[0] for name in set(sys.modules) - before})
+print(json.dumps({"ms": elapsed * 1000, "modules": loaded}))
+"""
+
+
+def resolve(name):
+    # Accept the stage name or the script name ("seo" or "seo_agent").
+    if name in AGENTS:
+        return name
+    for agent, (path, _, _, _) in AGENTS.items():
+        if os.path.splitext(os.path.basename(path))[0] == name:
+            return agent
+    raise SystemExit(f"Unknown agent: {name} (see: python main.py list)")
+
+
+def parse_params(assignments):
+    # "topic=New Topic" -> {"topic": "New Topic"}; values are parsed as JSON
+    # when possible, as with the orchestrator's --set.
+    params = {}
+    for assignment in assignments or []:
+        param, sep, raw = assignment.partition("=")
+        if not (sep and param):
+            raise SystemExit(f"--set expects param=value, got: {assignment}")
+        try:
+            params[param] = json.loads(raw)
+        except ValueError:
+            params[param] = raw
+    return params
+
+
+def measure_import(name, repeat=3):
+    """Imports an agent in fresh interpreters and returns the fastest run.
+
+    Returns:
+        dict: ``ms`` spent importing, the top-level ``modules`` it loaded,
+        the ``heavy`` ones among them, and whether it is ``within_budget``.
+    """
+    path, _, budget, light = AGENTS[name]
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _PROBE, os.path.join(ROOT, path)],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output))
+    best = min(runs, key=lambda run: run["ms"])
+    heavy = [module for module in HEAVY_MODULES if module in best["modules"]]
+    best.update(agent=name, budget=budget, light=light, heavy=heavy,
+                within_budget=best["ms"] <= budget and not (light and heavy))
+    return best
+
+
+def list_agents():
+    for name, (path, entry, budget, light) in AGENTS.items():
+        kind = "light" if light else "heavy"
+        print(f"{name:<12}{kind:<7}{budget:>5} ms  {path}:{entry}")
+
+
+def run_agent(name, params):
+    path, entry, _, _ = AGENTS[name]
+    setup_logger()
+    result = load_entry(os.path.join(ROOT, path), entry)(**params)
+    if result is not None:
+        print(result)
+
+
+def check_imports(names, repeat):
+    failed = []
+    print(f"{'agent':<12}{'import':>10}{'budget':>9}  heavy modules")
+    for name in names:
+        try:
+            result = measure_import(name, repeat)
+        except subprocess.CalledProcessError as error:
+            # A missing optional dependency fails the import itself.
+            reason = error.stderr.strip().splitlines()[-1] if error.stderr else error
+            print(f"{name:<12}{'error':>10}{AGENTS[name][2]:>6} ms  {reason}")
+            failed.append(name)
+            continue
+        status = "" if result["within_budget"] else "  OVER BUDGET"
+        print(f"{name:<12}{result['ms']:>7.1f} ms{result['budget']:>6} ms  "
+              f"{', '.join(result['heavy']) or '-'}{status}")
+        if not result["within_budget"]:
+            failed.append(name)
+    return failed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ("list", "run", "imports", "-h", "--help"):
+        # The orchestrator (and everything it imports) is only loaded here.
+        import orchestrator  # pylint: disable=import-outside-toplevel
+        orchestrator.main(argv[1:] if argv and argv[0] == "pipeline" else argv)
+        return
+
+    parser = argparse.ArgumentParser(description="Run the pipeline or a single agent.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("pipeline", help="run the full pipeline (default; takes "
+                                         "the orchestrator's flags)")
+    commands.add_parser("list", help="list the agents and their import budgets")
+    run_parser = commands.add_parser("run", help="run one agent by name")
+    run_parser.add_argument("agent", help="stage name (e.g. seo) or script name")
+    run_parser.add_argument("--set", dest="params", action="append", metavar="PARAM=VALUE",
+                            help="pass a parameter to the agent's entry function")
+    imports_parser = commands.add_parser("imports", help="check per-agent import budgets")
+    imports_parser.add_argument("agents", nargs="*", help="agents to check (default: all)")
+    imports_parser.add_argument("--repeat", type=int, default=3,
+                                help="fresh interpreters per agent (fastest kept)")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        list_agents()
+    elif args.command == "run":
+        run_agent(resolve(args.agent), parse_params(args.params))
+    else:
+        names = [resolve(name) for name in args.agents] or list(AGENTS)
+        failed = check_imports(names, args.repeat)
+        if failed:
+            print(f"{len(failed)} agent(s) failed the import check: " + ", ".join(failed),
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
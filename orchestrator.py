@@ -1,45 +1,258 @@
 #!/usr/bin/env python3
-import subprocess
+import argparse
+import json
 import os
 import sys
+from datetime import datetime
 
-def run_agent(path):
-    print(f"Running agent: {path}")
-    result = subprocess.run(["python3", path], capture_output=True, text=True)
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(result.stderr, file=sys.stderr)
-    if result.returncode != 0:
-        print(f"Error running agent: {path}", file=sys.stderr)
-        sys.exit(result.returncode)
-
-def main():
-    base = os.path.expanduser("~")
-    agents = [
-        os.path.join(base, "Documents/youtube/Agents/1_Content_Research_Agent/code/content_research_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/4_Voiceover_Audio_Agent/code/voiceover_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/5_Video_Creation_Editing_Agent/code/video_creation_agent_alternative.py"),
-        os.path.join(base, "Documents/youtube/Agents/3_Content_Planning_Calendar_Agent/code/planning_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/6_Thumbnail_Graphic_Design_Agent/code/thumbnail_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/7_SEO_Metadata_Optimization_Agent/code/seo_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/8_Social_Media_Promotion_Agent/code/social_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/9_Analytics_Performance_Agent/code/analytics_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/10_Quality_Assurance_Agent/code/qa_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/11_High_Level_Manager_Agent/code/manager_agent.py"),
-        os.path.join(base, "Documents/youtube/Agents/12_Video_Publishing_Agent/code/video_publishing_agent.py"),
+from utils.artifact_store import RUNS_DIR, ArtifactStore, Run
+from utils.batch_runner import SCRIPT_AGENT, run_batch
+from utils.dag_executor import DagExecutor, Stage, format_plan, load_entry
+from utils.instrumentation import configure
+from utils.logger import setup_logger
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASE = os.path.join(os.path.expanduser("~"), "Documents/youtube")
+VIDEO_AGENT = "Agents/5_Video_Creation_Editing_Agent/code/video_creation_agent_alternative.py"
+PUBLISHED_FILE = os.path.join(BASE, "Agents/1_Content_Research_Agent/code/published_topics.txt")
+
+
+def print_cache_summary():
+    # Caches live in the agent modules imported by this process.
+    stats = load_entry(os.path.join(ROOT, VIDEO_AGENT), "get_render_cache")().stats()
+    print(f"Render cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['evictions']} evictions")
+
+
+def build_stages(run, overrides=None):
+    # Every output goes under the run's directory, so concurrent runs never
+    # share files; downstream stages get the recorded artifact handles. Each
+    # stage declares the files it must produce and any inputs it reads from
+    # outside the run, so the executor can tell which stages are stale.
+    def social_post_kwargs():
+        # Promote the video using the title produced by the SEO stage; the run
+        # id keys the batch, so a rerun of this stage queues no duplicate posts.
+        metadata = run.artifact("seo", "metadata.json")
+        with open(metadata.path, "r", encoding="utf-8") as f:
+            title = json.load(f)["title"]
+        return {"content": title, "platforms": ["YouTube"], "video": run.run_id}
+
+    def publishing_kwargs():
+        return {"video_file": run.artifact("video", "final_video.mp4").path,
+                "metadata_file": run.artifact("seo", "metadata.json").path,
+                "video": run.run_id}
+
+    overrides = overrides or {}
+
+    def params(name, kwargs):
+        # Command-line overrides (--set stage.param=value) win over the defaults.
+        if callable(kwargs):
+            return lambda: {**kwargs(), **overrides.get(name, {})}
+        return {**kwargs, **overrides.get(name, {})}
+
+    snapshot_dir = run.stage_dir("research")
+    ranking_file = run.path("ranking", "ranking.json")
+    outline_file = run.path("script", "script_outline.txt")
+    voiceover_file = run.path("voiceover", "voiceover.wav")
+    return [
+        # Research queries live trends, so it never reuses an earlier run.
+        Stage("research", "Agents/1_Content_Research_Agent/code/content_research_agent.py",
+              "run_research", kwargs=params("research", {"snapshot_dir": snapshot_dir}),
+              reusable=False, outputs=["header.json"]),
+        Stage("ranking", "Agents/1_Content_Research_Agent/code/topic_ranker.py",
+              "rank_snapshot", deps=["research"],
+              kwargs=params("ranking", {"snapshot_dir": snapshot_dir,
+                                        "ranking_file": ranking_file}),
+              inputs=[PUBLISHED_FILE], outputs=["ranking.json"]),
+        Stage("script", "Agents/2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py",
+              "generate_script_outline", deps=["ranking", "research"],
+              kwargs=params("script", {"output_file": outline_file,
+                                       "snapshot_dir": snapshot_dir,
+                                       "ranking_file": ranking_file}),
+              outputs=["script_outline.txt"]),
+        Stage("voiceover", "Agents/4_Voiceover_Audio_Agent/code/voiceover_agent.py",
+              "generate_voiceover", deps=["script"],
+              kwargs=params("voiceover", {"outline_file": outline_file,
+                                          "output_file": voiceover_file}),
+              outputs=["voiceover.wav"]),
+        Stage("video", VIDEO_AGENT, "create_video", deps=["voiceover", "script"],
+              kwargs=params("video", {
+                  "voiceover_file": voiceover_file,
+                  "script_outline_file": outline_file,
+                  "output_video": run.path("video", "final_video.mp4"),
+              }),
+              outputs=["final_video.mp4"]),
+        # Planned once the render is done, so the slot is never before the video exists.
+        Stage("planning", "Agents/3_Content_Planning_Calendar_Agent/code/planning_agent.py",
+              "plan_content", deps=["video"],
+              kwargs=params("planning", {
+                  "video": run.run_id,
+                  "plan_file": run.path("planning", "content_calendar.txt"),
+              }),
+              reusable=False, outputs=["content_calendar.txt"]),
+        Stage("thumbnail", "Agents/6_Thumbnail_Graphic_Design_Agent/code/thumbnail_agent.py",
+              "generate_thumbnail",
+              kwargs=params("thumbnail", {
+                  "title": "AI Revolution in 2025",
+                  "output_path": run.path("thumbnail", "thumbnail.png"),
+              }),
+              outputs=["thumbnail.png"]),
+        Stage("seo", "Agents/7_SEO_Metadata_Optimization_Agent/code/seo_agent.py",
+              "optimize_metadata", deps=["script", "ranking"],
+              kwargs=params("seo", {"output_file": run.path("seo", "metadata.json"),
+                                    "outline_file": outline_file,
+                                    "ranking_file": ranking_file}),
+              inputs=[PUBLISHED_FILE], outputs=["metadata.json"]),
+        Stage("social", "Agents/8_Social_Media_Promotion_Agent/code/social_agent.py",
+              "promote_video", deps=["seo"], kwargs=params("social", social_post_kwargs),
+              reusable=False),
+        Stage("analytics", "Agents/9_Analytics_Performance_Agent/code/analytics_agent.py",
+              "generate_analytics_report",
+              kwargs=params("analytics", {
+                  "output_file": run.path("analytics", "analytics_report.json")}),
+              reusable=False, outputs=["analytics_report.json"]),
+        Stage("qa", "Agents/10_Quality_Assurance_Agent/code/qa_agent.py",
+              "run_quality_checks", deps=["video", "thumbnail", "seo", "social"],
+              kwargs=params("qa", {
+                  "script_file": outline_file,
+                  "voiceover_file": voiceover_file,
+                  "video_file": run.path("video", "final_video.mp4"),
+                  "thumbnail_file": run.path("thumbnail", "thumbnail.png"),
+                  "metadata_file": run.path("seo", "metadata.json"),
+                  "report_file": run.path("qa", "qa_report.json"),
+              }),
+              reusable=False, outputs=["qa_report.json"]),
+        Stage("manager", "Agents/11_High_Level_Manager_Agent/code/manager_agent.py",
+              "consolidate_work", deps=["qa", "planning", "analytics"],
+              kwargs=params("manager", {}), reusable=False),
+        Stage("publishing", "Agents/12_Video_Publishing_Agent/code/video_publishing_agent.py",
+              "main", deps=["manager", "video", "seo"],
+              kwargs=params("publishing", publishing_kwargs), reusable=False),
     ]
-    
-    for agent in agents:
-        if os.path.exists(agent):
-            run_agent(agent)
-        else:
-            print(f"Agent not found: {agent}")
-            # Optionally exit if a critical agent is missing:
-            # sys.exit(1)
+
+
+def parse_overrides(assignments):
+    # "seo.topic=New Topic" -> {"seo": {"topic": "New Topic"}}; values are
+    # parsed as JSON when possible so numbers and lists keep their type.
+    overrides = {}
+    for assignment in assignments or []:
+        target, sep, raw = assignment.partition("=")
+        stage, dot, param = target.partition(".")
+        if not (sep and dot and stage and param):
+            raise SystemExit(f"--set expects stage.param=value, got: {assignment}")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        overrides.setdefault(stage, {})[param] = value
+    return overrides
+
+
+def open_run(args):
+    store = ArtifactStore(args.runs_dir)
+    if args.resume:
+        run = store.latest_run()
+        if run is None:
+            raise SystemExit(f"No earlier run to resume in {args.runs_dir}")
+        return run
+    if args.run_id and os.path.isdir(os.path.join(args.runs_dir, args.run_id)):
+        return store.open_run(args.run_id)
+    if args.dry_run:
+        # Plan against an empty run without creating its directory.
+        return Run(store, args.run_id or "<new run>")
+    return store.new_run(args.run_id)
+
+
+def latest_research(runs_dir):
+    # Research and ranking write into their run's directory, so batch topics
+    # come from the newest run that researched; empty before any such run.
+    run = ArtifactStore(runs_dir).latest_run()
+    if run is None or not os.path.isdir(run.stage_dir("research")):
+        return {}
+    return {"snapshot_dir": run.stage_dir("research"),
+            "ranking_file": run.path("ranking", "ranking.json")}
+
+
+def run_batch_mode(args):
+    research = latest_research(args.runs_dir)
+    topics = args.topics
+    if not topics:
+        topics = load_entry(os.path.join(ROOT, SCRIPT_AGENT), "select_topics")(
+            args.count, **research)
+    if not topics:
+        print("No topics to produce.", file=sys.stderr)
+        sys.exit(1)
+    output_root = args.output_dir or os.path.join(
+        BASE, "runs", datetime.now().strftime("batch_%Y%m%d_%H%M%S"))
+    print(f"Producing {len(topics)} videos into {output_root}")
+    report = run_batch(topics, output_root, root=ROOT, workers=args.workers,
+                       ranking_file=research.get("ranking_file"))
+    print(report.format_summary())
+    if len(report.completed) != len(report.items):
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the agent pipeline.")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="maximum number of stages (or batch workers) running at once")
+    parser.add_argument("--batch", action="store_true",
+                        help="produce one video per topic instead of a single pipeline run")
+    parser.add_argument("--topics", nargs="+",
+                        help="topics for batch mode (default: the ranked trending topics)")
+    parser.add_argument("--count", type=int,
+                        help="produce only the N best-ranked topics in batch mode")
+    parser.add_argument("--output-dir",
+                        help="batch output directory (default: ~/Documents/youtube/runs/...)")
+    parser.add_argument("--runs-dir", default=RUNS_DIR,
+                        help="directory holding one subdirectory per pipeline run")
+    parser.add_argument("--run-id",
+                        help="run directory to create, or an existing run to rebuild in place "
+                             "(default: a new timestamp + random suffix)")
+    parser.add_argument("--resume", action="store_true",
+                        help="rebuild the most recent run in place, rerunning only stale stages")
+    parser.add_argument("--set", dest="overrides", action="append", metavar="STAGE.PARAM=VALUE",
+                        help="override a stage parameter, e.g. --set seo.topic='New Topic'")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show which stages would rebuild and the expected time saved")
+    parser.add_argument("--trace",
+                        help="Chrome-trace JSON output (default: trace.json in the run directory)")
+    parser.add_argument("--profile", action="append", default=[], metavar="SPAN",
+                        help="capture a cProfile of the named stage or sub-step "
+                             "(e.g. video, encode); repeatable")
+    parser.add_argument("--log-level", help="logging level (default: INFO)")
+    parser.add_argument("--log-file", help="also write the log to this file")
+    args = parser.parse_args(argv)
+    setup_logger(args.log_level, args.log_file)
+
+    if args.batch:
+        run_batch_mode(args)
+        return
+
+    run = open_run(args)
+    stages = build_stages(run, parse_overrides(args.overrides))
+    executor = DagExecutor(stages, root=ROOT, max_workers=args.workers, run=run)
+    if args.dry_run:
+        print(f"Run {run.run_id}")
+        print(format_plan(executor.plan()))
+        return
+    print(f"Run {run.run_id}: outputs in {run.dir}")
+    tracer = configure(profile=args.profile, profile_dir=run.dir)
+    report = executor.run()
+    print(report.format_summary())
+    print(tracer.format_summary())
+    trace_file = tracer.write_chrome_trace(args.trace or os.path.join(run.dir, "trace.json"))
+    print(f"Trace written to {trace_file}")
+    for name, path in tracer.profiles.items():
+        print(f"Profile of {name}: {path}")
+    if report.results["video"].status == "ok":
+        print_cache_summary()
+    for result in report.results.values():
+        if result.error:
+            print(f"Stage {result.name} {result.status}: {result.error}", file=sys.stderr)
+    if not report.ok:
+        sys.exit(1)
     print("Workflow complete.")
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,287 @@
+"""Run-scoped artifact store with content-hashed manifests.
+
+Every pipeline run gets its own directory, ``<root>/<run_id>/<stage>/...``,
+so concurrent runs never overwrite each other's files. After a stage
+succeeds, the files in its directory are hashed into typed :class:`Artifact`
+handles and recorded in the run's ``manifest.json`` together with a key
+derived from the stage's inputs (its dependencies' output digests) and
+parameters. A later run whose stage has the same key can adopt the earlier
+outputs, copied into its own directory, instead of running the stage.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.file_io import atomic_write, file_digest
+
+RUNS_DIR = os.path.join(os.path.expanduser("~"), "Documents/youtube/runs")
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.jsonl"
+
+_KINDS = {".txt": "text", ".json": "json", ".wav": "audio", ".aiff": "audio",
+          ".mp3": "audio", ".mp4": "video", ".png": "image", ".jpg": "image",
+          ".jpeg": "image", ".npy": "array"}
+
+
+class Artifact:
+    """Typed, content-addressed handle to a file produced by a stage."""
+
+    def __init__(self, kind: str, path: str, digest: str, size: int):
+        self.kind = kind
+        self.path = path
+        self.digest = digest
+        self.size = size
+
+    @classmethod
+    def from_path(cls, path: str, kind: Optional[str] = None) -> "Artifact":
+        """Hashes a file into a handle; the kind defaults to one from the extension."""
+        kind = kind or _KINDS.get(os.path.splitext(path)[1].lower(), "file")
+        return cls(kind, path, file_digest(path), os.path.getsize(path))
+
+    def verify(self) -> bool:
+        """True when the file still exists with the recorded contents."""
+        return (os.path.exists(self.path) and os.path.getsize(self.path) == self.size
+                and file_digest(self.path) == self.digest)
+
+    def as_dict(self, base: str) -> Dict[str, Any]:
+        """Serializes the handle with its path relative to ``base``."""
+        return {"kind": self.kind, "path": os.path.relpath(self.path, base),
+                "digest": self.digest, "size": self.size}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base: str) -> "Artifact":
+        """Restores a handle serialized by :meth:`as_dict`."""
+        return cls(data["kind"], os.path.join(base, data["path"]), data["digest"], data["size"])
+
+    def __repr__(self) -> str:
+        return f"Artifact({self.kind}, {self.path}, {self.digest[:12]})"
+
+
+def _place(source: str, destination: str) -> None:
+    """Copies ``source`` to ``destination`` atomically.
+
+    Never hard-links: stages rewrite and append to their outputs in place,
+    so a rebuild in the adopting run would otherwise change the earlier
+    run's recorded artifacts.
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    tmp_path = f"{destination}.{uuid.uuid4().hex}.tmp"
+    try:
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, destination)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class Run:
+    """One pipeline run's directory and manifest."""
+
+    def __init__(self, store: "ArtifactStore", run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self.dir = os.path.join(store.root, run_id)
+        self._lock = threading.Lock()
+        manifest_path = os.path.join(self.dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                self.manifest = json.load(file)
+        else:
+            self.manifest = {"run_id": run_id, "created_at": time.time(), "stages": {}}
+
+    def stage_dir(self, stage: str) -> str:
+        """Returns the directory holding a stage's outputs."""
+        return os.path.join(self.dir, stage)
+
+    def path(self, stage: str, name: str) -> str:
+        """Returns the run-scoped path for one of a stage's output files."""
+        return os.path.join(self.stage_dir(stage), name)
+
+    def outputs(self, stage: str) -> Dict[str, Artifact]:
+        """Returns the recorded outputs of a stage, keyed by relative name."""
+        entry = self.manifest["stages"].get(stage)
+        if entry is None:
+            raise KeyError(f"Stage '{stage}' has no outputs in run {self.run_id}")
+        return {name: Artifact.from_dict(data, self.dir)
+                for name, data in entry["outputs"].items()}
+
+    def artifact(self, stage: str, name: str) -> Artifact:
+        """Returns one recorded output of a stage."""
+        return self.outputs(stage)[name]
+
+    def fingerprint(self, stage: str, deps: Iterable[str], params: Dict[str, Any],
+                    inputs: Iterable[str] = (), source: Optional[str] = None) -> Dict[str, str]:
+        """Hashes everything a stage's outputs depend on.
+
+        Args:
+            stage (str): Stage name.
+            deps (Iterable[str]): Stages whose recorded output digests feed in.
+            params (Dict[str, Any]): Entry-function keyword arguments. Paths
+                inside this run are made relative so every run hashes alike.
+            inputs (Iterable[str]): Files read from outside the run.
+            source (Optional[str]): Digest of the agent's code.
+
+        Returns:
+            Dict[str, str]: One digest per component plus the combined ``key``.
+        """
+        def digest(value) -> str:
+            payload = json.dumps(value, sort_keys=True, default=str)
+            return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+        def portable(value):
+            if isinstance(value, str) and value.startswith(self.dir + os.sep):
+                return os.path.relpath(value, self.dir)
+            return value
+
+        outputs = {}
+        for dep in deps:
+            entry = self.manifest["stages"].get(dep)
+            if entry is not None:
+                outputs[dep] = {name: data["digest"] for name, data in entry["outputs"].items()}
+        parts = {
+            "deps": digest(outputs),
+            "params": digest({name: portable(value) for name, value in params.items()}),
+            "inputs": digest({path: file_digest(path) if os.path.exists(path) else None
+                              for path in inputs}),
+            "source": source or "",
+        }
+        parts["key"] = digest({"stage": stage, **parts})
+        return parts
+
+    def stage_key(self, stage: str, deps: Iterable[str], params: Dict[str, Any]) -> str:
+        """Hashes a stage's dependency outputs and parameters."""
+        return self.fingerprint(stage, deps, params)["key"]
+
+    def entry(self, stage: str) -> Dict[str, Any]:
+        """Returns a stage's manifest entry, or an empty dict if never recorded."""
+        return self.manifest["stages"].get(stage) or {}
+
+    def fresh(self, stage: str, key: str) -> Optional[Dict[str, Artifact]]:
+        """Returns the stage's outputs in this run if they were built from ``key``
+        and are unchanged on disk, otherwise None."""
+        if self.entry(stage).get("key") != key:
+            return None
+        outputs = self.outputs(stage)
+        if not all(artifact.verify() for artifact in outputs.values()):
+            return None
+        return outputs
+
+    def record(self, stage: str, key: Optional[str] = None, elapsed: Optional[float] = None,
+               reused_from: Optional[str] = None,
+               fingerprint: Optional[Dict[str, str]] = None) -> Dict[str, Artifact]:
+        """Hashes every file in the stage directory into the manifest.
+
+        Returns:
+            Dict[str, Artifact]: The recorded outputs.
+        """
+        base = self.stage_dir(stage)
+        outputs = {}
+        for dirpath, _, filenames in os.walk(base):
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                outputs[os.path.relpath(path, base)] = Artifact.from_path(path)
+        entry = {"key": key, "fingerprint": fingerprint, "recorded_at": time.time(),
+                 "elapsed": elapsed, "reused_from": reused_from,
+                 "outputs": {name: a.as_dict(self.dir) for name, a in outputs.items()}}
+        with self._lock:
+            self.manifest["stages"][stage] = entry
+            with atomic_write(os.path.join(self.dir, MANIFEST_FILE)) as file:
+                json.dump(self.manifest, file, indent=2)
+        if key is not None and reused_from is None:
+            self.store.index(stage, key, self.run_id)
+        return outputs
+
+    def find_reusable(self, stage: str, key: str) -> Optional["Run"]:
+        """Returns the newest other run whose outputs for ``key`` are intact."""
+        for run_id in self.store.find(stage, key):
+            if run_id == self.run_id:
+                continue
+            try:
+                previous = self.store.open_run(run_id)
+            except KeyError:
+                continue
+            if previous.fresh(stage, key) is not None:
+                return previous
+        return None
+
+    def reuse(self, stage: str, key: str,
+              fingerprint: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Artifact]]:
+        """Adopts a previous run's outputs for the same stage key.
+
+        Returns:
+            Optional[Dict[str, Artifact]]: The adopted outputs, or None when
+            no earlier run has intact outputs for ``key``.
+        """
+        previous = self.find_reusable(stage, key)
+        if previous is None:
+            return None
+        base = self.stage_dir(stage)
+        for name, artifact in previous.outputs(stage).items():
+            _place(artifact.path, os.path.join(base, name))
+        logging.info("Stage %s reused outputs of run %s", stage, previous.run_id)
+        return self.record(stage, key, elapsed=previous.entry(stage).get("elapsed"),
+                           reused_from=previous.run_id, fingerprint=fingerprint)
+
+
+class ArtifactStore:
+    """Directory of runs plus an append-only index of stage keys."""
+
+    def __init__(self, root: str = RUNS_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, INDEX_FILE)
+
+    def new_run(self, run_id: Optional[str] = None) -> Run:
+        """Creates a fresh, uniquely named run directory."""
+        run_id = run_id or f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        os.makedirs(os.path.join(self.root, run_id))
+        return Run(self, run_id)
+
+    def open_run(self, run_id: str) -> Run:
+        """Opens an existing run."""
+        if not os.path.isdir(os.path.join(self.root, run_id)):
+            raise KeyError(f"Unknown run: {run_id}")
+        return Run(self, run_id)
+
+    def latest_run(self) -> Optional[Run]:
+        """Returns the most recently updated run that has a manifest."""
+        candidates = []
+        for run_id in os.listdir(self.root):
+            manifest_path = os.path.join(self.root, run_id, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                candidates.append((os.path.getmtime(manifest_path), run_id))
+        if not candidates:
+            return None
+        return Run(self, max(candidates)[1])
+
+    def index(self, stage: str, key: str, run_id: str) -> None:
+        """Appends a stage key; single small appends are atomic across processes."""
+        line = json.dumps({"stage": stage, "key": key, "run_id": run_id}) + "\n"
+        fd = os.open(self._index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def find(self, stage: str, key: str) -> List[str]:
+        """Returns runs that recorded ``key`` for ``stage``, newest first."""
+        if not os.path.exists(self._index_path):
+            return []
+        matches = []
+        with open(self._index_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry["stage"] == stage and entry["key"] == key:
+                    matches.append(entry["run_id"])
+        return list(reversed(matches))
@@ -0,0 +1,173 @@
+"""Batch production of many videos through a warm process pool.
+
+Each worker process imports the production agents and loads the TTS model
+once in its initializer, then pushes topics one after another through
+script -> voiceover -> video -> thumbnail -> metadata. Every topic gets its
+own output directory so items never overwrite each other.
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.dag_executor import load_agent_module, load_entry
+
+SCRIPT_AGENT = "Agents/2_Scriptwriting_Outline_Agent/code/scriptwriting_agent.py"
+VOICEOVER_AGENT = "Agents/4_Voiceover_Audio_Agent/code/voiceover_agent.py"
+VIDEO_AGENT = "Agents/5_Video_Creation_Editing_Agent/code/video_creation_agent_alternative.py"
+THUMBNAIL_AGENT = "Agents/6_Thumbnail_Graphic_Design_Agent/code/thumbnail_agent.py"
+SEO_AGENT = "Agents/7_SEO_Metadata_Optimization_Agent/code/seo_agent.py"
+
+BATCH_STAGES = ("script", "voiceover", "video", "thumbnail", "metadata")
+
+# Per-process state populated by the pool initializer.
+_WORKER: Dict[str, Any] = {}
+
+
+def slugify(topic: str) -> str:
+    """Turns a topic into a filesystem-safe directory name."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", topic).strip("_").lower()
+    return slug[:60] or "topic"
+
+
+def _init_worker(root: str) -> None:
+    """Imports every batch agent and warms the TTS server once per worker."""
+    _WORKER["root"] = root
+    for module in (SCRIPT_AGENT, VOICEOVER_AGENT, VIDEO_AGENT, THUMBNAIL_AGENT, SEO_AGENT):
+        load_agent_module(os.path.join(root, module))
+    try:
+        load_entry(os.path.join(root, VOICEOVER_AGENT), "get_tts_server")().start()
+    except Exception:  # pylint: disable=broad-except
+        logging.exception("TTS warm-up failed; voiceover items will report the error")
+
+
+def _entry(module: str, func: str):
+    return load_entry(os.path.join(_WORKER["root"], module), func)
+
+
+def _produce_item(topic: str, item_dir: str,
+                  ranking_file: Optional[str] = None) -> Dict[str, Any]:
+    """Runs one topic through every batch stage inside a warm worker.
+
+    The SEO stage reads this item's own script outline, and ``ranking_file``
+    when given, instead of the agents' global defaults.
+
+    Returns:
+        Dict[str, Any]: Topic, output paths, per-stage seconds and any error.
+    """
+    os.makedirs(item_dir, exist_ok=True)
+    outline = os.path.join(item_dir, "script_outline.txt")
+    voiceover = os.path.join(item_dir, "voiceover.wav")
+    video = os.path.join(item_dir, "final_video.mp4")
+    thumbnail = os.path.join(item_dir, "thumbnail.png")
+    metadata = os.path.join(item_dir, "metadata.json")
+    seo_kwargs = {"ranking_file": ranking_file} if ranking_file else {}
+    steps = [
+        ("script", lambda: _entry(SCRIPT_AGENT, "generate_script_outline")(
+            trending_topic=topic, output_file=outline)),
+        ("voiceover", lambda: _entry(VOICEOVER_AGENT, "generate_voiceover")(
+            outline_file=outline, output_file=voiceover, workers=0)),
+        ("video", lambda: _entry(VIDEO_AGENT, "create_video")(
+            voiceover_file=voiceover, script_outline_file=outline, output_video=video)),
+        ("thumbnail", lambda: _entry(THUMBNAIL_AGENT, "generate_thumbnail")(
+            title=topic, output_path=thumbnail)),
+        ("metadata", lambda: _entry(SEO_AGENT, "optimize_metadata")(
+            topic=topic, output_file=metadata, outline_file=outline, **seo_kwargs)),
+    ]
+    item = {"topic": topic, "dir": item_dir, "timings": {}, "error": None,
+            "outputs": {"script": outline, "voiceover": voiceover, "video": video,
+                        "thumbnail": thumbnail, "metadata": metadata}}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            result = step()
+        except Exception as error:  # pylint: disable=broad-except
+            item["error"] = f"{name}: {type(error).__name__}: {error}"
+        else:
+            if result is None:
+                item["error"] = f"{name}: stage produced no output"
+        item["timings"][name] = time.perf_counter() - start
+        if item["error"]:
+            break
+    return item
+
+
+class BatchReport:
+    """Results and throughput figures of one batch run."""
+
+    def __init__(self, items: List[Dict[str, Any]], elapsed: float, workers: int):
+        self.items = items
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def completed(self) -> List[Dict[str, Any]]:
+        """Items that made it through every stage."""
+        return [item for item in self.items if not item["error"]]
+
+    @property
+    def videos_per_hour(self) -> float:
+        """Finished videos per hour of wall time for the whole pool."""
+        return len(self.completed) * 3600.0 / self.elapsed if self.elapsed else 0.0
+
+    def stage_throughput(self) -> Dict[str, Dict[str, float]]:
+        """Items, busy seconds and items/hour per worker for each stage."""
+        stats = {}
+        for name in BATCH_STAGES:
+            times = [item["timings"][name] for item in self.items if name in item["timings"]]
+            busy = sum(times)
+            stats[name] = {
+                "items": len(times),
+                "seconds": busy,
+                "per_hour": len(times) * 3600.0 / busy if busy else 0.0,
+            }
+        return stats
+
+    def format_summary(self) -> str:
+        """Renders the batch outcome as a plain-text table."""
+        lines = [f"{'stage':<12}{'items':>7}{'busy':>10}{'items/h/worker':>16}"]
+        for name, stats in self.stage_throughput().items():
+            lines.append(f"{name:<12}{stats['items']:>7}{stats['seconds']:>9.1f}s"
+                         f"{stats['per_hour']:>16.1f}")
+        lines.append(f"Videos: {len(self.completed)}/{len(self.items)} in "
+                     f"{self.elapsed:.1f}s with {self.workers} workers "
+                     f"({self.videos_per_hour:.1f} videos/hour)")
+        for item in self.items:
+            if item["error"]:
+                lines.append(f"Failed '{item['topic']}': {item['error']}")
+        return "\n".join(lines)
+
+
+def run_batch(topics: Sequence[str], output_root: str, root: str = ".",
+              workers: Optional[int] = None,
+              ranking_file: Optional[str] = None) -> BatchReport:
+    """Produces one video per topic using a bounded pool of warm workers.
+
+    Args:
+        topics (Sequence[str]): Topics to produce, in priority order.
+        output_root (str): Directory that receives one sub-directory per item.
+        root (str): Repository root the agent scripts are loaded from.
+        workers (Optional[int]): Pool size; defaults to the CPU count.
+        ranking_file (Optional[str]): Topic ranking the SEO stage scores
+            keywords against; the SEO agent's default when omitted.
+
+    Returns:
+        BatchReport: Per-item results and throughput.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    items = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(os.path.abspath(root),)) as pool:
+        futures = [
+            pool.submit(_produce_item, topic,
+                        os.path.join(output_root, f"{index:03d}_{slugify(topic)}"), ranking_file)
+            for index, topic in enumerate(topics, start=1)
+        ]
+        for future in as_completed(futures):
+            items.append(future.result())
+    items.sort(key=lambda item: item["dir"])
+    return BatchReport(items, time.perf_counter() - start, workers)
@@ -0,0 +1,421 @@
+"""Dependency-graph executor that runs agent entry functions in-process.
+
+Agent scripts are imported once by path and cached, so heavy libraries
+(pandas, TTS, ffmpeg-python, Pillow) are loaded a single time per process.
+Stages whose dependencies have finished run concurrently on a thread pool.
+With an artifact-store run attached, the executor works like ``make``: each
+stage is fingerprinted from its dependencies' output digests, its declared
+input files, its parameters and its agent's source code, and only runs when
+no manifest holds outputs for that fingerprint.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from utils.instrumentation import span
+
+_MODULE_CACHE: Dict[str, Any] = {}
+_MODULE_LOCK = threading.Lock()
+# Stage statuses that let dependents run.
+_SUCCESS = ("ok", "fresh", "reused")
+
+
+def load_agent_module(path: str):
+    """Imports an agent script by file path, reusing the cached module.
+
+    The agent's own directory is put on ``sys.path`` so the script can import
+    sibling helper modules exactly as it does when run directly.
+
+    Args:
+        path (str): Path to the agent's ``.py`` file.
+
+    Returns:
+        module: The imported module.
+
+    Raises:
+        FileNotFoundError: If the script does not exist.
+    """
+    path = os.path.abspath(path)
+    with _MODULE_LOCK:
+        module = _MODULE_CACHE.get(path)
+        if module is not None:
+            return module
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Agent not found: {path}")
+        code_dir = os.path.dirname(path)
+        if code_dir not in sys.path:
+            sys.path.insert(0, code_dir)
+        agent_dir = os.path.basename(os.path.dirname(code_dir))
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = re.sub(r"\W", "_", f"agent_{agent_dir}_{stem}")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        _MODULE_CACHE[path] = module
+        return module
+
+
+def load_entry(path: str, func_name: str) -> Callable[..., Any]:
+    """Returns the named entry function from an agent script."""
+    return getattr(load_agent_module(path), func_name)
+
+
+def source_digest(path: str) -> str:
+    """Hashes an agent script together with the helper modules beside it."""
+    code_dir = os.path.dirname(os.path.abspath(path))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(code_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(code_dir, name), "rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+class Stage:
+    """A pipeline step bound to an agent entry function."""
+
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        func: str,
+        deps: Iterable[str] = (),
+        kwargs: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        reusable: bool = True,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ):
+        """Initializes the stage.
+
+        Args:
+            name (str): Unique stage name.
+            module (str): Agent script path, relative to the executor root.
+            func (str): Entry function to call inside the script.
+            deps (Iterable[str]): Names of stages that must finish first.
+            kwargs: Keyword arguments for the entry function, or a callable
+                evaluated when the stage starts (after its dependencies ran).
+            reusable (bool): Whether outputs of an earlier run with the same
+                inputs may stand in for running the stage. Disable for stages
+                with side effects or inputs the manifest cannot see.
+            inputs (Iterable[str]): Files outside the run that the stage reads;
+                their contents are part of the stage's fingerprint.
+            outputs (Iterable[str]): Files the stage must leave in its run
+                directory; a run that does not produce them fails.
+        """
+        self.name = name
+        self.module = module
+        self.func = func
+        self.deps = tuple(deps)
+        self.kwargs = kwargs
+        self.reusable = reusable
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+    def resolve_kwargs(self) -> Dict[str, Any]:
+        """Returns the keyword arguments for this run of the stage."""
+        if callable(self.kwargs):
+            return self.kwargs()
+        return dict(self.kwargs or {})
+
+
+class StageResult:
+    """Outcome and timing of a single stage."""
+
+    def __init__(self, name: str, status: str, start: float = 0.0, end: float = 0.0,
+                 import_time: float = 0.0, value: Any = None, error: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.start = start
+        self.end = end
+        self.import_time = import_time
+        self.value = value
+        self.error = error
+
+    @property
+    def wall_time(self) -> float:
+        """Seconds between the stage starting and finishing."""
+        return self.end - self.start
+
+
+class RunReport:
+    """Per-stage results plus the critical path of one executor run."""
+
+    def __init__(self, stages: Dict[str, Stage], results: Dict[str, StageResult],
+                 elapsed: float):
+        self.stages = stages
+        self.results = results
+        self.elapsed = elapsed
+        self.critical_path, self.critical_path_time = self._critical_path()
+
+    @property
+    def ok(self) -> bool:
+        """True when every stage succeeded or reused earlier outputs."""
+        return all(r.status in _SUCCESS for r in self.results.values())
+
+    def _critical_path(self):
+        """Finds the longest chain of dependent stage wall times."""
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for name in _topological_order(self.stages):
+            deps = [d for d in self.stages[name].deps if d in finish]
+            prev = max(deps, key=lambda d: finish[d], default=None)
+            result = self.results.get(name)
+            duration = result.wall_time if result is not None else 0.0
+            finish[name] = duration + (finish[prev] if prev else 0.0)
+            via[name] = prev
+        if not finish:
+            return [], 0.0
+        node = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return list(reversed(path)), total
+
+    def format_summary(self) -> str:
+        """Renders a plain-text table of stage timings."""
+        lines = [f"{'stage':<14}{'status':<9}{'start':>8}{'wall':>9}{'import':>9}"]
+        ordered = sorted(self.results.values(), key=lambda r: (r.start, r.name))
+        for r in ordered:
+            lines.append(
+                f"{r.name:<14}{r.status:<9}{r.start:>7.2f}s{r.wall_time:>8.2f}s"
+                f"{r.import_time:>8.2f}s"
+            )
+        lines.append(f"Total wall time: {self.elapsed:.2f}s")
+        lines.append(
+            f"Critical path ({self.critical_path_time:.2f}s): "
+            + " -> ".join(self.critical_path)
+        )
+        return "\n".join(lines)
+
+
+def _topological_order(stages: Dict[str, Stage]) -> List[str]:
+    """Orders stage names so dependencies come first.
+
+    Raises:
+        ValueError: If a dependency is unknown or the graph has a cycle.
+    """
+    order: List[str] = []
+    state: Dict[str, int] = {}
+
+    def visit(name: str, trail: List[str]) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError("Dependency cycle: " + " -> ".join(trail + [name]))
+        state[name] = 1
+        for dep in stages[name].deps:
+            if dep not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+            visit(dep, trail + [name])
+        state[name] = 2
+        order.append(name)
+
+    for name in stages:
+        visit(name, [])
+    return order
+
+
+def _stale_reason(recorded: Optional[Dict[str, str]], current: Dict[str, str]) -> str:
+    """Names the fingerprint components that differ from the recorded build."""
+    if not recorded:
+        return "never built"
+    changed = [part for part in ("deps", "inputs", "params", "source")
+               if recorded.get(part) != current[part]]
+    return "changed: " + ", ".join(changed) if changed else "outputs missing or modified"
+
+
+def format_plan(plan: List[Dict[str, Any]]) -> str:
+    """Renders a dry-run plan with the expected time saved."""
+    lines = [f"{'stage':<14}{'action':<8}{'est.':>9}  reason"]
+    saved = rebuild = 0.0
+    unknown = 0
+    for step in plan:
+        seconds = step["seconds"]
+        estimate = f"{seconds:>8.2f}s" if seconds is not None else f"{'?':>9}"
+        lines.append(f"{step['stage']:<14}{step['action']:<8}{estimate}  {step['reason']}")
+        if seconds is None:
+            unknown += step["action"] == "run"
+        elif step["action"] == "run":
+            rebuild += seconds
+        else:
+            saved += seconds
+    stale = sum(step["action"] == "run" for step in plan)
+    lines.append(f"{stale} of {len(plan)} stages would run; expected time saved: {saved:.2f}s, "
+                 f"expected rebuild time: {rebuild:.2f}s"
+                 + (f" (+{unknown} stages never timed)" if unknown else ""))
+    return "\n".join(lines)
+
+
+class DagExecutor:
+    """Runs stages as soon as their dependencies have succeeded."""
+
+    def __init__(self, stages: Iterable[Stage], root: str = ".", max_workers: int = 4,
+                 run=None):
+        """Initializes the executor and validates the graph.
+
+        Args:
+            stages (Iterable[Stage]): The pipeline stages.
+            root (str): Directory that stage module paths are relative to.
+            max_workers (int): Maximum number of stages running at once.
+            run: Optional ``utils.artifact_store.Run`` that records stage
+                outputs and supplies reusable ones.
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles.
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = _topological_order(self.stages)
+        self.root = root
+        self.max_workers = max_workers
+        self.artifact_run = run
+
+    def _fingerprint(self, stage: Stage, kwargs: Dict[str, Any]) -> Dict[str, str]:
+        """Fingerprints a stage against the attached run's manifest."""
+        source = source_digest(os.path.join(self.root, stage.module))
+        return self.artifact_run.fingerprint(stage.name, stage.deps, kwargs,
+                                             inputs=stage.inputs, source=source)
+
+    def _run_stage(self, stage: Stage, t0: float) -> StageResult:
+        """Runs one stage inside a trace span tagged with its outcome."""
+        with span(stage.name, category="stage") as record:
+            result = self._execute_stage(stage, t0)
+            record.attrs["status"] = result.status
+        return result
+
+    def _execute_stage(self, stage: Stage, t0: float) -> StageResult:
+        """Imports and calls one stage, capturing its timing and errors."""
+        start = time.perf_counter() - t0
+        try:
+            import_start = time.perf_counter()
+            with span(f"import {stage.name}", category="import", module=stage.module):
+                func = load_entry(os.path.join(self.root, stage.module), stage.func)
+            import_time = time.perf_counter() - import_start
+            kwargs = stage.resolve_kwargs()
+            run = self.artifact_run
+            fingerprint = None
+            if run is not None:
+                fingerprint = self._fingerprint(stage, kwargs)
+                outputs = run.fresh(stage.name, fingerprint["key"])
+                status = "fresh"
+                if outputs is None and stage.reusable:
+                    outputs = run.reuse(stage.name, fingerprint["key"], fingerprint)
+                    status = "reused"
+                if outputs is not None:
+                    return StageResult(stage.name, status, start, time.perf_counter() - t0,
+                                       import_time=import_time, value=outputs)
+                os.makedirs(run.stage_dir(stage.name), exist_ok=True)
+            call_start = time.perf_counter()
+            value = func(**kwargs)
+            if run is not None:
+                missing = [name for name in stage.outputs
+                           if not os.path.exists(run.path(stage.name, name))]
+                if missing:
+                    raise FileNotFoundError(
+                        f"Stage did not produce declared outputs: {', '.join(missing)}")
+                run.record(stage.name, fingerprint["key"],
+                           elapsed=time.perf_counter() - call_start, fingerprint=fingerprint)
+        except Exception as error:  # pylint: disable=broad-except
+            logging.exception("Stage %s failed", stage.name)
+            return StageResult(stage.name, "failed", start, time.perf_counter() - t0,
+                               error=f"{type(error).__name__}: {error}")
+        return StageResult(stage.name, "ok", start, time.perf_counter() - t0,
+                           import_time=import_time, value=value)
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """Works out which stages a run would rebuild, without running any.
+
+        A stage is stale when its fingerprint has no intact outputs in this
+        run or a reusable earlier one; anything depending on a stale stage is
+        assumed stale too, since its inputs will be rewritten. Estimated
+        seconds come from the elapsed times recorded in the manifests.
+
+        Returns:
+            List[Dict[str, Any]]: Per stage, in execution order: ``action``
+            (run, fresh or reuse), ``reason`` and estimated ``seconds``.
+
+        Raises:
+            ValueError: If no artifact-store run is attached.
+        """
+        run = self.artifact_run
+        if run is None:
+            raise ValueError("Planning needs an artifact-store run")
+        rebuild = set()
+        plan = []
+        for name in self.order:
+            stage = self.stages[name]
+            previous = run.entry(name)
+            step = {"stage": name, "action": "run", "seconds": previous.get("elapsed")}
+            stale_deps = [dep for dep in stage.deps if dep in rebuild]
+            if stale_deps:
+                step["reason"] = "dependency rebuilds: " + ", ".join(stale_deps)
+            else:
+                try:
+                    fingerprint = self._fingerprint(stage, stage.resolve_kwargs())
+                except Exception as error:  # pylint: disable=broad-except
+                    fingerprint = None
+                    step["reason"] = f"inputs unavailable ({type(error).__name__})"
+                source = None
+                if fingerprint is not None and run.fresh(name, fingerprint["key"]) is not None:
+                    step.update(action="fresh", reason="up to date")
+                elif fingerprint is not None and stage.reusable:
+                    source = run.find_reusable(name, fingerprint["key"])
+                if source is not None:
+                    step.update(action="reuse", reason=f"outputs of run {source.run_id}",
+                                seconds=source.entry(name).get("elapsed"))
+                elif fingerprint is not None and step["action"] == "run":
+                    step["reason"] = _stale_reason(previous.get("fingerprint"), fingerprint)
+            if step["action"] == "run":
+                rebuild.add(name)
+            plan.append(step)
+        return plan
+
+    def run(self) -> RunReport:
+        """Executes the graph and returns the run report.
+
+        A failed stage only skips the stages that depend on it; independent
+        branches keep running.
+        """
+        t0 = time.perf_counter()
+        results: Dict[str, StageResult] = {}
+        pending = list(self.order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.stages[name].deps
+                    if any(results.get(d) and results[d].status not in _SUCCESS for d in deps):
+                        now = time.perf_counter() - t0
+                        results[name] = StageResult(name, "skipped", now, now,
+                                                    error="dependency did not succeed")
+                        pending.remove(name)
+                    elif all(d in results for d in deps):
+                        running[pool.submit(self._run_stage, self.stages[name], t0)] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    results[result.name] = result
+                    del running[future]
+        return RunReport(self.stages, results, time.perf_counter() - t0)
@@ -1,4 +1,8 @@
+import hashlib
 import json
+import os
+import uuid
+from contextlib import contextmanager
 
 def read_json(file_path: str) -> dict:
     """Reads a JSON file with error handling."""
@@ -9,9 +13,42 @@ def read_json(file_path: str) -> dict:
         raise IOError(f"Failed to read {file_path}: {str(e)}")
 
 def write_json(file_path: str, data: dict) -> None:
-    """Writes data to a JSON file with error handling."""
+    """Writes data to a JSON file atomically with error handling."""
     try:
-        with open(file_path, "w", encoding="utf-8") as file:
+        with atomic_write(file_path) as file:
             json.dump(data, file, indent=4)
     except IOError as e:
         raise IOError(f"Failed to write {file_path}: {str(e)}")
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = "w", encoding: str = "utf-8"):
+    """Writes to a temp file in the same directory and renames it into place.
+
+    Readers see either the old file or the complete new one, never a partial
+    write. The temp file is removed if the block raises.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_text(file_path: str, text: str) -> None:
+    """Writes text to a file atomically."""
+    with atomic_write(file_path) as file:
+        file.write(text)
+
+def file_digest(file_path: str) -> str:
+    """Returns the SHA-256 of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,274 @@
+"""Spans with wall time, CPU, peak RSS and I/O for pipeline stages and sub-steps.
+
+Agents and the orchestrator wrap interesting work in :func:`span`::
+
+    with span("encode", category="video", frames=900):
+        ffmpeg.run(...)
+
+Each span records its wall time, the CPU time of the calling thread and of
+finished child processes (ffmpeg, worker pools), the process's peak RSS and
+the bytes read and written according to ``/proc/self/io``. Spans nest per
+thread. The collected spans export as Chrome-trace JSON (open it in
+``chrome://tracing`` or Perfetto) and as a plain-text summary table.
+
+Setting ``PIPELINE_PROFILE`` to a span name (or passing ``profile=`` to
+:func:`configure`) additionally captures a cProfile of that span.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.file_io import atomic_write
+
+PROFILE_ENV = "PIPELINE_PROFILE"
+
+
+def read_proc_io() -> Dict[str, int]:
+    """Returns the process's storage ``read_bytes``/``write_bytes``.
+
+    Falls back to zeros where ``/proc/self/io`` is unavailable (non-Linux,
+    restricted containers).
+    """
+    counters = {"read_bytes": 0, "write_bytes": 0}
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as file:
+            for line in file:
+                name, _, value = line.partition(":")
+                if name in counters:
+                    counters[name] = int(value)
+    except OSError:
+        pass
+    return counters
+
+
+def _usage() -> Dict[str, float]:
+    """Snapshots the counters a span reports as deltas or maxima."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    proc_io = read_proc_io()
+    return {
+        "wall": time.perf_counter(),
+        "cpu": time.thread_time(),
+        "child_cpu": children.ru_utime + children.ru_stime,
+        # ru_maxrss is in KiB on Linux.
+        "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "child_rss": children.ru_maxrss,
+        "read": proc_io["read_bytes"],
+        "write": proc_io["write_bytes"],
+    }
+
+
+class Span:
+    """One timed region of work."""
+
+    def __init__(self, name: str, category: str, parent: Optional[str],
+                 attrs: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.attrs = attrs
+        self.thread_id = threading.get_ident()
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+        self.peak_rss_kb = 0
+        self.child_peak_rss_kb = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the span's measurements as plain values."""
+        return {"name": self.name, "category": self.category, "parent": self.parent,
+                "start": self.start, "wall": self.wall, "cpu": self.cpu,
+                "child_cpu": self.child_cpu, "peak_rss_kb": self.peak_rss_kb,
+                "child_peak_rss_kb": self.child_peak_rss_kb,
+                "read_bytes": self.read_bytes, "write_bytes": self.write_bytes,
+                "error": self.error, **self.attrs}
+
+
+class Tracer:
+    """Collects spans from every thread of the process.
+
+    Child-process CPU and I/O counters are process-wide, so spans running
+    concurrently on several threads each see the others' child work and I/O.
+    """
+
+    def __init__(self, profile: Iterable[str] = (), profile_dir: Optional[str] = None,
+                 enabled: bool = True):
+        """Initializes the tracer.
+
+        Args:
+            profile (Iterable[str]): Span names to capture with cProfile.
+            profile_dir (Optional[str]): Where ``<span>.prof`` files go;
+                defaults to the working directory.
+            enabled (bool): When False, spans cost nothing and record nothing.
+        """
+        self.profile = set(profile)
+        self.profile_dir = profile_dir
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        self.profiles: Dict[str, str] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, category: str = "step", **attrs: Any):
+        """Times the enclosed block as a span nested under the thread's current one.
+
+        Args:
+            name (str): Span name, e.g. a stage or sub-step.
+            category (str): Grouping shown in the trace viewer.
+            **attrs: Extra values stored with the span (sizes, counts, ...).
+
+        Yields:
+            Span: The open span; its ``attrs`` may be extended in the block.
+        """
+        if not self.enabled:
+            yield Span(name, category, None, attrs)
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        record = Span(name, category, stack[-1].name if stack else None, attrs)
+        profiler = cProfile.Profile() if name in self.profile else None
+        stack.append(record)
+        before = _usage()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException as error:
+            record.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            after = _usage()
+            stack.pop()
+            record.start = before["wall"] - self._origin
+            record.wall = after["wall"] - before["wall"]
+            record.cpu = after["cpu"] - before["cpu"]
+            record.child_cpu = after["child_cpu"] - before["child_cpu"]
+            record.peak_rss_kb = int(after["rss"])
+            record.child_peak_rss_kb = int(after["child_rss"])
+            record.read_bytes = int(after["read"] - before["read"])
+            record.write_bytes = int(after["write"] - before["write"])
+            with self._lock:
+                self.spans.append(record)
+            if profiler is not None:
+                self._save_profile(name, profiler)
+
+    def _save_profile(self, name: str, profiler: cProfile.Profile) -> None:
+        """Writes ``<name>.prof`` and logs the top functions by cumulative time."""
+        directory = self.profile_dir or os.getcwd()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.prof")
+        profiler.dump_stats(path)
+        self.profiles[name] = path
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(15)
+        logging.info("Profile of %s saved to %s\n%s", name, path, text.getvalue())
+
+    def reset(self) -> None:
+        """Discards collected spans and restarts the trace clock."""
+        with self._lock:
+            self.spans = []
+            self.profiles = {}
+            self._origin = time.perf_counter()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans as Chrome-trace "complete" events."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for record in spans:
+            args = record.as_dict()
+            for key in ("name", "category", "start", "wall"):
+                del args[key]
+            events.append({"name": record.name, "cat": record.category, "ph": "X",
+                           "ts": round(record.start * 1e6, 1),
+                           "dur": round(record.wall * 1e6, 1),
+                           "pid": pid, "tid": record.thread_id, "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> str:
+        """Writes the Chrome-trace JSON atomically and returns its path."""
+        with atomic_write(path) as file:
+            json.dump(self.chrome_trace(), file)
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregates spans by category and name, in first-seen order."""
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record.start)
+        for record in spans:
+            row = rows.setdefault((record.category, record.name), {
+                "category": record.category, "name": record.name, "count": 0,
+                "wall": 0.0, "cpu": 0.0, "child_cpu": 0.0, "peak_rss_kb": 0,
+                "read_bytes": 0, "write_bytes": 0, "errors": 0})
+            row["count"] += 1
+            row["wall"] += record.wall
+            row["cpu"] += record.cpu
+            row["child_cpu"] += record.child_cpu
+            row["peak_rss_kb"] = max(row["peak_rss_kb"], record.peak_rss_kb,
+                                     record.child_peak_rss_kb)
+            row["read_bytes"] += record.read_bytes
+            row["write_bytes"] += record.write_bytes
+            row["errors"] += record.error is not None
+        return list(rows.values())
+
+    def format_summary(self) -> str:
+        """Renders the summary as a plain-text table."""
+        lines = [f"{'span':<24}{'n':>4}{'wall':>10}{'cpu':>10}{'child cpu':>11}"
+                 f"{'peak rss':>11}{'read':>10}{'written':>10}"]
+        for row in self.summary():
+            label = f"{row['category']}/{row['name']}"[:23]
+            lines.append(
+                f"{label:<24}{row['count']:>4}{row['wall']:>9.2f}s{row['cpu']:>9.2f}s"
+                f"{row['child_cpu']:>10.2f}s{row['peak_rss_kb'] / 1024:>8.0f}MiB"
+                f"{_format_bytes(row['read_bytes']):>10}{_format_bytes(row['write_bytes']):>10}"
+            )
+        return "\n".join(lines)
+
+
+def _format_bytes(count: int) -> str:
+    """Formats a byte count with a binary unit."""
+    value = float(count)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
+
+
+_TRACER = Tracer(profile=[name for name in os.environ.get(PROFILE_ENV, "").split(",") if name])
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer."""
+    return _TRACER
+
+
+def configure(profile: Iterable[str] = (), profile_dir: Optional[str] = None,
+              enabled: bool = True) -> Tracer:
+    """Replaces the process-wide tracer, discarding spans collected so far."""
+    global _TRACER  # pylint: disable=global-statement
+    _TRACER = Tracer(profile, profile_dir, enabled)
+    return _TRACER
+
+
+def span(name: str, category: str = "step", **attrs: Any):
+    """Opens a span on the process-wide tracer; see :meth:`Tracer.span`."""
+    return _TRACER.span(name, category, **attrs)
+
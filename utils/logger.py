@@ -1,9 +1,38 @@
 import logging
+import os
+from typing import Optional
 
-def setup_logger():
-    """Centralized logging configuration."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler("debug.log"), logging.StreamHandler()]
-    )
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+LOG_FILE_ENV = "PIPELINE_LOG_FILE"
+LOG_LEVEL_ENV = "PIPELINE_LOG_LEVEL"
+
+def setup_logger(level: Optional[str] = None, log_file: Optional[str] = None,
+                 fmt: str = LOG_FORMAT, force: bool = False) -> logging.Logger:
+    """Centralized logging configuration shared by the agents and the orchestrator.
+
+    Only the first call configures the root logger (unless ``force`` is set),
+    so an agent imported by the orchestrator keeps the orchestrator's setup
+    instead of adding its own handlers.
+
+    Args:
+        level: Level name; defaults to ``$PIPELINE_LOG_LEVEL`` or INFO.
+        log_file: Optional file to log to as well as stderr; defaults to
+            ``$PIPELINE_LOG_FILE``. Nothing is written to the working directory
+            unless asked for.
+        fmt: Log record format.
+        force: Replace an existing configuration.
+
+    Returns:
+        logging.Logger: The root logger.
+    """
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return root
+    level = level or os.environ.get(LOG_LEVEL_ENV, "INFO")
+    log_file = log_file or os.environ.get(LOG_FILE_ENV)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(level=level.upper(), format=fmt, handlers=handlers, force=force)
+    return root
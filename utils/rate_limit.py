@@ -0,0 +1,131 @@
+"""Thread-safe rate limiting, request budgets and shared backoff."""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a request budget has no tokens left."""
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that calls :meth:`acquire`."""
+
+    def __init__(self, rate: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initializes a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (int): Bucket capacity.
+            clock: Monotonic time source (injectable for tests).
+            sleep: Sleep function (injectable for tests).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Takes tokens if they are available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Blocks until tokens are available and returns the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class RequestBudget:
+    """Caps the total number of requests a run may send."""
+
+    def __init__(self, limit: Optional[int]):
+        """Initializes the budget; ``None`` means unlimited."""
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self, tokens: int = 1) -> None:
+        """Spends tokens.
+
+        Raises:
+            BudgetExceeded: If the budget would go negative.
+        """
+        with self._lock:
+            if self.limit is not None and self.used + tokens > self.limit:
+                raise BudgetExceeded(f"Request budget of {self.limit} exhausted")
+            self.used += tokens
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Tokens left, or None when unlimited."""
+        return None if self.limit is None else self.limit - self.used
+
+
+class SharedBackoff:
+    """Exponential backoff whose pause applies to every worker at once.
+
+    When any worker is throttled, all workers hold off until the pause ends
+    instead of each one retrying on its own schedule.
+    """
+
+    def __init__(self, base: float = 1.0, maximum: float = 60.0, jitter: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.base = base
+        self.maximum = maximum
+        self.jitter = jitter
+        self.failures = 0
+        self._resume_at = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """Sleeps until any active pause is over and returns the time slept."""
+        with self._lock:
+            delay = self._resume_at - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+            return delay
+        return 0.0
+
+    def failure(self) -> float:
+        """Records a throttled request and extends the shared pause."""
+        with self._lock:
+            self.failures += 1
+            delay = min(self.maximum, self.base * 2 ** (self.failures - 1))
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            self._resume_at = max(self._resume_at, self._clock() + delay)
+            return delay
+
+    def success(self) -> None:
+        """Resets the backoff after a request goes through."""
+        with self._lock:
+            self.failures = 0
@@ -0,0 +1,138 @@
+"""Columnar interest-over-time snapshots: one NumPy matrix plus a JSON header.
+
+A snapshot directory holds ``header.json`` (topics, timestamps, partial flags
+and metadata) and a ``values-<id>.npy`` matrix of shape (topics, timestamps)
+stored as uint8, since Google Trends values are 0-100. Readers memory-map the
+matrix, so loading a snapshot of thousands of topics costs one header parse.
+"""
+
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+HEADER_FILE = "header.json"
+SNAPSHOT_VERSION = 1
+
+
+class TrendsSnapshot:
+    """A loaded snapshot; ``values`` is a read-only memmap when mapped."""
+
+    def __init__(self, header: Dict[str, Any], values):
+        self.header = header
+        self.topics: List[str] = header["topics"]
+        self.timestamps: List[str] = header["timestamps"]
+        self.partial: List[bool] = header["partial"]
+        self.values = values
+        self._index = {topic: row for row, topic in enumerate(self.topics)}
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def __contains__(self, topic: str) -> bool:
+        return topic in self._index
+
+    def series(self, topic: str):
+        """Returns the topic's row as a view into the matrix."""
+        return self.values[self._index[topic]]
+
+
+def build_matrix(trends: Dict[str, List[Dict[str, Any]]]):
+    """Aligns per-topic records on the union of their timestamps.
+
+    Args:
+        trends: Records in the ``fetch_trends`` layout keyed by topic.
+
+    Returns:
+        Tuple of topics, timestamps, partial flags and value rows (lists of
+        ints, 0 where a topic has no point).
+    """
+    topics = [topic for topic, records in trends.items() if records]
+    partial: Dict[str, bool] = {}
+    for topic in topics:
+        for record in trends[topic]:
+            partial[record["date"]] = partial.get(record["date"], False) or bool(
+                record.get("isPartial"))
+    timestamps = sorted(partial)
+    column = {date: i for i, date in enumerate(timestamps)}
+    rows = []
+    for topic in topics:
+        row = [0] * len(timestamps)
+        for record in trends[topic]:
+            row[column[record["date"]]] = int(record[topic])
+        rows.append(row)
+    return topics, timestamps, [partial[date] for date in timestamps], rows
+
+
+def write_matrix(snapshot_dir: str, topics: Sequence[str], timestamps: Sequence[str], values,
+                 partial: Optional[Sequence[bool]] = None,
+                 meta: Optional[Dict[str, Any]] = None) -> str:
+    """Writes a snapshot atomically and returns its directory.
+
+    The matrix goes to a fresh ``values-<id>.npy`` before the header that
+    names it is swapped in, so readers never see a header paired with a
+    half-written matrix.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    matrix = np.clip(np.asarray(values, dtype=np.int16), 0, 100).astype(np.uint8)
+    matrix = matrix.reshape(len(topics), len(timestamps))
+    os.makedirs(snapshot_dir, exist_ok=True)
+    values_file = f"values-{uuid.uuid4().hex[:12]}.npy"
+    tmp_path = os.path.join(snapshot_dir, values_file + ".tmp")
+    with open(tmp_path, "wb") as file:
+        np.save(file, matrix)
+    os.replace(tmp_path, os.path.join(snapshot_dir, values_file))
+
+    header = dict(meta or {}, version=SNAPSHOT_VERSION, created_at=time.time(),
+                  values_file=values_file, shape=list(matrix.shape), dtype="uint8",
+                  topics=list(topics), timestamps=list(timestamps),
+                  partial=list(partial) if partial is not None else [False] * len(timestamps))
+    header_path = os.path.join(snapshot_dir, HEADER_FILE)
+    with open(header_path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(header, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(header_path + ".tmp", header_path)
+
+    for name in os.listdir(snapshot_dir):
+        if name.startswith("values-") and name != values_file:
+            os.remove(os.path.join(snapshot_dir, name))
+    return snapshot_dir
+
+
+def write_snapshot(snapshot_dir: str, trends: Dict[str, List[Dict[str, Any]]],
+                   **meta) -> str:
+    """Writes per-topic trend records as a columnar snapshot."""
+    topics, timestamps, partial, rows = build_matrix(trends)
+    return write_matrix(snapshot_dir, topics, timestamps, rows, partial, meta)
+
+
+def read_header(snapshot_dir: str) -> Dict[str, Any]:
+    """Reads a snapshot header.
+
+    Raises:
+        OSError: If the snapshot does not exist.
+        ValueError: If the header is not a supported snapshot.
+    """
+    with open(os.path.join(snapshot_dir, HEADER_FILE), "r", encoding="utf-8") as file:
+        header = json.load(file)
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported trends snapshot version: {header.get('version')}")
+    return header
+
+
+def load_snapshot_topics(snapshot_dir: str) -> List[str]:
+    """Returns the snapshot's topics without touching the matrix."""
+    return read_header(snapshot_dir)["topics"]
+
+
+def load_trends_matrix(snapshot_dir: str, mmap: bool = True) -> TrendsSnapshot:
+    """Loads a snapshot, memory-mapping the matrix by default."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    header = read_header(snapshot_dir)
+    values = np.load(os.path.join(snapshot_dir, header["values_file"]),
+                     mmap_mode="r" if mmap else None)
+    if list(values.shape) != header["shape"]:
+        raise ValueError(f"Snapshot matrix shape {values.shape} does not match its header")
+    return TrendsSnapshot(header, values)